@@ -14,9 +14,26 @@ Usage:
 
 __version__ = "1.3.0"
 
-from .config_loader import load_config, ProjectConfig, PartSpec
-from .part_resolver import PartResolver, ResolvedPart
-from .kicad_builder import KicadBuilder
+import importlib
+
+# 공개 이름 → 정의 모듈 (처음 접근할 때 import - CLI 시작 시간 단축)
+_LAZY_EXPORTS = {
+    "load_config": ".config_loader",
+    "ProjectConfig": ".config_loader",
+    "PartSpec": ".config_loader",
+    "PartResolver": ".part_resolver",
+    "ResolvedPart": ".part_resolver",
+    "KicadBuilder": ".kicad_builder",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "__version__",
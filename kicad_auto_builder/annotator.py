@@ -0,0 +1,232 @@
+"""
+Annotator - 전체 시트 단일 패스 Reference 주석 엔진 v1.0
+
+scripts의 global_annotate / fix_annotations_v2 / fix_all_refs / fix_refs_simple /
+kicad_tools.annotate_schematic이 같은 일을 각자 구현했고, 그중 일부는 바꿀 Reference마다
+파일 전체에 re.sub(count=1)를 돌려 (변경 수 × 파일 크기) 시간이 걸리고
+"R?"가 여러 개면 엉뚱한 심볼의 이름을 바꿨습니다.
+
+1. 모든 시트를 한 번씩 읽어 심볼 인스턴스 (Reference, 위치, unit, lib_id) 수집
+2. 시트 순서 → 위치(y, x) 순으로 정렬해 접두사별 카운터로 번호 배정
+   - 기본: 모든 Reference를 1부터 다시 매김
+   - keep_existing: 번호가 있는 Reference는 유지하고 미주석("R?", "R")과 중복만 빈 번호로 채움
+   - 다중 유닛 심볼은 Reference를 공유 (주석된 묶음은 유지, 미주석 유닛은
+     같은 시트·같은 lib_id에서 그 유닛이 비어 있는 묶음에 합류)
+3. 시트마다 Reference 속성 / (instances ... (reference)) / (symbol_instances (path ... (reference)))
+   구간을 SchematicDocument에 기록했다가 한 번의 스플라이스로 출력
+   (원자적 교체, 내용이 같은 시트는 다시 쓰지 않음)
+
+- 전원 심볼(#PWR, #FLG 등 '#' 접두사)은 건너뜀
+
+Usage:
+    result = Annotator(keep_existing=True).annotate(["fcBoard_Power.kicad_sch", ...])
+    for change in result.changes:
+        print(change.sheet, change.old, "->", change.new)
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .document import SchematicDocument
+from .sch_writer import write_text
+from .sexpr import SNode
+
+logger = logging.getLogger(__name__)
+
+# 접두사 + 번호 + 미주석 표시 ("R12", "U?", "FB")
+_REF_RE = re.compile(r"^([A-Za-z_#]+)(\d*)(\??)$")
+
+
+@dataclass
+class AnnotationChange:
+    """Reference 변경 하나."""
+    sheet: str
+    uuid: str
+    old: str
+    new: str
+
+
+@dataclass
+class AnnotationResult:
+    """주석 결과."""
+    changes: list[AnnotationChange] = field(default_factory=list)
+    ranges: dict[str, int] = field(default_factory=dict)  # 접두사 → 최대 번호
+    symbols: int = 0
+    written: list[str] = field(default_factory=list)      # 실제로 다시 쓴 시트
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        """리포트용 요약."""
+        return {
+            "symbols": self.symbols,
+            "changed": len(self.changes),
+            "ranges": dict(sorted(self.ranges.items())),
+            "written": self.written,
+            "seconds": round(self.seconds, 4),
+        }
+
+
+@dataclass
+class _Symbol:
+    sheet: int
+    node: SNode
+    ref: str
+    prefix: str
+    number: Optional[int]  # 미주석이면 None
+    unit: int
+    lib_id: str
+    x: float
+    y: float
+
+
+class Annotator:
+    """전체 시트 Reference 주석기."""
+
+    def __init__(self, keep_existing: bool = False, prefixes: Optional[Iterable[str]] = None):
+        """초기화.
+
+        Args:
+            keep_existing: 번호가 있는 Reference 유지 (미주석/중복만 번호 배정)
+            prefixes: 주석할 접두사 (None이면 '#'로 시작하지 않는 모든 접두사)
+        """
+        self.keep_existing = keep_existing
+        self.prefixes = set(prefixes) if prefixes is not None else None
+
+    def annotate(self, paths: list[Union[str, Path]], dry_run: bool = False) -> AnnotationResult:
+        """시트들을 읽어 주석하고 바뀐 시트를 다시 씁니다.
+
+        Args:
+            paths: 회로도 파일 경로 (이 순서가 번호 순서)
+            dry_run: 파일을 쓰지 않고 결과만 계산
+
+        Returns:
+            AnnotationResult
+        """
+        started = time.perf_counter()
+        docs = [SchematicDocument.load(p) for p in paths]
+        symbols = self._collect(docs)
+        assigned = self._assign(symbols)
+
+        result = AnnotationResult(symbols=len(symbols))
+        for sym in symbols:
+            new = assigned[id(sym)]
+            result.ranges[sym.prefix] = max(result.ranges.get(sym.prefix, 0), int(new[len(sym.prefix):]))
+            if new == sym.ref:
+                continue
+            doc = docs[sym.sheet]
+            set_reference(doc, sym.node, new)
+            result.changes.append(AnnotationChange(
+                sheet=doc.path.name,
+                uuid=sym.node.get("uuid", default=""),
+                old=sym.ref,
+                new=new,
+            ))
+
+        for doc in docs:
+            if doc.modified and not dry_run and write_text(doc.path, doc.serialize(), skip_unchanged=True):
+                result.written.append(doc.path.name)
+
+        result.seconds = time.perf_counter() - started
+        logger.debug(f"주석: 심볼 {result.symbols}개, 변경 {len(result.changes)}개 ({result.seconds * 1000:.1f} ms)")
+        return result
+
+    def _collect(self, docs: list[SchematicDocument]) -> list[_Symbol]:
+        """주석 대상 심볼을 시트 → (y, x) 순으로 모읍니다."""
+        symbols = []
+        for sheet, doc in enumerate(docs):
+            for node in doc.symbols:
+                ref = node.property("Reference", "?")
+                match = _REF_RE.match(ref)
+                if match is None:
+                    continue
+                prefix, number, question = match.groups()
+                if prefix.startswith("#") or (self.prefixes is not None and prefix not in self.prefixes):
+                    continue
+                x, y, _ = node.at()
+                symbols.append(_Symbol(
+                    sheet=sheet,
+                    node=node,
+                    ref=ref,
+                    prefix=prefix,
+                    number=int(number) if number and not question else None,
+                    unit=int(node.get("unit", default="1")),
+                    lib_id=node.get("lib_id", default=""),
+                    x=x,
+                    y=y,
+                ))
+        symbols.sort(key=lambda s: (s.sheet, s.y, s.x))
+        return symbols
+
+    def _assign(self, symbols: list[_Symbol]) -> dict[int, str]:
+        """심볼 id → 새 Reference."""
+        used: dict[str, set[int]] = {}      # 접두사 → 사용 중인 번호
+        counters: dict[str, int] = {}       # 접두사 → 다음 후보 번호
+        packages: dict[str, tuple[str, set[int]]] = {}  # Reference → (lib_id, 유닛들)
+        assigned: dict[int, str] = {}
+
+        def join(ref: str, sym: _Symbol) -> bool:
+            """ref 묶음에 sym 유닛이 들어갈 수 있으면 합류."""
+            lib_id, units = packages[ref]
+            if lib_id != sym.lib_id or sym.unit in units:
+                return False
+            units.add(sym.unit)
+            assigned[id(sym)] = ref
+            return True
+
+        # keep_existing: 주석된 Reference를 먼저 확보 (중복된 두 번째부터는 다시 배정)
+        pending = []
+        for sym in symbols:
+            if self.keep_existing and sym.number is not None:
+                if sym.ref not in packages:
+                    packages[sym.ref] = (sym.lib_id, {sym.unit})
+                    used.setdefault(sym.prefix, set()).add(sym.number)
+                    assigned[id(sym)] = sym.ref
+                    continue
+                if join(sym.ref, sym):
+                    continue
+            pending.append(sym)
+
+        renamed: dict[str, str] = {}           # 기존 Reference → 새 Reference (다시 매길 때)
+        open_packages: dict[tuple, list[str]] = {}  # (시트, lib_id) → 이번에 만든 Reference
+        for sym in pending:
+            if sym.number is not None and sym.ref in renamed and join(renamed[sym.ref], sym):
+                continue
+            if sym.number is None and any(
+                join(ref, sym) for ref in open_packages.get((sym.sheet, sym.lib_id), ())
+            ):
+                continue
+
+            taken = used.setdefault(sym.prefix, set())
+            n = counters.get(sym.prefix, 1)
+            while n in taken:
+                n += 1
+            taken.add(n)
+            counters[sym.prefix] = n + 1
+            ref = f"{sym.prefix}{n}"
+            packages[ref] = (sym.lib_id, {sym.unit})
+            assigned[id(sym)] = ref
+            if sym.number is not None:
+                renamed.setdefault(sym.ref, ref)
+            else:
+                open_packages.setdefault((sym.sheet, sym.lib_id), []).append(ref)
+
+        return assigned
+
+
+def set_reference(doc: SchematicDocument, sym: SNode, new_ref: str) -> bool:
+    """심볼 Reference와 (KiCad 6) 최상위 symbol_instances의 항목을 함께 바꿉니다."""
+    if not doc.set_reference(sym, new_ref):
+        return False
+    legacy = doc.root.find("symbol_instances")
+    uuid = sym.get("uuid")
+    if legacy is not None and uuid:
+        for path in legacy.find_all("path"):
+            if (path.value() or "").rsplit("/", 1)[-1] == uuid:
+                ref_node = path.find("reference")
+                if ref_node is not None:
+                    doc.set_atom(ref_node, 0, new_ref)
+    return True
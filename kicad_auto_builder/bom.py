@@ -0,0 +1,601 @@
+"""
+BOM - 단일 패스 다중 출력 BOM 집계기 v1.0
+
+build_bom / build_bom_full은 self.parts를 각자 돌며 따로 묶었고, scripts의
+kicad_tools.generate_bom / kicad_tools_v2.generate_bom은 시트를 다시 파싱해 또 다른 키 /
+정렬 / 형식(txt, csv)으로 묶었습니다.
+
+1. 입력을 BomItem으로 통일 (ResolvedPart / connectivity.Project / 회로도 파일)
+2. BomAggregator가 Reference 자연 정렬을 한 번 하고, 가장 세밀한 키로 한 번 묶음 → Bom
+3. 출력마다 더 거친 키 / DNP 제외가 필요하면 이미 정렬된 묶음을 합치기만 함 (다시 정렬하지 않음)
+4. write_bom()이 묶음을 한 번 돌며 모든 출력(sink)에 행을 흘려보냄
+   - JlcCsvSink: JLC 조립용 CSV (DNP 제외)
+   - FullCsvSink: 전체 필드 CSV
+   - CsvSink: 열을 지정하는 CSV (scripts 형식 등)
+   - TextTableSink: 고정폭 텍스트 표
+   - JsonSink: JSON
+
+변형(variant) 빌드는 Bom.variant()로 DNP 표시만 바꾼 Bom을 만들어 같은 출력에 다시 흘리면 되며,
+정렬과 묶음은 다시 하지 않습니다.
+
+Usage:
+    bom = BomAggregator().aggregate(items_from_parts(resolved_parts))
+    write_bom(bom, [JlcCsvSink("out/bom_jlc.csv"), FullCsvSink("out/bom_full.csv"), JsonSink("out/bom.json")])
+
+    lite = bom.variant(dnp={"U5", "J3"})
+    write_bom(lite, [JlcCsvSink("out/bom_jlc_lite.csv")])
+"""
+
+import csv
+import heapq
+import io
+import json
+import re
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from . import __version__
+from .sch_writer import write_text
+from .sexpr import iter_instance_symbols, parse
+
+JSON_VERSION = 1
+
+# 묶음 키로 쓸 수 있는 BomItem 필드
+KEY_FIELDS = ("value", "footprint", "lcsc", "mpn", "manufacturer", "lib_id")
+# 기본 묶음 키 (build_bom_full과 같음 - JLC 키 (value, footprint, lcsc)를 포함)
+DEFAULT_KEYS = ("value", "footprint", "lcsc", "mpn", "manufacturer")
+JLC_KEYS = ("value", "footprint", "lcsc")
+
+# 묶음 순서: "input" = 입력에서 처음 나온 순서 (builder BOM), "ref" = 첫 Reference 자연 정렬 순
+ORDERS = ("input", "ref")
+
+# 회로도 속성 이름 (앞의 것 우선)
+LCSC_FIELDS = ("LCSC Part", "LCSC", "LCSC Part #", "JLCPCB Part #")
+MPN_FIELDS = ("MPN", "Manufacturer Part Number", "Manufacturer_Part_Number")
+MANUFACTURER_FIELDS = ("Manufacturer", "MFR")
+
+
+@dataclass(frozen=True)
+class BomItem:
+    """BOM 부품 하나 (Reference 하나)."""
+    ref: str
+    value: str = ""
+    footprint: str = ""
+    lcsc: str = ""
+    mpn: str = ""
+    manufacturer: str = ""
+    description: str = ""
+    lib_id: str = ""
+    sheet: str = ""
+    dnp: bool = False
+
+
+@dataclass
+class BomGroup:
+    """같은 키의 부품 묶음 (items는 Reference 자연 정렬 순)."""
+    key: tuple
+    items: list[BomItem] = field(default_factory=list)
+
+    @property
+    def refs(self) -> list[str]:
+        return [item.ref for item in self.items]
+
+    @property
+    def qty(self) -> int:
+        return len(self.items)
+
+    @property
+    def value(self) -> str:
+        return self.items[0].value
+
+    @property
+    def footprint(self) -> str:
+        return self.items[0].footprint
+
+    @property
+    def lcsc(self) -> str:
+        return self.items[0].lcsc
+
+    @property
+    def mpn(self) -> str:
+        return self.items[0].mpn
+
+    @property
+    def manufacturer(self) -> str:
+        return self.items[0].manufacturer
+
+    @property
+    def lib_id(self) -> str:
+        return self.items[0].lib_id
+
+    @property
+    def description(self) -> str:
+        """첫 번째로 비어 있지 않은 설명."""
+        return next((item.description for item in self.items if item.description), "")
+
+    @property
+    def dnp(self) -> bool:
+        """묶음 전체가 DNP인지."""
+        return all(item.dnp for item in self.items)
+
+    def to_dict(self) -> dict:
+        return {
+            "refs": self.refs,
+            "qty": self.qty,
+            "value": self.value,
+            "footprint": self.footprint,
+            "lcsc": self.lcsc,
+            "mpn": self.mpn,
+            "manufacturer": self.manufacturer,
+            "description": self.description,
+            "lib_id": self.lib_id,
+            "dnp": [item.ref for item in self.items if item.dnp],
+        }
+
+
+@dataclass
+class Bom:
+    """집계 결과 (가장 세밀한 키의 묶음 + 정렬 순위)."""
+    keys: tuple
+    groups: list[BomGroup]
+    rank: dict[str, int]    # Reference → 자연 정렬 순위
+    index: dict[str, int]   # Reference → 입력 순서
+    order: str = "input"
+
+    @property
+    def items(self) -> Iterable[BomItem]:
+        for group in self.groups:
+            yield from group.items
+
+    def view(self, keys: Optional[tuple] = None, fitted_only: bool = False) -> list[BomGroup]:
+        """출력 하나가 볼 묶음 목록.
+
+        Args:
+            keys: 묶음 키 (self.keys의 부분집합, None이면 self.keys)
+            fitted_only: DNP 부품 제외 (모두 DNP인 묶음은 빠짐)
+
+        Returns:
+            BomGroup 목록 (묶음을 합치기만 하고 부품을 다시 정렬하지 않음)
+        """
+        keys = tuple(keys) if keys is not None else self.keys
+        if keys == self.keys and not fitted_only:
+            return self.groups
+        missing = [k for k in keys if k not in self.keys]
+        if missing:
+            raise ValueError(f"집계 키 {self.keys}에 없는 키: {missing}")
+
+        positions = [self.keys.index(k) for k in keys]
+        merged: dict[tuple, list[list[BomItem]]] = {}
+        for group in self.groups:
+            items = [item for item in group.items if not item.dnp] if fitted_only else group.items
+            if items:
+                merged.setdefault(tuple(group.key[i] for i in positions), []).append(items)
+
+        rank = self.rank
+        groups = []
+        for key, runs in merged.items():
+            if len(runs) == 1:
+                items = list(runs[0])
+            else:
+                items = list(heapq.merge(*runs, key=lambda item: rank[item.ref]))
+            groups.append(BomGroup(key, items))
+        return self._sorted(groups)
+
+    def variant(self, dnp: Iterable[str] = (), fitted: Iterable[str] = ()) -> "Bom":
+        """DNP 표시만 바꾼 Bom (묶음 / 정렬 재사용).
+
+        Args:
+            dnp: 이 변형에서 실장하지 않을 Reference
+            fitted: 이 변형에서 실장할 Reference (기본 DNP 해제)
+        """
+        dnp, fitted = set(dnp), set(fitted)
+
+        def mark(item: BomItem) -> BomItem:
+            state = True if item.ref in dnp else False if item.ref in fitted else item.dnp
+            return item if state == item.dnp else replace(item, dnp=state)
+
+        groups = [BomGroup(group.key, [mark(item) for item in group.items]) for group in self.groups]
+        return Bom(self.keys, groups, self.rank, self.index, self.order)
+
+    def _sorted(self, groups: list[BomGroup]) -> list[BomGroup]:
+        if self.order == "ref":
+            return sorted(groups, key=lambda g: self.rank[g.items[0].ref])
+        return sorted(groups, key=lambda g: min(self.index[item.ref] for item in g.items))
+
+
+class BomAggregator:
+    """부품을 한 번 정렬하고 한 번 묶는 집계기."""
+
+    def __init__(self, keys: Iterable[str] = DEFAULT_KEYS, order: str = "input"):
+        """초기화.
+
+        Args:
+            keys: 묶음 키 (KEY_FIELDS 중에서, 출력들이 쓰는 키를 모두 포함해야 함)
+            order: 묶음 순서 ("input" 또는 "ref")
+        """
+        self.keys = tuple(keys)
+        unknown = [k for k in self.keys if k not in KEY_FIELDS]
+        if unknown:
+            raise ValueError(f"알 수 없는 BOM 키: {unknown} (가능: {', '.join(KEY_FIELDS)})")
+        if order not in ORDERS:
+            raise ValueError(f"알 수 없는 BOM 순서: {order} (가능: {', '.join(ORDERS)})")
+        self.order = order
+
+    def aggregate(self, items: Iterable[BomItem]) -> Bom:
+        """부품을 묶습니다.
+
+        Args:
+            items: BomItem (items_from_parts / items_from_project / items_from_schematics)
+
+        Returns:
+            Bom
+        """
+        items = list(items)
+        index: dict[str, int] = {}
+        for i, item in enumerate(items):
+            index.setdefault(item.ref, i)
+
+        # 자연 정렬은 여기서 한 번만 - 이후 묶음 / 합치기는 이 순서를 유지
+        ranked = sorted(items, key=lambda item: natural_key(item.ref))
+        rank = {item.ref: r for r, item in enumerate(ranked)}
+
+        groups: dict[tuple, BomGroup] = {}
+        for item in ranked:
+            key = tuple(getattr(item, k) for k in self.keys)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = BomGroup(key)
+            group.items.append(item)
+
+        bom = Bom(self.keys, [], rank, index, self.order)
+        bom.groups = bom._sorted(list(groups.values()))
+        return bom
+
+
+# =============================================================================
+# 입력
+# =============================================================================
+
+def items_from_parts(parts: Iterable) -> list[BomItem]:
+    """리졸브된 부품(ResolvedPart)에서 BomItem을 만듭니다."""
+    return [
+        BomItem(
+            ref=part.ref,
+            value=part.value,
+            footprint=part.footprint_full or "",
+            lcsc=part.lcsc or "",
+            mpn=part.mpn or "",
+            manufacturer=part.manufacturer or "",
+            description=part.description or "",
+            lib_id=part.symbol_name,
+            dnp=part.dnp,
+        )
+        for part in parts
+    ]
+
+
+def items_from_project(project) -> list[BomItem]:
+    """connectivity.Project의 부품(계층 전체, 전원 심볼 제외)에서 BomItem을 만듭니다.
+
+    exclude_from_bom(in_bom no) 부품은 제외합니다.
+    """
+    items = []
+    for component in project.components.values():
+        if not component.in_bom:
+            continue
+        items.append(_item(
+            component.ref,
+            component.fields,
+            value=component.value,
+            footprint=component.footprint,
+            description=component.description,
+            lib_id=component.lib_id,
+            sheet=component.sheet,
+            dnp=component.dnp,
+        ))
+    return items
+
+
+def items_from_schematics(paths: Iterable[Union[str, Path]]) -> list[BomItem]:
+    """회로도 파일들의 심볼 인스턴스에서 BomItem을 만듭니다 (계층을 따라가지 않음).
+
+    전원 심볼('#' 접두사 / power: 라이브러리)과 in_bom no 심볼은 제외하고,
+    다중 유닛 심볼은 Reference 하나로 합칩니다.
+
+    Args:
+        paths: 회로도 파일 경로 (이 순서가 입력 순서)
+    """
+    items: dict[str, BomItem] = {}
+    for path in paths:
+        path = Path(path)
+        root = parse(path.read_text(encoding="utf-8"))
+        for sym in iter_instance_symbols(root):
+            ref = sym.property("Reference", "?")
+            lib_id = sym.get("lib_id", default="")
+            if ref.startswith("#") or lib_id.startswith("power:") or sym.get("in_bom") == "no":
+                continue
+            if ref in items:
+                continue
+            props = {prop.value(0, ""): prop.value(1, "") for prop in sym.find_all("property")}
+            items[ref] = _item(
+                ref,
+                props,
+                value=props.get("Value", ""),
+                footprint=props.get("Footprint", ""),
+                description=props.get("Description", ""),
+                lib_id=lib_id,
+                sheet=path.name,
+                dnp=sym.get("dnp") == "yes",
+            )
+    return list(items.values())
+
+
+def _item(ref: str, fields: dict[str, str], **known) -> BomItem:
+    """회로도 속성에서 LCSC / MPN / 제조사를 찾아 BomItem을 만듭니다."""
+    return BomItem(
+        ref=ref,
+        lcsc=_first(fields, LCSC_FIELDS),
+        mpn=_first(fields, MPN_FIELDS),
+        manufacturer=_first(fields, MANUFACTURER_FIELDS),
+        **known,
+    )
+
+
+def _first(fields: dict[str, str], names: tuple[str, ...]) -> str:
+    return next((fields[name] for name in names if fields.get(name)), "")
+
+
+# =============================================================================
+# 출력
+# =============================================================================
+
+class BomSink:
+    """출력 하나 - begin() → 묶음마다 row() → end()로 텍스트를 만듭니다."""
+
+    keys: Optional[tuple] = None   # 묶음 키 (None이면 집계 키)
+    fitted_only: bool = False      # DNP 부품 제외
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else None
+        self.text = ""
+
+    def begin(self, bom: Bom):
+        pass
+
+    def row(self, group: BomGroup):
+        raise NotImplementedError
+
+    def end(self) -> str:
+        raise NotImplementedError
+
+
+# CSV 열 이름 → BomGroup 속성 (Designator / References / Qty / DNP는 CsvSink에서 처리)
+CSV_COLUMNS = {
+    "Comment": "value",
+    "Value": "value",
+    "Footprint": "footprint",
+    "LCSC": "lcsc",
+    "JLCPCB Part #": "lcsc",
+    "MPN": "mpn",
+    "Manufacturer": "manufacturer",
+    "Description": "description",
+    "Library": "lib_id",
+}
+_CSV_SPECIAL = ("Designator", "References", "Qty", "DNP")
+
+JLC_COLUMNS = ("Comment", "Designator", "Footprint", "JLCPCB Part #")
+FULL_COLUMNS = (
+    "Designator", "Value", "Footprint", "LCSC", "MPN",
+    "Manufacturer", "Description", "DNP", "Qty",
+)
+
+
+class CsvSink(BomSink):
+    """열을 지정하는 CSV."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]],
+        columns: Iterable[str],
+        keys: Optional[Iterable[str]] = None,
+        fitted_only: bool = False,
+        ref_sep: str = ",",
+        quoting: int = csv.QUOTE_MINIMAL,
+        lineterminator: str = "\r\n",
+    ):
+        """초기화.
+
+        Args:
+            path: 출력 파일 (None이면 text만)
+            columns: 열 이름 (CSV_COLUMNS 또는 Designator / References / Qty / DNP)
+            keys: 묶음 키 (None이면 집계 키)
+            fitted_only: DNP 부품 제외
+            ref_sep: Reference 구분자
+            quoting: 데이터 행 인용 방식 (머리글은 항상 QUOTE_MINIMAL)
+            lineterminator: 줄 끝
+        """
+        super().__init__(path)
+        self.columns = tuple(columns)
+        unknown = [c for c in self.columns if c not in CSV_COLUMNS and c not in _CSV_SPECIAL]
+        if unknown:
+            raise ValueError(f"알 수 없는 BOM 열: {unknown}")
+        self.keys = tuple(keys) if keys is not None else None
+        self.fitted_only = fitted_only
+        self.ref_sep = ref_sep
+        self.quoting = quoting
+        self.lineterminator = lineterminator
+
+    def begin(self, bom: Bom):
+        self._buffer = io.StringIO(newline="")
+        csv.writer(self._buffer, lineterminator=self.lineterminator).writerow(self.columns)
+        self._writer = csv.writer(self._buffer, quoting=self.quoting, lineterminator=self.lineterminator)
+
+    def row(self, group: BomGroup):
+        self._writer.writerow([self._cell(column, group) for column in self.columns])
+
+    def end(self) -> str:
+        self.text = self._buffer.getvalue()
+        return self.text
+
+    def _cell(self, column: str, group: BomGroup):
+        if column in ("Designator", "References"):
+            return self.ref_sep.join(group.refs)
+        if column == "Qty":
+            return group.qty
+        if column == "DNP":
+            return "Yes" if group.dnp else ""
+        return getattr(group, CSV_COLUMNS[column])
+
+
+class JlcCsvSink(CsvSink):
+    """JLC 조립용 BOM CSV (DNP 제외, (value, footprint, lcsc) 묶음)."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        super().__init__(path, JLC_COLUMNS, keys=JLC_KEYS, fitted_only=True)
+
+
+class FullCsvSink(CsvSink):
+    """모든 필드 BOM CSV (DNP 포함, 집계 키 묶음)."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        super().__init__(path, FULL_COLUMNS, keys=DEFAULT_KEYS)
+
+
+class TextTableSink(BomSink):
+    """고정폭 텍스트 표 (Qty / References / Value / Footprint)."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        title: str = "BILL OF MATERIALS",
+        widths: tuple[int, int, int, int] = (6, 30, 25, 35),
+        unique_label: str = "Total unique parts",
+        keys: Optional[Iterable[str]] = None,
+        fitted_only: bool = False,
+    ):
+        """초기화.
+
+        Args:
+            path: 출력 파일 (None이면 text만)
+            title: 제목 줄
+            widths: 열 너비 (Qty, References, Value, Footprint) - 넘치면 "..."로 자름
+            unique_label: 묶음 수 합계 줄의 이름
+            keys: 묶음 키 (None이면 집계 키)
+            fitted_only: DNP 부품 제외
+        """
+        super().__init__(path)
+        self.title = title
+        self.widths = widths
+        self.unique_label = unique_label
+        self.keys = tuple(keys) if keys is not None else None
+        self.fitted_only = fitted_only
+
+    def begin(self, bom: Bom):
+        qty, refs, value, footprint = self.widths
+        self.lines = [
+            "=" * 100,
+            self.title,
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "=" * 100,
+            "",
+            f"{'Qty':<{qty}} {'References':<{refs}} {'Value':<{value}} {'Footprint':<{footprint}}",
+            "-" * 100,
+        ]
+        self.unique = 0
+        self.total = 0
+
+    def row(self, group: BomGroup):
+        qty, refs, value, footprint = self.widths
+        refs_str = _clip(", ".join(group.refs), refs)
+        fp_short = _clip(group.footprint.split(":")[-1] if group.footprint else "N/A", footprint)
+        self.lines.append(f"{group.qty:<{qty}} {refs_str:<{refs}} {group.value:<{value}} {fp_short:<{footprint}}")
+        self.unique += 1
+        self.total += group.qty
+
+    def end(self) -> str:
+        self.lines.extend([
+            "-" * 100,
+            f"{self.unique_label}: {self.unique}",
+            f"Total components: {self.total}",
+        ])
+        self.text = "\n".join(self.lines) + "\n"
+        return self.text
+
+
+def _clip(text: str, width: int) -> str:
+    """열 너비 - 2자를 넘으면 너비 - 5자 + "..."."""
+    return text[:width - 5] + "..." if len(text) > width - 2 else text
+
+
+class JsonSink(BomSink):
+    """JSON BOM."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        keys: Optional[Iterable[str]] = None,
+        fitted_only: bool = False,
+    ):
+        super().__init__(path)
+        self.keys = tuple(keys) if keys is not None else None
+        self.fitted_only = fitted_only
+
+    def begin(self, bom: Bom):
+        self.data = {
+            "version": JSON_VERSION,
+            "tool": f"kicad_auto_builder {__version__}",
+            "keys": list(self.keys or bom.keys),
+            "groups": [],
+        }
+
+    def row(self, group: BomGroup):
+        self.data["groups"].append(group.to_dict())
+
+    def end(self) -> str:
+        groups = self.data["groups"]
+        self.data["totals"] = {
+            "unique": len(groups),
+            "components": sum(g["qty"] for g in groups),
+            "dnp": sum(len(g["dnp"]) for g in groups),
+        }
+        self.text = json.dumps(self.data, indent=1, ensure_ascii=False)
+        return self.text
+
+
+def write_bom(bom: Bom, sinks: list[BomSink], skip_unchanged: bool = True) -> dict[Path, bool]:
+    """묶음을 한 번 돌며 모든 출력에 행을 보내고 파일을 씁니다.
+
+    같은 (keys, fitted_only)를 쓰는 출력들은 같은 묶음 목록을 공유합니다.
+
+    Args:
+        bom: 집계 결과
+        sinks: 출력 목록
+        skip_unchanged: 내용이 같은 파일은 다시 쓰지 않음
+
+    Returns:
+        {출력 경로: 실제로 다시 썼는지} (경로가 있는 출력만)
+    """
+    views: dict[tuple, list[BomSink]] = {}
+    for sink in sinks:
+        views.setdefault((sink.keys, sink.fitted_only), []).append(sink)
+        sink.begin(bom)
+
+    for (keys, fitted_only), view_sinks in views.items():
+        for group in bom.view(keys, fitted_only):
+            for sink in view_sinks:
+                sink.row(group)
+
+    written = {}
+    for sink in sinks:
+        text = sink.end()
+        if sink.path is not None:
+            sink.path.parent.mkdir(parents=True, exist_ok=True)
+            written[sink.path] = write_text(sink.path, text, skip_unchanged)
+    return written
+
+
+def natural_key(s: str):
+    """자연 정렬 키 (R1, R2, R10 순서)."""
+    return [int(c) if c.isdigit() else c.lower() for c in re.split(r"(\d+)", s)]
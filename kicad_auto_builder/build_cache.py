@@ -0,0 +1,190 @@
+"""
+Build Cache - 증분 빌드 캐시 v1.2
+
+각 산출물(심볼 라이브러리, 시트, BOM, 리포트)의 입력을 지문(fingerprint)으로 만들어
+manifest.json의 "build_cache" 섹션에 저장합니다.
+다음 빌드에서 입력 지문과 출력 파일 해시가 모두 같으면 해당 산출물 생성을 건너뜁니다.
+
+지문 입력 예:
+- 시트: 빌더 버전, 시트 이름/파일명, 부품(ResolvedPart), 심볼 원본 해시, ports, 타이틀 블록
+- BOM: 부품 목록
+
+v1.1: 다시 생성한 산출물 중 파일 내용이 실제로 바뀐 것(rewritten)과
+      내용이 같아 기존 파일을 유지한 것(unchanged)을 구분해 기록
+v1.2: 산출물별 부가 정보(meta - 시트의 배선 요약 등)를 지문과 함께 저장하고,
+      건너뛴 산출물은 이전 빌드의 meta를 그대로 이월 (manifest를 쓰려고 다시 계산하지 않음)
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# manifest.json 내 캐시 섹션 이름 / 형식 버전
+MANIFEST_KEY = "build_cache"
+CACHE_FORMAT = 1
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """dataclass / Path 등을 JSON 직렬화 가능한 값으로 변환합니다."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: _to_jsonable(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+    if isinstance(obj, dict):
+        return {str(k): _to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_jsonable(v) for v in obj]
+    if isinstance(obj, Path):
+        return obj.as_posix()
+    return obj
+
+
+def fingerprint(*inputs: Any) -> str:
+    """입력 값들의 안정적인 SHA-256 지문을 계산합니다.
+
+    Args:
+        inputs: dataclass, dict, list, Path, 기본형 값
+
+    Returns:
+        16진수 지문 문자열
+    """
+    canonical = json.dumps(_to_jsonable(list(inputs)), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """파일 내용의 SHA-256 (없으면 None)."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class BuildCache:
+    """산출물별 지문 저장소.
+
+    이전 manifest.json에서 지문을 읽고, 이번 빌드의 지문을 새로 모읍니다.
+    """
+
+    def __init__(self, output_dir: Path, enabled: bool = True):
+        """초기화.
+
+        Args:
+            output_dir: 빌드 출력 디렉토리 (manifest.json 위치)
+            enabled: False면 항상 다시 생성 (지문은 계속 기록)
+        """
+        self.output_dir = Path(output_dir)
+        self.enabled = enabled
+        self.previous: dict[str, dict] = self._load_previous() if enabled else {}
+        self.entries: dict[str, dict] = {}
+        self.rebuilt: list[str] = []
+        self.skipped: list[str] = []
+        self.rewritten: list[str] = []
+        self.unchanged: list[str] = []
+
+    def _load_previous(self) -> dict[str, dict]:
+        manifest_path = self.output_dir / "manifest.json"
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                section = json.load(f).get(MANIFEST_KEY, {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"이전 manifest를 읽을 수 없어 전체 빌드합니다: {e}")
+            return {}
+        if section.get("format") != CACHE_FORMAT:
+            return {}
+        return section.get("artifacts", {})
+
+    def is_fresh(self, key: str, input_fp: str, path: Path) -> bool:
+        """이전 빌드와 입력 지문이 같고 출력 파일이 그대로인지 확인합니다."""
+        prev = self.previous.get(key)
+        if not prev or prev.get("inputs") != input_fp:
+            return False
+        if prev.get("path") != Path(path).as_posix():
+            return False
+        return file_digest(path) == prev.get("output")
+
+    def record(
+        self,
+        key: str,
+        input_fp: str,
+        path: Path,
+        output_fp: Optional[str] = None,
+        rewritten: bool = True,
+        meta: Optional[dict] = None,
+    ):
+        """이번 빌드에서 생성한 산출물의 지문을 기록합니다.
+
+        Args:
+            key: 산출물 키
+            input_fp: 입력 지문
+            path: 출력 경로
+            output_fp: 출력 파일 해시 (없으면 계산)
+            rewritten: False면 내용이 같아 기존 파일을 그대로 둔 산출물
+            meta: 산출물과 함께 만든 부가 정보 (JSON 직렬화 가능)
+        """
+        self.rebuilt.append(key)
+        (self.rewritten if rewritten else self.unchanged).append(key)
+        self.entries[key] = {
+            "path": Path(path).as_posix(),
+            "inputs": input_fp,
+            "output": output_fp or file_digest(path),
+        }
+        if meta is not None:
+            self.entries[key]["meta"] = meta
+
+    def meta(self, key: str) -> Optional[dict]:
+        """이번 빌드에서 기록했거나 이월한 산출물의 부가 정보 (없으면 None)."""
+        return self.entries.get(key, {}).get("meta")
+
+    def set_meta(self, key: str, meta: dict):
+        """이월한 산출물에 부가 정보가 없을 때 채웁니다 (이전 형식 manifest)."""
+        if key in self.entries:
+            self.entries[key] = {**self.entries[key], "meta": meta}
+
+    def check(self, key: str, input_fp: str, path: Path) -> bool:
+        """재사용 가능한지 확인하고, 가능하면 이전 지문을 이번 빌드로 이월합니다.
+
+        Returns:
+            True면 생성을 건너뛰어도 됨
+        """
+        if self.enabled and self.is_fresh(key, input_fp, path):
+            logger.info(f"[SKIP] {key}: 입력 변경 없음")
+            self.entries[key] = self.previous[key]
+            self.skipped.append(key)
+            return True
+        return False
+
+    def build(self, key: str, input_fp: str, path: Path, builder: Callable[[], Path]) -> Path:
+        """입력이 바뀐 경우에만 builder를 실행합니다.
+
+        Args:
+            key: 산출물 키 (예: "sheet:Power")
+            input_fp: 입력 지문
+            path: 예상 출력 경로
+            builder: 산출물을 생성하고 경로를 반환하는 함수
+
+        Returns:
+            산출물 경로
+        """
+        if self.check(key, input_fp, path):
+            return path
+
+        result = builder()
+        self.record(key, input_fp, result)
+        return result
+
+    def to_manifest(self) -> dict:
+        """manifest.json에 저장할 섹션."""
+        return {
+            "format": CACHE_FORMAT,
+            "artifacts": self.entries,
+            "rebuilt": self.rebuilt,
+            "skipped": self.skipped,
+            "rewritten": self.rewritten,
+            "unchanged": self.unchanged,
+        }
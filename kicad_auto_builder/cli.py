@@ -4,7 +4,16 @@ CLI - 커맨드라인 인터페이스
 Usage:
     python -m kicad_auto_builder.cli build power_board.yaml
     python -m kicad_auto_builder.cli build power_board.yaml --dry-run
+    python -m kicad_auto_builder.cli build power_board.yaml --jobs 4
+    python -m kicad_auto_builder.cli build power_board.yaml --placement force --seed 1
     python -m kicad_auto_builder.cli validate power_board.yaml
+    python -m kicad_auto_builder.cli validate power_board.yaml --offline
+    python -m kicad_auto_builder.cli cache --max-size-mb 200 --max-age-days 90
+    python -m kicad_auto_builder.cli annotate fcBoard_Power.kicad_sch fcBoard_USB.kicad_sch --keep-existing
+    python -m kicad_auto_builder.cli erc fcBoard.kicad_sch -o out/erc_report.txt
+    python -m kicad_auto_builder.cli export-netlist fcBoard.kicad_sch -o out/fcBoard.net
+    python -m kicad_auto_builder.cli verify power_board.yaml
+    python -m kicad_auto_builder.cli bom fcBoard.kicad_sch -o out/bom --variant lite=U5,J3
 """
 
 import argparse
@@ -13,10 +22,11 @@ import sys
 from pathlib import Path
 
 from . import __version__
-from .config_loader import load_config, validate_config
-from .part_resolver import PartResolver
-from .kicad_builder import KicadBuilder
-from .net_validator import validate_nets
+
+# 하위 명령 모듈(config_loader/yaml, part_resolver, kicad_builder 등)은
+# 해당 명령을 실행할 때만 import - --help / validate 시작 시간 단축
+# part_resolver.CACHE_BACKENDS와 같아야 함
+CACHE_BACKENDS = ("sqlite", "dir")
 
 # 로깅 설정
 logging.basicConfig(
@@ -27,8 +37,77 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def make_resolver(config, args):
+    """공통 리졸버 옵션으로 PartResolver를 만듭니다."""
+    from .part_resolver import PartResolver
+
+    return PartResolver(
+        cache_dir=config.cache_dir,
+        prefer_kicad_lib=config.prefer_kicad_lib,
+        jobs=args.resolve_jobs,
+        cache_backend=args.cache_backend,
+        negative_ttl=args.negative_ttl * 3600,
+        breaker_threshold=args.breaker_threshold,
+        offline=args.offline,
+    )
+
+
+def log_resolver_report(report: dict):
+    """조회 실패 / 서킷 브레이커 요약을 출력합니다."""
+    negative = report["negative_cache"]
+    breaker = report["circuit_breaker"]
+    if negative["hits"]:
+        logger.warning(f"최근 실패 기록으로 조회 생략: {', '.join(negative['hits'])}")
+    if negative["recorded"]:
+        logger.warning(f"LCSC 조회 실패 기록: {', '.join(negative['recorded'])}")
+    if breaker["open"]:
+        logger.warning(f"서킷 브레이커 열림 - 조회 생략: {', '.join(breaker['skipped']) or '-'}")
+
+    offline = report["offline"]
+    if offline["enabled"]:
+        logger.info(f"오프라인 모드: 캐시 미스로 건너뛴 부품 {len(offline['skipped'])}개")
+        for item in offline["skipped"]:
+            source = "내장 심볼" if item["builtin"] else "핀 정보 없음"
+            logger.warning(f"  건너뜀: {item['ref']} (LCSC {item['lcsc']}) → {item['fallback']} ({source})")
+
+
+def add_resolver_arguments(parser: argparse.ArgumentParser):
+    """build / validate 공통 리졸버 옵션."""
+    parser.add_argument(
+        "--resolve-jobs",
+        type=int,
+        default=8,
+        help="동시에 조회할 고유 LCSC 부품 수 (기본: 8)",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="sqlite",
+        help="부품 캐시 형식 (기본: sqlite)",
+    )
+    parser.add_argument(
+        "--negative-ttl",
+        type=float,
+        default=6,
+        help="실패한 LCSC 조회를 다시 시도하지 않을 시간 (시간 단위, 기본: 6, 0이면 기록 안 함)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=3,
+        help="연속 실패가 이 횟수에 이르면 easyeda2kicad 호출 중단 (기본: 3, 0이면 사용 안 함)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="캐시와 내장 심볼만 사용 (easyeda2kicad 미실행, 설치되지 않았으면 자동)",
+    )
+
+
 def build_command(args):
     """build 명령어 실행."""
+    from .config_loader import load_config, validate_config
+
     config_path = Path(args.config)
 
     logger.info("=" * 60)
@@ -91,13 +170,15 @@ def build_command(args):
             logger.info(f"  - {name}: {value}")
         return
 
+    # dry-run 이후에만 필요한 모듈
+    from .kicad_builder import KicadBuilder
+    from .net_table import NetTable
+    from .net_validator import validate_nets
+
     # 4. 부품 리졸브 (all_parts: 단일/계층 모드 통합)
     logger.info("")
     logger.info("부품 리졸브 중...")
-    resolver = PartResolver(
-        cache_dir=config.cache_dir,
-        prefer_kicad_lib=config.prefer_kicad_lib,
-    )
+    resolver = make_resolver(config, args)
 
     all_parts = config.all_parts  # 단일/계층 모드 통합
 
@@ -108,11 +189,15 @@ def build_command(args):
         sys.exit(1)
 
     logger.info(f"리졸브 완료: {len(resolved_parts)}개 부품")
+    log_resolver_report(resolver.report())
+
+    # 리졸브 후 한 번 만든 넷 테이블을 검증 / 빌드 단계가 공유
+    net_table = NetTable.from_config(config, resolved_parts)
 
     # 5. 핀-넷 검증
     logger.info("")
     logger.info("핀-넷 검증 중...")
-    net_errors, net_warnings = validate_nets(resolved_parts, all_parts)
+    net_errors, net_warnings = validate_nets(resolved_parts, all_parts, net_table)
 
     # warnings 출력
     for w in net_warnings:
@@ -129,7 +214,19 @@ def build_command(args):
 
     # 6. 빌드
     logger.info("")
-    builder = KicadBuilder(config, resolved_parts)
+    builder = KicadBuilder(
+        config,
+        resolved_parts,
+        incremental=not args.force,
+        jobs=args.jobs,
+        executor=args.executor,
+        resolver_report=resolver.report(),
+        canonical=args.canonical,
+        skip_unchanged=args.skip_unchanged,
+        placement=args.placement,
+        placement_seed=args.seed,
+        net_table=net_table,
+    )
 
     try:
         result = builder.build_all(warnings=net_warnings)
@@ -149,6 +246,10 @@ def build_command(args):
 
 def validate_command(args):
     """validate 명령어 실행 (v1.3: 파일 생성 없이 검증만)."""
+    from .config_loader import load_config, validate_config
+    from .net_table import NetTable
+    from .net_validator import validate_nets
+
     config_path = Path(args.config)
 
     logger.info("=" * 60)
@@ -183,10 +284,7 @@ def validate_command(args):
     # 3. 부품 리졸브 (가능하면)
     logger.info("")
     logger.info("부품 리졸브 중...")
-    resolver = PartResolver(
-        cache_dir=config.cache_dir,
-        prefer_kicad_lib=config.prefer_kicad_lib,
-    )
+    resolver = make_resolver(config, args)
 
     all_parts = config.all_parts
     resolve_errors = []
@@ -198,6 +296,7 @@ def validate_command(args):
         resolve_errors.append(str(e))
         logger.error(f"리졸브 실패: {e}")
         resolved_parts = []
+    log_resolver_report(resolver.report())
 
     # 4. 핀-넷 검증 (리졸브 성공 시)
     net_errors = []
@@ -206,7 +305,8 @@ def validate_command(args):
     if resolved_parts:
         logger.info("")
         logger.info("핀-넷 검증 중...")
-        net_errors, net_warnings = validate_nets(resolved_parts, all_parts)
+        net_table = NetTable.from_config(config, resolved_parts)
+        net_errors, net_warnings = validate_nets(resolved_parts, all_parts, net_table)
 
         for w in net_warnings:
             logger.warning(w)
@@ -241,6 +341,186 @@ def validate_command(args):
         sys.exit(0)
 
 
+def cache_command(args):
+    """cache 명령어 실행 - SQLite 부품 캐시 마이그레이션 / 정리."""
+    from .part_cache import DB_FILENAME, SqlitePartCache
+
+    cache_dir = Path(args.cache_dir)
+    store = SqlitePartCache(cache_dir / DB_FILENAME)
+    try:
+        if args.migrate:
+            imported = store.import_directory(cache_dir)
+            logger.info(f"마이그레이션: {imported}개 항목")
+
+        max_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb is not None else None
+        if max_bytes is not None or args.max_age_days is not None:
+            removed = store.evict(max_bytes=max_bytes, max_age_days=args.max_age_days)
+            logger.info(f"정리: {removed}개 항목 삭제")
+
+        stats = store.stats()
+        logger.info(f"캐시: {store.db_path} ({stats['entries']}개 항목, {stats['bytes'] / 1024:.1f} KB)")
+    finally:
+        store.close()
+
+
+def annotate_command(args):
+    """annotate 명령어 실행 - 전체 시트 Reference 주석."""
+    from .annotator import Annotator
+
+    missing = [p for p in args.sheets if not Path(p).exists()]
+    if missing:
+        logger.error(f"회로도 파일 없음: {', '.join(missing)}")
+        sys.exit(1)
+
+    result = Annotator(keep_existing=args.keep_existing).annotate(args.sheets, dry_run=args.dry_run)
+    for change in result.changes:
+        logger.info(f"  {change.sheet}: {change.old} → {change.new}")
+    for prefix, last in sorted(result.ranges.items()):
+        logger.info(f"  {prefix}: 1-{last}")
+
+    action = "변경 예정" if args.dry_run else f"다시 쓴 시트 {len(result.written)}개"
+    logger.info(
+        f"주석 완료: 심볼 {result.symbols}개 중 {len(result.changes)}개 변경, {action} "
+        f"({result.seconds * 1000:.1f} ms)"
+    )
+
+
+def erc_command(args):
+    """erc 명령어 실행 - kicad-cli 없이 프로젝트 연결성 검사."""
+    import json
+
+    from .connectivity import Project
+
+    if not Path(args.schematic).exists():
+        logger.error(f"회로도 파일 없음: {args.schematic}")
+        sys.exit(1)
+
+    project = Project.load(args.schematic)
+    report = project.erc()
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if output.suffix == ".json":
+            output.write_text(json.dumps(report.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        else:
+            output.write_text(report.format(), encoding="utf-8")
+        logger.info(f"ERC 리포트: {output}")
+    for code, count in report.counts().items():
+        logger.info(f"  {code}: {count}")
+    logger.info(
+        f"ERC 완료: 시트 {len(report.sheets)}개, 넷 {report.nets}개, "
+        f"오류 {report.errors}개, 경고 {report.warnings}개 ({report.seconds * 1000:.1f} ms)"
+    )
+    if report.errors:
+        sys.exit(1)
+
+
+def export_netlist_command(args):
+    """export-netlist 명령어 실행 - eeschema 없이 넷리스트 내보내기."""
+    import time
+
+    from .connectivity import Project
+    from .netlist import Netlist
+
+    if not Path(args.schematic).exists():
+        logger.error(f"회로도 파일 없음: {args.schematic}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    netlist = Netlist.from_project(Project.load(args.schematic), source=Path(args.schematic).resolve())
+    output = Path(args.output) if args.output else Path(args.schematic).with_suffix(".net")
+    json_output = Path(args.json) if args.json else output.with_suffix(".json")
+
+    for path in (output, json_output):
+        written = netlist.save(path)
+        logger.info(f"넷리스트: {path}{'' if written else ' (변경 없음)'}")
+    logger.info(
+        f"내보내기 완료: 부품 {len(netlist.components)}개, 넷 {len(netlist.nets)}개 "
+        f"({(time.perf_counter() - started) * 1000:.1f} ms)"
+    )
+
+
+def bom_command(args):
+    """bom 명령어 실행 - 회로도에서 BOM을 한 번 집계해 모든 형식으로 내보내기."""
+    import time
+
+    from .bom import (
+        BomAggregator, FullCsvSink, JlcCsvSink, JsonSink, TextTableSink,
+        items_from_project, write_bom,
+    )
+    from .connectivity import Project
+
+    if not Path(args.schematic).exists():
+        logger.error(f"회로도 파일 없음: {args.schematic}")
+        sys.exit(1)
+
+    variants = {"": set()}
+    for spec in args.variant or []:
+        name, sep, refs = spec.partition("=")
+        if not sep or not name:
+            logger.error(f"--variant 형식 오류: {spec} (NAME=REF,REF,...)")
+            sys.exit(1)
+        variants[name] = {ref.strip() for ref in refs.split(",") if ref.strip()}
+
+    started = time.perf_counter()
+    bom = BomAggregator().aggregate(items_from_project(Project.load(args.schematic)))
+    output_dir = Path(args.output) if args.output else Path(args.schematic).parent
+
+    for name, dnp in variants.items():
+        suffix = f"_{name}" if name else ""
+        sinks = [
+            JlcCsvSink(output_dir / f"bom_jlc{suffix}.csv"),
+            FullCsvSink(output_dir / f"bom_full{suffix}.csv"),
+            TextTableSink(output_dir / f"bom{suffix}.txt", title=f"BILL OF MATERIALS - {Path(args.schematic).stem}"),
+            JsonSink(output_dir / f"bom{suffix}.json"),
+        ]
+        for path, written in write_bom(bom.variant(dnp=dnp), sinks).items():
+            logger.info(f"BOM: {path}{'' if written else ' (변경 없음)'}")
+
+    logger.info(
+        f"BOM 완료: 부품 {sum(g.qty for g in bom.groups)}개, 묶음 {len(bom.groups)}개, "
+        f"변형 {len(variants)}개 ({(time.perf_counter() - started) * 1000:.1f} ms)"
+    )
+
+
+def verify_command(args):
+    """verify 명령어 실행 - YAML nets와 생성된 회로도의 실제 연결 비교."""
+    import json
+
+    from .config_loader import load_config
+    from .connectivity import Project
+    from .net_diff import diff_nets
+
+    try:
+        config = load_config(args.config)
+    except Exception as e:
+        logger.error(f"설정 파일 로드 실패: {e}")
+        sys.exit(1)
+
+    schematic = Path(args.schematic) if args.schematic else config.output_path / config.schematic_filename
+    if not schematic.exists():
+        logger.error(f"회로도 파일 없음: {schematic} (먼저 build 하거나 --schematic 지정)")
+        sys.exit(1)
+
+    diff = diff_nets(config, Project.load(schematic))
+    for issue in diff.issues:
+        pin = f".{issue.pin}" if issue.pin else ""
+        expected = f" [설정: {issue.expected}]" if issue.expected else ""
+        logger.warning(f"  {issue.kind}: {issue.ref}{pin}{expected} {issue.message}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(diff.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"비교 리포트: {args.json}")
+
+    counts = diff.counts()
+    logger.info(
+        f"연결 비교: 설정 핀 {diff.checked}개 중 {diff.matched}개 일치, "
+        f"missing {counts['missing']} / misassigned {counts['misassigned']} / extra {counts['extra']} "
+        f"({diff.seconds * 1000:.1f} ms)"
+    )
+    if counts["missing"] or counts["misassigned"] or (args.strict and counts["extra"]):
+        sys.exit(1)
+
+
 def main():
     """메인 진입점."""
     parser = argparse.ArgumentParser(
@@ -266,6 +546,46 @@ def main():
         "--output", "-o",
         help="출력 디렉토리",
     )
+    build_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="증분 빌드 캐시를 무시하고 모든 산출물 재생성",
+    )
+    build_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="동시에 생성할 산출물 수 (기본: 1, 직렬)",
+    )
+    build_parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="병렬 생성 방식 (기본: thread)",
+    )
+    build_parser.add_argument(
+        "--canonical",
+        action="store_true",
+        help="회로도를 KiCad 저장 레이아웃으로 출력 (KiCad에서 다시 저장해도 diff 없음)",
+    )
+    build_parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="내용(해시)이 기존 파일과 같은 산출물은 다시 쓰지 않음 (manifest에 다시 쓴 목록 기록)",
+    )
+    build_parser.add_argument(
+        "--placement",
+        choices=["grid", "force"],
+        default="grid",
+        help="부품 배치 방식 (grid: 설정 순서대로, force: 넷을 공유하는 부품끼리 모음, NumPy 필요)",
+    )
+    build_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="--placement force의 난수 시드 (기본: 0, 같은 시드면 같은 배치)",
+    )
+    add_resolver_arguments(build_parser)
     build_parser.add_argument(
         "--prefer-kicad-lib",
         action="store_true",
@@ -280,12 +600,131 @@ def main():
     # validate 명령어 (v1.3)
     validate_parser = subparsers.add_parser("validate", help="설정 파일 검증 (파일 생성 없음)")
     validate_parser.add_argument("config", help="YAML 설정 파일 경로")
+    add_resolver_arguments(validate_parser)
     validate_parser.add_argument(
         "-v", "--verbose",
         action="store_true",
         help="상세 로그 출력",
     )
 
+    # cache 명령어
+    cache_parser = subparsers.add_parser("cache", help="부품 캐시 마이그레이션 / 정리")
+    cache_parser.add_argument(
+        "--cache-dir",
+        default="cache",
+        help="캐시 디렉토리 (기본: cache)",
+    )
+    cache_parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="기존 <LCSC>/meta.json 디렉토리 캐시를 SQLite로 가져오기",
+    )
+    cache_parser.add_argument(
+        "--max-size-mb",
+        type=float,
+        help="총 크기가 이 값을 넘으면 오래 사용하지 않은 항목부터 삭제",
+    )
+    cache_parser.add_argument(
+        "--max-age-days",
+        type=float,
+        help="이 기간 동안 사용하지 않은 항목 삭제",
+    )
+    cache_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
+    # annotate 명령어
+    annotate_parser = subparsers.add_parser("annotate", help="여러 시트의 Reference를 한 번에 주석")
+    annotate_parser.add_argument("sheets", nargs="+", help="회로도 파일 (이 순서대로 번호 배정)")
+    annotate_parser.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="번호가 있는 Reference는 유지하고 미주석(R?)과 중복만 빈 번호로 채움",
+    )
+    annotate_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="파일을 쓰지 않고 변경 내용만 출력",
+    )
+    annotate_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
+    # erc 명령어
+    erc_parser = subparsers.add_parser("erc", help="kicad-cli 없이 ERC (계층 프로젝트 전체)")
+    erc_parser.add_argument("schematic", help="루트 회로도 파일")
+    erc_parser.add_argument(
+        "--output", "-o",
+        help="리포트 파일 (.json이면 JSON, 그 외에는 kicad-cli 텍스트 형식)",
+    )
+    erc_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
+    # export-netlist 명령어
+    netlist_parser = subparsers.add_parser("export-netlist", help="KiCad .net + JSON 넷리스트 내보내기")
+    netlist_parser.add_argument("schematic", help="루트 회로도 파일")
+    netlist_parser.add_argument(
+        "--output", "-o",
+        help="KiCad 넷리스트 파일 (기본: 회로도 이름.net)",
+    )
+    netlist_parser.add_argument(
+        "--json",
+        help="JSON 넷리스트 파일 (기본: --output과 같은 이름.json)",
+    )
+    netlist_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
+    # verify 명령어
+    verify_parser = subparsers.add_parser("verify", help="YAML nets와 생성된 회로도의 실제 연결 비교")
+    verify_parser.add_argument("config", help="YAML 설정 파일 경로")
+    verify_parser.add_argument(
+        "--schematic",
+        help="루트 회로도 파일 (기본: 설정의 out_dir/<name>.kicad_sch)",
+    )
+    verify_parser.add_argument(
+        "--json",
+        help="비교 결과를 JSON으로 저장",
+    )
+    verify_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="extra(설정에 없는 연결 / 부품)도 실패로 처리",
+    )
+    verify_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
+    # bom 명령어
+    bom_parser = subparsers.add_parser("bom", help="회로도에서 BOM 내보내기 (JLC / Full CSV, 텍스트, JSON)")
+    bom_parser.add_argument("schematic", help="루트 회로도 파일")
+    bom_parser.add_argument(
+        "--output", "-o",
+        help="출력 디렉토리 (기본: 회로도가 있는 디렉토리)",
+    )
+    bom_parser.add_argument(
+        "--variant",
+        action="append",
+        metavar="NAME=REF,...",
+        help="변형 BOM 추가 - 나열한 Reference를 DNP로 (여러 번 지정 가능)",
+    )
+    bom_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="상세 로그 출력",
+    )
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -300,6 +739,18 @@ def main():
         build_command(args)
     elif args.command == "validate":
         validate_command(args)
+    elif args.command == "cache":
+        cache_command(args)
+    elif args.command == "annotate":
+        annotate_command(args)
+    elif args.command == "erc":
+        erc_command(args)
+    elif args.command == "export-netlist":
+        export_netlist_command(args)
+    elif args.command == "verify":
+        verify_command(args)
+    elif args.command == "bom":
+        bom_command(args)
     else:
         parser.print_help()
 
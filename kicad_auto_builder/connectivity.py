@@ -0,0 +1,670 @@
+"""
+Connectivity - 프로젝트 연결성 엔진 + 네이티브 ERC v1.2
+
+kicad-cli(KiCad 전체 실행) 없이 계층 프로젝트의 넷을 계산하고 ERC를 수행합니다.
+scripts의 run_erc는 "?" Reference / 풋프린트 누락 / 중복만 보므로
+끊어진 라벨, 연결되지 않은 핀·시트 핀 같은 실제 연결 오류는 잡지 못했습니다.
+
+1. 루트 시트에서 (sheet (property "Sheetfile")) 를 따라 모든 시트 인스턴스를 읽음
+   (같은 파일을 여러 번 쓰는 시트도 파일은 한 번만 파싱)
+2. 시트 인스턴스마다 연결점을 좌표 키로 묶는 union-find
+   - 와이어 끝, 정션, 라벨 앵커, 시트 핀, 심볼 핀 (lib_symbols 핀을 인스턴스 위치/회전/미러로 변환)
+   - 와이어 중간에는 정션 / 라벨만 연결 (T자 연결은 KiCad가 저장할 때 와이어를 나눔)
+3. 이름으로 묶기
+   - 로컬 라벨 / 계층 라벨: 같은 시트 인스턴스 안에서 (KiCad처럼 두 종류끼리도 연결)
+   - 글로벌 라벨 / 전원 심볼(Value) / 숨은 power_in 핀(핀 이름): 프로젝트 전체
+   - 계층 라벨: 부모 시트의 같은 이름 시트 핀과
+4. ERC (KiCad 규칙 이름과 메시지 사용 - 기존 kicad-cli 리포트와 비교 가능)
+   - label_dangling: 와이어/핀에 닿지 않은 라벨
+   - pin_not_connected: 아무것도 연결되지 않은 심볼 핀 / 시트 핀 (no_connect 표시 제외)
+   - unconnected_wire_endpoint: 아무것도 닿지 않은 와이어 끝
+   - hier_label_mismatch: 짝이 없는 계층 라벨 / 시트 핀
+   - single_pin_net: 라벨·와이어는 있지만 핀이 하나뿐인 넷
+   - pin_to_pin: 핀 전기 타입 충돌 (KiCad 기본 핀 충돌 표)
+   - pin_not_driven / power_pin_not_driven: 입력 / 전원 입력 핀만 있고 구동 핀이 없는 넷
+
+v1.1: 넷 이름 - 전원 심볼 이름이 계층/로컬 라벨보다 우선 (+3V3 핀과 로컬 라벨이 같은 넷이면 +3V3)
+v1.2: Project.components - 심볼 인스턴스의 부품 정보 (넷리스트 / BOM용)
+
+Usage:
+    project = Project.load("fcBoard.kicad_sch")
+    report = project.erc()
+    print(report.format())
+    for net in project.nets():
+        print(net.name, [f"{p.ref}.{p.number}" for p in net.pins])
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+from .sexpr import SNode, iter_instance_symbols, parse
+from .spatial_index import LABEL_KINDS, _resolve_extends, point_key, symbol_pins
+
+logger = logging.getLogger(__name__)
+
+# 핀 전기 타입 (KiCad 파일 토큰 → 리포트 표기)
+PIN_TYPES = {
+    "input": "Input",
+    "output": "Output",
+    "bidirectional": "Bidirectional",
+    "tri_state": "Tri-state",
+    "passive": "Passive",
+    "free": "Free",
+    "unspecified": "Unspecified",
+    "power_in": "Power input",
+    "power_out": "Power output",
+    "open_collector": "Open collector",
+    "open_emitter": "Open emitter",
+    "no_connect": "Unconnected",
+}
+
+# KiCad 기본 핀 충돌 표 (erc_settings.cpp) - 나열하지 않은 조합은 OK
+_ORDER = ["input", "output", "bidirectional", "tri_state", "passive", "free",
+          "unspecified", "power_in", "power_out", "open_collector", "open_emitter", "no_connect"]
+_MATRIX = [
+    # I    O    Bi   3S   Pas  NIC  UnS  PwrI PwrO OC   OE   NC
+    "......W....E",
+    ".E.W..W.EEEE",
+    "......W.W.WE",
+    ".W....WWEWWE",
+    "......W....E",
+    "............",
+    "WWWWW.WWWWWE",
+    "...W..W....E",
+    ".EWE..W.EEEE",
+    ".E.W..W.E..E",
+    ".EWW..W.E..E",
+    "EEEEE.EEEEEE",
+]
+PIN_CONFLICTS: dict[tuple[str, str], str] = {}
+for _i, _a in enumerate(_ORDER):
+    for _j, _b in enumerate(_ORDER):
+        _mark = _MATRIX[_i][_j]
+        if _mark in "EW":
+            PIN_CONFLICTS[(_a, _b)] = "error" if _mark == "E" else "warning"
+
+# 넷을 구동하는 핀 타입
+DRIVER_TYPES = {"output", "bidirectional", "tri_state", "passive", "power_out", "open_collector", "open_emitter"}
+
+# 규칙 → (심각도, 메시지)
+RULES = {
+    "label_dangling": ("error", "Label not connected to anything"),
+    "pin_not_connected": ("error", "Pin not connected"),
+    "unconnected_wire_endpoint": ("warning", "Unconnected wire endpoint"),
+    "hier_label_mismatch": ("error", "Hierarchical label and sheet pin do not match"),
+    "single_pin_net": ("warning", "Net has only one pin"),
+    "pin_to_pin": (None, "Pins of type {a} and {b} are connected"),
+    "pin_not_driven": ("error", "Input pin not driven by any Output pins"),
+    "power_pin_not_driven": ("error", "Input Power pin not driven by any Output Power pins"),
+}
+
+# Component 필드로 따로 두는 속성
+_COMPONENT_PROPERTIES = {"Reference", "Value", "Footprint", "Datasheet", "Description"}
+
+_LABEL_TITLES = {
+    "label": "Label",
+    "global_label": "Global Label",
+    "hierarchical_label": "Hierarchical Label",
+}
+
+
+@dataclass
+class Connection:
+    """연결 항목 (와이어, 라벨, 핀 등) 하나."""
+    kind: str        # wire / junction / no_connect / label / global_label / hierarchical_label / sheet_pin / pin
+    sheet: str       # 시트 인스턴스 경로 ("/", "/Power Supply/")
+    at: tuple        # 대표 좌표 (와이어는 시작점)
+    name: str = ""   # 라벨 / 시트 핀 이름, 심볼 핀은 핀 이름
+    ref: str = ""    # 심볼 Reference (핀)
+    number: str = ""  # 핀 번호
+    type: str = ""   # 핀 전기 타입
+    shape: str = ""
+    power: bool = False  # 전원 심볼 핀 (#PWR, #FLG)
+    id: int = -1
+
+    def describe(self) -> str:
+        """KiCad 리포트 형식의 항목 설명."""
+        if self.kind == "pin":
+            shape = self.shape.replace("_", " ").capitalize()
+            return f"Symbol {self.ref} Pin {self.number} [{self.name}, {PIN_TYPES.get(self.type, self.type)}, {shape}]"
+        if self.kind == "sheet_pin":
+            return f"Hierarchical Sheet Pin {self.name}"
+        if self.kind in _LABEL_TITLES:
+            return f"{_LABEL_TITLES[self.kind]} '{self.name}'"
+        return self.kind.replace("_", " ").capitalize()
+
+
+@dataclass
+class Component:
+    """부품 (Reference 하나 - 다중 유닛 심볼은 하나로 합침)."""
+    ref: str
+    value: str = ""
+    footprint: str = ""
+    lib_id: str = ""
+    datasheet: str = ""
+    description: str = ""
+    sheet: str = "/"      # 시트 인스턴스 경로
+    sheet_uuids: str = "/"  # 시트 인스턴스 uuid 경로
+    uuids: list[str] = field(default_factory=list)  # 유닛별 심볼 uuid
+    fields: dict[str, str] = field(default_factory=dict)  # 그 밖의 속성 (LCSC 등)
+    in_bom: bool = True
+    on_board: bool = True
+    dnp: bool = False
+
+
+@dataclass
+class Net:
+    """넷 (연결 그룹)."""
+    name: str
+    items: list[Connection] = field(default_factory=list)
+
+    @property
+    def pins(self) -> list[Connection]:
+        """전원 심볼을 제외한 심볼 핀."""
+        return [c for c in self.items if c.kind == "pin" and not c.power]
+
+    @property
+    def names(self) -> list[str]:
+        return sorted({c.name for c in self.items if c.kind in LABEL_KINDS or c.power})
+
+
+@dataclass
+class ErcViolation:
+    """ERC 위반 하나."""
+    code: str
+    severity: str
+    message: str
+    sheet: str
+    items: list[Connection] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "severity": self.severity,
+            "message": self.message,
+            "sheet": self.sheet,
+            "items": [{"at": list(c.at), "description": c.describe()} for c in self.items],
+        }
+
+
+@dataclass
+class ErcReport:
+    """ERC 결과."""
+    violations: list[ErcViolation] = field(default_factory=list)
+    sheets: list[str] = field(default_factory=list)
+    nets: int = 0
+    seconds: float = 0.0
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for v in self.violations if v.severity == "error")
+
+    @property
+    def warnings(self) -> int:
+        return sum(1 for v in self.violations if v.severity == "warning")
+
+    def counts(self) -> dict[str, int]:
+        """규칙별 위반 수."""
+        counts: dict[str, int] = {}
+        for v in self.violations:
+            counts[v.code] = counts.get(v.code, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def to_dict(self) -> dict:
+        return {
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "nets": self.nets,
+            "counts": self.counts(),
+            "seconds": round(self.seconds, 4),
+            "violations": [v.to_dict() for v in self.violations],
+        }
+
+    def format(self) -> str:
+        """kicad-cli sch erc 텍스트 리포트와 같은 형식."""
+        lines = [f"ERC report ({datetime.now().astimezone().isoformat(timespec='seconds')}, Encoding UTF8)", ""]
+        for sheet in self.sheets:
+            lines.append(f"***** Sheet {sheet}")
+            for v in self.violations:
+                if v.sheet != sheet:
+                    continue
+                lines.append(f"[{v.code}]: {v.message}")
+                lines.append(f"    ; {v.severity}")
+                for item in v.items:
+                    x, y = item.at
+                    lines.append(f"    @({x:.2f} mm, {y:.2f} mm): {item.describe()}")
+        lines.append("")
+        lines.append(
+            f" ** ERC messages: {len(self.violations)}  Errors {self.errors}  Warnings {self.warnings}"
+        )
+        return "\n".join(lines) + "\n"
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: list[int] = []
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+@dataclass
+class _Sheet:
+    """시트 인스턴스 하나의 연결 항목."""
+    path: str
+    uuid_path: str
+    root: SNode
+    wire_ends: dict = field(default_factory=dict)    # 점 키 → 그 점이 끝인 와이어 id들
+    sheet_pins: dict = field(default_factory=dict)   # 자식 시트 경로 → {이름: id}
+    hier_labels: dict = field(default_factory=dict)  # 이름 → [id]
+
+
+class Project:
+    """계층 프로젝트 연결성."""
+
+    def __init__(self):
+        self.items: list[Connection] = []
+        self.sheets: list[_Sheet] = []
+        self.components: dict[str, Component] = {}  # Reference → 부품 (전원 심볼 제외, 읽은 순서)
+        self._uf = _UnionFind()
+        self._geometry: list[int] = []  # 이름으로 묶기 전 (좌표만) 그룹 대표
+        self._implicit: list[tuple[str, int]] = []  # 숨은 power_in 핀 (핀 이름, id)
+        self._files: dict[Path, SNode] = {}
+
+    @classmethod
+    def load(cls, root_path: Union[str, Path]) -> "Project":
+        """루트 회로도와 하위 시트를 모두 읽어 연결성을 계산합니다.
+
+        Args:
+            root_path: 루트 .kicad_sch (하위 시트 파일 경로는 이 파일 기준)
+        """
+        project = cls()
+        root_path = Path(root_path)
+        root = project._parse(root_path)
+        project._add_sheet(root_path, root, "/", "/" + (root.get("uuid") or ""))
+        project._connect_names()
+        return project
+
+    # =========================================================================
+    # 읽기
+    # =========================================================================
+
+    def _parse(self, path: Path) -> SNode:
+        key = path.resolve()
+        if key not in self._files:
+            with open(path, "r", encoding="utf-8") as f:
+                self._files[key] = parse(f.read())
+        return self._files[key]
+
+    def _new(self, conn: Connection) -> int:
+        conn.id = self._uf.add()
+        self.items.append(conn)
+        return conn.id
+
+    def _add_sheet(self, path: Path, root: SNode, sheet_path: str, uuid_path: str):
+        sheet = _Sheet(sheet_path, uuid_path, root)
+        self.sheets.append(sheet)
+        points: dict[tuple, list[int]] = {}    # 점 키 → 그 점에 연결점이 있는 항목
+        on_wire: list[tuple[int, tuple]] = []  # 와이어 중간에도 붙는 항목 (정션 / 라벨)
+        wires: list[tuple[int, tuple, tuple]] = []
+
+        def at_point(conn: Connection, x: float, y: float, mid_wire: bool = False) -> int:
+            i = self._new(conn)
+            key = point_key(x, y)
+            points.setdefault(key, []).append(i)
+            if mid_wire:
+                on_wire.append((i, key))
+            return i
+
+        for node in root.children:
+            name = node.name
+            if name == "wire":
+                pts = node.find("pts")
+                xy = [n.atoms for n in pts.find_all("xy")] if pts is not None else []
+                if len(xy) != 2:
+                    continue
+                (x1, y1), (x2, y2) = ((float(a), float(b)) for a, b, *_ in xy)
+                i = self._new(Connection("wire", sheet_path, (x1, y1)))
+                a, b = point_key(x1, y1), point_key(x2, y2)
+                for key in (a, b):
+                    points.setdefault(key, []).append(i)
+                    sheet.wire_ends.setdefault(key, []).append(i)
+                wires.append((i, a, b))
+            elif name == "junction":
+                x, y, _ = node.at()
+                at_point(Connection("junction", sheet_path, (x, y)), x, y, mid_wire=True)
+            elif name == "no_connect":
+                x, y, _ = node.at()
+                at_point(Connection("no_connect", sheet_path, (x, y)), x, y)
+            elif name in LABEL_KINDS:
+                x, y, _ = node.at()
+                i = at_point(Connection(name, sheet_path, (x, y), name=node.value(0, "")), x, y, mid_wire=True)
+                if name == "hierarchical_label":
+                    sheet.hier_labels.setdefault(self.items[i].name, []).append(i)
+            elif name == "sheet":
+                self._add_sheet_node(path, node, sheet, at_point)
+
+        self._add_symbols(root, sheet, at_point)
+
+        # 같은 점의 항목끼리 연결
+        uf = self._uf
+        for ids in points.values():
+            for other in ids[1:]:
+                uf.union(ids[0], other)
+
+        # 와이어 중간의 정션 / 라벨 (가로·세로 와이어를 좌표별로 색인)
+        horizontal: dict[int, list] = {}
+        vertical: dict[int, list] = {}
+        diagonal = []
+        for i, a, b in wires:
+            if a[1] == b[1]:
+                horizontal.setdefault(a[1], []).append((min(a[0], b[0]), max(a[0], b[0]), i))
+            elif a[0] == b[0]:
+                vertical.setdefault(a[0], []).append((min(a[1], b[1]), max(a[1], b[1]), i))
+            else:
+                diagonal.append((i, a, b))
+        for i, (kx, ky) in on_wire:
+            for lo, hi, w in horizontal.get(ky, ()):
+                if lo < kx < hi:
+                    uf.union(i, w)
+            for lo, hi, w in vertical.get(kx, ()):
+                if lo < ky < hi:
+                    uf.union(i, w)
+            for w, a, b in diagonal:
+                if _between((kx, ky), a, b):
+                    uf.union(i, w)
+
+    def _add_sheet_node(self, path: Path, node: SNode, parent: _Sheet, at_point):
+        """(sheet ...) 기호: 시트 핀을 부모 시트에 추가하고 하위 시트를 읽습니다."""
+        name = node.property("Sheetname") or node.property("Sheet name") or ""
+        filename = node.property("Sheetfile") or node.property("Sheet file")
+        child_path = f"{parent.path}{name}/"
+        pins = parent.sheet_pins.setdefault(child_path, {})
+        for pin in node.find_all("pin"):
+            x, y, _ = pin.at()
+            pin_name = pin.value(0, "")
+            pins[pin_name] = at_point(Connection("sheet_pin", parent.path, (x, y), name=pin_name), x, y)
+
+        if not filename:
+            return
+        child_file = path.parent / filename
+        if not child_file.exists():
+            logger.warning(f"하위 시트 파일 없음: {child_file}")
+            return
+        uuid = node.get("uuid") or ""
+        self._add_sheet(child_file, self._parse(child_file), child_path, f"{parent.uuid_path}/{uuid}")
+
+    def _add_symbols(self, root: SNode, sheet: _Sheet, at_point):
+        """심볼 인스턴스의 핀 끝점을 추가합니다."""
+        lib_node = root.find("lib_symbols")
+        lib_symbols = {n.value(): n for n in lib_node.find_all("symbol")} if lib_node is not None else {}
+        for sym in iter_instance_symbols(root):
+            lib_id = sym.get("lib_id", default="")
+            # 생성기 출력 중에는 lib_symbols 이름에 라이브러리 접두사가 없는 것이 있음
+            lib = lib_symbols.get(lib_id) or lib_symbols.get(lib_id.rpartition(":")[2])
+            power = lib is not None and lib.find("power") is not None
+            ref = _instance_reference(sym, sheet.uuid_path)
+            if not power and not ref.startswith("#"):
+                self._add_component(sym, ref, sheet)
+            if lib is None:
+                logger.debug(f"lib_symbols에 심볼 정의 없음: {lib_id} ({ref})")
+                continue
+            value = sym.property("Value", "")
+            x, y, angle = sym.at()
+            for pin in symbol_pins(
+                _resolve_extends(lib, lib_symbols), x, y, angle,
+                mirror=sym.get("mirror", default=""),
+                unit=int(sym.get("unit", default="1")),
+            ):
+                conn = Connection(
+                    "pin", sheet.path, (pin.x, pin.y),
+                    name=value if power else pin.name,
+                    ref=ref, number=pin.number, type=pin.type, shape=pin.shape,
+                    power=power,
+                )
+                i = at_point(conn, pin.x, pin.y)
+                if not power and pin.hidden and pin.type == "power_in":
+                    # 숨은 전원 입력 핀은 핀 이름의 전역 넷에 암시적으로 연결
+                    self._implicit.append((pin.name, i))
+
+    def _add_component(self, sym: SNode, ref: str, sheet: _Sheet):
+        """심볼 인스턴스를 부품 목록에 추가합니다 (같은 Reference의 다른 유닛은 uuid만 추가)."""
+        uuid = sym.get("uuid") or ""
+        component = self.components.get(ref)
+        if component is not None:
+            component.uuids.append(uuid)
+            return
+        fields = {}
+        for prop in sym.find_all("property"):
+            key = prop.value(0, "")
+            if key not in _COMPONENT_PROPERTIES:
+                fields[key] = prop.value(1, "")
+        self.components[ref] = Component(
+            ref=ref,
+            value=sym.property("Value", ""),
+            footprint=sym.property("Footprint", ""),
+            lib_id=sym.get("lib_id", default=""),
+            datasheet=sym.property("Datasheet", ""),
+            description=sym.property("Description", ""),
+            sheet=sheet.path,
+            sheet_uuids=sheet.uuid_path,
+            uuids=[uuid],
+            fields=fields,
+            in_bom=sym.get("in_bom") != "no",
+            on_board=sym.get("on_board") != "no",
+            dnp=sym.get("dnp") == "yes",
+        )
+
+    # =========================================================================
+    # 이름으로 묶기
+    # =========================================================================
+
+    def _connect_names(self):
+        uf = self._uf
+        # 좌표만으로 묶은 그룹 (dangling 판정용)
+        self._geometry = [uf.find(i) for i in range(len(self.items))]
+
+        first: dict[tuple, int] = {}
+
+        def join(key, i):
+            if key in first:
+                uf.union(first[key], i)
+            else:
+                first[key] = i
+
+        for conn in self.items:
+            if conn.kind in ("label", "hierarchical_label"):
+                join(("local", conn.sheet, conn.name), conn.id)
+            elif conn.kind == "global_label" or (conn.kind == "pin" and conn.power):
+                join(("global", conn.name), conn.id)
+        for name, i in self._implicit:
+            join(("global", name), i)
+
+        # 계층 라벨 ↔ 부모 시트 핀
+        by_path = {sheet.path: sheet for sheet in self.sheets}
+        for parent in self.sheets:
+            for child_path, pins in parent.sheet_pins.items():
+                child = by_path.get(child_path)
+                if child is None:
+                    continue
+                for name, pin_id in pins.items():
+                    for label_id in child.hier_labels.get(name, ()):
+                        uf.union(pin_id, label_id)
+
+    # =========================================================================
+    # 넷
+    # =========================================================================
+
+    def nets(self) -> list[Net]:
+        """넷 목록 (와이어/정션/no_connect만 있는 그룹 제외, 첫 항목 순)."""
+        groups: dict[int, list[Connection]] = {}
+        for conn in self.items:
+            groups.setdefault(self._uf.find(conn.id), []).append(conn)
+        nets = []
+        for items in groups.values():
+            if not any(c.kind not in ("wire", "junction", "no_connect") for c in items):
+                continue
+            nets.append(Net(_net_name(items), items))
+        return nets
+
+    # =========================================================================
+    # ERC
+    # =========================================================================
+
+    def erc(self) -> ErcReport:
+        """ERC를 수행합니다."""
+        started = time.perf_counter()
+        report = ErcReport(sheets=[s.path for s in self.sheets])
+        add = report.violations.append
+
+        def violation(code: str, sheet: str, items: list[Connection], severity: Optional[str] = None, **kw):
+            default, message = RULES[code]
+            add(ErcViolation(code, severity or default, message.format(**kw), sheet, items))
+
+        # 좌표 그룹 구성
+        geometry: dict[int, list[Connection]] = {}
+        for conn in self.items:
+            geometry.setdefault(self._geometry[conn.id], []).append(conn)
+
+        for members in geometry.values():
+            kinds = {c.kind for c in members}
+            no_connect = "no_connect" in kinds
+            for conn in members:
+                if conn.kind in LABEL_KINDS and not kinds & {"wire", "pin", "sheet_pin"}:
+                    violation("label_dangling", conn.sheet, [conn])
+                elif conn.kind in ("pin", "sheet_pin") and len(members) == 1 and not no_connect:
+                    if conn.kind == "pin" and (conn.power or conn.type == "no_connect"):
+                        continue
+                    violation("pin_not_connected", conn.sheet, [conn])
+
+        # 와이어 끝
+        for sheet in self.sheets:
+            for key, wire_ids in sheet.wire_ends.items():
+                if len(wire_ids) > 1:
+                    continue
+                wire = self.items[wire_ids[0]]
+                members = geometry[self._geometry[wire.id]]
+                if _endpoint_alone(key, wire, members):
+                    x, y = key[0] / 10000, key[1] / 10000
+                    violation("unconnected_wire_endpoint", sheet.path, [Connection("wire", sheet.path, (x, y))])
+
+        # 계층 라벨 ↔ 시트 핀 짝
+        by_path = {sheet.path: sheet for sheet in self.sheets}
+        for parent in self.sheets:
+            for child_path, pins in parent.sheet_pins.items():
+                child = by_path.get(child_path)
+                labels = child.hier_labels if child is not None else {}
+                for name, pin_id in pins.items():
+                    if name not in labels:
+                        violation("hier_label_mismatch", parent.path, [self.items[pin_id]])
+                if child is not None:
+                    for name, ids in labels.items():
+                        if name not in pins:
+                            violation("hier_label_mismatch", child.path, [self.items[ids[0]]])
+
+        # 넷 단위 검사
+        nets = self.nets()
+        report.nets = len(nets)
+        isolated = {v.items[0].id for v in report.violations if v.code == "pin_not_connected"}
+        for net in nets:
+            pins = [c for c in net.items if c.kind == "pin"]
+            real = [c for c in pins if not c.power]
+            no_connect = any(c.kind == "no_connect" for c in net.items)
+            if len(real) == 1 and len(pins) == 1 and not no_connect and real[0].id not in isolated:
+                violation("single_pin_net", real[0].sheet, real)
+
+            # 핀 타입 충돌 - 타입 조합마다 한 번
+            seen = set()
+            for i, a in enumerate(pins):
+                for b in pins[i + 1:]:
+                    combo = tuple(sorted((a.type, b.type)))
+                    if combo in seen:
+                        continue
+                    severity = PIN_CONFLICTS.get((a.type, b.type))
+                    if severity is None:
+                        continue
+                    seen.add(combo)
+                    violation("pin_to_pin", a.sheet, [a, b], severity,
+                              a=PIN_TYPES.get(a.type, a.type), b=PIN_TYPES.get(b.type, b.type))
+
+            types = {c.type for c in pins}
+            if "input" in types and not types & DRIVER_TYPES:
+                pin = next(c for c in pins if c.type == "input")
+                violation("pin_not_driven", pin.sheet, [pin])
+            if "power_in" in types and "power_out" not in types:
+                pin = next(c for c in pins if c.type == "power_in")
+                violation("power_pin_not_driven", pin.sheet, [pin])
+
+        order = {path: i for i, path in enumerate(report.sheets)}
+        report.violations.sort(key=lambda v: order.get(v.sheet, len(order)))
+        report.seconds = time.perf_counter() - started
+        return report
+
+
+def _instance_reference(sym: SNode, uuid_path: str) -> str:
+    """시트 인스턴스 경로에 해당하는 (instances ... (path ... (reference))) 값, 없으면 Reference 속성."""
+    instances = sym.find("instances")
+    if instances is not None:
+        for path in instances.iter("path"):
+            if path.value() == uuid_path:
+                ref = path.get("reference")
+                if ref:
+                    return ref
+    return sym.property("Reference", "?")
+
+
+def _net_name(items: list[Connection]) -> str:
+    """넷 이름: 글로벌 라벨 > 전원 심볼 > 계층/로컬 라벨 > 시트 핀 > 자동 이름."""
+    names = sorted(c.name for c in items if c.kind == "global_label" and c.name)
+    if names:
+        return names[0]
+    power = sorted(c.name for c in items if c.kind == "pin" and c.power and c.name)
+    if power:
+        return power[0]
+    for kinds in (("hierarchical_label", "label"), ("sheet_pin",)):
+        scoped = sorted((c.sheet, c.name) for c in items if c.kind in kinds and c.name)
+        if scoped:
+            sheet, name = scoped[0]
+            return f"{sheet}{name}"
+    pins = sorted((c.ref, c.number) for c in items if c.kind == "pin")
+    if pins:
+        ref, number = pins[0]
+        return f"Net-({ref}-Pad{number})"
+    return "Net-(unnamed)"
+
+
+def _between(k: tuple, a: tuple, b: tuple) -> bool:
+    """정수 키 k가 선분 a-b 중간(끝점 제외)에 있는지."""
+    (kx, ky), (ax, ay), (bx, by) = k, a, b
+    if k == a or k == b:
+        return False
+    if not (min(ax, bx) <= kx <= max(ax, bx) and min(ay, by) <= ky <= max(ay, by)):
+        return False
+    return (bx - ax) * (ky - ay) == (by - ay) * (kx - ax)
+
+
+def _endpoint_alone(key: tuple, wire: Connection, members: list[Connection]) -> bool:
+    """와이어 끝 key에 다른 연결점(핀, 라벨, 정션, no_connect, 시트 핀)이 없는지."""
+    for conn in members:
+        if conn is wire or conn.kind == "wire":
+            continue
+        if point_key(*conn.at) == key:
+            return False
+    return True
@@ -0,0 +1,319 @@
+"""
+Document - 인덱스 기반 KiCad 문서 모델 v1.0
+
+파일을 한 번 파싱해 Reference / uuid / lib_id / 라벨 이름 → 노드 인덱스를 만들고,
+수정은 노드 구간(start, end)에 대한 치환으로 기록했다가 serialize() 시 한 번에 적용합니다.
+파일 전체를 대상으로 하는 반복 re.sub 대신 필요한 구간만 바뀌므로
+나머지 내용(포맷, 공백)은 바이트 단위로 그대로 유지됩니다.
+
+Usage:
+    from kicad_auto_builder.document import SchematicDocument
+
+    doc = SchematicDocument.load("power.kicad_sch")
+    sym = doc.symbol("R?")
+    doc.set_reference(sym, "R1")
+    doc.set_footprint(sym, "Resistor_SMD:R_0402_1005Metric")
+    doc.save()
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+from .sexpr import SNode, parse, iter_nodes, iter_tokens, escape, OPEN, CLOSE
+
+# 넷 이름을 가지는 라벨 노드
+LABEL_KINDS = ("label", "global_label", "hierarchical_label")
+
+
+def _format_number(value: float) -> str:
+    """KiCad 좌표 표기 (불필요한 소수점 제거)."""
+    text = f"{value:.4f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+class SexprDocument:
+    """S-표현식 문서 + 구간 치환 편집기.
+
+    Attributes:
+        content: 원본 텍스트 (편집 중에는 변경되지 않음)
+        path: 원본 파일 경로 (없으면 None)
+        root: 최상위 노드
+    """
+
+    def __init__(self, content: str, path: Optional[Union[str, Path]] = None):
+        self.content = content
+        self.path = Path(path) if path is not None else None
+        self.root = parse(content)
+        self._edits: dict[tuple[int, int], str] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]):
+        """파일을 읽어 문서를 만듭니다."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read(), path)
+
+    @property
+    def modified(self) -> bool:
+        """기록된 편집이 있는지 여부."""
+        return bool(self._edits)
+
+    # =========================================================================
+    # 편집
+    # =========================================================================
+
+    def replace_span(self, start: int, end: int, text: str):
+        """원본 구간 [start, end)를 text로 치환하도록 기록합니다.
+
+        같은 구간을 다시 치환하면 마지막 값이 적용됩니다.
+        """
+        if start == end:
+            # 삽입은 같은 위치에 여러 번 가능하도록 이어 붙임
+            text = self._edits.get((start, end), "") + text
+        self._edits[(start, end)] = text
+
+    def insert(self, pos: int, text: str):
+        """원본 오프셋 pos에 text를 삽입합니다."""
+        self.replace_span(pos, pos, text)
+
+    def atom_span(self, node: SNode, index: int) -> Optional[tuple[int, int]]:
+        """node의 index번째 직계 아톰 토큰의 원본 구간 (따옴표 포함)."""
+        depth = 0
+        seen = -1  # 첫 아톰은 노드 이름
+        for kind, _, start, end in iter_tokens(self.content, node.start, node.end):
+            if kind == OPEN:
+                depth += 1
+            elif kind == CLOSE:
+                depth -= 1
+            elif depth == 1:
+                if seen == index:
+                    return start, end
+                seen += 1
+        return None
+
+    def set_atom(self, node: SNode, index: int, value: str, quoted: bool = True) -> bool:
+        """node의 index번째 아톰 값을 바꿉니다.
+
+        Returns:
+            해당 아톰이 존재해 편집이 기록되었는지 여부
+        """
+        span = self.atom_span(node, index)
+        if span is None:
+            return False
+        self.replace_span(span[0], span[1], f'"{escape(value)}"' if quoted else value)
+
+        # 메모리 트리도 갱신해 이후 조회가 편집 결과를 보도록 함
+        seen = 0
+        for i, item in enumerate(node.items):
+            if isinstance(item, SNode):
+                continue
+            if seen == index:
+                node.items[i] = value
+                break
+            seen += 1
+        return True
+
+    def set_property(self, node: SNode, key: str, value: str) -> bool:
+        """(property "key" "value")의 값을 바꿉니다. 속성이 없으면 False."""
+        prop = node.property_node(key)
+        if prop is None:
+            return False
+        if prop.value(1) == value:
+            return True
+        return self.set_atom(prop, 1, value)
+
+    def set_at(self, node: SNode, x: float, y: float, angle: float = 0) -> bool:
+        """node의 직계 (at x y [angle])를 바꿉니다. 없으면 False."""
+        at = node.find("at")
+        if at is None:
+            return False
+        text = f"(at {_format_number(x)} {_format_number(y)}"
+        text += f" {_format_number(angle)})" if angle else ")"
+        self.replace_span(at.start, at.end, text)
+        at.items = [_format_number(x), _format_number(y)] + ([_format_number(angle)] if angle else [])
+        return True
+
+    def append(self, text: str) -> list[SNode]:
+        """최상위 노드의 닫는 괄호 앞에 항목들을 추가합니다.
+
+        Returns:
+            추가된 텍스트를 파싱한 노드 (오프셋은 text 기준)
+        """
+        self.insert(self.root.end - 1, text)
+        return list(iter_nodes(text, depth=0))
+
+    # =========================================================================
+    # 출력
+    # =========================================================================
+
+    def serialize(self) -> str:
+        """편집을 적용한 전체 텍스트를 반환합니다.
+
+        Raises:
+            ValueError: 서로 겹치는 구간 편집이 있을 때
+        """
+        if not self._edits:
+            return self.content
+
+        parts = []
+        pos = 0
+        for (start, end), text in sorted(self._edits.items()):
+            if start < pos:
+                raise ValueError(f"겹치는 편집 구간: {start}..{end} (이전 편집 끝 {pos})")
+            parts.append(self.content[pos:start])
+            parts.append(text)
+            pos = end
+        parts.append(self.content[pos:])
+        return "".join(parts)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """편집 결과를 파일로 저장합니다 (기본: 원본 경로)."""
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("저장 경로가 없습니다")
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(self.serialize())
+        return target
+
+
+class SchematicDocument(SexprDocument):
+    """.kicad_sch 문서.
+
+    인덱스 (모두 최상위 노드 대상, O(1) 조회):
+        refs: Reference → 심볼 인스턴스 목록 (미주석 "R?" 등은 여러 개일 수 있음)
+        uuids: uuid → 노드 (심볼, 와이어, 라벨 등)
+        lib_ids: lib_id → 심볼 인스턴스 목록
+        labels: 넷 이름 → 라벨 노드 목록 (label / global_label / hierarchical_label)
+    """
+
+    def __init__(self, content: str, path: Optional[Union[str, Path]] = None):
+        super().__init__(content, path)
+        self.lib_symbols: Optional[SNode] = None
+        self.symbols: list[SNode] = []
+        self.refs: dict[str, list[SNode]] = {}
+        self.uuids: dict[str, SNode] = {}
+        self.lib_ids: dict[str, list[SNode]] = {}
+        self.labels: dict[str, list[SNode]] = {}
+
+        for node in self.root.items:
+            if isinstance(node, SNode):
+                self._index(node)
+
+    def _index(self, node: SNode):
+        name = node.name
+        if name == "lib_symbols":
+            self.lib_symbols = node
+            return
+
+        uuid = node.get("uuid")
+        if uuid:
+            self.uuids[uuid] = node
+
+        if name == "symbol":
+            lib_id = node.get("lib_id")
+            if lib_id is None:
+                return
+            self.symbols.append(node)
+            self.lib_ids.setdefault(lib_id, []).append(node)
+            self.refs.setdefault(node.property("Reference", "?"), []).append(node)
+        elif name in LABEL_KINDS:
+            self.labels.setdefault(node.value(0, ""), []).append(node)
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def symbol(self, ref: str) -> Optional[SNode]:
+        """Reference가 ref인 첫 번째 심볼 인스턴스."""
+        nodes = self.refs.get(ref)
+        return nodes[0] if nodes else None
+
+    def by_uuid(self, uuid: str) -> Optional[SNode]:
+        """uuid로 최상위 노드를 찾습니다."""
+        return self.uuids.get(uuid)
+
+    def symbols_by_lib_id(self, lib_id: str) -> list[SNode]:
+        """lib_id가 같은 심볼 인스턴스 목록."""
+        return self.lib_ids.get(lib_id, [])
+
+    def labels_by_name(self, name: str) -> list[SNode]:
+        """넷 이름이 같은 라벨 노드 목록."""
+        return self.labels.get(name, [])
+
+    def lib_symbol(self, lib_id: str) -> Optional[SNode]:
+        """lib_symbols 안의 심볼 정의."""
+        if self.lib_symbols is None:
+            return None
+        for node in self.lib_symbols.find_all("symbol"):
+            if node.value() == lib_id:
+                return node
+        return None
+
+    # =========================================================================
+    # 편집
+    # =========================================================================
+
+    def set_reference(self, sym: SNode, new_ref: str) -> bool:
+        """심볼의 Reference 속성과 (instances ... (reference ...))를 함께 바꿉니다."""
+        old_ref = sym.property("Reference", "?")
+        if old_ref == new_ref:
+            return False
+        if not self.set_property(sym, "Reference", new_ref):
+            return False
+
+        instances = sym.find("instances")
+        if instances is not None:
+            for ref_node in instances.iter("reference"):
+                self.set_atom(ref_node, 0, new_ref)
+
+        nodes = self.refs.get(old_ref, [])
+        if sym in nodes:
+            nodes.remove(sym)
+            if not nodes:
+                del self.refs[old_ref]
+        self.refs.setdefault(new_ref, []).append(sym)
+        return True
+
+    def set_footprint(self, sym: SNode, footprint: str) -> bool:
+        """Footprint 속성을 바꿉니다. 값이 바뀌었으면 True."""
+        if sym.property("Footprint") == footprint:
+            return False
+        return self.set_property(sym, "Footprint", footprint)
+
+    def add_items(self, text: str) -> list[SNode]:
+        """라벨/와이어 등 최상위 항목을 추가하고 인덱스에 등록합니다."""
+        nodes = self.append(text)
+        for node in nodes:
+            self._index(node)
+        return nodes
+
+
+class PcbDocument(SexprDocument):
+    """.kicad_pcb 문서.
+
+    인덱스:
+        footprints: Reference → footprint 노드
+    """
+
+    def __init__(self, content: str, path: Optional[Union[str, Path]] = None):
+        super().__init__(content, path)
+        self.footprints: dict[str, SNode] = {}
+        for node in self.root.items:
+            if isinstance(node, SNode) and node.name == "footprint":
+                ref = self.footprint_reference(node)
+                if ref:
+                    self.footprints[ref] = node
+
+    @staticmethod
+    def footprint_reference(node: SNode) -> Optional[str]:
+        """footprint 노드의 Reference (KiCad 8 property / 이전 fp_text 형식)."""
+        ref = node.property("Reference")
+        if ref is not None:
+            return ref
+        for text in node.find_all("fp_text"):
+            if text.value(0) == "reference":
+                return text.value(1)
+        return None
+
+    def footprint(self, ref: str) -> Optional[SNode]:
+        """Reference로 footprint 노드를 찾습니다."""
+        return self.footprints.get(ref)
@@ -2,56 +2,157 @@
 KiCad Builder - 라이브러리 및 회로도 생성 v1.3
 
 심볼/풋프린트 라이브러리 병합 및 회로도 자동 생성.
-와이어 자동 생성 기능 포함 (그리드 스냅 + L자 라우팅).
+와이어 자동 생성 기능 포함 (그리드 스냅 + 넷별 직교 Steiner 트리 배선).
 v1.2: 계층 시트 지원
 v1.3: BOM 고도화, 버전 통합, 타이틀 블록 동적 생성, ports 확장
+v1.4: 증분 빌드 (입력 지문이 같은 산출물은 재생성하지 않음),
+      작업 그래프 기반 병렬 생성 (--jobs)
+v1.5: 빌드 단위 심볼 캐시 - 라이브러리 파일은 한 번만 읽고 추출/들여쓰기 결과 재사용,
+      여러 심볼이 있는 라이브러리에서 symbol_name으로 심볼 선택
+v1.6: 회로도 스트리밍 출력 + 원자적 교체, canonical(KiCad 저장 레이아웃) 출력 옵션
+v1.7: 결정적 UUID ((project, sheet, ref, role)에서 생성), 내용이 같은 산출물은 다시 쓰지 않는 모드,
+      manifest에 실제로 다시 쓴 산출물 목록 기록
+v1.8: 체인 L자 라우팅 → WireRouter (넷별 최소 신장/Steiner 트리 + 다른 넷 회피),
+      manifest에 시트/넷별 배선 길이와 세그먼트 수 기록
+      (시트 작업이 배선 요약을 함께 돌려주고 manifest는 그 값(건너뛴 시트는 이전 빌드 값)을 사용)
+v1.9: 시트 공간 인덱스 - 배선 분기점에 정션 삽입, 다른 넷과 닿는 와이어 거부,
+      전원 심볼을 부품/라벨/와이어와 겹치지 않는 가장 가까운 빈 자리에 배치,
+      네트 라벨을 부품 위가 아니라 심볼 핀 끝점에 배치 (배선도 핀에서 시작 - 회로도가 실제로 연결됨),
+      배선 전에 심볼 본체와 핀(핀별 넷)을 시트 인덱스에 넣어 정션 / 다른 넷 거부가 핀에도 적용
+v1.10: 넷 연결 기반 부품 배치 옵션 (placement="force", ForcePlacer) - manifest에 HPWL 개선율 기록
+       (배치 결과도 시트 작업이 함께 돌려줌, 배치 위치는 그리드에 스냅)
+v1.11: 공유 NetTable - 라벨/배선/배치/포트 점검이 부품별 nets 사전 대신 인터닝된 넷 id 사용
+v1.12: BOM 산출물(JLC / Full)을 한 번의 집계(bom.BomAggregator)로 함께 생성
 """
 
-import csv
 import json
 import logging
 import re
 import shutil
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from . import __version__
+from .bom import BomAggregator, FullCsvSink, JlcCsvSink, items_from_parts, write_bom
+from .build_cache import BuildCache, file_digest, fingerprint
 from .config_loader import ProjectConfig
+from .net_table import NetTable
 from .part_resolver import ResolvedPart
+from .placement import ForcePlacer, PlacementResult
+from .sch_writer import write_text
+from .scheduler import TaskGraph
+from .sexpr import parse
+from .spatial_index import SchematicIndex, place_symbol
+from .symbol_cache import SymbolCache
 from .templates.symbol import SymbolTemplate, BUILTIN_SYMBOLS
-from .templates.schematic import SchematicTemplate, TitleBlockInfo
+from .templates.schematic import Position, SchematicTemplate, TitleBlockInfo, gen_uuid
+from .wire_router import NetRoute, WireRouter
 
 logger = logging.getLogger(__name__)
 
 # KiCad 그리드 크기 (mm)
 GRID_SIZE = 2.54
 
+# 루트(단일) 시트의 UUID 키 이름 (KiCad 시트 경로 기준)
+ROOT_SHEET = "/"
+
+# BOM 산출물 키 → (파일 이름, 출력)
+BOM_SINKS = {
+    "bom_jlc": ("bom_jlc.csv", JlcCsvSink),
+    "bom_full": ("bom_full.csv", FullCsvSink),
+}
+
+
+@dataclass
+class SheetBuild:
+    """시트 작업 결과 - 회로도 경로와 manifest용 요약 (프로세스 작업자에서도 그대로 돌려받음)."""
+    path: Path
+    routing: dict                     # routing_report()의 시트 항목
+    placement: Optional[dict] = None  # placement="force"일 때 PlacementResult.to_dict()
+
+    @property
+    def meta(self) -> dict:
+        """빌드 캐시에 산출물과 함께 기록할 부가 정보."""
+        meta = {"routing": self.routing}
+        if self.placement is not None:
+            meta["placement"] = self.placement
+        return meta
+
 
 def snap_to_grid(value: float, grid: float = GRID_SIZE) -> float:
     """값을 그리드에 스냅합니다."""
     return round(value / grid) * grid
 
 
+def _snap_position(pos: Position) -> Position:
+    """부품 위치를 그리드에 스냅합니다 (0.1 µm 단위로 반올림)."""
+    return Position(round(snap_to_grid(pos.x), 4), round(snap_to_grid(pos.y), 4), pos.rotation)
+
+
 class KicadBuilder:
     """KiCad 라이브러리 및 회로도 빌더."""
 
-    def __init__(self, config: ProjectConfig, resolved_parts: list[ResolvedPart]):
+    def __init__(
+        self,
+        config: ProjectConfig,
+        resolved_parts: list[ResolvedPart],
+        incremental: bool = True,
+        jobs: int = 1,
+        executor: str = "thread",
+        resolver_report: Optional[dict] = None,
+        canonical: bool = False,
+        skip_unchanged: bool = False,
+        placement: str = "grid",
+        placement_seed: int = 0,
+        net_table: Optional[NetTable] = None,
+    ):
         """초기화.
 
         Args:
             config: 프로젝트 설정
             resolved_parts: 리졸브된 부품 목록
+            incremental: 입력이 바뀌지 않은 산출물은 재생성하지 않음
+            jobs: 동시에 생성할 산출물 수 (1이면 직렬)
+            executor: 병렬 실행 방식 ("thread" 또는 "process")
+            resolver_report: PartResolver.report() 결과 (manifest에 포함)
+            canonical: 회로도를 KiCad 저장 레이아웃으로 출력 (KiCad에서 다시 저장해도 diff 없음)
+            skip_unchanged: 새 출력이 디스크의 파일과 해시가 같으면 다시 쓰지 않음 (mtime 유지)
+            placement: 부품 배치 방식 ("grid": 설정 순서대로 그리드, "force": 넷 연결 기반)
+            placement_seed: placement="force"의 난수 시드 (같은 시드 → 같은 배치)
+            net_table: 리졸브 후 만든 공유 넷 테이블 (없으면 resolved_parts로 생성)
         """
         self.config = config
         self.parts = resolved_parts
+        self.net_table = net_table or NetTable.from_config(config, resolved_parts)
 
         # 출력 디렉토리 생성
         self.output_dir = Path(config.out_dir)
         self.lib_dir = self.output_dir / "lib"
         self.lib_dir.mkdir(parents=True, exist_ok=True)
 
+        # 증분 빌드 캐시 (이전 manifest.json의 지문)
+        self.cache = BuildCache(self.output_dir, enabled=incremental)
+
+        # 심볼 라이브러리 / lib_symbols가 공유하는 심볼 캐시
+        # (지문 계산 시 메인 프로세스에서 채워지므로 작업 실행 중에는 파일을 다시 읽지 않음)
+        self.symbols = SymbolCache()
+
+        # 작업 그래프 실행 설정
+        self.jobs = max(1, jobs)
+        self.executor = executor
+
+        self.resolver_report = resolver_report or {}
+        self.canonical = canonical
+        self.skip_unchanged = skip_unchanged
+        self.placement = placement
+        self.placement_seed = placement_seed
+        # 시트 → 배치 결과 (같은 시트를 여러 번 배치하지 않도록)
+        self._placements: dict[str, PlacementResult] = {}
+
     def _get_title_block(self, title: str = None, is_sub_sheet: bool = False) -> TitleBlockInfo:
         """타이틀 블록 정보를 생성합니다.
 
@@ -72,47 +173,123 @@ class KicadBuilder:
             comment2=tb.comment2,
         )
 
+    def _uuid_key(self, sheet: str, *ref) -> tuple:
+        """결정적 UUID 키 (project, sheet, ref...) - 요소 역할(role)은 템플릿이 덧붙입니다.
+
+        같은 설계를 다시 빌드하면 모든 UUID가 같으므로, 내용이 바뀌지 않은 시트는
+        바이트 단위로 같은 파일이 됩니다.
+        """
+        return (self.config.name, sheet, *ref)
+
     def build_all(self, warnings: list[str] = None):
         """전체 빌드 실행.
 
+        서로 독립적인 산출물(심볼 라이브러리, 풋프린트 복사, 서브시트, BOM, 리포트)은
+        작업 그래프로 묶어 jobs 개수만큼 병렬 생성하고, manifest는 모두 끝난 뒤 생성합니다.
+
         Args:
             warnings: 검증 단계에서 발생한 경고 목록 (manifest에 포함)
         """
+        warnings = warnings or []
+
         logger.info("=" * 60)
         logger.info(f"프로젝트 빌드: {self.config.name}")
         logger.info("=" * 60)
 
+        graph = TaskGraph()
+        artifacts: dict[str, Path] = {}
+        pending: dict[str, str] = {}
+
         # 1. 심볼 라이브러리 생성
-        sym_path = self.build_symbol_library()
-        logger.info(f"[OK] 심볼 라이브러리: {sym_path}")
+        self._schedule_artifact(
+            graph, artifacts, pending,
+            "symbol_lib",
+            fingerprint(__version__, self.config.net_presets, self._symbols_fingerprint(self.parts)),
+            self.lib_dir / "custom.kicad_sym",
+            self.build_symbol_library,
+        )
 
         # 2. 풋프린트 라이브러리 생성 (복사)
-        fp_path = self.build_footprint_library()
+        graph.add("footprint_lib", self.build_footprint_library)
+
+        # 3. 회로도 생성 (단일/계층 모드)
+        if self.config.is_hierarchical:
+            sheet_keys = self._schedule_hierarchical(graph, artifacts, pending)
+        else:
+            sheet_keys = {}
+            self._schedule_artifact(
+                graph, artifacts, pending,
+                "schematic",
+                fingerprint(
+                    __version__,
+                    self.canonical,
+                    (self.placement, self.placement_seed),
+                    self.config.name,
+                    self.config.net_presets,
+                    self.parts,
+                    self._symbols_fingerprint(self.parts),
+                    self._get_title_block(),
+                ),
+                self.output_dir / f"{self.config.name}.kicad_sch",
+                self._build_schematic,
+            )
+
+        # 4. BOM 생성 (v1.3: JLC + Full, v1.12: 다시 만들 것만 한 작업에서 함께)
+        parts_fp = fingerprint(__version__, self.parts)
+        stale_boms = []
+        for key, (filename, _) in BOM_SINKS.items():
+            path = self.output_dir / filename
+            if self.cache.check(key, parts_fp, path):
+                artifacts[key] = path
+            else:
+                stale_boms.append(key)
+                pending[key] = (parts_fp, path)
+        if stale_boms:
+            graph.add("bom", self.build_boms, stale_boms)
+
+        # 5. Report 생성 (v1.3)
+        self._schedule_artifact(
+            graph, artifacts, pending,
+            "report",
+            fingerprint(
+                __version__,
+                self.config.name,
+                self.config.kicad_version,
+                self.parts,
+                warnings,
+                [(s.name, len(s.parts), s.ports) for s in self.config.sheets],
+            ),
+            self.output_dir / "report.md",
+            self.build_report,
+            warnings,
+        )
+
+        results = self._run_graph(graph, artifacts, pending)
+
+        # 결과 로그는 완료 순서와 관계없이 고정 순서로 출력
+        sym_path = results["symbol_lib"]
+        logger.info(f"[OK] 심볼 라이브러리: {sym_path}")
+
+        fp_path = results["footprint_lib"]
         if fp_path:
             logger.info(f"[OK] 풋프린트 라이브러리: {fp_path}")
 
-        # 3. 회로도 생성 (단일/계층 모드)
         if self.config.is_hierarchical:
-            sch_paths = self.build_hierarchical_schematics()
-            sch_path = sch_paths["root"]
-            for name, path in sch_paths.items():
-                logger.info(f"[OK] 회로도 ({name}): {path}")
+            for name, key in sheet_keys.items():
+                logger.info(f"[OK] 회로도 ({name}): {results[key]}")
+            sch_path = results[sheet_keys["root"]]
         else:
-            sch_path = self.build_schematic()
+            sch_path = results["schematic"]
             logger.info(f"[OK] 회로도: {sch_path}")
 
-        # 4. BOM 생성 (v1.3: JLC + Full)
-        bom_path = self.build_bom()
+        bom_path = results["bom_jlc"]
         logger.info(f"[OK] BOM (JLC): {bom_path}")
-
-        bom_full_path = self.build_bom_full()
+        bom_full_path = results["bom_full"]
         logger.info(f"[OK] BOM (Full): {bom_full_path}")
-
-        # 5. Report 생성 (v1.3)
-        report_path = self.build_report(warnings or [])
+        report_path = results["report"]
         logger.info(f"[OK] Report: {report_path}")
 
-        # 6. Manifest 생성
+        # 6. Manifest 생성 (모든 산출물 완료 후)
         result = {
             "symbol_lib": sym_path,
             "footprint_lib": fp_path,
@@ -121,71 +298,149 @@ class KicadBuilder:
             "bom_full": bom_full_path,
             "report": report_path,
         }
-        manifest_path = self.build_manifest(result, warnings or [])
+        manifest_path = self.build_manifest(result, warnings)
         logger.info(f"[OK] Manifest: {manifest_path}")
         result["manifest"] = manifest_path
 
+        if self.cache.skipped:
+            logger.info(
+                f"증분 빌드: {len(self.cache.rebuilt)}개 재생성, "
+                f"{len(self.cache.skipped)}개 변경 없음"
+            )
+        if self.skip_unchanged:
+            logger.info(
+                f"다시 쓴 산출물: {len(self.cache.rewritten)}개, "
+                f"내용이 같아 유지: {len(self.cache.unchanged)}개"
+            )
+
         logger.info("=" * 60)
         logger.info("빌드 완료!")
         logger.info("=" * 60)
 
         return result
 
-    def build_symbol_library(self) -> Path:
-        """심볼 라이브러리를 생성합니다."""
-        symbols = []
-        added_symbols = set()
-
-        # 네트 프리셋에서 전원 심볼 추가
-        for net_name, net_value in self.config.net_presets.items():
-            if net_value.upper() == "GND":
-                if "GND" not in added_symbols:
-                    symbols.append(BUILTIN_SYMBOLS["GND"])
-                    added_symbols.add("GND")
+    def _schedule_artifact(
+        self,
+        graph: TaskGraph,
+        artifacts: dict,
+        pending: dict,
+        key: str,
+        input_fp: str,
+        path: Path,
+        func,
+        *args,
+    ):
+        """캐시가 유효하면 기존 경로를 쓰고, 아니면 작업 그래프에 생성 작업을 추가합니다."""
+        if self.cache.check(key, input_fp, path):
+            artifacts[key] = path
+            return
+        graph.add(key, func, *args)
+        pending[key] = (input_fp, path)
+
+    def _run_graph(self, graph: TaskGraph, artifacts: dict, pending: dict) -> dict:
+        """작업 그래프를 실행하고, 생성된 산출물의 지문을 등록 순서대로 기록합니다.
+
+        skip_unchanged 모드에서는 실행 전후의 출력 해시를 비교해 실제로 다시 쓴 산출물만
+        rewritten으로 기록합니다 (작업이 다른 프로세스에서 실행되어도 동일).
+        """
+        if self.jobs > 1 and graph.tasks:
+            logger.info(f"병렬 빌드: {len(graph.tasks)}개 작업, jobs={self.jobs} ({self.executor})")
+
+        before = {}
+        if self.skip_unchanged:
+            before = {key: file_digest(path) for key, (_, path) in pending.items()}
+
+        results = dict(artifacts)
+        metas = {}
+        for key, value in graph.run(jobs=self.jobs, executor=self.executor).items():
+            if isinstance(value, dict):
+                # 여러 산출물을 함께 만드는 작업 (build_boms)
+                results.update(value)
+            elif isinstance(value, SheetBuild):
+                results[key] = value.path
+                metas[key] = value.meta
             else:
-                # 전원 심볼 생성
-                sym_name = net_value.replace(".", "V").replace("+", "")
-                if sym_name not in added_symbols:
-                    # 내장 심볼 확인
-                    builtin = SymbolTemplate.get_builtin_symbol(net_value)
-                    if builtin:
-                        symbols.append(builtin)
-                    else:
-                        symbols.append(SymbolTemplate.create_power_symbol(net_value, net_value))
-                    added_symbols.add(net_value)
-
-        # 각 부품의 심볼 추가
-        for part in self.parts:
-            sym_name = part.symbol_name
+                results[key] = value
 
-            if sym_name in added_symbols:
-                continue
+        for key, (input_fp, _) in pending.items():
+            output_fp = file_digest(results[key])
+            rewritten = key not in before or before[key] != output_fp
+            self.cache.record(key, input_fp, results[key], output_fp, rewritten=rewritten, meta=metas.get(key))
 
-            # 1. LCSC에서 가져온 심볼 파일이 있으면 사용
-            if part.symbol_lib and part.symbol_lib.exists():
-                content = part.symbol_lib.read_text(encoding='utf-8')
-                # 라이브러리 헤더/푸터 제거하고 심볼만 추출
-                sym_content = self._extract_symbol_from_lib(content)
-                if sym_content:
-                    symbols.append(sym_content)
-                    added_symbols.add(sym_name)
-                    continue
+        return results
 
-            # 2. 내장 심볼 확인
-            builtin = SymbolTemplate.get_builtin_symbol(sym_name)
-            if builtin:
-                symbols.append(builtin)
-                added_symbols.add(sym_name)
-                continue
+    def _schedule_hierarchical(self, graph: TaskGraph, artifacts: dict, pending: dict) -> dict[str, str]:
+        """서브시트/루트 시트 생성 작업을 등록합니다.
 
-            # 3. 없으면 경고
-            logger.warning(f"심볼 없음: {sym_name} ({part.ref})")
+        Returns:
+            {"sheet_name": 작업 키, ..., "root": 작업 키}
+        """
+        keys = {}
+
+        # 1. 각 서브시트 (서로 독립 - 병렬 가능)
+        for sheet, parts in self._sheet_parts():
+            key = f"sheet:{sheet.name}"
+            self._schedule_artifact(
+                graph, artifacts, pending,
+                key,
+                fingerprint(
+                    __version__,
+                    self.canonical,
+                    (self.placement, self.placement_seed),
+                    self.config.name,
+                    sheet.name,
+                    sheet.filename,
+                    sheet.ports,
+                    parts,
+                    self._symbols_fingerprint(parts),
+                    self._get_title_block(title=sheet.name, is_sub_sheet=True),
+                ),
+                self.output_dir / sheet.filename,
+                self._build_sub_sheet,
+                sheet,
+                parts,
+            )
+            keys[sheet.name] = key
+
+        # 2. 루트 시트 (시트 구성/포트가 바뀐 경우만)
+        self._schedule_artifact(
+            graph, artifacts, pending,
+            "sheet:root",
+            fingerprint(
+                __version__,
+                self.canonical,
+                self.config.name,
+                [(s.name, s.filename, s.ports) for s in self.config.sheets],
+                self._get_title_block(),
+            ),
+            self.output_dir / f"{self.config.name}.kicad_sch",
+            self._build_root_sheet,
+        )
+        keys["root"] = "sheet:root"
+
+        return keys
+
+    def _sheet_parts(self) -> list[tuple]:
+        """서브시트별 리졸브된 부품 목록.
+
+        Returns:
+            [(SheetConfig, [ResolvedPart, ...]), ...]
+        """
+        ref_to_resolved = {p.ref: p for p in self.parts}
+        return [
+            (sheet, [ref_to_resolved[p.ref] for p in sheet.parts if p.ref in ref_to_resolved])
+            for sheet in self.config.sheets
+        ]
+
+    def build_symbol_library(self) -> Path:
+        """심볼 라이브러리를 생성합니다."""
+        symbols = self._collect_symbols(self.parts, include_power=True, warn_missing=True)
 
         # 라이브러리 파일 생성
         lib_content = SymbolTemplate.create_library(symbols, "custom")
 
         output_path = self.lib_dir / "custom.kicad_sym"
-        output_path.write_text(lib_content, encoding='utf-8')
+        write_text(output_path, lib_content, self.skip_unchanged)
 
         return output_path
 
@@ -212,98 +467,69 @@ class KicadBuilder:
 
     def build_schematic(self) -> Path:
         """회로도를 생성합니다."""
+        return self._build_schematic().path
+
+    def _build_schematic(self) -> SheetBuild:
+        """단일 시트 회로도를 생성하고 배치/배선 요약을 함께 돌려줍니다."""
         # lib_symbols 섹션 생성
         lib_symbols = self._build_lib_symbols_section()
 
-        # 컴포넌트 인스턴스 생성
-        components = []
-        labels = []
-        label_points = defaultdict(list)  # net -> [(x, y), ...]
+        # 컴포넌트 인스턴스 + 네트 라벨
+        components, labels = self._place_parts(self.parts, ROOT_SHEET)
 
-        for i, part in enumerate(self.parts):
-            pos = SchematicTemplate.calculate_grid_position(i)
-
-            # 컴포넌트 인스턴스
-            lib_id = f"custom:{part.symbol_name}"
-            comp = SchematicTemplate.create_component_instance(
-                lib_id=lib_id,
-                ref=part.ref,
-                value=part.value,
-                x=pos.x,
-                y=pos.y,
-                footprint=part.footprint_full,
-                lcsc=part.lcsc,
-                project=self.config.name,
-            )
-            components.append(comp)
-
-            # 네트 라벨 추가 (각 핀에 대해)
-            label_y = pos.y - 10.16
-            for pin_name, net_name in part.nets.items():
-                # 그리드 스냅
-                snapped_x = snap_to_grid(pos.x)
-                snapped_y = snap_to_grid(label_y)
-
-                label = SchematicTemplate.create_label(
-                    name=net_name,
-                    x=snapped_x,
-                    y=snapped_y,
-                )
-                labels.append(label)
-
-                # 와이어 생성용 좌표 기록
-                label_points[net_name].append((snapped_x, snapped_y))
-
-                label_y -= 2.54
+        # 와이어 생성
+        index, routes, wires, rejected = self._wire_sheet(self.parts, ROOT_SHEET)
+        routing = self._routing_summary(index, routes, rejected)
 
-        # 전원 심볼 인스턴스 추가
+        # 전원 심볼 인스턴스 추가 (부품 본체 / 라벨 / 와이어를 피해 빈 자리에 - 본체는 _wire_sheet에서 등록됨)
         power_symbols = []
         power_y = 30.0
 
         for net_name, net_value in self.config.net_presets.items():
             lib_id = f"custom:{net_value}"
             rotation = 180 if net_value.upper() == "GND" else 0
+            x, y = self._free_symbol_position(index, self.symbols.power_symbol(net_value), 250.0, power_y, rotation)
 
             power = SchematicTemplate.create_power_instance(
                 lib_id=lib_id,
                 value=net_value,
-                x=250.0,
-                y=power_y,
+                x=x,
+                y=y,
                 rotation=rotation,
                 project=self.config.name,
+                uuid_key=self._uuid_key(ROOT_SHEET, f"#PWR:{net_name}"),
             )
             power_symbols.append(power)
             power_y += 15.0
 
-        # 와이어 생성
-        wires_str = self._generate_wires(label_points)
-
         # 제목 텍스트
         title_text = SchematicTemplate.create_text(
             text=f"{self.config.name}\\n\\nAuto-generated schematic\\nParts: {len(self.parts)}",
             x=25.0,
             y=25.0,
+            uuid_key=self._uuid_key(ROOT_SHEET, "title"),
         )
 
         # 타이틀 블록
         title_block = self._get_title_block()
 
-        # 회로도 생성
-        schematic = SchematicTemplate.create_schematic(
+        # 회로도 생성 (섹션 단위 스트리밍 + 원자적 교체)
+        path = SchematicTemplate.write_file(
+            self.output_dir / f"{self.config.name}.kicad_sch",
+            SchematicTemplate.emit_schematic,
             project_name=self.config.name,
             lib_symbols=lib_symbols,
-            components="\n".join(components + power_symbols),
-            wires=wires_str,
-            labels="\n".join(labels),
+            components=chain(components, power_symbols),
+            wires=wires,
+            labels=labels,
             texts=title_text,
             title_block=title_block,
             generator_version=__version__,
+            schematic_uuid=gen_uuid(*self._uuid_key(ROOT_SHEET), "schematic"),
+            canonical=self.canonical,
+            skip_unchanged=self.skip_unchanged,
         )
-
-        output_path = self.output_dir / f"{self.config.name}.kicad_sch"
-        output_path.write_text(schematic, encoding='utf-8')
-
-        return output_path
+        return SheetBuild(path, routing, self._placement_summary(ROOT_SHEET))
 
     def build_hierarchical_schematics(self) -> dict[str, Path]:
         """계층 시트 구조의 회로도를 생성합니다 (v1.2).
@@ -311,40 +537,26 @@ class KicadBuilder:
         Returns:
             {"root": Path, "sheet_name": Path, ...}
         """
-        results = {}
-
-        # 시트별 리졸브된 부품 매핑
-        sheet_parts_map = {}
-        ref_to_resolved = {p.ref: p for p in self.parts}
-
-        for sheet in self.config.sheets:
-            sheet_parts_map[sheet.name] = [
-                ref_to_resolved[p.ref]
-                for p in sheet.parts
-                if p.ref in ref_to_resolved
-            ]
+        graph = TaskGraph()
+        artifacts: dict[str, Path] = {}
+        pending: dict[str, str] = {}
 
-        # 1. 각 서브시트 생성
-        for sheet in self.config.sheets:
-            sheet_path = self._build_sub_sheet(sheet, sheet_parts_map[sheet.name])
-            results[sheet.name] = sheet_path
+        keys = self._schedule_hierarchical(graph, artifacts, pending)
+        results = self._run_graph(graph, artifacts, pending)
 
-        # 2. 루트 시트 생성
-        root_path = self._build_root_sheet()
-        results["root"] = root_path
-
-        return results
+        return {name: results[key] for name, key in keys.items()}
 
     def _build_root_sheet(self) -> Path:
         """루트 시트를 생성합니다."""
         # 서브시트 심볼 배치
         sheet_symbols = []
-        x, y = 50.0, 50.0
+        sheet_labels = []
+        x, y = 50.8, 50.8
 
         for i, sheet in enumerate(self.config.sheets):
             # 시트 심볼 크기 계산 (포트 수에 따라)
             pin_count = len(sheet.ports)
-            height = max(20.0, (pin_count + 2) * 2.54)
+            height = max(20.32, (pin_count + 2) * 2.54)
 
             # v1.3: ports가 PortSpec 객체인 경우 처리
             symbol = SchematicTemplate.create_sheet_symbol(
@@ -352,354 +564,454 @@ class KicadBuilder:
                 filename=sheet.filename,
                 x=x,
                 y=y,
-                width=30.0,
+                width=30.48,
                 height=height,
                 pins=sheet.ports,  # PortSpec 객체 리스트 전달
+                uuid_key=self._uuid_key(ROOT_SHEET, sheet.name),
             )
             sheet_symbols.append(symbol)
 
+            # 시트 핀마다 같은 이름의 로컬 라벨 - 이름이 같은 포트끼리 루트에서 연결됨
+            # (핀 위치는 create_sheet_symbol과 같은 규칙: 변마다 y + 2.54부터 2.54 간격)
+            for side, pin_x, rotation in (("left", x, 180), ("right", x + 30.48, 0)):
+                pin_y = y
+                for port in sheet.ports:
+                    if (port.side == "left") != (side == "left"):
+                        continue
+                    pin_y += 2.54
+                    sheet_labels.append(SchematicTemplate.create_label(
+                        name=port.name,
+                        x=round(pin_x, 4),
+                        y=round(pin_y, 4),
+                        rotation=rotation,
+                        uuid_key=self._uuid_key(ROOT_SHEET, sheet.name, f"pin:{port.name}"),
+                    ))
+
             # 다음 시트 위치 (가로로 배치)
-            x += 50.0
+            x += 50.8
             if (i + 1) % 4 == 0:  # 4개마다 줄바꿈
-                x = 50.0
-                y += 60.0
+                x = 50.8
+                y += 60.96
 
         # 타이틀 텍스트
         title_text = SchematicTemplate.create_text(
             text=f"{self.config.name}\\n\\nHierarchical Design\\nSheets: {len(self.config.sheets)}",
             x=25.0,
             y=25.0,
+            uuid_key=self._uuid_key(ROOT_SHEET, "title"),
         )
 
         # 타이틀 블록
         title_block = self._get_title_block()
 
         # 루트 회로도 생성
-        root_sch = SchematicTemplate.create_root_schematic(
+        return SchematicTemplate.write_file(
+            self.output_dir / f"{self.config.name}.kicad_sch",
+            SchematicTemplate.emit_root_schematic,
             project_name=self.config.name,
             lib_symbols="",  # 루트에는 심볼 불필요
-            sheet_symbols="\n".join(sheet_symbols),
+            sheet_symbols=sheet_symbols,
             texts=title_text,
+            labels=sheet_labels,
             title_block=title_block,
             generator_version=__version__,
+            schematic_uuid=gen_uuid(*self._uuid_key(ROOT_SHEET), "schematic"),
+            canonical=self.canonical,
+            skip_unchanged=self.skip_unchanged,
         )
 
-        output_path = self.output_dir / f"{self.config.name}.kicad_sch"
-        output_path.write_text(root_sch, encoding='utf-8')
-
-        return output_path
-
-    def _build_sub_sheet(self, sheet, resolved_parts: list) -> Path:
-        """서브시트를 생성합니다."""
+    def _build_sub_sheet(self, sheet, resolved_parts: list) -> SheetBuild:
+        """서브시트를 생성하고 배치/배선 요약을 함께 돌려줍니다."""
         # lib_symbols 섹션 (이 시트에서 사용하는 심볼만)
         lib_symbols = self._build_lib_symbols_for_parts(resolved_parts)
 
-        # 컴포넌트 배치
-        components = []
-        labels = []
-        label_points = defaultdict(list)
-
-        for i, part in enumerate(resolved_parts):
-            pos = SchematicTemplate.calculate_grid_position(i)
-
-            lib_id = f"custom:{part.symbol_name}"
-            comp = SchematicTemplate.create_component_instance(
-                lib_id=lib_id,
-                ref=part.ref,
-                value=part.value,
-                x=pos.x,
-                y=pos.y,
-                footprint=part.footprint_full,
-                lcsc=part.lcsc,
-                project=self.config.name,
-            )
-            components.append(comp)
-
-            # 네트 라벨
-            label_y = pos.y - 10.16
-            for pin_name, net_name in part.nets.items():
-                snapped_x = snap_to_grid(pos.x)
-                snapped_y = snap_to_grid(label_y)
-
-                label = SchematicTemplate.create_label(
-                    name=net_name,
-                    x=snapped_x,
-                    y=snapped_y,
-                )
-                labels.append(label)
-                label_points[net_name].append((snapped_x, snapped_y))
-                label_y -= 2.54
+        # 컴포넌트 배치 + 네트 라벨
+        components, labels = self._place_parts(resolved_parts, sheet.name)
 
         # 와이어 생성
-        wires_str = self._generate_wires(label_points)
-
-        # 계층 핀 (포트) 생성 - v1.3: PortSpec 지원
-        hierarchical_pins = []
-        left_y = 30.0
-        right_y = 30.0
+        index, routes, wires, rejected = self._wire_sheet(resolved_parts, sheet.name)
+        routing = self._routing_summary(index, routes, rejected)
 
-        for port in sheet.ports:
-            # PortSpec 객체에서 정보 추출
-            port_name = port.name
-            port_shape = port.shape
-            port_side = port.side
-
-            if port_side == "left":
-                h_pin = SchematicTemplate.create_hierarchical_pin(
-                    name=port_name,
-                    x=25.0,
-                    y=left_y,
-                    shape=port_shape,
-                    rotation=180,
-                )
-                left_y += 5.08
-            else:  # right
-                h_pin = SchematicTemplate.create_hierarchical_pin(
-                    name=port_name,
-                    x=250.0,
-                    y=right_y,
-                    shape=port_shape,
-                    rotation=0,
-                )
-                right_y += 5.08
+        self._check_ports(sheet)
 
-            hierarchical_pins.append(h_pin)
+        # 계층 핀 (포트) 생성 - v1.3: PortSpec 지원 (배선은 _wire_sheet에서 같은 이름 넷과 함께)
+        hierarchical_pins = [
+            SchematicTemplate.create_hierarchical_pin(
+                name=port.name,
+                x=x,
+                y=y,
+                shape=port.shape,
+                rotation=rotation,
+                uuid_key=self._uuid_key(sheet.name, f"port:{port.name}"),
+            )
+            for port, x, y, rotation in self._port_layout(sheet)
+        ]
 
         # 타이틀 텍스트
         title_text = SchematicTemplate.create_text(
             text=f"{sheet.name}\\nParts: {len(resolved_parts)}",
             x=25.0,
             y=15.0,
+            uuid_key=self._uuid_key(sheet.name, "title"),
         )
 
         # 타이틀 블록 (서브시트)
         title_block = self._get_title_block(title=sheet.name, is_sub_sheet=True)
 
         # 서브시트 생성
-        sub_sch = SchematicTemplate.create_sub_schematic(
+        path = SchematicTemplate.write_file(
+            self.output_dir / sheet.filename,
+            SchematicTemplate.emit_sub_schematic,
             sheet_name=sheet.name,
             project_name=self.config.name,
             lib_symbols=lib_symbols,
-            components="\n".join(components),
-            wires=wires_str,
-            labels="\n".join(labels),
-            hierarchical_pins="\n".join(hierarchical_pins),
+            components=components,
+            wires=wires,
+            labels=labels,
+            hierarchical_pins=hierarchical_pins,
             texts=title_text,
+            sheet_uuid=gen_uuid(*self._uuid_key(sheet.name), "schematic"),
             title_block=title_block,
             generator_version=__version__,
+            canonical=self.canonical,
+            skip_unchanged=self.skip_unchanged,
         )
+        return SheetBuild(path, routing, self._placement_summary(sheet.name))
 
-        output_path = self.output_dir / sheet.filename
-        output_path.write_text(sub_sch, encoding='utf-8')
+    @staticmethod
+    def _port_layout(sheet) -> list[tuple]:
+        """서브시트 계층 핀 위치 (그리드 위, 왼쪽 포트는 왼쪽 여백 / 오른쪽 포트는 부품 열 바깥).
 
-        return output_path
+        Returns:
+            [(PortSpec, x, y, rotation), ...]
+        """
+        layout = []
+        next_y = {"left": 30.48, "right": 30.48}
+        for port in sheet.ports:
+            side = "left" if port.side == "left" else "right"
+            x, rotation = (25.4, 180) if side == "left" else (274.32, 0)
+            layout.append((port, x, round(next_y[side], 4), rotation))
+            next_y[side] += 5.08
+        return layout
 
-    def _build_lib_symbols_for_parts(self, parts: list) -> str:
-        """특정 부품 목록에 대한 lib_symbols 섹션을 생성합니다."""
-        symbols = []
-        added = set()
+    def _check_ports(self, sheet) -> list[str]:
+        """넷 테이블로 시트 포트를 점검합니다.
 
-        for part in parts:
-            sym_name = part.symbol_name
-            if sym_name in added:
-                continue
+        다른 시트와 공유하는 넷(전원 프리셋 제외)에 포트가 없거나, 시트에서 쓰지 않는 포트가 있으면 경고.
 
-            # LCSC 심볼
-            if part.symbol_lib and part.symbol_lib.exists():
-                content = part.symbol_lib.read_text(encoding='utf-8')
-                sym_content = self._extract_symbol_from_lib(content)
-                if sym_content:
-                    symbols.append(self._indent_symbol(sym_content))
-                    added.add(sym_name)
-                    continue
+        Returns:
+            경고 메시지 목록
+        """
+        table = self.net_table
+        ports = {port.name for port in sheet.ports}
+        used = {table.name(net_id) for net_id in table.sheet_nets(sheet.name)}
+        messages = []
+        for net_id in table.crossing_nets(sheet.name):
+            name = table.name(net_id)
+            if name not in ports and name not in self.config.net_presets:
+                others = [s for s in table.net_sheets[net_id] if s != sheet.name]
+                messages.append(f"시트 {sheet.name}: 넷 {name}이 {', '.join(others)} 시트와 공유되지만 포트 없음")
+        for name in sorted(ports - used):
+            messages.append(f"시트 {sheet.name}: 포트 {name}을 쓰는 부품 핀 없음")
+        for message in messages:
+            logger.warning(message)
+        return messages
+
+    def _build_lib_symbols_for_parts(self, parts: list) -> Iterator[str]:
+        """특정 부품 목록에 대한 lib_symbols 섹션 (들여쓰기된 심볼 블록)."""
+        return (self.symbols.indented(sym) for sym in self._collect_symbols(parts))
+
+    def _positions(self, parts: list, sheet: str = ROOT_SHEET) -> list[Position]:
+        """시트 부품 위치 (placement 방식에 따라 그리드 순서 또는 넷 연결 기반).
+
+        배치는 결정적이므로 프로세스 작업자와 manifest 생성 시 같은 결과가 나옵니다.
+        위치는 그리드에 스냅하므로 그리드 위 핀 끝점도 그리드에 놓입니다.
+        """
+        if self.placement != "force":
+            return [_snap_position(SchematicTemplate.calculate_grid_position(i)) for i in range(len(parts))]
 
-            # 내장 심볼
-            builtin = SymbolTemplate.get_builtin_symbol(sym_name)
-            if builtin:
-                symbols.append(self._indent_symbol(builtin))
-                added.add(sym_name)
+        result = self._placements.get(sheet)
+        if result is None:
+            result = ForcePlacer(seed=self.placement_seed).place(
+                [[net_id for _, net_id in self.net_table.nets_of(part.ref)] for part in parts]
+            )
+            self._placements[sheet] = result
+            logger.debug(
+                f"배치 [{sheet}]: HPWL {result.grid_wirelength:.1f} → {result.wirelength:.1f}mm "
+                f"({result.improvement:.1f}% 감소, {result.seconds * 1000:.0f}ms)"
+            )
+        return [_snap_position(pos) for pos in result.positions]
 
-        return "\n".join(symbols)
+    def _layout(self, parts: list, sheet: str = ROOT_SHEET) -> Iterator[tuple]:
+        """부품 위치와 핀별 네트 라벨 위치.
 
-    def _generate_wires(self, label_points: dict[str, list[tuple[float, float]]]) -> str:
-        """동일 net 라벨들을 와이어로 연결합니다.
+        라벨은 심볼 핀 끝점에 본체 바깥쪽을 향하도록 놓습니다. 심볼에서 핀을 찾지 못하면
+        (심볼 없음, 다른 유닛의 핀) 예전처럼 부품 위쪽에 쌓습니다 - 이 라벨은 핀과 연결되지 않습니다.
 
-        Args:
-            label_points: {net_name: [(x, y), ...], ...}
+        Yields:
+            (part, 부품 위치, [(pin_name, net_name, x, y, rotation), ...])
+        """
+        names = self.net_table.names
+        for part, pos in zip(parts, self._positions(parts, sheet)):
+            geometry = self.symbols.geometry(part)
+            pins = []
+            label_y = pos.y - 10.16
+            for pin_name, net_id in self.net_table.nets_of(part.ref):
+                pin = geometry.find(pin_name) if geometry else None
+                if pin is not None:
+                    x, y = round(pos.x + pin.x, 4), round(pos.y + pin.y, 4)
+                    pins.append((pin_name, names[net_id], x, y, int(pin.angle + 180) % 360))
+                else:
+                    logger.debug(f"라벨 [{sheet}] {part.ref}.{pin_name}: 심볼 핀을 찾지 못해 부품 위에 배치")
+                    pins.append((pin_name, names[net_id], snap_to_grid(pos.x), snap_to_grid(label_y), 0))
+                    label_y -= 2.54
+            yield part, pos, pins
+
+    def _place_parts(self, parts: list, sheet: str) -> tuple[list[str], list[str]]:
+        """컴포넌트 인스턴스와 네트 라벨을 생성합니다.
 
         Returns:
-            와이어 섹션 문자열
+            (컴포넌트 문자열 목록, 라벨 문자열 목록)
         """
-        if not label_points:
-            return ""
+        components = []
+        labels = []
 
-        wires = []
-        seen_segments = set()
+        for part, pos, pins in self._layout(parts, sheet):
+            components.append(SchematicTemplate.create_component_instance(
+                lib_id=f"custom:{part.symbol_name}",
+                ref=part.ref,
+                value=part.value,
+                x=pos.x,
+                y=pos.y,
+                footprint=part.footprint_full,
+                lcsc=part.lcsc,
+                project=self.config.name,
+                uuid_key=self._uuid_key(sheet, part.ref),
+            ))
 
-        for net, coords in label_points.items():
-            if len(coords) < 2:
-                continue
+            # 네트 라벨 (각 핀에 대해)
+            for pin_name, net_name, x, y, rotation in pins:
+                labels.append(SchematicTemplate.create_label(
+                    name=net_name,
+                    x=x,
+                    y=y,
+                    rotation=rotation,
+                    uuid_key=self._uuid_key(sheet, part.ref, pin_name),
+                ))
 
-            # y -> x 기준 정렬 후 체인 연결
-            sorted_coords = sorted(coords, key=lambda c: (c[1], c[0]))
+        return components, labels
 
-            # 체인 방식 연결: [0]->[1]->[2]...
-            for i in range(len(sorted_coords) - 1):
-                x1, y1 = sorted_coords[i]
-                x2, y2 = sorted_coords[i + 1]
+    def _route(self, label_points: dict[str, list[tuple[float, float]]]) -> dict[str, NetRoute]:
+        """넷별 배선 (시트마다 새 점유 맵)."""
+        return WireRouter(grid=GRID_SIZE).route(label_points)
 
-                # 그리드 스냅
-                x1, y1 = snap_to_grid(x1), snap_to_grid(y1)
-                x2, y2 = snap_to_grid(x2), snap_to_grid(y2)
+    def _wire_sheet(self, parts: list, sheet: str = ROOT_SHEET) -> tuple:
+        """동일 net 라벨들을 와이어로 연결합니다.
 
-                # L자(직교) 라우팅
-                wire_segs = self._create_l_route(x1, y1, x2, y2)
+        라벨은 핀 끝점에 있으므로 와이어도 핀에서 시작합니다. 그리드 밖 핀은 가장 가까운
+        그리드 점까지 짧은 와이어를 먼저 놓고 그 점에서 배선합니다. 배선 전에 심볼 본체와
+        모든 핀 끝점(핀별 설정 넷)을 인덱스에 넣어 다른 넷 핀에 닿는 와이어를 거부하고,
+        와이어 중간에 걸친 핀에는 정션을 답니다.
+        라우터 결과를 시트 공간 인덱스에 하나씩 넣으면서 다른 넷의 라벨/와이어와
+        연결되는 세그먼트는 거부하고 (같은 이름 라벨끼리는 와이어 없이도 연결됨),
+        마지막에 분기점(끝점 3개 이상 / T자)에 정션을 추가합니다.
 
-                for seg in wire_segs:
-                    sx1, sy1, sx2, sy2 = seg
-                    wire_str = self._make_wire_segment(sx1, sy1, sx2, sy2, seen_segments)
-                    if wire_str:
-                        wires.append(wire_str)
+        Args:
+            parts: 시트의 부품 목록
+            sheet: 시트 이름 (UUID 키)
 
-        if not wires:
-            return ""
+        Returns:
+            (SchematicIndex, {net: NetRoute}, 와이어 + 정션 노드 문자열 목록, 거부한 세그먼트 수)
+        """
+        index = SchematicIndex()
+        label_points = defaultdict(list)
+        off_grid = []
+        for part, pos, pins in self._layout(parts, sheet):
+            # 심볼 본체와 모든 핀 끝점 (설정에 없는 핀은 넷 없음 - 어떤 와이어도 닿으면 거부)
+            pin_nets = {(x, y): net_name for _, net_name, x, y, _ in pins}
+            geometry = self.symbols.geometry(part)
+            if geometry is not None:
+                if geometry.bbox is not None:
+                    x0, y0, x1, y1 = geometry.bbox
+                    index.add_symbol((pos.x + x0, pos.y + y0, pos.x + x1, pos.y + y1), part.ref)
+                for pin in geometry.pins:
+                    x, y = round(pos.x + pin.x, 4), round(pos.y + pin.y, 4)
+                    index.add_pin(x, y, part.ref, pin_nets.get((x, y)))
+            for _, net_name, x, y, rotation in pins:
+                index.add_label(net_name, x, y, rotation)
+                gx, gy = round(snap_to_grid(x), 4), round(snap_to_grid(y), 4)
+                label_points[net_name].append((gx, gy))
+                if (gx, gy) != (x, y):
+                    off_grid.append((net_name, x, y, gx, gy))
+        # 계층 핀 (포트)도 같은 이름 넷의 단자
+        sheet_config = next((s for s in self.config.sheets if s.name == sheet), None)
+        for port, x, y, rotation in self._port_layout(sheet_config) if sheet_config else ():
+            index.add_label(port.name, x, y, rotation, kind="hierarchical_label")
+            label_points[port.name].append((x, y))
+
+        # 단자가 둘 이상인 넷만 배선 - 그리드 밖 핀은 그리드 점까지 짧은 와이어
+        stubs = defaultdict(list)
+        for net_name, x, y, gx, gy in off_grid:
+            if len(label_points[net_name]) > 1:
+                if gx != x:
+                    stubs[net_name].append((x, y, gx, y))
+                if gy != y:
+                    stubs[net_name].append((gx, y, gx, gy))
+
+        routes = self._route(label_points)
+        nodes = []
+        rejected = 0
+
+        for net in dict.fromkeys(chain(stubs, routes)):
+            route = routes.get(net, NetRoute(net))
+            uuid_key = self._uuid_key(sheet, f"net:{net}")
+            for x1, y1, x2, y2 in chain(stubs.get(net, ()), route.segments):
+                conflicts = index.conflicts(x1, y1, x2, y2, net)
+                if conflicts:
+                    rejected += 1
+                    logger.debug(
+                        f"와이어 거부 [{sheet}] {net} ({x1:.2f}, {y1:.2f})-({x2:.2f}, {y2:.2f}): "
+                        f"{', '.join(sorted({c.net or c.ref or c.kind for c in conflicts}))}와 연결됨"
+                    )
+                    continue
+                index.add_wire(x1, y1, x2, y2, net)
+                # 세그먼트 키: 정규화된 양 끝점 (작은 값이 먼저)
+                key = tuple(sorted([(round(x1, 2), round(y1, 2)), (round(x2, 2), round(y2, 2))]))
+                nodes.append(SchematicTemplate.create_wire(x1, y1, x2, y2, uuid_key=uuid_key + (key,)))
+            if route.segments:
+                logger.debug(
+                    f"배선 [{sheet}] {net}: {route.length:.2f}mm, "
+                    f"{len(route.segments)}개 세그먼트, 충돌 {route.conflicts}"
+                )
 
-        return "\n".join(wires)
+        for x, y in index.junctions_needed():
+            index.add_junction(x, y)
+            nodes.append(SchematicTemplate.create_junction(
+                x, y, uuid_key=self._uuid_key(sheet, "junction", (round(x, 2), round(y, 2))),
+            ))
 
-    def _create_l_route(
-        self,
-        x1: float,
-        y1: float,
-        x2: float,
-        y2: float
-    ) -> list[tuple[float, float, float, float]]:
-        """두 점 사이의 L자 라우팅 세그먼트를 생성합니다.
+        return index, routes, nodes, rejected
+
+    @staticmethod
+    def _free_symbol_position(index: SchematicIndex, symbol_text: str, x: float, y: float,
+                              rotation: int = 0) -> tuple[float, float]:
+        """심볼을 (x, y) 근처의 빈 자리에 놓고 인덱스에 등록합니다.
 
         Returns:
-            [(x1, y1, x2, y2), ...] 세그먼트 리스트
+            심볼 위치 (빈 자리가 없으면 (x, y))
         """
-        segments = []
-
-        # 같은 x 또는 같은 y면 직선 1개
-        if abs(x1 - x2) < 0.01:
-            # 수직선
-            segments.append((x1, y1, x2, y2))
-        elif abs(y1 - y2) < 0.01:
-            # 수평선
-            segments.append((x1, y1, x2, y2))
-        else:
-            # L자 라우팅: 3개 세그먼트 (수직-수평-수직)
-            mid_y = snap_to_grid((y1 + y2) / 2)
+        node = parse(symbol_text)
+        bbox, _ = place_symbol(node, 0.0, 0.0, rotation)
+        if bbox is not None:
+            x0, y0, x1, y1 = bbox
+            free = index.free_position(x + x0, y + y0, x1 - x0, y1 - y0)
+            if free is not None:
+                x, y = round(free[0] - x0, 4), round(free[1] - y0, 4)
+        index.add_lib_symbol(node, x, y, rotation)
+        return x, y
 
-            # Segment 1: (x1, y1) -> (x1, mid_y) 수직
-            segments.append((x1, y1, x1, mid_y))
-            # Segment 2: (x1, mid_y) -> (x2, mid_y) 수평
-            segments.append((x1, mid_y, x2, mid_y))
-            # Segment 3: (x2, mid_y) -> (x2, y2) 수직
-            segments.append((x2, mid_y, x2, y2))
+    def placement_report(self) -> dict:
+        """시트별 부품 배치 결과 (manifest용, placement="force"일 때만).
 
-        return segments
+        시트 작업이 돌려준 값(건너뛴 시트는 이전 빌드에서 이월한 값)을 쓰므로 다시 배치하지 않습니다.
 
-    def _make_wire_segment(
-        self,
-        x1: float,
-        y1: float,
-        x2: float,
-        y2: float,
-        seen: set
-    ) -> Optional[str]:
-        """중복되지 않은 와이어 세그먼트를 생성합니다.
+        Returns:
+            {sheet: {"grid_hpwl_mm", "hpwl_mm", "improvement_pct", "seconds"}, ...}
+        """
+        if self.placement != "force":
+            return {}
+        report = {}
+        for name, parts in self._schematic_sheets():
+            result = self._sheet_meta(name, parts)["placement"]
+            report[name] = result
+            logger.info(
+                f"배치 [{name}]: HPWL {result['grid_hpwl_mm']:.1f} → {result['hpwl_mm']:.1f}mm "
+                f"({result['improvement_pct']:.1f}% 감소)"
+            )
+        return report
 
-        Args:
-            x1, y1, x2, y2: 시작/끝 좌표
-            seen: 이미 생성된 세그먼트 집합
+    def _schematic_sheets(self) -> list[tuple[str, list]]:
+        """부품을 배치/배선하는 시트 목록 [(시트 이름, 부품 목록), ...]."""
+        if self.config.is_hierarchical:
+            return [(sheet.name, parts) for sheet, parts in self._sheet_parts()]
+        return [(ROOT_SHEET, self.parts)]
+
+    def routing_report(self) -> dict:
+        """시트/넷별 배선 길이와 세그먼트 수 (manifest용).
+
+        시트 작업이 돌려준 값(건너뛴 시트는 이전 빌드에서 이월한 값)을 쓰므로 다시 배선하지 않습니다.
 
         Returns:
-            와이어 문자열 또는 None (중복이거나 길이 0인 경우)
+            {sheet: {"nets": {net: {"length_mm", "segments", "conflicts"}},
+                     "total_length_mm", "segments", "conflicts", "junctions", "rejected"}, ...}
         """
-        # 길이 0 와이어 스킵
-        if abs(x1 - x2) < 0.01 and abs(y1 - y2) < 0.01:
-            return None
+        report = {}
+        for name, parts in self._schematic_sheets():
+            report[name] = self._sheet_meta(name, parts)["routing"]
+            if report[name]["rejected"]:
+                logger.warning(
+                    f"배선 [{name}]: 다른 넷과 연결되는 와이어 {report[name]['rejected']}개 제외 (-v로 상세 확인)"
+                )
+        return report
 
-        # 좌표 정규화 (작은 값이 먼저) - 중복 방지
-        p1 = (round(x1, 2), round(y1, 2))
-        p2 = (round(x2, 2), round(y2, 2))
-        key = tuple(sorted([p1, p2]))
+    def _sheet_meta(self, name: str, parts: list) -> dict:
+        """시트 산출물의 배치/배선 요약.
 
-        if key in seen:
-            return None
+        빌드 캐시에 없을 때만 (이전 형식 manifest에서 이월한 시트, build_all 밖에서 호출) 계산해 채웁니다.
+        """
+        key = f"sheet:{name}" if self.config.is_hierarchical else "schematic"
+        meta = self.cache.meta(key)
+        if meta is None or (self.placement == "force" and "placement" not in meta):
+            index, routes, _, rejected = self._wire_sheet(parts, name)
+            meta = SheetBuild(None, self._routing_summary(index, routes, rejected), self._placement_summary(name)).meta
+            self.cache.set_meta(key, meta)
+        return meta
 
-        seen.add(key)
-        return SchematicTemplate.create_wire(x1, y1, x2, y2)
+    @staticmethod
+    def _routing_summary(index: SchematicIndex, routes: dict[str, NetRoute], rejected: int) -> dict:
+        """시트 하나의 배선 요약 (routing_report 항목)."""
+        return {
+            "nets": {net: route.to_dict() for net, route in routes.items() if route.segments},
+            "total_length_mm": round(sum(r.length for r in routes.values()), 2),
+            "segments": sum(len(r.segments) for r in routes.values()),
+            "conflicts": sum(r.conflicts for r in routes.values()),
+            "junctions": sum(1 for item in index.items if item.kind == "junction"),
+            "rejected": rejected,
+        }
 
-    def build_bom(self) -> Path:
-        """JLC BOM CSV를 생성합니다 (v1.3: DNP 필터링 + 수량 그룹화)."""
-        output_path = self.output_dir / "bom_jlc.csv"
+    def _placement_summary(self, sheet: str) -> Optional[dict]:
+        """시트 하나의 배치 요약 (placement="force"이고 이미 배치한 시트만)."""
+        result = self._placements.get(sheet)
+        return result.to_dict() if result is not None else None
 
-        # DNP가 아닌 부품만 필터링
-        active_parts = [p for p in self.parts if not p.dnp]
+    def build_boms(self, keys: Optional[list[str]] = None) -> dict[str, Path]:
+        """BOM 산출물을 한 번의 집계로 함께 생성합니다 (v1.12).
 
-        # 동일 부품 그룹화: (value, footprint, lcsc) 기준
-        groups = defaultdict(list)
-        for part in active_parts:
-            key = (part.value, part.footprint_full or "", part.lcsc or "")
-            groups[key].append(part.ref)
+        부품을 (value, footprint, lcsc, mpn, manufacturer)로 한 번 묶고, JLC BOM은 그 묶음을
+        (value, footprint, lcsc)로 합치기만 합니다.
 
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Comment", "Designator", "Footprint", "JLCPCB Part #"])
+        Args:
+            keys: 만들 산출물 키 (BOM_SINKS, 없으면 전부)
 
-            for (value, footprint, lcsc), refs in groups.items():
-                # Designator: 콤마로 구분된 레퍼런스 목록
-                designator = ",".join(sorted(refs, key=self._natural_sort_key))
-                writer.writerow([value, designator, footprint, lcsc])
+        Returns:
+            {산출물 키: 파일 경로}
+        """
+        keys = list(BOM_SINKS) if keys is None else keys
+        paths = {key: self.output_dir / BOM_SINKS[key][0] for key in keys}
+        bom = BomAggregator().aggregate(items_from_parts(self.parts))
+        write_bom(bom, [BOM_SINKS[key][1](paths[key]) for key in keys], self.skip_unchanged)
+        return paths
 
-        return output_path
+    def build_bom(self) -> Path:
+        """JLC BOM CSV를 생성합니다 (v1.3: DNP 필터링 + 수량 그룹화)."""
+        return self.build_boms(["bom_jlc"])["bom_jlc"]
 
     def build_bom_full(self) -> Path:
         """상세 BOM CSV를 생성합니다 (v1.3).
 
         모든 필드 포함: Ref, Value, Footprint, LCSC, MPN, Manufacturer, Description, DNP, Qty
         """
-        output_path = self.output_dir / "bom_full.csv"
-
-        # 그룹화: (value, footprint, lcsc, mpn, manufacturer) 기준
-        groups = defaultdict(lambda: {"refs": [], "description": "", "dnp": False})
-        for part in self.parts:
-            key = (
-                part.value,
-                part.footprint_full or "",
-                part.lcsc or "",
-                part.mpn or "",
-                part.manufacturer or "",
-            )
-            groups[key]["refs"].append(part.ref)
-            if part.description:
-                groups[key]["description"] = part.description
-            groups[key]["dnp"] = part.dnp
-
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "Designator", "Value", "Footprint", "LCSC", "MPN",
-                "Manufacturer", "Description", "DNP", "Qty"
-            ])
-
-            for (value, footprint, lcsc, mpn, manufacturer), info in groups.items():
-                refs = sorted(info["refs"], key=self._natural_sort_key)
-                writer.writerow([
-                    ",".join(refs),
-                    value,
-                    footprint,
-                    lcsc,
-                    mpn,
-                    manufacturer,
-                    info["description"],
-                    "Yes" if info["dnp"] else "",
-                    len(refs),
-                ])
-
-        return output_path
+        return self.build_boms(["bom_full"])["bom_full"]
 
     def build_report(self, warnings: list[str] = None) -> Path:
         """빌드 리포트를 생성합니다 (v1.3).
@@ -796,17 +1108,19 @@ class KicadBuilder:
                 "",
                 "## Hierarchical Sheets",
                 "",
-                "| Sheet | Parts | Ports |",
-                "|-------|-------|-------|",
+                "| Sheet | Parts | Nets | Shared Nets | Ports |",
+                "|-------|-------|------|-------------|-------|",
             ])
             for sheet in self.config.sheets:
                 port_names = [p.name for p in sheet.ports[:3]]
                 ports = ", ".join(port_names)
                 if len(sheet.ports) > 3:
                     ports += "..."
-                lines.append(f"| {sheet.name} | {len(sheet.parts)} | {ports} |")
+                nets = len(self.net_table.sheet_nets(sheet.name))
+                shared = len(self.net_table.crossing_nets(sheet.name))
+                lines.append(f"| {sheet.name} | {len(sheet.parts)} | {nets} | {shared} | {ports} |")
 
-        output_path.write_text("\n".join(lines), encoding='utf-8')
+        write_text(output_path, "\n".join(lines), self.skip_unchanged)
         return output_path
 
     @staticmethod
@@ -859,6 +1173,10 @@ class KicadBuilder:
             "parts": parts_info,
             "warnings": warnings,
             "files": files,
+            "build_cache": self.cache.to_manifest(),
+            "resolver": self.resolver_report,
+            "placement": self.placement_report(),
+            "routing": self.routing_report(),
         }
 
         output_path = self.output_dir / "manifest.json"
@@ -867,61 +1185,47 @@ class KicadBuilder:
 
         return output_path
 
-    def _build_lib_symbols_section(self) -> str:
-        """lib_symbols 섹션을 생성합니다."""
+    def _symbols_fingerprint(self, parts: list) -> list[tuple[str, str]]:
+        """부품들이 사용하는 심볼 텍스트의 지문 목록 (LCSC 라이브러리에서 추출한 심볼 또는 내장 심볼)."""
+        return [(part.symbol_name, self.symbols.digest(part)) for part in parts]
+
+    def _collect_symbols(self, parts: list, include_power: bool = False, warn_missing: bool = False) -> list[str]:
+        """부품(과 전원 넷 프리셋)이 사용하는 심볼 정의를 중복 없이 모읍니다.
+
+        Args:
+            parts: 부품 목록
+            include_power: net_presets의 전원 심볼을 앞에 포함
+            warn_missing: 심볼을 찾지 못한 부품 경고
+
+        Returns:
+            심볼 텍스트 목록 (들여쓰기 없음)
+        """
         symbols = []
         added = set()
 
         # 전원 심볼
-        for net_name, net_value in self.config.net_presets.items():
-            if net_value not in added:
-                if net_value.upper() == "GND":
-                    symbols.append(self._indent_symbol(BUILTIN_SYMBOLS["GND"]))
-                else:
-                    builtin = SymbolTemplate.get_builtin_symbol(net_value)
-                    if builtin:
-                        symbols.append(self._indent_symbol(builtin))
-                    else:
-                        symbols.append(self._indent_symbol(
-                            SymbolTemplate.create_power_symbol(net_value, net_value)
-                        ))
+        if include_power:
+            for net_value in self.config.net_presets.values():
+                if net_value in added:
+                    continue
+                symbols.append(self.symbols.power_symbol("GND" if net_value.upper() == "GND" else net_value))
                 added.add(net_value)
 
-        # 부품 심볼
-        for part in self.parts:
+        # 부품 심볼 (LCSC 라이브러리 > 내장 심볼)
+        for part in parts:
             sym_name = part.symbol_name
             if sym_name in added:
                 continue
+            sym = self.symbols.part_symbol(part)
+            if sym is None:
+                if warn_missing:
+                    logger.warning(f"심볼 없음: {sym_name} ({part.ref})")
+                continue
+            symbols.append(sym)
+            added.add(sym_name)
 
-            # LCSC 심볼
-            if part.symbol_lib and part.symbol_lib.exists():
-                content = part.symbol_lib.read_text(encoding='utf-8')
-                sym_content = self._extract_symbol_from_lib(content)
-                if sym_content:
-                    symbols.append(self._indent_symbol(sym_content))
-                    added.add(sym_name)
-                    continue
-
-            # 내장 심볼
-            builtin = SymbolTemplate.get_builtin_symbol(sym_name)
-            if builtin:
-                symbols.append(self._indent_symbol(builtin))
-                added.add(sym_name)
-
-        return "\n".join(symbols)
-
-    def _extract_symbol_from_lib(self, content: str) -> Optional[str]:
-        """라이브러리 파일에서 심볼 정의만 추출합니다."""
-        # (symbol "NAME" ... ) 패턴 찾기
-        pattern = r'(\(symbol\s+"[^"]+"\s+[\s\S]*?\n\))'
-        matches = re.findall(pattern, content)
-
-        if matches:
-            return matches[0]
-
-        return None
+        return symbols
 
-    def _indent_symbol(self, symbol: str) -> str:
-        """심볼에 탭 들여쓰기를 추가합니다."""
-        lines = symbol.strip().split('\n')
-        return '\n'.join('\t\t' + line for line in lines)
+    def _build_lib_symbols_section(self) -> Iterator[str]:
+        """lib_symbols 섹션 (들여쓰기된 심볼 블록)."""
+        return (self.symbols.indented(sym) for sym in self._collect_symbols(self.parts, include_power=True))
@@ -0,0 +1,143 @@
+"""
+Loader - 메모리 매핑 기반 지연 로더 v1.0
+
+.kicad_sch / .kicad_pcb 파일을 mmap으로 열고 최상위 항목의 구간만 먼저 색인합니다.
+개별 노드는 요청될 때만 파싱되므로, 인스턴스만 필요하면 수백 KB의 lib_symbols는
+토큰화하지 않고 건너뜁니다.
+
+최상위 구간 색인:
+    KiCad는 최상위 항목을 한 단계 들여쓰기로 저장합니다
+    (회로도는 탭, PCB는 공백 2칸). 그 들여쓰기 + '(' 로 시작하는 줄만
+    C 수준 정규식으로 찾으므로 하위 내용은 읽지 않습니다 (sexpr.scan_sections, parse()와 공유).
+    들여쓰기를 판별할 수 없으면 전체 파서(iter_nodes)로 대체합니다.
+
+오프셋은 파일 바이트 기준이며, view()는 복사 없는 memoryview를 반환합니다.
+
+Usage:
+    from kicad_auto_builder.loader import open_sheet
+
+    with open_sheet("connector_with_labels.kicad_sch") as sheet:
+        for sym in sheet.instance_symbols():
+            print(sym.property("Reference"))
+"""
+
+import mmap
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+
+from .sexpr import SNode, parse, iter_nodes, scan_sections
+
+
+class Section(NamedTuple):
+    """최상위 항목 구간 (바이트 오프셋)."""
+    name: str
+    start: int
+    end: int
+
+
+class LazySheet:
+    """mmap 위의 KiCad 문서.
+
+    노드와 view()는 close() 전까지만 유효합니다.
+    close() 전에 view()로 얻은 memoryview는 release() 해야 합니다.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 매핑할 수 없음
+            self._file.close()
+            raise ValueError(f"빈 파일: {self.path}")
+        self._sections: Optional[list[Section]] = None
+        self._by_name: dict[str, list[Section]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """매핑과 파일을 닫습니다."""
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+            self._file.close()
+
+    @property
+    def buffer(self) -> mmap.mmap:
+        """원본 매핑 (bytes 호환)."""
+        return self._buf
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """[start, end) 구간의 복사 없는 view."""
+        if end is None:
+            end = len(self._buf)
+        return memoryview(self._buf)[start:end]
+
+    def text(self, start: int, end: int) -> str:
+        """[start, end) 구간을 디코딩합니다 (이 시점에만 복사)."""
+        return self._buf[start:end].decode("utf-8")
+
+    # =========================================================================
+    # 최상위 구간 색인
+    # =========================================================================
+
+    @property
+    def sections(self) -> list[Section]:
+        """최상위 항목 구간 목록 (처음 접근 시 한 번 색인)."""
+        if self._sections is None:
+            self._sections = self._scan_sections()
+            for sec in self._sections:
+                self._by_name.setdefault(sec.name, []).append(sec)
+        return self._sections
+
+    def _scan_sections(self) -> list[Section]:
+        buf = self._buf
+        scanned = scan_sections(buf)
+        if scanned is None:
+            # 한 줄로 저장된 파일 등: 전체 토큰화로 대체
+            return [Section(n.name, n.start, n.end) for n in iter_nodes(buf, depth=1)]
+        return [Section(name, start, end) for name, start, _, end in scanned[3]]
+
+    def find_sections(self, name: str) -> list[Section]:
+        """이름이 name인 최상위 구간들."""
+        self.sections
+        return self._by_name.get(name, [])
+
+    # =========================================================================
+    # 노드 (요청 시 파싱)
+    # =========================================================================
+
+    def node(self, section: Section) -> SNode:
+        """구간 하나를 파싱합니다."""
+        return parse(self._buf, section.start, section.end)
+
+    def nodes(self, *names: str) -> Iterator[SNode]:
+        """지정한 이름의 최상위 노드를 파일 순서대로 파싱합니다. 이름이 없으면 전체."""
+        for sec in self.sections:
+            if not names or sec.name in names:
+                yield self.node(sec)
+
+    def instance_symbols(self) -> Iterator[SNode]:
+        """심볼 인스턴스 (lib_symbols는 토큰화하지 않음)."""
+        for node in self.nodes("symbol"):
+            if node.find("lib_id") is not None:
+                yield node
+
+    def lib_symbols(self) -> Optional[SNode]:
+        """lib_symbols 노드 (요청 시에만 파싱)."""
+        found = self.find_sections("lib_symbols")
+        return self.node(found[0]) if found else None
+
+    def footprints(self) -> Iterator[SNode]:
+        """PCB footprint 노드."""
+        return self.nodes("footprint")
+
+
+def open_sheet(path: Union[str, Path]) -> LazySheet:
+    """.kicad_sch / .kicad_pcb 파일을 지연 로딩으로 엽니다."""
+    return LazySheet(path)
@@ -0,0 +1,199 @@
+"""
+Net Diff - 설계 의도(YAML nets) ↔ 회로도 연결성 비교 v1.1
+
+verify_connections(_v2).py는 심볼 / 와이어 / 라벨 개수만 세고, net_validator는 YAML 핀 이름이
+심볼에 있는지만 봅니다. 생성된 .kicad_sch에서 실제로 PartSpec.nets대로 연결되었는지는
+아무도 확인하지 않았습니다.
+
+1. 의도 테이블: 설정으로 만든 NetTable - (ref, 핀 키) → 넷 id (계층 설정이면 시트별로 묶음,
+   시트 포트와 같은 이름의 넷은 루트에서 이어지므로 시트를 넘어 하나로)
+2. 실제 테이블: connectivity.Project의 넷을 (ref, 핀 번호) → 넷 id 해시 인덱스로
+   (핀 키는 이름 → 번호 → 대소문자 무시 이름 순으로 해석, net_validator.match_pin과 같은 규칙)
+3. (ref, 핀)으로 조인해 분류
+   - missing: 회로도에 부품 / 핀이 없거나 핀이 아무 데도 연결되지 않음
+   - misassigned: 핀이 다른 이름의 넷에 연결됨, 같은 의도 넷의 핀들이 서로 다른 넷으로 갈라짐,
+     또는 다른 의도 넷과 합쳐짐 (소수 쪽 핀을 보고)
+   - extra: 설정에 없는 핀이 다른 핀 / 라벨과 연결됨, 설정에 없는 부품
+
+모든 단계가 해시 조회라서 (설정 핀 수 + 회로도 항목 수)에 선형입니다.
+
+Usage:
+    diff = diff_nets(load_config("board.yaml"), Project.load("out/board/Board.kicad_sch"))
+    for issue in diff.issues:
+        print(issue.kind, issue.ref, issue.pin, issue.message)
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .config_loader import ProjectConfig
+from .connectivity import Connection, Project
+from .net_table import NetTable
+
+# 분류 (리포트 순서)
+ISSUE_KINDS = ("missing", "misassigned", "extra")
+
+
+@dataclass
+class NetIssue:
+    """의도와 다른 연결 하나."""
+    kind: str            # missing / misassigned / extra
+    ref: str
+    pin: str             # 설정의 핀 키 (extra는 회로도 핀 번호)
+    expected: str = ""   # 설정의 넷 이름
+    actual: str = ""     # 회로도의 넷 이름
+    message: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "ref": self.ref,
+            "pin": self.pin,
+            "expected": self.expected,
+            "actual": self.actual,
+            "message": self.message,
+        }
+
+
+@dataclass
+class NetDiff:
+    """비교 결과."""
+    issues: list[NetIssue] = field(default_factory=list)
+    checked: int = 0     # 비교한 설정 핀 수
+    matched: int = 0     # 의도대로 연결된 핀 수
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def counts(self) -> dict[str, int]:
+        counts = Counter(issue.kind for issue in self.issues)
+        return {kind: counts.get(kind, 0) for kind in ISSUE_KINDS}
+
+    def to_dict(self) -> dict:
+        return {
+            "checked": self.checked,
+            "matched": self.matched,
+            "counts": self.counts(),
+            "seconds": round(self.seconds, 4),
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+@dataclass
+class _Actual:
+    """회로도 핀 하나의 실제 연결."""
+    pin: Connection
+    net: int             # 넷 대표 id
+    names: set           # 넷의 라벨 / 전원 이름
+    connected: bool      # 다른 핀 또는 라벨과 연결됨
+
+
+def diff_nets(config: ProjectConfig, project: Project, table: Optional[NetTable] = None) -> NetDiff:
+    """설정의 PartSpec.nets와 회로도 연결성을 비교합니다.
+
+    Args:
+        config: 프로젝트 설정
+        project: 생성된 회로도의 연결성 (Project.load(루트 회로도))
+        table: 설정의 넷 테이블 (없으면 NetTable.from_config(config))
+
+    Returns:
+        NetDiff
+    """
+    started = time.perf_counter()
+    result = NetDiff()
+    issue = result.issues.append
+    if table is None:
+        table = NetTable.from_config(config)
+
+    # 실제 테이블: (ref, 핀 번호) → _Actual, 이름 조회용 (ref, 이름) / (ref, 소문자 이름) → 핀 번호
+    actual: dict[tuple[str, str], _Actual] = {}
+    by_name: dict[tuple[str, str], str] = {}
+    by_folded: dict[tuple[str, str], str] = {}
+    net_names: dict[int, str] = {}
+    for net in project.nets():
+        pins = net.pins
+        names = set(net.names)
+        net_id = pins[0].id if pins else -1
+        net_names[net_id] = net.name
+        for pin in pins:
+            actual[(pin.ref, pin.number)] = _Actual(pin, net_id, names, len(pins) > 1 or bool(names))
+            by_name.setdefault((pin.ref, pin.name), pin.number)
+            by_folded.setdefault((pin.ref, pin.name.casefold()), pin.number)
+
+    def resolve(ref: str, key: str) -> Optional[str]:
+        number = by_name.get((ref, key))
+        if number is None and (ref, key) in actual:
+            number = key
+        return number or by_folded.get((ref, key.casefold()))
+
+    # 의도 넷별로 핀을 조인 (포트로 나간 넷은 시트 구분 없이 ("", 넷))
+    ports = {(sheet.name, port.name) for sheet in config.sheets for port in sheet.ports}
+    intents: dict[tuple[str, str], list[tuple]] = {}  # (시트, 넷) → [(ref, 핀 키, _Actual)]
+    expected_pins: set[tuple[str, str]] = set()
+    config_refs = set(table.part_nets)
+    for ref, part_nets in table.part_nets.items():
+        if ref not in project.components:
+            if part_nets:
+                issue(NetIssue("missing", ref, "", message="회로도에 부품 없음"))
+            continue
+        for pin_key, net_id in part_nets:
+            result.checked += 1
+            net_name = table.name(net_id)
+            number = resolve(ref, pin_key)
+            if number is None:
+                issue(NetIssue("missing", ref, pin_key, net_name, message="회로도 심볼에 핀 없음"))
+                continue
+            expected_pins.add((ref, number))
+            found = actual[(ref, number)]
+            if not found.connected:
+                issue(NetIssue("missing", ref, pin_key, net_name, message="핀이 연결되지 않음"))
+                continue
+            if found.names and net_name not in found.names:
+                issue(NetIssue(
+                    "misassigned", ref, pin_key, net_name, net_names[found.net],
+                    message=f"다른 넷에 연결됨 ({', '.join(sorted(found.names))})",
+                ))
+                continue
+            sheet = table.sheet_of(ref)
+            key = ("", net_name) if (sheet, net_name) in ports else (sheet, net_name)
+            intents.setdefault(key, []).append((ref, pin_key, found))
+
+    # 갈라진 넷 / 합쳐진 넷: 의도 넷마다 가장 많은 핀이 있는 실제 넷을 대표로
+    owners: dict[int, tuple[str, str]] = {}
+    for key, pins in intents.items():
+        main, _ = Counter(found.net for _, _, found in pins).most_common(1)[0]
+        owner = owners.setdefault(main, key)
+        for ref, pin_key, found in pins:
+            if found.net != main:
+                issue(NetIssue(
+                    "misassigned", ref, pin_key, key[1], net_names[found.net],
+                    message=f"같은 넷의 다른 핀과 연결되지 않음 ({net_names[main]}과 분리)",
+                ))
+            elif owner != key:
+                issue(NetIssue(
+                    "misassigned", ref, pin_key, key[1], net_names[found.net],
+                    message=f"넷 {owner[1]}과 합쳐짐",
+                ))
+            else:
+                result.matched += 1
+
+    # 설정에 없는 연결
+    for (ref, number), found in actual.items():
+        if ref in config_refs and (ref, number) not in expected_pins and found.connected:
+            issue(NetIssue(
+                "extra", ref, number, actual=net_names[found.net],
+                message=f"설정에 없는 연결 (핀 {found.pin.name})",
+            ))
+    for ref in project.components:
+        if ref not in config_refs:
+            issue(NetIssue("extra", ref, "", message="설정에 없는 부품"))
+
+    order = {kind: i for i, kind in enumerate(ISSUE_KINDS)}
+    result.issues.sort(key=lambda i: order[i.kind])
+    result.seconds = time.perf_counter() - started
+    return result
+
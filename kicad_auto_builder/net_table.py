@@ -0,0 +1,140 @@
+"""
+Net Table - 빌드 전체가 공유하는 넷 테이블 v1.0
+
+넷 이름은 PartSpec / ResolvedPart마다 nets 사전의 문자열로만 있어서 단계마다 따로 묶었습니다
+(build_schematic의 label_points, validate_nets의 부품별 루프, _build_sub_sheet의 포트 처리,
+ForcePlacer의 부품-넷 그래프). NetTable은 리졸브 직후 한 번 만들어 모든 단계가 함께 씁니다.
+
+- 넷 이름 인터닝: 이름 → 정수 id (설정에 처음 나온 순서), id → 이름
+- 넷별 핀 목록 [(ref, 핀 키, 시트)] / 부품별 [(핀 키, 넷 id)] (설정 순서 유지)
+- 시트별 넷 id 목록, 두 시트 이상에 나오는 넷 표시 (crossing - 포트가 필요한 넷)
+
+테이블은 변경하지 않으므로 병렬 작업자(스레드 / 프로세스)에 그대로 넘길 수 있습니다.
+
+Usage:
+    table = NetTable.build(resolved_parts, sheet_of=config_sheet_map(config))
+    for net_id in table.sheet_nets("Power"):
+        print(table.name(net_id), table.pins(net_id), table.crossing(net_id))
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+# 단일 시트 모드의 시트 이름
+ROOT = ""
+
+
+@dataclass(frozen=True)
+class NetPin:
+    """넷에 연결된 부품 핀 (설정 기준)."""
+    ref: str
+    pin: str    # 설정의 핀 키 (이름 또는 번호)
+    sheet: str = ROOT
+
+
+@dataclass
+class NetTable:
+    """인터닝된 넷 테이블."""
+    names: list[str] = field(default_factory=list)             # id → 넷 이름
+    ids: dict[str, int] = field(default_factory=dict)          # 넷 이름 → id
+    net_pins: list[list[NetPin]] = field(default_factory=list)  # id → 핀
+    part_nets: dict[str, list[tuple[str, int]]] = field(default_factory=dict)  # ref → [(핀 키, id)]
+    part_sheets: dict[str, str] = field(default_factory=dict)  # ref → 시트
+    sheets: dict[str, list[int]] = field(default_factory=dict)  # 시트 → 넷 id (처음 나온 순서)
+    net_sheets: list[list[str]] = field(default_factory=list)   # id → 시트
+
+    @classmethod
+    def build(cls, parts: Iterable, sheet_of: Optional[dict[str, str]] = None) -> "NetTable":
+        """부품 목록(PartSpec 또는 ResolvedPart)의 nets로 테이블을 만듭니다.
+
+        Args:
+            parts: .ref / .nets가 있는 부품들 (이 순서가 id 순서)
+            sheet_of: Reference → 시트 이름 (없으면 모두 단일 시트)
+        """
+        table = cls()
+        sheet_of = sheet_of or {}
+        for part in parts:
+            sheet = sheet_of.get(part.ref, ROOT)
+            table.part_sheets[part.ref] = sheet
+            entries = table.part_nets.setdefault(part.ref, [])
+            for pin_key, net_name in part.nets.items():
+                pin_key = str(pin_key)
+                net_id = table.intern(str(net_name))
+                entries.append((pin_key, net_id))
+                table.net_pins[net_id].append(NetPin(part.ref, pin_key, sheet))
+                sheets = table.net_sheets[net_id]
+                if sheet not in sheets:
+                    sheets.append(sheet)
+                    table.sheets.setdefault(sheet, []).append(net_id)
+        return table
+
+    @classmethod
+    def from_config(cls, config, parts: Optional[Iterable] = None) -> "NetTable":
+        """설정의 시트 구성으로 테이블을 만듭니다.
+
+        Args:
+            config: ProjectConfig
+            parts: 리졸브된 부품 (없으면 config.all_parts의 PartSpec)
+        """
+        return cls.build(config.all_parts if parts is None else parts, sheet_of=config_sheet_map(config))
+
+    def intern(self, name: str) -> int:
+        """넷 이름의 id (처음 보는 이름이면 새 id)."""
+        net_id = self.ids.get(name)
+        if net_id is None:
+            net_id = len(self.names)
+            name = sys.intern(name)
+            self.names.append(name)
+            self.ids[name] = net_id
+            self.net_pins.append([])
+            self.net_sheets.append([])
+        return net_id
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def name(self, net_id: int) -> str:
+        return self.names[net_id]
+
+    def pins(self, net_id: int) -> list[NetPin]:
+        """넷의 핀 (설정 순서)."""
+        return self.net_pins[net_id]
+
+    def nets_of(self, ref: str) -> list[tuple[str, int]]:
+        """부품의 [(핀 키, 넷 id)] (설정 순서)."""
+        return self.part_nets.get(ref, [])
+
+    def sheet_of(self, ref: str) -> str:
+        """부품이 있는 시트."""
+        return self.part_sheets.get(ref, ROOT)
+
+    def sheet_nets(self, sheet: str = ROOT) -> list[int]:
+        """시트에서 쓰는 넷 id."""
+        return self.sheets.get(sheet, [])
+
+    def crossing(self, net_id: int) -> bool:
+        """두 시트 이상에 걸친 넷인지."""
+        return len(self.net_sheets[net_id]) > 1
+
+    def crossing_nets(self, sheet: Optional[str] = None) -> list[int]:
+        """여러 시트에 걸친 넷 id (sheet를 주면 그 시트의 것만)."""
+        ids = self.sheet_nets(sheet) if sheet is not None else range(len(self.names))
+        return [net_id for net_id in ids if self.crossing(net_id)]
+
+    def to_dict(self) -> dict:
+        """리포트용 요약."""
+        return {
+            "nets": len(self.names),
+            "pins": sum(len(p) for p in self.net_pins),
+            "crossing": [self.names[i] for i in self.crossing_nets()],
+        }
+
+
+def config_sheet_map(config) -> dict[str, str]:
+    """Reference → 시트 이름 (단일 시트 모드는 빈 사전)."""
+    return {part.ref: sheet.name for sheet in config.sheets for part in sheet.parts}
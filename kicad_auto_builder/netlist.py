@@ -0,0 +1,242 @@
+"""
+Netlist - 회로도 넷리스트 내보내기 v1.0
+
+eeschema를 열지 않고 생성된 / 손으로 편집한 회로도에서 넷리스트를 만듭니다.
+connectivity.Project가 루트 시트와 모든 하위 시트를 한 번씩 읽어 계층 핀 / 글로벌 라벨 /
+전원 심볼까지 묶은 넷을 그대로 사용합니다.
+
+- to_kicad(): KiCad 넷리스트 (.net, export version "E") - Pcbnew "Update PCB from netlist"용
+- to_dict() / save(".json"): 정수 넷 id를 쓰는 간단한 JSON
+  BOM / PCB 배치 / 자체 검사 등 후속 단계는 회로도를 다시 파싱하지 않고 Netlist.load()로 읽음
+
+JSON 형식:
+    {"version": 1, "source": "...",
+     "components": [{"ref": "R1", "value": "10k", "footprint": "...", ...}],
+     "nets": [{"id": 1, "name": "GND", "nodes": [[0, "2", "passive"], ...]}]}
+    nodes의 첫 값은 components 인덱스
+
+Usage:
+    netlist = Netlist.from_project(Project.load("fcBoard.kicad_sch"))
+    netlist.save("out/fcBoard.net")
+    netlist.save("out/fcBoard.json")
+
+    netlist = Netlist.load("out/fcBoard.json")
+    print(netlist.net_of("U1", "3"))  # → 넷 id
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+from . import __version__
+from .connectivity import Component, Project
+from .sch_writer import write_text
+from .sexpr import escape
+
+JSON_VERSION = 1
+
+
+@dataclass
+class NetNode:
+    """넷에 연결된 부품 핀."""
+    ref: str
+    pin: str
+    type: str = "passive"
+    function: str = ""  # 핀 이름 (없거나 "~"이면 빈 문자열)
+
+
+@dataclass
+class NetlistNet:
+    """넷 (id는 1부터, 이름 순)."""
+    id: int
+    name: str
+    nodes: list[NetNode] = field(default_factory=list)
+
+
+@dataclass
+class Netlist:
+    """넷리스트."""
+    source: str = ""
+    components: list[Component] = field(default_factory=list)
+    nets: list[NetlistNet] = field(default_factory=list)
+    sheets: list[tuple[str, str]] = field(default_factory=list)  # (이름 경로, uuid 경로)
+    _pins: Optional[dict] = field(default=None, repr=False)
+
+    @classmethod
+    def from_project(cls, project: Project, source: Union[str, Path] = "") -> "Netlist":
+        """연결성 결과에서 넷리스트를 만듭니다.
+
+        부품 핀이 하나도 없는 넷(라벨 / 전원 심볼만)은 제외하고, 라벨 없이 핀 하나만 있는 넷은
+        KiCad처럼 "unconnected-(REF-PadN)"으로 이름 붙입니다.
+        """
+        netlist = cls(source=str(source))
+        netlist.components = sorted(project.components.values(), key=lambda c: _natural_key(c.ref))
+        netlist.sheets = [(sheet.path, _sheet_tstamps(sheet.uuid_path)) for sheet in project.sheets]
+
+        nets = []
+        for net in project.nets():
+            pins = {}
+            for pin in net.pins:
+                if pin.ref in project.components:
+                    pins.setdefault((pin.ref, pin.number), pin)
+            if not pins:
+                continue
+            name = net.name
+            if len(pins) == 1 and not net.names and name.startswith("Net-("):
+                (ref, number), = pins
+                name = f"unconnected-({ref}-Pad{number})"
+            nodes = [
+                NetNode(ref, number, pin.type, "" if pin.name in ("", "~") else pin.name)
+                for (ref, number), pin in sorted(pins.items(), key=lambda kv: (_natural_key(kv[0][0]), _natural_key(kv[0][1])))
+            ]
+            nets.append((name, nodes))
+
+        nets.sort(key=lambda n: _natural_key(n[0]))
+        netlist.nets = [NetlistNet(i, name, nodes) for i, (name, nodes) in enumerate(nets, 1)]
+        return netlist
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def pin_nets(self) -> dict[str, dict[str, int]]:
+        """Reference → {핀 번호: 넷 id}."""
+        if self._pins is None:
+            self._pins = {}
+            for net in self.nets:
+                for node in net.nodes:
+                    self._pins.setdefault(node.ref, {})[node.pin] = net.id
+        return self._pins
+
+    def net_of(self, ref: str, pin: str) -> Optional[int]:
+        """핀이 연결된 넷 id (없으면 None)."""
+        return self.pin_nets().get(ref, {}).get(pin)
+
+    def net_names(self) -> dict[int, str]:
+        """넷 id → 이름."""
+        return {net.id: net.name for net in self.nets}
+
+    # =========================================================================
+    # 출력
+    # =========================================================================
+
+    def to_dict(self) -> dict:
+        """정수 넷 id JSON."""
+        index = {c.ref: i for i, c in enumerate(self.components)}
+        return {
+            "version": JSON_VERSION,
+            "source": self.source,
+            "tool": f"kicad_auto_builder {__version__}",
+            "sheets": [list(s) for s in self.sheets],
+            "components": [asdict(c) for c in self.components],
+            "nets": [
+                {
+                    "id": net.id,
+                    "name": net.name,
+                    "nodes": [[index[n.ref], n.pin, n.type] + ([n.function] if n.function else [])
+                              for n in net.nodes],
+                }
+                for net in self.nets
+            ],
+        }
+
+    def to_kicad(self) -> str:
+        """KiCad 넷리스트 (export version "E")."""
+        q = _quote
+        lines = ['(export (version "E")', "  (design"]
+        lines.append(f"    (source {q(self.source)})")
+        lines.append(f"    (date {q(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))})")
+        lines.append(f"    (tool {q(f'kicad_auto_builder {__version__}')})")
+        for number, (names, tstamps) in enumerate(self.sheets, 1):
+            lines.append(f"    (sheet (number {q(str(number))}) (name {q(names)}) (tstamps {q(tstamps)}))")
+        lines.append("  )")
+
+        tstamps = dict(self.sheets)
+        lines.append("  (components")
+        for c in self.components:
+            lib, _, part = c.lib_id.rpartition(":")
+            lines.append(f"    (comp (ref {q(c.ref)})")
+            lines.append(f"      (value {q(c.value)})")
+            if c.footprint:
+                lines.append(f"      (footprint {q(c.footprint)})")
+            lines.append(f"      (datasheet {q(c.datasheet or '~')})")
+            if c.description:
+                lines.append(f"      (description {q(c.description)})")
+            if c.fields:
+                fields = " ".join(f"(field (name {q(k)}) {q(v)})" for k, v in c.fields.items())
+                lines.append(f"      (fields {fields})")
+            lines.append(f"      (libsource (lib {q(lib)}) (part {q(part)}) (description {q(c.description)}))")
+            if c.dnp:
+                lines.append('      (property (name "dnp"))')
+            if not c.in_bom:
+                lines.append('      (property (name "exclude_from_bom"))')
+            if not c.on_board:
+                lines.append('      (property (name "exclude_from_board"))')
+            lines.append(f"      (sheetpath (names {q(c.sheet)}) (tstamps {q(tstamps.get(c.sheet, '/'))}))")
+            lines.append(f"      (tstamps {' '.join(q(u) for u in c.uuids)}))")
+        lines.append("  )")
+        lines.append("  (libparts)")
+        lines.append("  (libraries)")
+
+        lines.append("  (nets")
+        for net in self.nets:
+            lines.append(f'    (net (code {q(str(net.id))}) (name {q(net.name)}) (class "Default")')
+            for n in net.nodes:
+                function = f" (pinfunction {q(n.function)})" if n.function else ""
+                lines.append(f"      (node (ref {q(n.ref)}) (pin {q(n.pin)}){function} (pintype {q(n.type)}))")
+            lines[-1] += ")"
+        lines.append("  )")
+        lines.append(")")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: Union[str, Path], skip_unchanged: bool = True) -> bool:
+        """확장자가 .json이면 JSON, 그 외에는 KiCad .net으로 저장합니다.
+
+        Returns:
+            파일을 실제로 다시 썼는지
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            text = json.dumps(self.to_dict(), indent=1, ensure_ascii=False)
+        else:
+            text = self.to_kicad()
+        return write_text(path, text, skip_unchanged)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Netlist":
+        """save()로 쓴 JSON 넷리스트를 읽습니다."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != JSON_VERSION:
+            raise ValueError(f"지원하지 않는 넷리스트 JSON 버전: {data.get('version')}")
+        components = [Component(**c) for c in data["components"]]
+        refs = [c.ref for c in components]
+        nets = [
+            NetlistNet(net["id"], net["name"], [NetNode(refs[n[0]], *n[1:]) for n in net["nodes"]])
+            for net in data["nets"]
+        ]
+        return cls(
+            source=data.get("source", ""),
+            components=components,
+            nets=nets,
+            sheets=[tuple(s) for s in data.get("sheets", [])],
+        )
+
+
+def _quote(text: str) -> str:
+    return f'"{escape(text)}"'
+
+
+def _sheet_tstamps(uuid_path: str) -> str:
+    """루트 uuid를 뺀 시트 uuid 경로 ("/<root>/<sheet>" → "/<sheet>/")."""
+    parts = [p for p in uuid_path.split("/") if p][1:]
+    return "/" + "".join(f"{p}/" for p in parts)
+
+
+def _natural_key(s: str):
+    """자연 정렬 키 (R1, R2, R10 순서)."""
+    return [int(c) if c.isdigit() else c.lower() for c in re.split(r"(\d+)", s)]
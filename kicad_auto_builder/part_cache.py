@@ -0,0 +1,310 @@
+"""
+Part Cache - SQLite 기반 부품 캐시 v1.1
+
+cache_dir/<LCSC>/meta.json + 낱개 파일 구조 대신 단일 SQLite 파일에
+메타데이터, 핀 테이블, 심볼/풋프린트 원본(blob)을 저장합니다.
+
+- get_many(): 여러 LCSC ID를 한 번의 쿼리로 조회
+- evict(): 마지막 사용 시각 기준 LRU 정리 (총 크기 / 경과 일수)
+- import_directory(): 기존 디렉토리 캐시를 가져오기 (마이그레이션)
+- put_failure() / get_failure(): 실패한 조회 기록 (네거티브 캐시)
+
+빌더는 심볼/풋프린트를 파일 경로로 다루므로, 조회된 부품의 원본만
+<db 이름>.files/<LCSC>/ 아래에 필요할 때 풀어 씁니다.
+
+v1.1: 읽기 전용 열기 (read_only=True) - DB를 만들지 않고, 사용 시각 갱신 / 저장을 생략
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "parts.sqlite"
+
+# SQLite 바인드 변수 제한(999)보다 작게 나눠 조회
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    lcsc           TEXT PRIMARY KEY,
+    meta           TEXT NOT NULL,
+    symbol_file    TEXT NOT NULL DEFAULT '',
+    symbol_blob    BLOB,
+    footprint_file TEXT NOT NULL DEFAULT '',
+    footprint_blob BLOB,
+    size           INTEGER NOT NULL DEFAULT 0,
+    created_at     REAL NOT NULL,
+    accessed_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parts_accessed ON parts (accessed_at);
+CREATE TABLE IF NOT EXISTS failures (
+    lcsc      TEXT PRIMARY KEY,
+    error     TEXT NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class CacheEntry:
+    """캐시 항목."""
+    lcsc: str
+    meta: dict = field(default_factory=dict)  # symbol_name, footprint_name, value, pins
+    symbol_file: str = ""
+    symbol_blob: Optional[bytes] = None
+    footprint_file: str = ""
+    footprint_blob: Optional[bytes] = None
+
+
+class SqlitePartCache:
+    """단일 파일 부품 캐시 (스레드 안전)."""
+
+    def __init__(self, db_path: Path, read_only: bool = False):
+        """초기화.
+
+        Args:
+            db_path: SQLite 파일 경로 (없으면 생성)
+            read_only: 기존 DB를 읽기 전용으로 열기 (없으면 sqlite3.OperationalError)
+        """
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self.files_dir = self.db_path.with_name(self.db_path.stem + ".files")
+
+        self._lock = threading.Lock()
+        if read_only:
+            self._conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                         check_same_thread=False)
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        # 여러 CI 러너가 같은 캐시를 공유하는 경우를 위한 WAL 모드
+        self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+
+    # =========================================================================
+    # 조회 / 저장
+    # =========================================================================
+
+    def get_many(self, lcsc_ids: Iterable[str]) -> dict[str, CacheEntry]:
+        """여러 부품을 한 번에 조회하고 마지막 사용 시각을 갱신합니다.
+
+        Returns:
+            {lcsc: CacheEntry} - 캐시에 없는 ID는 포함되지 않음
+        """
+        ids = list(dict.fromkeys(lcsc_ids))
+        found: dict[str, CacheEntry] = {}
+        now = time.time()
+
+        with self._lock:
+            for i in range(0, len(ids), _QUERY_CHUNK):
+                chunk = ids[i:i + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT lcsc, meta, symbol_file, symbol_blob, footprint_file, footprint_blob "
+                    f"FROM parts WHERE lcsc IN ({marks})",
+                    chunk,
+                ).fetchall()
+                for lcsc, meta, sym_file, sym_blob, fp_file, fp_blob in rows:
+                    found[lcsc] = CacheEntry(lcsc, json.loads(meta), sym_file, sym_blob, fp_file, fp_blob)
+
+            if found and not self.read_only:
+                self._conn.executemany(
+                    "UPDATE parts SET accessed_at = ? WHERE lcsc = ?",
+                    [(now, lcsc) for lcsc in found],
+                )
+                self._conn.commit()
+
+        return found
+
+    def get(self, lcsc_id: str) -> Optional[CacheEntry]:
+        """부품 하나를 조회합니다."""
+        return self.get_many([lcsc_id]).get(lcsc_id)
+
+    def put(self, entry: CacheEntry):
+        """부품을 저장합니다 (같은 LCSC ID는 교체, 읽기 전용이면 생략)."""
+        if self.read_only:
+            return
+        meta = json.dumps(entry.meta, ensure_ascii=False)
+        size = len(meta) + len(entry.symbol_blob or b"") + len(entry.footprint_blob or b"")
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parts "
+                "(lcsc, meta, symbol_file, symbol_blob, footprint_file, footprint_blob, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.lcsc, meta,
+                    entry.symbol_file, entry.symbol_blob,
+                    entry.footprint_file, entry.footprint_blob,
+                    size, now, now,
+                ),
+            )
+            self._conn.execute("DELETE FROM failures WHERE lcsc = ?", (entry.lcsc,))
+            self._conn.commit()
+
+    def put_failure(self, lcsc_id: str, error: str):
+        """조회 실패를 기록합니다 (읽기 전용이면 생략)."""
+        if self.read_only:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO failures (lcsc, error, failed_at) VALUES (?, ?, ?)",
+                (lcsc_id, error, time.time()),
+            )
+            self._conn.commit()
+
+    def get_failure(self, lcsc_id: str, ttl: float) -> Optional[tuple[str, float]]:
+        """ttl초 이내에 기록된 실패를 조회합니다.
+
+        Returns:
+            (오류 메시지, 실패 시각) 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT error, failed_at FROM failures WHERE lcsc = ? AND failed_at >= ?",
+                (lcsc_id, time.time() - ttl),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def materialize(self, entry: CacheEntry) -> tuple[Optional[Path], Optional[Path]]:
+        """심볼/풋프린트 원본을 파일로 풀어 경로를 반환합니다 (내용이 같으면 다시 쓰지 않음).
+
+        Returns:
+            (symbol_path, footprint_path)
+        """
+        target_dir = self.files_dir / entry.lcsc
+        paths = []
+        for name, blob in ((entry.symbol_file, entry.symbol_blob), (entry.footprint_file, entry.footprint_blob)):
+            if not name or blob is None:
+                paths.append(None)
+                continue
+            path = target_dir / name
+            if not path.exists() or path.stat().st_size != len(blob) or path.read_bytes() != blob:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(blob)
+            paths.append(path)
+        return paths[0], paths[1]
+
+    # =========================================================================
+    # 정리 / 마이그레이션
+    # =========================================================================
+
+    def evict(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        """오래 사용하지 않은 항목부터 삭제합니다 (LRU).
+
+        Args:
+            max_bytes: 남길 총 크기 상한
+            max_age_days: 마지막 사용 후 이 기간이 지난 항목 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        removed = []
+
+        with self._lock:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                removed += [r[0] for r in self._conn.execute(
+                    "SELECT lcsc FROM parts WHERE accessed_at < ?", (cutoff,)
+                )]
+                self._conn.execute("DELETE FROM parts WHERE accessed_at < ?", (cutoff,))
+                self._conn.execute("DELETE FROM failures WHERE failed_at < ?", (cutoff,))
+
+            if max_bytes is not None:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parts").fetchone()[0]
+                if total > max_bytes:
+                    victims = []
+                    for lcsc, size in self._conn.execute("SELECT lcsc, size FROM parts ORDER BY accessed_at"):
+                        if total <= max_bytes:
+                            break
+                        victims.append(lcsc)
+                        total -= size
+                    self._conn.executemany("DELETE FROM parts WHERE lcsc = ?", [(v,) for v in victims])
+                    removed += victims
+
+            self._conn.commit()
+            if removed:
+                self._conn.execute("VACUUM")
+
+        # 풀어 둔 파일도 정리
+        for lcsc in removed:
+            target_dir = self.files_dir / lcsc
+            if target_dir.is_dir():
+                for path in target_dir.iterdir():
+                    path.unlink()
+                target_dir.rmdir()
+
+        if removed:
+            logger.info(f"캐시 정리: {len(removed)}개 항목 삭제")
+        return len(removed)
+
+    def stats(self) -> dict:
+        """항목 수와 총 크기."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parts"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+    def import_directory(self, cache_dir: Path) -> int:
+        """기존 cache_dir/<LCSC>/meta.json 구조를 가져옵니다. 이미 있는 항목은 건너뜁니다.
+
+        Returns:
+            가져온 항목 수
+        """
+        cache_dir = Path(cache_dir)
+        if not cache_dir.is_dir():
+            return 0
+
+        meta_files = sorted(cache_dir.glob("*/meta.json"))
+        existing = self.get_many(f.parent.name for f in meta_files)
+        imported = 0
+
+        for meta_file in meta_files:
+            part_dir = meta_file.parent
+            if part_dir.name in existing:
+                continue
+            try:
+                with open(meta_file, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"마이그레이션 건너뜀 ({part_dir.name}): {e}")
+                continue
+
+            sym_files = sorted(part_dir.glob("*.kicad_sym"))
+            fp_files = sorted(part_dir.glob("*.kicad_mod"))
+            self.put(CacheEntry(
+                lcsc=meta.get("lcsc", part_dir.name),
+                meta={
+                    "symbol_name": meta.get("symbol_name", ""),
+                    "footprint_name": meta.get("footprint_name", ""),
+                    "value": meta.get("value", ""),
+                    "pins": meta.get("pins"),
+                },
+                symbol_file=sym_files[0].name if sym_files else "",
+                symbol_blob=sym_files[0].read_bytes() if sym_files else None,
+                footprint_file=fp_files[0].name if fp_files else "",
+                footprint_blob=fp_files[0].read_bytes() if fp_files else None,
+            ))
+            imported += 1
+
+        if imported:
+            logger.info(f"디렉토리 캐시 마이그레이션: {imported}개 항목 ({cache_dir})")
+        return imported
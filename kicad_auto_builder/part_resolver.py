@@ -1,20 +1,40 @@
 """
-Part Resolver - 부품 → 심볼/풋프린트 매핑 v1.1
+Part Resolver - 부품 → 심볼/풋프린트 매핑 v1.2
 
 easyeda2kicad를 통해 LCSC 부품의 심볼/풋프린트를 자동으로 가져옵니다.
 footprint_override 지원 추가.
+v1.2: resolve_all 병렬화 - LCSC ID 중복 제거 후 스레드 풀에서 조회,
+      easyeda2kicad 동시 실행 수 제한
+v1.3: 캐시 meta.json에 핀 테이블/파일 정보 저장 - 웜 리졸브는 stat만 확인
+v1.4: SQLite 캐시 백엔드 (기본) - resolve_all은 한 번의 쿼리로 캐시 조회,
+      기존 디렉토리 캐시는 처음 열 때 가져옴
+v1.5: 실패한 조회를 TTL 동안 기록 (네거티브 캐시),
+      연속 실패 시 easyeda2kicad 호출 차단 (서킷 브레이커)
+v1.6: 오프라인 모드 - 캐시와 내장 심볼만 사용하고 프로세스를 실행하지 않음
+      (--offline 또는 easyeda2kicad가 없을 때 자동)
+v1.7: 오프라인 모드는 SQLite 캐시를 만들지 않음 - 없으면 디렉토리 캐시만, 있으면 읽기 전용
+v1.8: 핀 목록은 공유 핀 카탈로그의 PinTable (같은 심볼을 쓰는 부품끼리 공유)
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
 from .config_loader import PartSpec
+from .part_cache import DB_FILENAME, CacheEntry, SqlitePartCache
+from .pin_catalog import CATALOG
+from .templates.symbol import BUILTIN_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +54,7 @@ class ResolvedPart:
     manufacturer: str = ""            # 제조사
     description: str = ""             # 설명
     nets: dict = field(default_factory=dict)  # 핀-넷 매핑
-    pins: list = field(default_factory=list)  # 핀 목록 [{name, number, type}]
+    pins: list = field(default_factory=list)  # 핀 목록 [{name, number, type}] (리졸브 후 공유 PinTable)
     # v1.3 BOM 고도화 필드
     mpn: str = ""                     # Manufacturer Part Number
     dnp: bool = False                 # Do Not Populate
@@ -67,6 +87,20 @@ class ResolvedPart:
         return ""
 
 
+# meta.json 형식 버전 (2: 핀 테이블 + 심볼 파일 stat/해시 포함)
+META_VERSION = 2
+
+# 캐시 백엔드: sqlite (cache_dir/parts.sqlite) / dir (cache_dir/<LCSC>/meta.json)
+CACHE_BACKENDS = ("sqlite", "dir")
+
+# 실패 기록 파일 (dir 백엔드: cache_dir/<LCSC>/failure.json)
+FAILURE_FILENAME = "failure.json"
+
+
+class CacheMiss(LookupError):
+    """오프라인 모드에서 캐시에 없는 LCSC 부품."""
+
+
 # 내부 역할 → 기본 심볼 매핑 테이블
 ROLE_MAPPING = {
     # 전원 IC
@@ -105,16 +139,82 @@ ROLE_MAPPING = {
 class PartResolver:
     """부품 리졸버 - LCSC/내부매핑으로 심볼/풋프린트 획득."""
 
-    def __init__(self, cache_dir: str = "cache", prefer_kicad_lib: bool = False):
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        prefer_kicad_lib: bool = False,
+        jobs: int = 8,
+        max_subprocesses: int = 4,
+        cache_backend: str = "sqlite",
+        negative_ttl: float = 6 * 3600,
+        breaker_threshold: int = 3,
+        offline: bool = False,
+    ):
         """초기화.
 
         Args:
             cache_dir: easyeda2kicad 캐시 디렉토리
             prefer_kicad_lib: KiCad 기본 라이브러리 우선 사용 여부
+            jobs: resolve_all에서 동시에 조회할 고유 LCSC ID 수
+            max_subprocesses: 동시에 실행할 easyeda2kicad 프로세스 최대 수
+            cache_backend: "sqlite" 또는 "dir"
+            negative_ttl: 실패한 조회를 다시 시도하지 않을 기간 (초, 0이면 기록 안 함)
+            breaker_threshold: 연속 실패가 이 횟수에 이르면 이후 easyeda2kicad 호출 중단 (0이면 사용 안 함)
+            offline: 캐시와 내장 심볼만 사용 (easyeda2kicad가 없으면 자동으로 켜짐)
+
+        Raises:
+            ValueError: 알 수 없는 cache_backend
         """
+        if cache_backend not in CACHE_BACKENDS:
+            raise ValueError(f"알 수 없는 캐시 백엔드: {cache_backend} (가능: {', '.join(CACHE_BACKENDS)})")
+
         self.cache_dir = Path(cache_dir)
         self.prefer_kicad_lib = prefer_kicad_lib
+        self.jobs = max(1, jobs)
+        self.cache_backend = cache_backend
+        self._store: Optional[SqlitePartCache] = None
         self._easyeda2kicad_available = None
+        self._subprocess_slots = threading.BoundedSemaphore(max(1, max_subprocesses))
+
+        # 네거티브 캐시 / 서킷 브레이커 상태 (prefetch 스레드 간 공유)
+        self.negative_ttl = max(0, negative_ttl)
+        self.breaker_threshold = max(0, breaker_threshold)
+        self._state_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._breaker_open = False
+        self.negative_hits: list[str] = []
+        self.failures: dict[str, str] = {}
+        self.breaker_skipped: list[str] = []
+
+        # 오프라인 모드에서 캐시에 없어 LCSC 조회를 건너뛴 부품
+        self.offline = offline
+        self.offline_skipped: list[dict] = []
+
+    @property
+    def offline_mode(self) -> bool:
+        """캐시 전용 모드 여부 (명시적 offline 또는 easyeda2kicad 없음)."""
+        return self.offline or not self.easyeda2kicad_available
+
+    @property
+    def store(self) -> Optional[SqlitePartCache]:
+        """SQLite 캐시 (dir 백엔드면 None). 새로 만들면 기존 디렉토리 캐시를 가져옵니다.
+
+        오프라인 모드에서는 DB가 없으면 None (디렉토리 캐시만 확인), 있으면 읽기 전용으로 엽니다.
+        """
+        if self.cache_backend != "sqlite":
+            return None
+        if self._store is None:
+            db_path = self.cache_dir / DB_FILENAME
+            if self.offline_mode:
+                if not db_path.exists():
+                    return None
+                self._store = SqlitePartCache(db_path, read_only=True)
+                return self._store
+            created = not db_path.exists()
+            self._store = SqlitePartCache(db_path)
+            if created:
+                self._store.import_directory(self.cache_dir)
+        return self._store
 
     @property
     def easyeda2kicad_available(self) -> bool:
@@ -123,11 +223,12 @@ class PartResolver:
             self._easyeda2kicad_available = shutil.which("easyeda2kicad") is not None
         return self._easyeda2kicad_available
 
-    def resolve(self, part: PartSpec) -> ResolvedPart:
+    def resolve(self, part: PartSpec, prefetched: Optional[dict] = None) -> ResolvedPart:
         """부품 명세를 리졸브합니다.
 
         Args:
             part: 부품 명세
+            prefetched: resolve_all이 미리 조회한 {lcsc: ResolvedPart 또는 예외}
 
         Returns:
             리졸브된 부품 정보
@@ -144,11 +245,18 @@ class PartResolver:
             lcsc=part.lcsc or "",
         )
 
-        # 1순위: LCSC ID가 있으면 easyeda2kicad 시도
-        if part.lcsc and self.easyeda2kicad_available:
+        # 1순위: LCSC ID가 있으면 캐시 / easyeda2kicad 시도 (오프라인이면 캐시만)
+        cache_miss = False
+        if part.lcsc:
             try:
-                self._resolve_from_lcsc(part.lcsc, resolved)
+                if prefetched is not None and part.lcsc in prefetched:
+                    self._apply_lcsc(prefetched[part.lcsc], resolved)
+                else:
+                    self._resolve_from_lcsc(part.lcsc, resolved)
                 logger.info(f"  → LCSC에서 리졸브 성공: {resolved.symbol_name}")
+            except CacheMiss as e:
+                cache_miss = True
+                logger.info(f"  → {e}")
             except Exception as e:
                 logger.warning(f"  → LCSC 리졸브 실패: {e}")
                 # 실패해도 계속 진행 (내부 매핑으로 폴백)
@@ -168,6 +276,14 @@ class PartResolver:
                 resolved.value = part.role
             logger.warning(f"  → 매핑 없음, role을 심볼로 사용: {resolved.symbol_name}")
 
+        if cache_miss:
+            self.offline_skipped.append({
+                "ref": part.ref,
+                "lcsc": part.lcsc,
+                "fallback": resolved.symbol_name,
+                "builtin": resolved.symbol_name in BUILTIN_SYMBOLS,
+            })
+
         # Override 적용: LCSC/내부매핑 결과와 무관하게 part.value, part.footprint 우선
         if part.value:
             resolved.value = part.value
@@ -192,18 +308,23 @@ class PartResolver:
     def resolve_all(self, parts: list[PartSpec]) -> list[ResolvedPart]:
         """여러 부품을 리졸브합니다.
 
+        같은 LCSC ID를 쓰는 부품(예: 100nF 캡 수십 개)은 한 번만 조회하고,
+        고유 ID들은 스레드 풀에서 동시에 조회한 뒤 결과를 각 부품에 나눠 줍니다.
+
         Args:
             parts: 부품 명세 목록
 
         Returns:
-            리졸브된 부품 목록
+            리졸브된 부품 목록 (입력 순서 유지)
         """
         resolved = []
         errors = []
 
+        prefetched = self.prefetch_lcsc(parts)
+
         for part in parts:
             try:
-                r = self.resolve(part)
+                r = self.resolve(part, prefetched)
                 resolved.append(r)
             except ValueError as e:
                 errors.append(str(e))
@@ -213,8 +334,101 @@ class PartResolver:
 
         return resolved
 
+    def report(self) -> dict:
+        """manifest.json에 저장할 조회 실패 / 서킷 브레이커 정보."""
+        return {
+            "negative_cache": {
+                "ttl_seconds": self.negative_ttl,
+                "hits": sorted(self.negative_hits),
+                "recorded": dict(sorted(self.failures.items())),
+            },
+            "circuit_breaker": {
+                "threshold": self.breaker_threshold,
+                "open": self._breaker_open,
+                "consecutive_failures": self._consecutive_failures,
+                "skipped": sorted(self.breaker_skipped),
+            },
+            "offline": {
+                "enabled": self.offline_mode,
+                "skipped": self.offline_skipped,
+            },
+        }
+
+    def prefetch_lcsc(self, parts: list[PartSpec]) -> dict:
+        """부품들의 고유 LCSC ID를 병렬로 조회합니다.
+
+        Returns:
+            {lcsc: 조회 결과 ResolvedPart 또는 발생한 예외}
+        """
+        # 입력 순서를 유지한 중복 제거
+        lcsc_ids = list(dict.fromkeys(p.lcsc for p in parts if p.lcsc))
+        if not lcsc_ids:
+            return {}
+
+        if len(lcsc_ids) < len([p for p in parts if p.lcsc]):
+            logger.info(f"LCSC 조회: 고유 {len(lcsc_ids)}개 (중복 제거)")
+
+        results = {}
+        if self.store is not None:
+            # 캐시 히트는 한 번의 쿼리로 처리하고 나머지만 easyeda2kicad로 조회
+            for lcsc_id, entry in self.store.get_many(lcsc_ids).items():
+                template = ResolvedPart(ref="", role="", lcsc=lcsc_id)
+                self._load_from_store(entry, template)
+                results[lcsc_id] = template
+            if results:
+                logger.info(f"LCSC 캐시 히트: {len(results)}/{len(lcsc_ids)}")
+            lcsc_ids = [i for i in lcsc_ids if i not in results]
+            if not lcsc_ids:
+                return results
+
+        if self.offline_mode:
+            if self.store is not None:
+                results.update((lcsc_id, self._cache_miss(lcsc_id)) for lcsc_id in lcsc_ids)
+                return results
+            # dir 백엔드: 캐시 확인만 하므로 스레드 없이 처리
+            workers = 1
+        else:
+            workers = min(self.jobs, len(lcsc_ids))
+
+        def fetch(lcsc_id: str):
+            try:
+                return self._fetch_lcsc(lcsc_id)
+            except Exception as e:
+                return e
+
+        if workers <= 1:
+            results.update((lcsc_id, fetch(lcsc_id)) for lcsc_id in lcsc_ids)
+            return results
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results.update(zip(lcsc_ids, pool.map(fetch, lcsc_ids)))
+        return results
+
+    def _fetch_lcsc(self, lcsc_id: str) -> ResolvedPart:
+        """LCSC ID 하나를 조회해 부품 간에 공유할 결과를 만듭니다."""
+        template = ResolvedPart(ref="", role="", lcsc=lcsc_id)
+        self._resolve_from_lcsc(lcsc_id, template)
+        return template
+
+    @staticmethod
+    def _apply_lcsc(result, resolved: ResolvedPart):
+        """prefetch 결과를 부품에 적용합니다 (실패였다면 예외를 다시 발생)."""
+        if isinstance(result, Exception):
+            raise result
+        resolved.symbol_lib = result.symbol_lib
+        resolved.symbol_name = result.symbol_name
+        resolved.footprint_lib = result.footprint_lib
+        resolved.footprint_name = result.footprint_name
+        resolved.pins = result.pins  # 변경 불가 PinTable이므로 복사 없이 공유
+        if not resolved.value:
+            resolved.value = result.value
+
     def _resolve_from_lcsc(self, lcsc_id: str, resolved: ResolvedPart):
         """LCSC ID로 easyeda2kicad를 통해 심볼/풋프린트를 가져옵니다."""
+        if self.store is not None:
+            self._resolve_from_store(lcsc_id, resolved)
+            return
+
         # 캐시 확인
         cache_path = self.cache_dir / lcsc_id
         meta_file = cache_path / "meta.json"
@@ -225,41 +439,171 @@ class PartResolver:
             return
 
         # easyeda2kicad 호출
+        if self.offline_mode:
+            raise self._cache_miss(lcsc_id)
+        self._check_failure(lcsc_id)
         logger.info(f"  easyeda2kicad 호출: {lcsc_id}")
         cache_path.mkdir(parents=True, exist_ok=True)
 
-        try:
-            result = subprocess.run(
-                ["easyeda2kicad", "--lcsc_id", lcsc_id, "--output", str(cache_path)],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
+        self._run_easyeda2kicad(lcsc_id, cache_path)
 
-            if result.returncode != 0:
-                raise RuntimeError(f"easyeda2kicad 실패: {result.stderr}")
+        # 생성된 파일 파싱
+        self._parse_easyeda_output(cache_path, lcsc_id, resolved)
 
-            # 생성된 파일 파싱
-            self._parse_easyeda_output(cache_path, lcsc_id, resolved)
+        # 메타 정보 저장
+        self._write_meta(cache_path, lcsc_id, resolved)
+        (cache_path / FAILURE_FILENAME).unlink(missing_ok=True)
 
-            # 메타 정보 저장
-            meta = {
-                "lcsc": lcsc_id,
-                "symbol_name": resolved.symbol_name,
-                "footprint_name": resolved.footprint_name,
-                "value": resolved.value,
-            }
-            with open(meta_file, 'w') as f:
-                json.dump(meta, f)
+    def _run_easyeda2kicad(self, lcsc_id: str, output_dir: Path):
+        """easyeda2kicad를 실행합니다 (동시 실행 수 제한, 캐시 히트는 제한 없음).
 
-        except subprocess.TimeoutExpired:
-            raise RuntimeError(f"easyeda2kicad 타임아웃: {lcsc_id}")
+        실패하면 네거티브 캐시에 기록하고 서킷 브레이커 카운터를 올립니다.
+
+        Raises:
+            RuntimeError: 서킷 브레이커가 열려 있거나 easyeda2kicad 실패 / 타임아웃
+        """
+        with self._subprocess_slots:
+            # 대기 중에 브레이커가 열렸을 수 있으므로 슬롯을 얻은 뒤 확인
+            if self._breaker_open:
+                with self._state_lock:
+                    self.breaker_skipped.append(lcsc_id)
+                raise RuntimeError(f"서킷 브레이커 열림 - easyeda2kicad 호출 생략: {lcsc_id}")
+            try:
+                result = subprocess.run(
+                    ["easyeda2kicad", "--lcsc_id", lcsc_id, "--output", str(output_dir)],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+                error = None if result.returncode == 0 else f"easyeda2kicad 실패: {result.stderr.strip()}"
+            except subprocess.TimeoutExpired:
+                error = f"easyeda2kicad 타임아웃: {lcsc_id}"
+
+            with self._state_lock:
+                if error is None:
+                    self._consecutive_failures = 0
+                else:
+                    self._consecutive_failures += 1
+                    if self.breaker_threshold and self._consecutive_failures >= self.breaker_threshold \
+                            and not self._breaker_open:
+                        self._breaker_open = True
+                        logger.warning(
+                            f"easyeda2kicad 연속 {self._consecutive_failures}회 실패 - "
+                            f"이번 빌드에서는 더 이상 호출하지 않습니다"
+                        )
+
+        if error is not None:
+            self._record_failure(lcsc_id, error)
+            raise RuntimeError(error)
+
+    @staticmethod
+    def _cache_miss(lcsc_id: str) -> CacheMiss:
+        return CacheMiss(f"오프라인: 캐시에 없음, LCSC 조회 건너뜀 ({lcsc_id})")
+
+    def _check_failure(self, lcsc_id: str):
+        """TTL 이내에 실패한 기록이 있으면 easyeda2kicad를 호출하지 않습니다.
+
+        Raises:
+            RuntimeError: 실패 기록이 있을 때
+        """
+        if not self.negative_ttl:
+            return
+
+        failure = None
+        if self.store is not None:
+            failure = self.store.get_failure(lcsc_id, self.negative_ttl)
+        else:
+            failure_file = self.cache_dir / lcsc_id / FAILURE_FILENAME
+            try:
+                with open(failure_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if time.time() - data["failed_at"] <= self.negative_ttl:
+                    failure = (data["error"], data["failed_at"])
+            except (OSError, ValueError, KeyError):
+                pass
+
+        if failure is not None:
+            with self._state_lock:
+                self.negative_hits.append(lcsc_id)
+            raise RuntimeError(f"최근 실패 기록으로 조회 생략 ({failure[0]})")
+
+    def _record_failure(self, lcsc_id: str, error: str):
+        """실패한 조회를 기록합니다."""
+        with self._state_lock:
+            self.failures[lcsc_id] = error
+        if not self.negative_ttl:
+            return
+
+        if self.store is not None:
+            self.store.put_failure(lcsc_id, error)
+        else:
+            failure_dir = self.cache_dir / lcsc_id
+            failure_dir.mkdir(parents=True, exist_ok=True)
+            with open(failure_dir / FAILURE_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump({"lcsc": lcsc_id, "error": error, "failed_at": time.time()}, f, ensure_ascii=False)
+
+    def _resolve_from_store(self, lcsc_id: str, resolved: ResolvedPart):
+        """SQLite 캐시에서 조회하고, 없으면 임시 디렉토리에 받아 캐시에 저장합니다."""
+        entry = self.store.get(lcsc_id)
+        if entry is not None:
+            logger.debug(f"  캐시 사용: {lcsc_id}")
+            self._load_from_store(entry, resolved)
+            return
+
+        if self.offline_mode:
+            raise self._cache_miss(lcsc_id)
+        self._check_failure(lcsc_id)
+        logger.info(f"  easyeda2kicad 호출: {lcsc_id}")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix=f"{lcsc_id}-", dir=self.cache_dir) as tmp:
+            tmp_path = Path(tmp)
+            self._run_easyeda2kicad(lcsc_id, tmp_path)
+            self._parse_easyeda_output(tmp_path, lcsc_id, resolved)
+
+            entry = CacheEntry(
+                lcsc=lcsc_id,
+                meta={
+                    "symbol_name": resolved.symbol_name,
+                    "footprint_name": resolved.footprint_name,
+                    "value": resolved.value,
+                    "pins": resolved.pins,
+                },
+                symbol_file=resolved.symbol_lib.name if resolved.symbol_lib else "",
+                symbol_blob=resolved.symbol_lib.read_bytes() if resolved.symbol_lib else None,
+                footprint_file=resolved.footprint_lib.name if resolved.footprint_lib else "",
+                footprint_blob=resolved.footprint_lib.read_bytes() if resolved.footprint_lib else None,
+            )
+            self.store.put(entry)
+
+        # 임시 디렉토리는 삭제되므로 캐시 파일 경로로 교체
+        resolved.symbol_lib, resolved.footprint_lib = self.store.materialize(entry)
+
+    def _load_from_store(self, entry: CacheEntry, resolved: ResolvedPart):
+        """SQLite 캐시 항목을 부품에 적용합니다."""
+        meta = entry.meta
+        resolved.symbol_name = meta.get("symbol_name", "")
+        resolved.footprint_name = meta.get("footprint_name", "")
+        if not resolved.value:
+            resolved.value = meta.get("value", "")
+        resolved.symbol_lib, resolved.footprint_lib = self.store.materialize(entry)
+
+        pins = meta.get("pins")
+        if pins is None:
+            # 핀 테이블 없이 가져온 예전 항목: 한 번 파싱해 저장
+            pins = self._parse_symbol_pins(resolved.symbol_lib) if resolved.symbol_lib else []
+            meta["pins"] = pins
+            self.store.put(entry)
+        resolved.pins = CATALOG.intern(pins)
 
     def _load_from_cache(self, cache_path: Path, resolved: ResolvedPart):
-        """캐시에서 부품 정보를 로드합니다."""
+        """캐시에서 부품 정보를 로드합니다.
+
+        meta.json에 저장된 핀 테이블은 심볼 파일의 mtime/size가 같으면 그대로 사용하고,
+        파일이 바뀌었거나 이전 형식이면 다시 파싱해 meta.json을 갱신합니다.
+        """
         meta_file = cache_path / "meta.json"
 
-        with open(meta_file, 'r') as f:
+        with open(meta_file, 'r', encoding='utf-8') as f:
             meta = json.load(f)
 
         resolved.symbol_name = meta.get("symbol_name", "")
@@ -267,18 +611,69 @@ class PartResolver:
         if not resolved.value:
             resolved.value = meta.get("value", "")
 
-        # 심볼/풋프린트 파일 경로
-        sym_files = list(cache_path.glob("*.kicad_sym"))
-        if sym_files:
-            resolved.symbol_lib = sym_files[0]
+        # 빠른 경로: glob/파싱 없이 stat만 비교
+        if meta.get("meta_version") == META_VERSION:
+            sym_file = meta.get("symbol_file") or ""
+            fp_file = meta.get("footprint_file") or ""
+            resolved.symbol_lib = cache_path / sym_file if sym_file else None
+            resolved.footprint_lib = cache_path / fp_file if fp_file else None
 
-        fp_files = list(cache_path.glob("*.kicad_mod"))
-        if fp_files:
-            resolved.footprint_lib = fp_files[0]
+            if resolved.symbol_lib is None:
+                resolved.pins = []
+                return
+            if self._file_stat(resolved.symbol_lib) == meta.get("symbol_stat"):
+                resolved.pins = CATALOG.intern(meta.get("pins", []))
+                return
+
+        # 느린 경로: 파일 탐색 + 핀 파싱 후 meta.json 갱신
+        sym_files = sorted(cache_path.glob("*.kicad_sym"))
+        resolved.symbol_lib = sym_files[0] if sym_files else None
+
+        fp_files = sorted(cache_path.glob("*.kicad_mod"))
+        resolved.footprint_lib = fp_files[0] if fp_files else None
 
-        # 핀 정보 파싱
-        if resolved.symbol_lib:
-            resolved.pins = self._parse_symbol_pins(resolved.symbol_lib)
+        resolved.pins = CATALOG.intern(self._parse_symbol_pins(resolved.symbol_lib)) if resolved.symbol_lib else []
+
+        logger.debug(f"  캐시 메타 갱신: {meta_file}")
+        self._write_meta(cache_path, meta.get("lcsc", cache_path.name), resolved, value=meta.get("value", ""))
+
+    @staticmethod
+    def _file_stat(path: Path) -> Optional[dict]:
+        """캐시 유효성 비교용 파일 stat (없으면 None)."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    def _write_meta(
+        self,
+        cache_path: Path,
+        lcsc_id: str,
+        resolved: ResolvedPart,
+        value: Optional[str] = None,
+    ):
+        """리졸브 결과와 핀 테이블, 심볼 파일 정보를 meta.json에 저장합니다."""
+        sym_file = resolved.symbol_lib
+        meta = {
+            "meta_version": META_VERSION,
+            "lcsc": lcsc_id,
+            "symbol_name": resolved.symbol_name,
+            "footprint_name": resolved.footprint_name,
+            "value": resolved.value if value is None else value,
+            "symbol_file": sym_file.name if sym_file else "",
+            "footprint_file": resolved.footprint_lib.name if resolved.footprint_lib else "",
+            "symbol_stat": self._file_stat(sym_file) if sym_file else None,
+            "symbol_sha256": hashlib.sha256(sym_file.read_bytes()).hexdigest() if sym_file else "",
+            "pins": resolved.pins,
+        }
+
+        # 쓰는 도중 다른 프로세스가 읽어도 깨진 JSON을 보지 않도록 교체 방식으로 저장
+        meta_file = cache_path / "meta.json"
+        tmp_file = meta_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_file, meta_file)
 
     def _parse_easyeda_output(self, cache_path: Path, lcsc_id: str, resolved: ResolvedPart):
         """easyeda2kicad 출력 파일을 파싱합니다."""
@@ -288,7 +683,7 @@ class PartResolver:
             resolved.symbol_lib = sym_files[0]
             # 심볼 이름 추출
             resolved.symbol_name = self._extract_symbol_name(sym_files[0])
-            resolved.pins = self._parse_symbol_pins(sym_files[0])
+            resolved.pins = CATALOG.intern(self._parse_symbol_pins(sym_files[0]))
 
         # 풋프린트 파일 찾기
         fp_files = list(cache_path.glob("*.kicad_mod"))
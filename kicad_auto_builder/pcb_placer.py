@@ -0,0 +1,685 @@
+"""
+PCB Placer - 시뮬레이티드 어닐링 PCB 부품 배치 v1.1
+
+scripts/place_components.py의 get_placement_map()은 좌표를 손으로 적은 표라서 넷을 모르고,
+회로도가 바뀔 때마다 다시 고쳐야 했습니다. PcbPlacer는 .kicad_pcb의 footprint / 패드 넷 /
+코트야드를 읽어 HPWL(넷별 패드 경계 상자 반둘레 합)이 작은 배치를 계산합니다.
+
+1. 읽기: footprint 위치·회전, 패드 넷과 로컬 좌표, F/B.CrtYd 코트야드 경계 상자
+   (코트야드가 없으면 패드 경계 + 여유), Edge.Cuts 보드 외곽
+2. 시뮬레이티드 어닐링 (NumPy 벡터화): 이동 / 교환 / 90° 회전 후보마다
+   - 관련 넷 HPWL 변화를 CSR 인덱스 + reduceat로 한 번에 계산
+   - 같은 면 모든 부품과의 코트야드 겹침 면적, 보드 밖 면적 변화를 한 번에 계산
+   - 겹침 가중치는 온도가 내려갈수록 커져 겹침 없는 배치로 수렴
+3. 합법화: 그래도 남은 겹침은 주변 링 후보 중 겹침 없는 가장 짧은 HPWL 위치로 이동
+4. 고정 부품: (locked yes) footprint와 fixed로 지정한 Reference (보드 가장자리 커넥터 등)
+5. 쓰기: 바뀐 footprint의 (at)만 스플라이스 편집 - 회전하면 패드/텍스트 각도도 함께 갱신
+
+- 같은 seed면 항상 같은 배치
+- 팬아웃이 큰 넷(GND, 전원 등)은 비용에서 제외 (플레인으로 연결)
+- 서로 다른 면(F.Cu / B.Cu)의 코트야드는 겹침으로 보지 않음
+
+NumPy가 없으면 배치하지 않고 현재 위치의 리포트만 반환합니다.
+
+v1.1: load_footprints(pin_nets=) - 넷리스트(JSON)의 핀 넷으로 패드 넷 채우기
+      (아직 넷리스트로 갱신하지 않은 PCB)
+
+Usage:
+    doc = PcbDocument.load("fcBoard.kicad_pcb")
+    footprints = load_footprints(doc)
+    result = PcbPlacer(seed=0).place(footprints, board_outline(doc), fixed={"J16"})
+    apply_placement(doc, footprints, result)
+    doc.save()
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # 배치 엔진은 NumPy 필요 - 없으면 리포트만
+    np = None
+
+from .document import PcbDocument
+from .sexpr import SNode
+
+logger = logging.getLogger(__name__)
+
+# 코트야드가 없는 footprint의 패드 경계 여유 (mm, IPC-7351 nominal)
+COURTYARD_MARGIN = 0.25
+
+# 어닐링 스케줄: 온도 단계마다 (이동 가능 부품 수 × MOVES_PER_PART)번 시도
+MOVES_PER_PART = 10
+COOLING = 0.88
+FINAL_TEMPERATURE = 1e-4  # 초기 온도 대비
+
+# 겹침/보드 밖 면적 가중치 (mm / mm²): 시작 → 끝으로 기하급수 증가
+OVERLAP_WEIGHT = (1.0, 1000.0)
+
+# 이동 후보 비율: 교환 / 회전 (나머지는 변위)
+SWAP_RATE = 0.2
+ROTATE_RATE = 0.1
+
+# VPR식 목표 채택률 - 변위 창 크기를 채택률에 맞춰 조절
+TARGET_ACCEPT = 0.44
+
+Box = tuple[float, float, float, float]  # (x0, y0, x1, y1)
+
+
+@dataclass
+class FootprintInfo:
+    """배치에 필요한 footprint 정보 (좌표는 footprint 로컬 기준)."""
+    ref: str
+    x: float
+    y: float
+    angle: float
+    layer: str = "F.Cu"
+    pads: list[tuple[float, float, str]] = field(default_factory=list)  # (x, y, net)
+    courtyard: Box = (0.0, 0.0, 0.0, 0.0)
+    locked: bool = False
+    node: Optional[SNode] = field(default=None, repr=False)
+
+    def box(self, x: float, y: float, angle: float) -> Box:
+        """(x, y, angle)에 놓았을 때 코트야드의 절대 경계 상자."""
+        x0, y0, x1, y1 = self.courtyard
+        corners = [_rotate(cx, cy, angle) for cx in (x0, x1) for cy in (y0, y1)]
+        xs = [x + cx for cx, _ in corners]
+        ys = [y + cy for _, cy in corners]
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+@dataclass
+class PcbPlacementResult:
+    """배치 결과."""
+    positions: dict[str, tuple[float, float, float]] = field(default_factory=dict)  # ref → (x, y, angle)
+    nets: int = 0
+    movable: int = 0
+    hpwl_before: float = 0.0
+    hpwl: float = 0.0
+    overlap_before: float = 0.0   # 코트야드 겹침 면적 합 (mm²)
+    overlap: float = 0.0
+    outside: float = 0.0          # 보드 밖으로 나간 코트야드 면적 (mm²)
+    overlaps: list[tuple[str, str, float]] = field(default_factory=list)  # 남은 겹침 (ref, ref, mm²)
+    moves: int = 0
+    accepted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def improvement(self) -> float:
+        """배치 전 대비 HPWL 감소율 (%)."""
+        if self.hpwl_before <= 0:
+            return 0.0
+        return (self.hpwl_before - self.hpwl) / self.hpwl_before * 100
+
+    def to_dict(self) -> dict:
+        """리포트용 요약."""
+        return {
+            "footprints": len(self.positions),
+            "movable": self.movable,
+            "nets": self.nets,
+            "hpwl_before_mm": round(self.hpwl_before, 2),
+            "hpwl_mm": round(self.hpwl, 2),
+            "improvement_pct": round(self.improvement, 1),
+            "overlap_before_mm2": round(self.overlap_before, 2),
+            "overlap_mm2": round(self.overlap, 2),
+            "overlapping_pairs": len(self.overlaps),
+            "outside_mm2": round(self.outside, 2),
+            "moves": self.moves,
+            "accepted": self.accepted,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+# =============================================================================
+# 읽기
+# =============================================================================
+
+def load_footprints(doc: PcbDocument, pin_nets: Optional[dict[str, dict[str, object]]] = None) -> list[FootprintInfo]:
+    """PCB 문서의 footprint들을 읽습니다 (Reference가 있는 것만, 파일 순서).
+
+    Args:
+        doc: PcbDocument
+        pin_nets: Reference → {패드 번호: 넷} (Netlist.pin_nets()) - 넷이 없는 패드에만 사용
+
+    Returns:
+        FootprintInfo 목록
+    """
+    footprints = []
+    for ref, node in doc.footprints.items():
+        x, y, angle = node.at()
+        nets = (pin_nets or {}).get(ref, {})
+        pads = []
+        for pad in node.find_all("pad"):
+            px, py, _ = pad.at()
+            net = pad.find("net")
+            # KiCad 8: (net 3 "+5V") / KiCad 9: (net "+5V")
+            name = net.atoms[-1] if net is not None and net.atoms else ""
+            if not name and pad.value(0) in nets:
+                name = str(nets[pad.value(0)])
+            pads.append((px, py, name))
+
+        courtyard = _courtyard(node)
+        if courtyard is None:
+            courtyard = _pad_box(node)
+
+        footprints.append(FootprintInfo(
+            ref=ref,
+            x=x,
+            y=y,
+            angle=angle,
+            layer=node.get("layer", default="F.Cu"),
+            pads=pads,
+            courtyard=courtyard,
+            locked="locked" in node.atoms or node.get("locked") == "yes",
+            node=node,
+        ))
+    return footprints
+
+
+def board_outline(doc: PcbDocument) -> Optional[Box]:
+    """Edge.Cuts 그래픽의 경계 상자. 외곽선이 없으면 None."""
+    xs, ys = [], []
+    for node in doc.root.children:
+        if not node.name.startswith("gr_") or node.get("layer") != "Edge.Cuts":
+            continue
+        for x, y in _shape_points(node):
+            xs.append(x)
+            ys.append(y)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _shape_points(node: SNode) -> list[tuple[float, float]]:
+    """그래픽 노드의 좌표점들 (start/end/mid/center, pts의 xy)."""
+    points = []
+    for key in ("start", "end", "mid", "center"):
+        child = node.find(key)
+        if child is not None and len(child.atoms) >= 2:
+            points.append((float(child.atoms[0]), float(child.atoms[1])))
+    if node.name.endswith("circle") and len(points) >= 2:
+        # (center) + (end): 반지름만큼 상자로 확장
+        (cx, cy), (ex, ey) = points[-2], points[-1]
+        r = math.hypot(ex - cx, ey - cy)
+        points += [(cx - r, cy - r), (cx + r, cy + r)]
+    pts = node.find("pts")
+    if pts is not None:
+        for xy in pts.find_all("xy"):
+            points.append((float(xy.atoms[0]), float(xy.atoms[1])))
+    return points
+
+
+def _courtyard(node: SNode) -> Optional[Box]:
+    """F/B.CrtYd 그래픽의 로컬 경계 상자."""
+    xs, ys = [], []
+    for child in node.children:
+        if not child.name.startswith("fp_") or not (child.get("layer") or "").endswith(".CrtYd"):
+            continue
+        for x, y in _shape_points(child):
+            xs.append(x)
+            ys.append(y)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _pad_box(node: SNode) -> Box:
+    """코트야드가 없을 때: 패드 경계 + COURTYARD_MARGIN (패드도 없으면 1 mm 정사각형)."""
+    xs, ys = [], []
+    for pad in node.find_all("pad"):
+        px, py, pad_angle = pad.at()
+        size = pad.find("size")
+        w, h = (float(size.atoms[0]), float(size.atoms[1])) if size is not None else (0.0, 0.0)
+        if round(pad_angle - node.at()[2]) % 180 == 90:
+            w, h = h, w
+        xs += [px - w / 2, px + w / 2]
+        ys += [py - h / 2, py + h / 2]
+    if not xs:
+        return -0.5, -0.5, 0.5, 0.5
+    m = COURTYARD_MARGIN
+    return min(xs) - m, min(ys) - m, max(xs) + m, max(ys) + m
+
+
+def _rotate(x: float, y: float, angle: float) -> tuple[float, float]:
+    """KiCad 회전 (y축 아래, 반시계 방향 각도)."""
+    if not angle:
+        return x, y
+    rad = math.radians(angle)
+    c, s = math.cos(rad), math.sin(rad)
+    return x * c + y * s, -x * s + y * c
+
+
+def _normalize(angle: float) -> float:
+    """각도를 (-180, 180] 범위로 (KiCad 저장 형식)."""
+    angle = math.fmod(angle, 360.0)
+    if angle > 180:
+        angle -= 360
+    elif angle <= -180:
+        angle += 360
+    return round(angle, 6) + 0.0
+
+
+# =============================================================================
+# 배치
+# =============================================================================
+
+class PcbPlacer:
+    """시뮬레이티드 어닐링 PCB 배치기."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        moves_per_part: int = MOVES_PER_PART,
+        cooling: float = COOLING,
+        max_fanout: int = 0,
+        rotate: bool = True,
+        grid: float = 0.1,
+    ):
+        """초기화.
+
+        Args:
+            seed: 난수 시드 (같은 시드 → 같은 배치)
+            moves_per_part: 온도 단계마다 이동 가능 부품당 시도 횟수
+            cooling: 온도 감소율 (0~1)
+            max_fanout: 비용에 넣을 넷의 최대 footprint 수 (0이면 max(8, footprint 수 / 5))
+            rotate: 90° 회전 후보 사용
+            grid: 좌표 스냅 간격 (mm)
+        """
+        self.seed = seed
+        self.moves_per_part = moves_per_part
+        self.cooling = cooling
+        self.max_fanout = max_fanout
+        self.rotate = rotate
+        self.grid = grid
+
+    def place(
+        self,
+        footprints: list[FootprintInfo],
+        board: Optional[Box] = None,
+        fixed: Iterable[str] = (),
+    ) -> PcbPlacementResult:
+        """footprint들의 배치를 계산합니다 (문서는 바꾸지 않음).
+
+        Args:
+            footprints: load_footprints() 결과 (현재 위치가 시작 배치)
+            board: 보드 외곽 (x0, y0, x1, y1) - None이면 보드 밖 비용 없음
+            fixed: 움직이지 않을 Reference (locked footprint는 항상 고정)
+
+        Returns:
+            PcbPlacementResult
+        """
+        started = time.perf_counter()
+        fixed = set(fixed)
+        result = PcbPlacementResult(
+            positions={fp.ref: (fp.x, fp.y, fp.angle) for fp in footprints}
+        )
+        if not footprints:
+            return result
+        if np is None:
+            logger.warning("NumPy가 설치되어 있지 않아 PCB 배치를 건너뜁니다")
+            return result
+
+        state = _State(footprints, board, fixed, self.max_fanout, self.rotate, self.grid)
+        result.nets = len(state.net_ptr) - 1
+        result.movable = len(state.movable)
+        result.hpwl_before = state.hpwl()
+        result.overlap_before = state.total_overlap()
+
+        if len(state.movable):
+            rng = np.random.default_rng(self.seed)
+            state.scatter_outside(rng)
+            result.moves, result.accepted = self._anneal(state, rng)
+            state.legalize()
+
+        result.hpwl = state.hpwl()
+        result.overlap = state.total_overlap()
+        result.outside = float(state.outside_area(np.arange(state.n)).sum())
+        result.overlaps = state.overlapping_pairs()
+        result.positions = state.positions()
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _anneal(self, state: "_State", rng) -> tuple[int, int]:
+        """어닐링 본체. Returns: (시도 수, 채택 수)."""
+        movable = state.movable
+        per_step = max(1, self.moves_per_part * len(movable))
+        span = max(state.extent)
+        window = span
+
+        # 초기 온도: 무작위 후보 비용 증가량의 표준편차 (겹침 가중치는 시작값)
+        weight, weight_end = OVERLAP_WEIGHT
+        samples = []
+        for _ in range(min(per_step, 200)):
+            move = self._propose(state, rng, window)
+            if move is not None:
+                samples.append(state.delta(move, weight))
+        temperature = float(np.std(samples)) if samples else 0.0
+        if temperature <= 0:
+            temperature = 1.0
+        final = temperature * FINAL_TEMPERATURE
+        steps = max(1, math.ceil(math.log(FINAL_TEMPERATURE) / math.log(self.cooling)))
+        growth = (weight_end / weight) ** (1.0 / steps)
+
+        moves = accepted = 0
+        while temperature > final:
+            step_accepted = 0
+            randoms = rng.random(per_step)
+            for k in range(per_step):
+                move = self._propose(state, rng, window)
+                if move is None:
+                    continue
+                delta = state.delta(move, weight)
+                if delta <= 0 or randoms[k] < math.exp(-delta / temperature):
+                    state.commit(move)
+                    step_accepted += 1
+            moves += per_step
+            accepted += step_accepted
+
+            rate = step_accepted / per_step
+            window = min(span, max(self.grid * 10, window * (1 - TARGET_ACCEPT + rate)))
+            temperature *= self.cooling
+            weight *= growth
+
+        return moves, accepted
+
+    def _propose(self, state: "_State", rng, window: float) -> Optional["_Move"]:
+        """이동 후보: 변위 / 교환 / 회전."""
+        movable = state.movable
+        i = int(movable[rng.integers(len(movable))])
+        kind = rng.random()
+
+        if kind < SWAP_RATE and len(movable) > 1:
+            j = int(movable[rng.integers(len(movable))])
+            if i == j or state.side[i] != state.side[j]:
+                return None
+            parts = np.array([i, j])
+            pos = state.pos[[j, i]].copy()
+            return _Move(parts, pos, state.rot[parts].copy())
+
+        if kind < SWAP_RATE + ROTATE_RATE and state.rotate:
+            rot = (state.rot[i] + rng.integers(1, 4)) % 4
+            return _Move(np.array([i]), state.pos[[i]].copy(), np.array([rot]))
+
+        step = rng.uniform(-window, window, size=2)
+        pos = state.clamp(state.pos[i] + step)
+        if np.array_equal(pos, state.pos[i]):
+            return None
+        return _Move(np.array([i]), pos[None, :], state.rot[[i]].copy())
+
+
+@dataclass
+class _Move:
+    """후보 이동: parts의 새 위치/회전 인덱스."""
+    parts: "np.ndarray"
+    pos: "np.ndarray"
+    rot: "np.ndarray"
+
+
+class _State:
+    """어닐링 상태 - footprint 위치/회전, 패드 좌표, 코트야드 상자, 넷 HPWL 배열."""
+
+    def __init__(self, footprints, board, fixed, max_fanout, rotate, grid):
+        self.footprints = footprints
+        self.n = n = len(footprints)
+        self.board = board
+        self.rotate = rotate
+        self.grid = grid
+
+        self.pos = np.array([(fp.x, fp.y) for fp in footprints], dtype=float)
+        self.rot = np.zeros(n, dtype=int)  # 원래 각도 + rot × 90°
+        sides = {}
+        self.side = np.array([sides.setdefault(fp.layer, len(sides)) for fp in footprints])
+        self.same_side = np.array([self.side == k for k in range(len(sides))], dtype=float)
+        locked = np.array([fp.locked or fp.ref in fixed for fp in footprints])
+        self.movable = np.flatnonzero(~locked)
+
+        # 회전 4가지에 대한 코트야드 상자 / 패드 오프셋을 미리 계산
+        self.court = np.array([
+            [fp.box(0.0, 0.0, fp.angle + 90 * k) for fp in footprints] for k in range(4)
+        ])  # (4, n, 4)
+        pad_fp, offsets, pad_net = [], [[] for _ in range(4)], []
+        for i, fp in enumerate(footprints):
+            for px, py, net in fp.pads:
+                pad_fp.append(i)
+                pad_net.append(net)
+                for k in range(4):
+                    offsets[k].append(_rotate(px, py, fp.angle + 90 * k))
+        self.pad_fp = np.array(pad_fp, dtype=int)
+        self.pad_off = np.array(offsets, dtype=float).reshape(4, len(pad_fp), 2)
+        fp_pads = [[] for _ in range(n)]
+        for p, i in enumerate(pad_fp):
+            fp_pads[i].append(p)
+        self.fp_pads = [np.array(p, dtype=int) for p in fp_pads]
+
+        # 넷 CSR (footprint 2개 이상, 팬아웃 제한 이하)
+        max_fanout = max_fanout or max(8, n // 5)
+        members: dict[str, list[int]] = {}
+        for p, net in enumerate(pad_net):
+            if net:
+                members.setdefault(net, []).append(p)
+        nets = [
+            pads for pads in members.values()
+            if 2 <= len({pad_fp[p] for p in pads}) <= max_fanout
+        ]
+        self.net_flat = np.array([p for pads in nets for p in pads], dtype=int)
+        self.net_ptr = np.cumsum([0] + [len(pads) for pads in nets])
+        fp_nets = [set() for _ in range(n)]
+        for k, pads in enumerate(nets):
+            for p in pads:
+                fp_nets[pad_fp[p]].add(k)
+        self.fp_nets = [np.array(sorted(s), dtype=int) for s in fp_nets]
+
+        if board is not None:
+            self.extent = (board[2] - board[0], board[3] - board[1])
+            self.bounds = np.array(board, dtype=float)
+        else:
+            boxes = self.boxes(np.arange(n))
+            lo, hi = boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)
+            self.extent = tuple(np.maximum(hi - lo, 1.0))
+            self.bounds = None
+
+        self.box_arr = self.boxes(np.arange(n))
+        self.pad_xy = self.pos[self.pad_fp] + self.pad_off[self.rot[self.pad_fp], np.arange(len(pad_fp))]
+        self.net_len = self.net_lengths(np.arange(len(nets)), self.pad_xy)
+
+    # ---- 기본 계산 ---------------------------------------------------------
+
+    def boxes(self, parts, pos=None, rot=None):
+        """parts의 코트야드 절대 상자 (len, 4)."""
+        pos = self.pos[parts] if pos is None else pos
+        rot = self.rot[parts] if rot is None else rot
+        return self.court[rot, parts] + np.concatenate([pos, pos], axis=1)
+
+    def net_lengths(self, nets, pad_xy):
+        """nets의 HPWL 배열 (CSR 구간을 모아 reduceat 한 번)."""
+        if len(nets) == 0:
+            return np.zeros(0)
+        counts = self.net_ptr[nets + 1] - self.net_ptr[nets]
+        starts = np.cumsum(counts) - counts
+        idx = np.repeat(self.net_ptr[nets] - starts, counts) + np.arange(counts.sum())
+        pts = pad_xy[self.net_flat[idx]]
+        span = np.maximum.reduceat(pts, starts, axis=0) - np.minimum.reduceat(pts, starts, axis=0)
+        return span.sum(axis=1)
+
+    def hpwl(self) -> float:
+        return float(self.net_len.sum())
+
+    def overlap_with_others(self, parts, boxes):
+        """parts(새 상자 boxes)와 나머지 같은 면 부품들의 겹침 면적 합 + parts끼리의 겹침."""
+        total = 0.0
+        for k, i in enumerate(parts):
+            areas = _overlap_area(boxes[k], self.box_arr) * self.same_side[self.side[i]]
+            areas[parts] = 0.0
+            total += areas.sum()
+        for a in range(len(parts)):
+            for b in range(a + 1, len(parts)):
+                if self.side[parts[a]] == self.side[parts[b]]:
+                    total += _overlap_area(boxes[a], boxes[b][None, :]).sum()
+        return float(total)
+
+    def outside_area(self, parts, boxes=None):
+        """코트야드 중 보드 밖 면적 (parts별 배열)."""
+        boxes = self.boxes(parts) if boxes is None else boxes
+        if self.bounds is None:
+            return np.zeros(len(boxes))
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        return area - _overlap_area(self.bounds, boxes)
+
+    def total_overlap(self) -> float:
+        boxes = self.boxes(np.arange(self.n))
+        total = 0.0
+        for i in range(self.n - 1):
+            mask = self.side[i + 1:] == self.side[i]
+            total += _overlap_area(boxes[i], boxes[i + 1:][mask]).sum()
+        return float(total)
+
+    def overlapping_pairs(self) -> list[tuple[str, str, float]]:
+        boxes = self.boxes(np.arange(self.n))
+        pairs = []
+        for i in range(self.n - 1):
+            areas = _overlap_area(boxes[i], boxes[i + 1:])
+            for j in np.flatnonzero(areas > 1e-9):
+                j = i + 1 + int(j)
+                if self.side[i] == self.side[j]:
+                    pairs.append((self.footprints[i].ref, self.footprints[j].ref, round(float(areas[j - i - 1]), 3)))
+        return pairs
+
+    def clamp(self, xy):
+        """그리드 스냅 + 보드 안으로 (원점 기준)."""
+        xy = np.round(xy / self.grid) * self.grid
+        if self.bounds is not None:
+            xy = np.clip(xy, self.bounds[:2], self.bounds[2:])
+        return xy
+
+    # ---- 이동 ---------------------------------------------------------------
+
+    def _nets_of(self, parts):
+        if len(parts) == 1:
+            return self.fp_nets[parts[0]]
+        return np.unique(np.concatenate([self.fp_nets[i] for i in parts]))
+
+    def _moved_pads(self, move: _Move):
+        pads = [self.fp_pads[i] for i in move.parts]
+        xy = [move.pos[k] + self.pad_off[move.rot[k], p] for k, p in enumerate(pads)]
+        return np.concatenate(pads), np.concatenate(xy)
+
+    def delta(self, move: _Move, weight: float) -> float:
+        """후보 이동의 비용 변화량 (HPWL + weight × (겹침 + 보드 밖))."""
+        parts = move.parts
+        nets = self._nets_of(parts)
+        wire = 0.0
+        if len(nets):
+            pads, xy = self._moved_pads(move)
+            saved = self.pad_xy[pads].copy()
+            self.pad_xy[pads] = xy
+            wire = float(self.net_lengths(nets, self.pad_xy).sum() - self.net_len[nets].sum())
+            self.pad_xy[pads] = saved
+
+        old = self.boxes(parts)
+        new = self.boxes(parts, move.pos, move.rot)
+        area = (
+            self.overlap_with_others(parts, new) - self.overlap_with_others(parts, old)
+            + float(self.outside_area(parts, new).sum() - self.outside_area(parts, old).sum())
+        )
+        return wire + weight * area
+
+    def commit(self, move: _Move):
+        """이동을 적용합니다."""
+        self.pos[move.parts] = move.pos
+        self.rot[move.parts] = move.rot
+        self.box_arr[move.parts] = self.boxes(move.parts)
+        pads, xy = self._moved_pads(move)
+        self.pad_xy[pads] = xy
+        nets = self._nets_of(move.parts)
+        self.net_len[nets] = self.net_lengths(nets, self.pad_xy)
+
+    def scatter_outside(self, rng):
+        """중심이 보드 밖인 이동 가능 부품을 보드 안 무작위 위치로 (처음 배치되는 footprint)."""
+        if self.bounds is None:
+            return
+        lo, hi = self.bounds[:2], self.bounds[2:]
+        for i in self.movable:
+            if np.any(self.pos[i] < lo) or np.any(self.pos[i] > hi):
+                pos = self.clamp(rng.uniform(lo, hi))
+                self.commit(_Move(np.array([i]), pos[None, :], self.rot[[i]].copy()))
+
+    def legalize(self, max_rings: int = 200):
+        """남은 겹침/보드 밖 부품을 주변 링에서 겹침 없는 가장 짧은 HPWL 위치로 옮깁니다."""
+        step = max(self.grid, 0.5)
+        parts_all = np.arange(self.n)
+        for i in self.movable:
+            i = int(i)
+            box = self.boxes(np.array([i]))
+            if self.overlap_with_others([i], box) <= 0 and self.outside_area([i], box)[0] <= 0:
+                continue
+            for ring in range(1, max_rings + 1):
+                offsets = np.array([
+                    (dx, dy) for dx in range(-ring, ring + 1) for dy in range(-ring, ring + 1)
+                    if max(abs(dx), abs(dy)) == ring
+                ], dtype=float) * step
+                cands = self.clamp(self.pos[i] + offsets)
+                boxes = self.court[self.rot[i], i] + np.concatenate([cands, cands], axis=1)
+                mask = (parts_all != i) & (self.side == self.side[i])
+                rest = self.boxes(parts_all[mask])
+                free = np.array([_overlap_area(b, rest).sum() <= 0 for b in boxes])
+                if self.bounds is not None:
+                    free &= self.outside_area(np.full(len(boxes), i), boxes) <= 1e-9
+                if not free.any():
+                    continue
+                best, best_delta = None, math.inf
+                for pos in cands[free]:
+                    move = _Move(np.array([i]), pos[None, :], self.rot[[i]].copy())
+                    d = self.delta(move, 0.0)
+                    if d < best_delta:
+                        best, best_delta = move, d
+                self.commit(best)
+                break
+
+    def positions(self) -> dict[str, tuple[float, float, float]]:
+        out = {}
+        for i, fp in enumerate(self.footprints):
+            x, y = (round(float(v), 4) for v in self.pos[i])
+            out[fp.ref] = (x, y, _normalize(fp.angle + 90 * int(self.rot[i])))
+        return out
+
+
+def _overlap_area(box, boxes):
+    """box와 boxes(m, 4) 각각의 교차 면적 배열."""
+    w = np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0])
+    h = np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1])
+    return np.maximum(w, 0.0) * np.maximum(h, 0.0)
+
+
+# =============================================================================
+# 쓰기
+# =============================================================================
+
+def apply_placement(doc: PcbDocument, footprints: list[FootprintInfo], result: PcbPlacementResult) -> int:
+    """배치 결과를 문서에 스플라이스 편집으로 기록합니다 (저장은 호출자가).
+
+    회전이 바뀐 footprint는 패드 / property / fp_text의 각도도 같은 만큼 돌립니다
+    (KiCad는 이 각도들을 보드 기준 절대값으로 저장).
+
+    Returns:
+        위치가 바뀐 footprint 수
+    """
+    moved = 0
+    for fp in footprints:
+        x, y, angle = result.positions.get(fp.ref, (fp.x, fp.y, fp.angle))
+        turn = _normalize(angle - fp.angle)
+        if (x, y) == (fp.x, fp.y) and not turn:
+            continue
+        if fp.node is None or not doc.set_at(fp.node, x, y, angle):
+            logger.warning(f"{fp.ref}: footprint 위치를 바꿀 수 없습니다")
+            continue
+        if turn:
+            for child in fp.node.children:
+                if child.name in ("pad", "property", "fp_text") and child.find("at") is not None:
+                    cx, cy, child_angle = child.at()
+                    doc.set_at(child, cx, cy, _normalize(child_angle + turn))
+        fp.x, fp.y, fp.angle = x, y, angle
+        moved += 1
+    return moved
@@ -0,0 +1,170 @@
+"""
+Pin Catalog - 심볼 핀 테이블 공유 카탈로그 v1.0
+
+심볼마다 핀 테이블을 한 번만 만들고, 같은 심볼을 쓰는 모든 ResolvedPart가 공유합니다.
+핀 테이블은 변경 불가하며 이름 / 번호 / 대소문자 무시 이름 → 핀 사전을 미리 만들어 두므로
+match()는 핀 수와 무관하게 O(1)입니다.
+
+- builtin(name): 내장 심볼 텍스트를 심볼당 한 번만 파싱
+- intern(pins): 내용이 같은 핀 목록(캐시에서 읽은 LCSC 부품 등)을 하나의 테이블로 공유
+
+Usage:
+    from kicad_auto_builder.pin_catalog import CATALOG
+
+    table = CATALOG.builtin("LM2596S-5")
+    pin = table.match("VIN")
+"""
+
+import re
+import threading
+from typing import Iterable, Optional
+
+from .templates.symbol import BUILTIN_SYMBOLS
+
+# (pin TYPE STYLE (at ...) (length ...) (name "NAME" (effects...)) (number "NUM" (effects...)))
+# 중첩 괄호가 있으므로 name/number 값만 추출
+_PIN_RE = re.compile(
+    r'\(pin\s+(\w+)\s+\w+\s+'   # (pin TYPE STYLE
+    r'.*?'                       # 중간 내용 (at, length 등)
+    r'\(name\s+"([^"]*)"'        # (name "NAME" - 값만 추출
+    r'.*?'                       # effects 등
+    r'\(number\s+"([^"]*)"',     # (number "NUM" - 값만 추출
+    re.DOTALL
+)
+
+
+def parse_pins_from_symbol(symbol_text: str) -> list[dict]:
+    """심볼 텍스트에서 핀 정보를 파싱합니다.
+
+    Args:
+        symbol_text: KiCad 심볼 정의 텍스트
+
+    Returns:
+        [{"name": str, "number": str, "type": str}, ...]
+    """
+    return [
+        {"type": m.group(1), "name": m.group(2), "number": m.group(3)}
+        for m in _PIN_RE.finditer(symbol_text)
+    ]
+
+
+class Pin(dict):
+    """변경 불가 핀 정보 ({name, number, type}).
+
+    dict를 그대로 상속하므로 JSON 직렬화 / .get() 사용은 기존과 같습니다.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Pin은 변경할 수 없습니다 (dict(pin)으로 복사해 사용)")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self):
+        return hash((self.get("name"), self.get("number"), self.get("type")))
+
+    def __reduce__(self):
+        return (Pin, (dict(self),))
+
+
+class PinTable(tuple):
+    """변경 불가 핀 테이블 + 조회 사전.
+
+    tuple이므로 기존 핀 목록(list[dict])처럼 순회 / 슬라이스 / JSON 직렬화할 수 있습니다.
+
+    Attributes:
+        by_name: 핀 이름 → 핀 (같은 이름이면 먼저 나온 핀)
+        by_number: 핀 번호 → 핀
+        by_casefold: 대소문자 무시 핀 이름 → 핀
+    """
+
+    def __new__(cls, pins: Iterable[dict] = ()):
+        table = super().__new__(cls, (p if isinstance(p, Pin) else Pin(p) for p in pins))
+        table.by_name = {}
+        table.by_number = {}
+        table.by_casefold = {}
+        for pin in table:
+            name = pin.get("name", "")
+            table.by_name.setdefault(name, pin)
+            table.by_number.setdefault(pin.get("number"), pin)
+            table.by_casefold.setdefault(name.casefold(), pin)
+        return table
+
+    def __reduce__(self):
+        # 프로세스 풀로 넘길 때 사전은 다시 만듦
+        return (PinTable, (tuple(self),))
+
+    def match(self, pin_key) -> Optional[Pin]:
+        """핀 키와 매칭되는 핀.
+
+        매칭 규칙 (우선순위):
+        1. 핀 이름 일치
+        2. 핀 번호 일치
+        3. 대소문자 무시 핀 이름 일치
+
+        Args:
+            pin_key: YAML에서 지정한 핀 이름 (str 또는 int)
+
+        Returns:
+            매칭된 핀 또는 None
+        """
+        # YAML에서 숫자로 파싱될 수 있으므로 문자열 변환
+        pin_key = str(pin_key)
+        pin = self.by_name.get(pin_key)
+        if pin is None:
+            pin = self.by_number.get(pin_key)
+        if pin is None:
+            pin = self.by_casefold.get(pin_key.casefold())
+        return pin
+
+
+EMPTY_TABLE = PinTable()
+
+
+class PinCatalog:
+    """심볼 핀 테이블 저장소 (스레드 안전)."""
+
+    def __init__(self):
+        self._builtin: dict[str, PinTable] = {}
+        self._interned: dict[tuple, PinTable] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """서로 다른 핀 테이블 수."""
+        return len(self._interned)
+
+    def intern(self, pins: Iterable[dict]) -> PinTable:
+        """내용이 같은 핀 목록은 같은 PinTable을 반환합니다."""
+        if isinstance(pins, PinTable):
+            return pins
+        pins = list(pins)
+        if not pins:
+            return EMPTY_TABLE
+
+        key = self._content_key(pins)
+        table = self._interned.get(key)
+        if table is None:
+            with self._lock:
+                table = self._interned.setdefault(key, PinTable(pins))
+        return table
+
+    def builtin(self, symbol_name: str) -> Optional[PinTable]:
+        """내장 심볼의 핀 테이블 (내장 심볼이 아니면 None)."""
+        table = self._builtin.get(symbol_name)
+        if table is not None:
+            return table
+
+        text = BUILTIN_SYMBOLS.get(symbol_name)
+        if text is None:
+            return None
+        table = self.intern(parse_pins_from_symbol(text))
+        with self._lock:
+            return self._builtin.setdefault(symbol_name, table)
+
+    @staticmethod
+    def _content_key(pins: Iterable[dict]) -> tuple:
+        return tuple((p.get("name", ""), p.get("number", ""), p.get("type", "")) for p in pins)
+
+
+# 프로세스 전역 카탈로그
+CATALOG = PinCatalog()
@@ -0,0 +1,275 @@
+"""
+Schematic Writer - 스트리밍 .kicad_sch 출력기 v1.1
+
+회로도 전체를 f-string 하나로 만든 뒤 write_text로 쓰는 대신,
+헤더 / lib_symbols / 컴포넌트 / 와이어 / 라벨 섹션을 열린 파일 핸들에 차례로 씁니다.
+섹션은 문자열 목록(또는 제너레이터)으로 받으므로 파일 전체 크기의 중간 문자열을 만들지 않습니다.
+
+- atomic_write(): 같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체
+  (중간에 실패해도 기존 회로도는 그대로 남음)
+- canonical 모드: KiCad 8/9 저장 레이아웃(KICAD_FORMAT::Prettify)과 같은 형식으로 출력
+  (탭 들여쓰기, 리스트마다 한 줄, 하위 리스트가 있으면 닫는 괄호를 별도 줄에)
+  → KiCad에서 다시 저장해도 diff가 생기지 않음
+- skip_unchanged: 새 출력의 해시가 디스크의 파일과 같으면 교체하지 않음 (mtime 유지) (v1.1)
+
+Usage:
+    from kicad_auto_builder.sch_writer import atomic_write
+
+    with atomic_write(path, canonical=True) as writer:
+        writer.write(header)
+        writer.lib_symbols(symbol_blocks)
+        writer.section(components)
+        writer.write(")\n")
+"""
+
+import io
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO, Union
+
+from .build_cache import file_digest
+
+# 토큰: (앞 공백, "문자열" (이스케이프 포함, 닫히지 않은 문자열은 끝까지) | 괄호 | 아톰)
+_FORMAT_TOKEN_RE = re.compile(r'(\s*)("(?:[^"\\]|\\.)*"?|[()]|[^\s()"]+)', re.DOTALL)
+
+# KiCad Prettify 상수
+_INDENT = "\t"
+_XY_COLUMN_LIMIT = 99      # (xy ...) 목록은 이 열까지 한 줄에 이어 씀
+_TOKEN_WRAP_COLUMN = 72    # 한 리스트 안의 아톰이 이 열을 넘으면 줄바꿈
+
+Section = Union[str, Iterable[str]]
+
+
+class CanonicalFormatter:
+    """KiCad 저장 레이아웃 포매터 (스트리밍).
+
+    KiCad의 KICAD_FORMAT::Prettify와 같은 규칙을 토큰 단위로 적용합니다.
+    상태(괄호 깊이, 열 위치 등)를 유지하므로 노드 경계에서 잘린 조각을 순서대로 feed()하면
+    전체를 한 번에 변환한 것과 같은 결과가 나옵니다.
+    조각 앞뒤의 공백은 무시되므로 조각은 노드 경계에서 잘라야 합니다.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._column = 0
+        self._last = ""
+        self._started = False
+        self._in_xy = False
+        self._multi_line = False
+
+    def feed(self, chunk: str) -> str:
+        """조각을 변환합니다.
+
+        Args:
+            chunk: S-표현식 조각 (노드 경계에서 자른 것)
+
+        Returns:
+            변환된 텍스트
+        """
+        tokens = _FORMAT_TOKEN_RE.findall(chunk.strip())
+        out = []
+        append = out.append
+        depth = self._depth
+        column = self._column
+        last = self._last
+        in_xy = self._in_xy
+        multi_line = self._multi_line
+
+        for i, (space, tok) in enumerate(tokens):
+            if tok == "(":
+                is_xy = (
+                    i + 1 < len(tokens)
+                    and tokens[i + 1][1] == "xy"
+                    and i + 2 < len(tokens)
+                    and tokens[i + 2][0][:1] == " "
+                )
+                if not self._started:
+                    append("(")
+                    column += 1
+                    self._started = True
+                elif in_xy and is_xy and column < _XY_COLUMN_LIMIT:
+                    append(" (")
+                    column += 2
+                else:
+                    append("\n" + _INDENT * depth + "(")
+                    column = depth + 1
+                in_xy = is_xy
+                depth += 1
+                last = "("
+            elif tok == ")":
+                if depth > 0:
+                    depth -= 1
+                if last == ")" or multi_line:
+                    append("\n" + _INDENT * depth + ")")
+                    column = depth + 1
+                    multi_line = False
+                else:
+                    append(")")
+                    column += 1
+                last = ")"
+            else:
+                # 리스트 안 아톰 사이의 공백은 하나로 (여는 괄호 직후 공백은 제거)
+                if space and depth > 0 and last != "(":
+                    if in_xy or column < _TOKEN_WRAP_COLUMN:
+                        append(" ")
+                        column += 1
+                    else:
+                        append("\n" + _INDENT * depth)
+                        column = depth
+                        multi_line = True
+                append(tok)
+                column += len(tok)
+                last = tok[-1]
+
+        self._depth = depth
+        self._column = column
+        self._last = last
+        self._in_xy = in_xy
+        self._multi_line = multi_line
+        return "".join(out)
+
+    def finish(self) -> str:
+        """파일 끝 개행."""
+        return "\n"
+
+
+def format_canonical(text: str) -> str:
+    """S-표현식 텍스트 전체를 KiCad 저장 레이아웃으로 변환합니다."""
+    formatter = CanonicalFormatter()
+    return formatter.feed(text) + formatter.finish()
+
+
+class SchematicWriter:
+    """섹션 단위 회로도 출력기.
+
+    기본 모드는 기존 템플릿 출력과 바이트 단위로 같고,
+    canonical 모드는 모든 조각을 CanonicalFormatter로 변환해 씁니다.
+    """
+
+    def __init__(self, fp: TextIO, canonical: bool = False):
+        """초기화.
+
+        Args:
+            fp: 출력 텍스트 핸들
+            canonical: KiCad 저장 레이아웃으로 출력
+        """
+        self.fp = fp
+        self.canonical = canonical
+        self._formatter = CanonicalFormatter() if canonical else None
+        # atomic_write(skip_unchanged=True)에서 내용이 같아 파일을 교체하지 않았으면 False
+        self.changed = True
+
+    def write(self, text: str):
+        """노드 경계에서 자른 텍스트 조각을 씁니다."""
+        if self._formatter is None:
+            self.fp.write(text)
+        elif text.strip():
+            self.fp.write(self._formatter.feed(text))
+
+    def section(self, items: Section):
+        """항목들을 한 섹션으로 씁니다 ("\\n".join(items) + "\\n"과 같은 출력).
+
+        Args:
+            items: 노드 문자열 목록/제너레이터 (문자열 하나도 허용)
+        """
+        if isinstance(items, str):
+            items = (items,)
+
+        if self._formatter is not None:
+            for item in items:
+                self.write(item)
+            return
+
+        write = self.fp.write
+        first = True
+        for item in items:
+            if not first:
+                write("\n")
+            write(item)
+            first = False
+        write("\n")
+
+    def lib_symbols(self, symbols: Section):
+        """lib_symbols 섹션 (심볼 블록은 이미 들여쓰기된 상태)."""
+        self.write("\t(lib_symbols\n")
+        self.section(symbols)
+        self.write("\t)\n")
+
+    def close(self):
+        """canonical 모드의 파일 끝 개행을 씁니다."""
+        if self._formatter is not None:
+            self.fp.write(self._formatter.finish())
+            self._formatter = None
+
+
+def render(emit, canonical: bool = False) -> str:
+    """emit(writer)가 쓴 내용을 문자열로 반환합니다 (기존 create_* API 호환용)."""
+    buf = io.StringIO()
+    writer = SchematicWriter(buf, canonical)
+    emit(writer)
+    writer.close()
+    return buf.getvalue()
+
+
+@contextmanager
+def atomic_write(path: Path, canonical: bool = False, skip_unchanged: bool = False) -> Iterator[SchematicWriter]:
+    """같은 디렉토리의 임시 파일에 쓰고, 블록이 정상 종료되면 path로 교체합니다.
+
+    Args:
+        path: 최종 출력 경로
+        canonical: KiCad 저장 레이아웃으로 출력
+        skip_unchanged: 새 내용의 해시가 기존 파일과 같으면 교체하지 않음
+                        (결과는 블록 종료 후 writer.changed로 확인)
+
+    Yields:
+        SchematicWriter
+    """
+    path = Path(path)
+    # 병렬 빌드(스레드/프로세스)에서 임시 파일 이름이 겹치지 않도록
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            writer = SchematicWriter(f, canonical)
+            yield writer
+            writer.close()
+        if skip_unchanged and _same_content(tmp_path, path):
+            writer.changed = False
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_text(path: Path, text: str, skip_unchanged: bool = False) -> bool:
+    """텍스트 파일을 원자적으로 씁니다 (BOM, 리포트, 심볼 라이브러리 등).
+
+    Args:
+        path: 출력 경로
+        text: 파일 내용 (개행 변환 없이 그대로 씀)
+        skip_unchanged: 내용이 기존 파일과 같으면 교체하지 않음
+
+    Returns:
+        파일을 실제로 교체했으면 True
+    """
+    with atomic_write(path, skip_unchanged=skip_unchanged) as writer:
+        writer.write(text)
+    return writer.changed
+
+
+def _same_content(new_path: Path, old_path: Path) -> bool:
+    """크기가 같을 때만 SHA-256을 비교합니다."""
+    try:
+        if new_path.stat().st_size != old_path.stat().st_size:
+            return False
+    except OSError:
+        return False
+    return file_digest(new_path) == file_digest(old_path)
@@ -0,0 +1,143 @@
+"""
+Scheduler - 빌드 작업 DAG 스케줄러 v1.0
+
+의존성이 없는 작업(서브시트, BOM, 리포트 등)을 스레드/프로세스 풀에서 병렬 실행합니다.
+작업 결과는 작업 이름으로 모아 반환하므로, 완료 순서와 관계없이 호출 측에서는
+직렬 실행과 같은 순서로 결과를 사용할 수 있습니다.
+
+Usage:
+    graph = TaskGraph()
+    graph.add("sheet:Power", builder._build_sub_sheet, sheet, parts)
+    graph.add("bom_jlc", builder.build_bom)
+    graph.add("manifest", write_manifest, deps=["sheet:Power", "bom_jlc"], local=True)
+    results = graph.run(jobs=4)
+"""
+
+import logging
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("thread", "process")
+
+
+@dataclass
+class Task:
+    """DAG 노드."""
+    name: str
+    func: Callable
+    args: tuple = ()
+    deps: list = field(default_factory=list)
+    local: bool = False               # True면 풀 대신 호출 스레드에서 실행
+
+
+class TaskGraph:
+    """작업 의존성 그래프."""
+
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable,
+        *args: Any,
+        deps: Optional[list[str]] = None,
+        local: bool = False,
+    ) -> Task:
+        """작업을 추가합니다.
+
+        Args:
+            name: 작업 이름 (결과 키)
+            func: 실행 함수 (프로세스 풀이면 pickle 가능해야 함)
+            args: func 인자
+            deps: 먼저 끝나야 하는 작업 이름 목록
+            local: 호출 스레드에서 실행 (공유 상태를 갱신하는 작업용)
+
+        Raises:
+            ValueError: 이름 중복 또는 등록되지 않은 의존성
+        """
+        if name in self.tasks:
+            raise ValueError(f"작업 이름 중복: {name}")
+        deps = list(deps or [])
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"등록되지 않은 의존성: {name} -> {dep}")
+        task = Task(name, func, args, deps, local)
+        self.tasks[name] = task
+        return task
+
+    def run(self, jobs: int = 1, executor: str = "thread") -> dict[str, Any]:
+        """그래프를 실행합니다.
+
+        의존성은 add() 시점에 이미 등록된 작업만 허용되므로 등록 순서가 위상 정렬 순서입니다.
+        jobs <= 1이면 등록 순서대로 직렬 실행합니다.
+
+        Args:
+            jobs: 동시 실행 작업 수
+            executor: "thread" 또는 "process"
+
+        Returns:
+            {작업 이름: 반환값}
+
+        Raises:
+            작업에서 발생한 첫 번째 예외 (남은 작업은 취소)
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"알 수 없는 executor: {executor} (가능: {', '.join(EXECUTORS)})")
+
+        if jobs <= 1:
+            return {name: task.func(*task.args) for name, task in self.tasks.items()}
+
+        if executor == "process":
+            # multiprocessing은 import 비용이 커서 필요할 때만 로드
+            from concurrent.futures import ProcessPoolExecutor as pool_cls
+        else:
+            pool_cls = ThreadPoolExecutor
+        with pool_cls(max_workers=jobs) as pool:
+            return self._run_parallel(pool)
+
+    def _run_parallel(self, pool: Executor) -> dict[str, Any]:
+        results: dict[str, Any] = {}
+        remaining = dict(self.tasks)
+        running: dict[Future, str] = {}
+
+        try:
+            while remaining or running:
+                # 의존성이 모두 끝난 작업 제출 (등록 순서 유지)
+                for name in list(remaining):
+                    task = remaining[name]
+                    if any(dep not in results for dep in task.deps):
+                        continue
+                    del remaining[name]
+                    if task.local:
+                        results[name] = task.func(*task.args)
+                    else:
+                        running[pool.submit(task.func, *task.args)] = name
+
+                if not running:
+                    if remaining:
+                        # local 작업 완료로 새로 풀린 작업이 있을 수 있음
+                        continue
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    logger.debug(f"작업 완료: {name}")
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+        # 결과를 등록 순서로 정렬
+        return {name: results[name] for name in self.tasks}
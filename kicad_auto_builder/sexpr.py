@@ -0,0 +1,479 @@
+"""
+S-Expression Parser - KiCad S-표현식 스트리밍 파서 v1.1
+
+.kicad_sch / .kicad_sym / .kicad_pcb 파일을 단일 선형 패스로 토큰화/파싱합니다.
+모든 노드는 원본 버퍼 기준 오프셋(start, end)을 가지므로
+정규식 재검색 없이 원본 구간을 잘라내거나 치환할 수 있습니다.
+
+오프셋 기준:
+- str 입력: 문자 인덱스
+- bytes / bytearray / mmap 입력: 바이트 인덱스
+
+높이가 낮은 하위 트리 ((at ...), (effects (font (size ...))) 등)는 정규식 한 번으로
+통째로 매칭해 구간만 기록하고, 실제로 접근할 때 펼칩니다 (lazy).
+파일의 대부분을 차지하는 이런 노드를 파이썬 루프에서 토큰 단위로 다루지 않기 때문에
+전체 파싱 비용이 정규식 스캔 몇 번 수준으로 줄어듭니다.
+
+파일 전체를 parse()하면 최상위 항목은 들여쓰기 색인(scan_sections, loader와 공유)으로
+구간만 찾아 접힌 노드로 둡니다. 건드리지 않는 항목(lib_symbols 그래픽 등)은 끝까지
+정규식에 들어가지 않으며, 괄호 짝 오류는 그 항목을 펼칠 때 ValueError로 드러납니다.
+
+v1.1: 최상위 구간 색인으로 루트 파싱 (parse()만 약 5배, 도구 단계 전체는 레거시 정규식과 비슷 - 1.0~1.2배)
+
+Usage:
+    from kicad_auto_builder.sexpr import parse, iter_instance_symbols
+
+    root = parse(content)
+    for sym in iter_instance_symbols(root):
+        print(sym.property("Reference"), sym.start, sym.end)
+"""
+
+import re
+from typing import Iterator, Optional, Union
+
+# 토큰: ( | ) | "문자열" | 아톰
+_TOKEN_PATTERN = r'(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+)'
+_TOKEN_RE = re.compile(_TOKEN_PATTERN, re.DOTALL)
+_TOKEN_RE_BYTES = re.compile(_TOKEN_PATTERN.encode("ascii"), re.DOTALL)
+
+# 한 번에 매칭해 lazy 노드로 남길 하위 트리의 최대 높이
+COLLAPSE_HEIGHT = 4
+
+
+def _collapse_body(height: int) -> str:
+    """높이 height 이하 하위 트리의 본문(괄호 안쪽) 패턴.
+
+    소유 수량자(*+, ++)로 역추적을 막아 실패 시에도 선형으로 끝납니다 (Python 3.11+).
+    """
+    string = r'"(?:[^"\\]|\\.)*+"'
+    body = rf'(?:[^()"]++|{string})*+'
+    for _ in range(height):
+        body = rf'(?:[^()"]++|{string}|\({body}\))*+'
+    return body
+
+
+def _node_pattern() -> str:
+    # 1,2: 접힌 하위 트리 (이름, 본문)  3: 여는 괄호+이름  4: ')'  5: "문자열"  6: 아톰  7: 이름 없는 '('
+    tail = r'|\(\s*([^\s()"]+)|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+)|(\()'
+    try:
+        pattern = rf'\(\s*([^\s()"]+)({_collapse_body(COLLAPSE_HEIGHT)})\)' + tail
+        re.compile(pattern)
+    except re.error:
+        # 소유 수량자 미지원 (Python < 3.11): 문자열 없는 리프 노드만 접음
+        pattern = r'\(\s*([^\s()"]+)([^()"]*)\)' + tail
+    return pattern
+
+
+_NODE_PATTERN = _node_pattern()
+_NODE_RE = re.compile(_NODE_PATTERN, re.DOTALL)
+_NODE_RE_BYTES = re.compile(_NODE_PATTERN.encode("ascii"), re.DOTALL)
+
+# 접힌 노드 본문 맨 앞의 아톰 하나 (1: 문자열, 2: 아톰)
+_LEAD_PATTERN = r'\s*(?:"((?:[^"\\]|\\.)*)"|([^\s()"]+))'
+_LEAD_RE = re.compile(_LEAD_PATTERN, re.DOTALL)
+_LEAD_RE_BYTES = re.compile(_LEAD_PATTERN.encode("ascii"), re.DOTALL)
+
+# 최상위 구간 색인: 첫 줄 "(kicad_sch" (이름만) 다음 줄의 들여쓰기 단위
+_INDENT_PATTERN = r'\A\s*\(([^\s()"]+)[ \t\r]*\n([ \t]+)\('
+_INDENT_RE = re.compile(_INDENT_PATTERN)
+_INDENT_RE_BYTES = re.compile(_INDENT_PATTERN.encode("ascii"))
+
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+# 토큰 종류
+OPEN = 1
+CLOSE = 2
+STRING = 3
+ATOM = 4
+
+Buffer = Union[str, bytes, bytearray, memoryview]
+
+
+def unescape(text: str) -> str:
+    """KiCad 문자열 이스케이프(\\", \\\\, \\n)를 해제합니다."""
+    if "\\" not in text:
+        return text
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def escape(text: str) -> str:
+    """KiCad 문자열로 쓰기 위해 이스케이프합니다 (따옴표 미포함)."""
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SNode:
+    """S-표현식 노드.
+
+    Attributes:
+        name: 첫 번째 아톰 (symbol, property, at, ...)
+        items: 나머지 항목 (str 아톰 또는 SNode) - 접힌 노드는 첫 접근 시 파싱
+        start: 여는 괄호 오프셋
+        end: 닫는 괄호 다음 오프셋
+    """
+
+    __slots__ = ("name", "_items", "start", "end", "_source")
+
+    def __init__(self, name: Optional[str] = None, start: int = 0, end: int = 0):
+        self.name = name
+        self._items = []
+        self.start = start
+        self.end = end
+        self._source = None  # 접힌 노드: (buf, body_start, body_end)
+
+    def __repr__(self) -> str:
+        return f"SNode({self.name!r}, start={self.start}, end={self.end})"
+
+    @property
+    def items(self) -> list:
+        """아톰/자식 노드 목록."""
+        if self._source is not None:
+            buf, body_start, body_end = self._source
+            self._source = None
+            for _ in _scan(buf, body_start, body_end, [self], -1):
+                pass
+        return self._items
+
+    @items.setter
+    def items(self, value: list):
+        self._source = None
+        self._items = value
+
+    @property
+    def is_expanded(self) -> bool:
+        """하위 항목이 이미 파싱되었는지 여부."""
+        return self._source is None
+
+    def may_contain(self, name: str) -> bool:
+        """하위 트리에 (name ...) 노드가 있을 수 있는지 펼치지 않고 확인합니다."""
+        if self._source is None:
+            return True
+        buf, body_start, body_end = self._source
+        rx = _name_probe(name, not isinstance(buf, str))
+        return rx.search(buf, body_start, body_end) is not None
+
+    @property
+    def children(self) -> list:
+        """자식 노드 목록 (아톰 제외)."""
+        return [i for i in self.items if isinstance(i, SNode)]
+
+    @property
+    def atoms(self) -> list[str]:
+        """아톰 인자 목록 (자식 노드 제외)."""
+        return [i for i in self.items if not isinstance(i, SNode)]
+
+    def value(self, index: int = 0, default: Optional[str] = None) -> Optional[str]:
+        """index번째 아톰 인자를 반환합니다.
+
+        접힌 노드는 본문 앞부분의 아톰만 읽고, 자식 노드를 만나기 전에 찾으면 펼치지 않습니다.
+        """
+        if self._source is not None:
+            buf, pos, body_end = self._source
+            is_bytes = not isinstance(buf, str)
+            rx = _LEAD_RE_BYTES if is_bytes else _LEAD_RE
+            for _ in range(index + 1):
+                m = rx.match(buf, pos, body_end)
+                if m is None:
+                    break
+                pos = m.end()
+            else:
+                text = m.group(m.lastindex)
+                if is_bytes:
+                    text = text.decode("utf-8")
+                return unescape(text) if m.lastindex == 1 else text
+        atoms = self.atoms
+        if index < len(atoms):
+            return atoms[index]
+        return default
+
+    def find(self, name: str) -> Optional["SNode"]:
+        """이름이 name인 첫 번째 직계 자식 노드."""
+        for item in self.items:
+            if isinstance(item, SNode) and item.name == name:
+                return item
+        return None
+
+    def find_all(self, name: str) -> list["SNode"]:
+        """이름이 name인 모든 직계 자식 노드."""
+        return [i for i in self.items if isinstance(i, SNode) and i.name == name]
+
+    def get(self, name: str, index: int = 0, default: Optional[str] = None) -> Optional[str]:
+        """직계 자식 (name ...)의 index번째 아톰을 반환합니다."""
+        node = self.find(name)
+        if node is None:
+            return default
+        return node.value(index, default)
+
+    def iter(self, name: Optional[str] = None) -> Iterator["SNode"]:
+        """하위 모든 노드를 깊이 우선으로 순회합니다 (자기 자신 포함).
+
+        name을 지정하면 (name ...)이 없는 접힌 하위 트리는 펼치지 않고 건너뜁니다.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if name is None or node.name == name:
+                yield node
+            if name is not None and not node.may_contain(name):
+                continue
+            stack.extend(reversed([i for i in node.items if isinstance(i, SNode)]))
+
+    def property_node(self, key: str) -> Optional["SNode"]:
+        """(property "key" ...) 노드를 찾습니다."""
+        for item in self.items:
+            if isinstance(item, SNode) and item.name == "property" and item.value() == key:
+                return item
+        return None
+
+    def property(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """(property "key" "value") 값을 반환합니다."""
+        node = self.property_node(key)
+        if node is None:
+            return default
+        return node.value(1, default)
+
+    def at(self) -> tuple[float, float, float]:
+        """(at x y [angle]) 좌표를 반환합니다. 없으면 (0, 0, 0)."""
+        node = self.find("at")
+        if node is None:
+            return 0.0, 0.0, 0.0
+        atoms = node.atoms
+        x = float(atoms[0]) if len(atoms) > 0 else 0.0
+        y = float(atoms[1]) if len(atoms) > 1 else 0.0
+        angle = float(atoms[2]) if len(atoms) > 2 else 0.0
+        return x, y, angle
+
+
+_PROBES = {}
+
+
+def _name_probe(name: str, is_bytes: bool):
+    key = (name, is_bytes)
+    rx = _PROBES.get(key)
+    if rx is None:
+        pattern = r'\(\s*' + re.escape(name) + r'(?=[\s()"])'
+        rx = re.compile(pattern.encode("utf-8") if is_bytes else pattern)
+        _PROBES[key] = rx
+    return rx
+
+
+def scan_sections(buf: Buffer) -> Optional[tuple[str, int, int, list[tuple[str, int, int, int]]]]:
+    """최상위 항목 구간을 하위 내용을 읽지 않고 찾습니다.
+
+    KiCad는 최상위 항목을 한 단계 들여쓰기로 저장합니다 (회로도는 탭, PCB는 공백 2칸).
+    그 들여쓰기 + '(' 로 시작하는 줄만 정규식으로 찾고, 각 항목의 끝은 다음 항목 앞의
+    마지막 ')'로 정합니다.
+
+    Returns:
+        (루트 이름, 루트 start, 루트 end, [(이름, start, body_start, end), ...]) -
+        들여쓰기를 판별할 수 없으면 (한 줄로 저장된 파일, 루트 줄에 아톰이 있는 파일,
+        최상위 들여쓰기보다 얕은 '(' 줄이 있는 손 편집 파일 등) None
+    """
+    is_bytes = not isinstance(buf, str)
+    m = (_INDENT_RE_BYTES if is_bytes else _INDENT_RE).match(buf)
+    if m is None:
+        return None
+    indent = m.group(2)
+    head_re, shallow_re = _section_res(indent)
+    if shallow_re.search(buf) is not None:
+        return None
+    close = b")" if is_bytes else ")"
+    heads = [(h.start() + 1 + len(indent), h.end(), h.group(1)) for h in head_re.finditer(buf)]
+
+    sections = []
+    # 최상위 노드의 닫는 괄호
+    root_end = buf.rfind(close)
+    for i, (start, body_start, name) in enumerate(heads):
+        limit = heads[i + 1][0] if i + 1 < len(heads) else root_end
+        end = buf.rfind(close, start, limit) + 1
+        if end <= start:
+            raise ValueError(f"잘못된 최상위 항목 구간: {name} @ {start}")
+        sections.append((name.decode("utf-8") if is_bytes else name, start, body_start, end))
+
+    root_name = m.group(1).decode("utf-8") if is_bytes else m.group(1)
+    return root_name, m.start(1) - 1, root_end + 1, sections
+
+
+_SECTION_RES = {}
+
+
+def _section_res(indent: Union[str, bytes]) -> tuple:
+    """(최상위 항목 머리 정규식, 그보다 얕게 들여쓴 '(' 줄 정규식)."""
+    res = _SECTION_RES.get(indent)
+    if res is None:
+        is_bytes = isinstance(indent, bytes)
+        text = indent.decode("ascii") if is_bytes else indent
+        patterns = (
+            r'\n' + re.escape(text) + r'\(([^\s()"]+)',
+            r'\n[ \t]{0,%d}\(' % (len(text) - 1),
+        )
+        res = tuple(re.compile(p.encode("ascii") if is_bytes else p) for p in patterns)
+        _SECTION_RES[indent] = res
+    return res
+
+
+def _parse_sections(buf: Buffer) -> Optional[SNode]:
+    """최상위 구간 색인으로 루트를 만듭니다 (각 항목은 접힌 노드, 처음 접근 시 파싱)."""
+    scanned = scan_sections(buf)
+    if scanned is None:
+        return None
+    root_name, root_start, root_end, sections = scanned
+    root = SNode(root_name, root_start, root_end)
+    for name, start, body_start, end in sections:
+        node = SNode(name, start, end)
+        if end - 1 > body_start:
+            node._source = (buf, body_start, end - 1)
+        root._items.append(node)
+    return root
+
+
+def iter_tokens(buf: Buffer, pos: int = 0, endpos: Optional[int] = None) -> Iterator[tuple]:
+    """버퍼를 토큰 단위로 순회합니다.
+
+    Yields:
+        (kind, text, start, end) - kind는 OPEN/CLOSE/STRING/ATOM
+    """
+    if isinstance(buf, str):
+        rx, is_bytes = _TOKEN_RE, False
+    else:
+        rx, is_bytes = _TOKEN_RE_BYTES, True
+    if endpos is None:
+        endpos = len(buf)
+
+    for m in rx.finditer(buf, pos, endpos):
+        kind = m.lastindex
+        if kind == OPEN:
+            yield OPEN, "(", m.start(), m.end()
+        elif kind == CLOSE:
+            yield CLOSE, ")", m.start(), m.end()
+        else:
+            text = m.group(kind)
+            if is_bytes:
+                text = text.decode("utf-8")
+            if kind == STRING:
+                text = unescape(text)
+            yield kind, text, m.start(), m.end()
+
+
+def _scan(buf: Buffer, pos: int, endpos: int, stack: list, depth: int) -> Iterator[SNode]:
+    """노드 빌더 본체.
+
+    stack에 미리 부모 노드를 넣어두면 구간 안의 항목이 그 부모에 붙습니다 (lazy 노드 펼치기).
+    깊이가 depth인 노드는 부모에 붙이지 않고 완성되는 즉시 내보냅니다.
+    """
+    if isinstance(buf, str):
+        rx, is_bytes = _NODE_RE, False
+    else:
+        rx, is_bytes = _NODE_RE_BYTES, True
+    base = len(stack)
+
+    for m in rx.finditer(buf, pos, endpos):
+        kind = m.lastindex
+        if kind == 2:
+            # 접힌 하위 트리: 구간만 기록하고 닫힌 노드로 취급
+            name = m.group(1)
+            if is_bytes:
+                name = name.decode("utf-8")
+            node = SNode(name, m.start(), m.end())
+            if m.end(2) > m.start(2):
+                node._source = (buf, m.start(2), m.end(2))
+            if len(stack) == depth:
+                yield node
+            elif len(stack) < depth:
+                # 내보낼 깊이보다 얕은 곳에서 접힌 경우 (작은 파일): 본문에서 해당 깊이 노드를 찾음
+                if node._source is not None:
+                    yield from _scan(buf, m.start(2), m.end(2), stack + [node], depth)
+            elif stack:
+                stack[-1]._items.append(node)
+            if not stack:
+                return
+        elif kind == 3 or kind == 7:
+            name = m.group(3)
+            if is_bytes and name is not None:
+                name = name.decode("utf-8")
+            node = SNode(name, m.start())
+            # 내보낼 깊이보다 깊은 노드만 부모에 연결
+            if stack and len(stack) > depth:
+                stack[-1]._items.append(node)
+            stack.append(node)
+        elif kind == 4:
+            if len(stack) <= base:
+                raise ValueError(f"짝이 맞지 않는 ')' (offset {m.start()})")
+            node = stack.pop()
+            node.end = m.end()
+            if len(stack) == depth:
+                yield node
+            if not stack:
+                return
+        elif stack:
+            text = m.group(kind)
+            if is_bytes:
+                text = text.decode("utf-8")
+            if kind == 5 and "\\" in text:
+                text = unescape(text)
+            top = stack[-1]
+            if top.name is None:
+                top.name = text
+            else:
+                top._items.append(text)
+
+    if len(stack) > base:
+        raise ValueError(f"닫히지 않은 '(' (offset {stack[-1].start})")
+
+
+def iter_nodes(
+    buf: Buffer,
+    depth: int = 1,
+    pos: int = 0,
+    endpos: Optional[int] = None,
+) -> Iterator[SNode]:
+    """버퍼를 한 번 훑으면서 지정 깊이의 노드를 완성되는 즉시 내보냅니다.
+
+    depth=0이면 최상위 노드(kicad_sch 등) 하나, depth=1이면 그 직계 자식들이 나옵니다.
+    내보낸 노드는 부모에 붙이지 않으므로 파일 전체 트리를 메모리에 유지하지 않습니다.
+
+    Args:
+        buf: 파싱할 버퍼 (str, bytes, mmap 등)
+        depth: 내보낼 노드 깊이
+        pos: 시작 오프셋
+        endpos: 끝 오프셋
+
+    Yields:
+        SNode
+    """
+    if endpos is None:
+        endpos = len(buf)
+    return _scan(buf, pos, endpos, [], depth)
+
+
+def parse(buf: Buffer, pos: int = 0, endpos: Optional[int] = None) -> SNode:
+    """pos 이후 첫 번째 완성 노드를 트리로 파싱합니다.
+
+    버퍼 전체를 파싱할 때는 최상위 구간 색인으로 루트를 만들고 항목은 접힌 채로 둡니다.
+
+    Raises:
+        ValueError: 노드가 없거나 괄호가 맞지 않을 때 (색인한 항목은 펼칠 때)
+    """
+    if pos == 0 and endpos is None:
+        root = _parse_sections(buf)
+        if root is not None:
+            return root
+    for node in iter_nodes(buf, depth=0, pos=pos, endpos=endpos):
+        return node
+    raise ValueError("S-표현식 노드가 없습니다")
+
+
+def parse_file(path) -> SNode:
+    """파일 전체를 읽어 파싱합니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse(f.read())
+
+
+def iter_instance_symbols(root: SNode) -> Iterator[SNode]:
+    """회로도 최상위의 심볼 인스턴스 (symbol (lib_id ...)) 노드를 순회합니다.
+
+    lib_symbols 안의 심볼 정의는 최상위가 아니므로 자연스럽게 제외됩니다.
+    """
+    for node in root.items:
+        if isinstance(node, SNode) and node.name == "symbol" and node.find("lib_id") is not None:
+            yield node
@@ -0,0 +1,585 @@
+"""
+Spatial Index - 회로도 기하 공간 인덱스 v1.1
+
+시트 하나의 와이어 / 라벨 / 핀 끝점 / 정션 / 심볼 경계 상자를 균일 그리드 버킷에 넣어
+점·영역 질의를 주변 버킷만 보고 처리합니다 (시트 전체를 훑지 않음).
+
+- junctions_needed(): 정션이 필요한데 없는 점
+  (와이어 끝이 다른 와이어 중간에 닿는 T자, 끝점 3개 이상이 모이는 점, 와이어 중간의 핀)
+- conflicts(): 새 와이어가 다른 넷의 와이어/라벨/핀과 겹치거나 닿는지 (삽입 전 거부용)
+- shorts(): 연결 그룹 하나에 서로 다른 라벨 이름이 섞인 곳 (기존 회로도 검사용)
+- free_position(): 기준 위치에서 가장 가까운, 아무것도 겹치지 않는 빈 자리
+
+생성한 시트는 add_*로 직접 채우고, 손으로 편집한 fcBoard_*.kicad_sch 등 기존 파일은
+load()로 읽습니다 (lib_symbols의 핀 좌표를 인스턴스 위치/회전/미러로 변환).
+
+v1.1: symbol_pins() - 변환된 핀 끝점과 번호/이름/전기 타입/방향 (라벨을 핀 끝점에 바깥쪽으로 놓기 위함),
+      load()는 lib_id 접두어 없는 lib_symbols도 찾음 (생성된 회로도의 핀을 인덱스에 포함)
+
+Usage:
+    from kicad_auto_builder.spatial_index import SchematicIndex
+
+    index = SchematicIndex.load("fcBoard_Reset.kicad_sch")
+    for x, y in index.junctions_needed():
+        print(f"정션 누락: ({x}, {y})")
+"""
+
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .sexpr import SNode, iter_instance_symbols, parse
+
+BBox = tuple[float, float, float, float]  # (x0, y0, x1, y1), x0 <= x1, y0 <= y1
+Point = tuple[float, float]
+
+# 버킷 한 칸 크기 (mm) - 4 그리드
+CELL_SIZE = 10.16
+
+# 좌표 비교 단위: KiCad 파일 좌표는 소수점 4자리 (0.1um)
+_KEY_SCALE = 10000
+
+# 라벨 글자 폭 / 높이 근사 (1.27mm 폰트)
+LABEL_CHAR_WIDTH = 1.0
+LABEL_HEIGHT = 1.9
+
+# 라벨 노드
+LABEL_KINDS = ("label", "global_label", "hierarchical_label")
+
+
+def point_key(x: float, y: float) -> tuple[int, int]:
+    """좌표 비교용 정수 키 (부동소수 오차 제거)."""
+    return round(x * _KEY_SCALE), round(y * _KEY_SCALE)
+
+
+@dataclass
+class Item:
+    """인덱스 항목.
+
+    Attributes:
+        kind: "wire" | "label" | "pin" | "junction" | "no_connect" | "symbol"
+        bbox: 경계 상자
+        net: 넷 이름 (모르면 None - 기존 파일의 와이어 등)
+        points: 연결점 (와이어는 양 끝, 라벨/핀/정션은 한 점, 심볼은 없음)
+        ref: 심볼/핀의 Reference, 라벨 이름 등 보고용 이름
+    """
+    kind: str
+    bbox: BBox
+    net: Optional[str] = None
+    points: tuple = ()
+    ref: str = ""
+    id: int = field(default=-1, compare=False)
+
+    def on_interior(self, x: float, y: float) -> bool:
+        """와이어 중간(끝점 제외)에 (x, y)가 있는지."""
+        if self.kind != "wire":
+            return False
+        (x1, y1), (x2, y2) = self.points
+        k, a, b = point_key(x, y), point_key(x1, y1), point_key(x2, y2)
+        if k == a or k == b:
+            return False
+        return _on_segment(k, a, b)
+
+
+class SpatialIndex:
+    """균일 그리드 버킷 인덱스.
+
+    항목은 경계 상자가 걸치는 모든 버킷에 들어가며, 질의는 질의 상자가 걸치는 버킷만 확인합니다.
+    """
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        self.cell_size = cell_size
+        self.items: list[Item] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def insert(self, item: Item) -> Item:
+        """항목을 추가합니다."""
+        item.id = len(self.items)
+        self.items.append(item)
+        for cell in self._cells_of(item.bbox):
+            self._cells.setdefault(cell, []).append(item.id)
+        return item
+
+    def query(self, bbox: BBox, kinds: tuple = ()) -> Iterator[Item]:
+        """경계 상자가 bbox와 겹치는(닿는 것 포함) 항목."""
+        x0, y0, x1, y1 = bbox
+        seen = set()
+        for cell in self._cells_of(bbox):
+            for i in self._cells.get(cell, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                item = self.items[i]
+                if kinds and item.kind not in kinds:
+                    continue
+                ix0, iy0, ix1, iy1 = item.bbox
+                if ix0 <= x1 + 1e-6 and x0 <= ix1 + 1e-6 and iy0 <= y1 + 1e-6 and y0 <= iy1 + 1e-6:
+                    yield item
+
+    def query_point(self, x: float, y: float, kinds: tuple = ()) -> Iterator[Item]:
+        """(x, y)를 경계 상자에 포함하는 항목."""
+        return self.query((x, y, x, y), kinds)
+
+    def _cells_of(self, bbox: BBox) -> Iterator[tuple[int, int]]:
+        s = self.cell_size
+        x0, y0, x1, y1 = bbox
+        for cx in range(math.floor(x0 / s), math.floor(x1 / s) + 1):
+            for cy in range(math.floor(y0 / s), math.floor(y1 / s) + 1):
+                yield cx, cy
+
+
+class SchematicIndex(SpatialIndex):
+    """회로도 시트 기하 인덱스."""
+
+    # =========================================================================
+    # 추가
+    # =========================================================================
+
+    def add_wire(self, x1: float, y1: float, x2: float, y2: float, net: Optional[str] = None) -> Item:
+        """와이어를 추가합니다."""
+        bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        return self.insert(Item("wire", bbox, net, ((x1, y1), (x2, y2))))
+
+    def add_label(self, name: str, x: float, y: float, angle: float = 0, kind: str = "label") -> Item:
+        """라벨을 추가합니다 (연결점은 앵커, 경계 상자는 글자 수로 근사)."""
+        return self.insert(Item(kind, _label_bbox(name, x, y, angle), name, ((x, y),), name))
+
+    def add_pin(self, x: float, y: float, ref: str = "", net: Optional[str] = None) -> Item:
+        """핀 끝점(연결점)을 추가합니다."""
+        return self.insert(Item("pin", (x, y, x, y), net, ((x, y),), ref))
+
+    def add_junction(self, x: float, y: float) -> Item:
+        """정션을 추가합니다."""
+        return self.insert(Item("junction", (x, y, x, y), None, ((x, y),)))
+
+    def add_no_connect(self, x: float, y: float) -> Item:
+        """no_connect 표시를 추가합니다."""
+        return self.insert(Item("no_connect", (x, y, x, y), None, ((x, y),)))
+
+    def add_symbol(self, bbox: BBox, ref: str = "") -> Item:
+        """심볼 본체 경계 상자를 추가합니다 (연결점 없음 - 빈 자리 찾기용)."""
+        return self.insert(Item("symbol", bbox, None, (), ref))
+
+    def add_lib_symbol(self, lib_symbol: SNode, x: float, y: float, angle: float = 0,
+                       mirror: str = "", unit: int = 1, ref: str = "", net: Optional[str] = None):
+        """심볼 정의를 인스턴스 위치에 놓아 본체 상자와 핀 끝점을 추가합니다.
+
+        Args:
+            lib_symbol: lib_symbols 안의 (symbol "lib:name" ...) 노드 또는 심볼 라이브러리 노드
+            x, y, angle: 인스턴스 위치와 회전
+            mirror: "x" | "y" | ""
+            unit: 다중 유닛 심볼의 유닛 번호
+            ref: Reference
+            net: 핀 넷 이름 (전원 심볼 등 알고 있는 경우)
+        """
+        bbox, pin_points = place_symbol(lib_symbol, x, y, angle, mirror, unit)
+        if bbox is not None:
+            self.add_symbol(bbox, ref)
+        for px, py in pin_points:
+            self.add_pin(px, py, ref, net)
+
+    # =========================================================================
+    # 기존 회로도 읽기
+    # =========================================================================
+
+    @classmethod
+    def from_root(cls, root: SNode, cell_size: float = CELL_SIZE) -> "SchematicIndex":
+        """파싱된 .kicad_sch 최상위 노드로 인덱스를 만듭니다."""
+        index = cls(cell_size)
+        lib_symbols = {}
+        lib_node = root.find("lib_symbols")
+        if lib_node is not None:
+            lib_symbols = {node.value(): node for node in lib_node.find_all("symbol")}
+
+        for node in root.items:
+            if not isinstance(node, SNode):
+                continue
+            name = node.name
+            if name == "wire":
+                pts = node.find("pts")
+                xy = [n.atoms for n in pts.find_all("xy")] if pts is not None else []
+                if len(xy) == 2:
+                    (x1, y1), (x2, y2) = ((float(a), float(b)) for a, b, *_ in xy)
+                    index.add_wire(x1, y1, x2, y2)
+            elif name in LABEL_KINDS:
+                x, y, angle = node.at()
+                index.add_label(node.value(0, ""), x, y, angle, kind=name)
+            elif name == "junction":
+                x, y, _ = node.at()
+                index.add_junction(x, y)
+            elif name == "no_connect":
+                x, y, _ = node.at()
+                index.add_no_connect(x, y)
+
+        for sym in iter_instance_symbols(root):
+            # 생성된 회로도는 lib_symbols에 라이브러리 접두어 없이 들어감 (connectivity와 같은 규칙)
+            lib_id = sym.get("lib_id", default="")
+            lib = lib_symbols.get(lib_id) or lib_symbols.get(lib_id.rpartition(":")[2])
+            if lib is None:
+                continue
+            x, y, angle = sym.at()
+            value = sym.property("Value")
+            is_power = lib.find("power") is not None
+            index.add_lib_symbol(
+                _resolve_extends(lib, lib_symbols),
+                x, y, angle,
+                mirror=sym.get("mirror", default=""),
+                unit=int(sym.get("unit", default="1")),
+                ref=sym.property("Reference", ""),
+                net=value if is_power else None,
+            )
+        return index
+
+    @classmethod
+    def load(cls, path: Union[str, Path], cell_size: float = CELL_SIZE) -> "SchematicIndex":
+        """.kicad_sch 파일을 읽어 인덱스를 만듭니다."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_root(parse(f.read()), cell_size)
+
+    # =========================================================================
+    # 질의
+    # =========================================================================
+
+    def connection_items(self, x: float, y: float) -> list[Item]:
+        """(x, y)에 연결점이 있거나 와이어 중간이 지나가는 항목."""
+        key = point_key(x, y)
+        found = []
+        for item in self.query_point(x, y):
+            if item.kind == "symbol":
+                continue
+            if any(point_key(*p) == key for p in item.points) or item.on_interior(x, y):
+                found.append(item)
+        return found
+
+    def junctions_needed(self) -> list[Point]:
+        """정션이 있어야 하는데 없는 점 (좌표 순).
+
+        KiCad 규칙과 같이 와이어는 끝점에서만 연결되므로,
+        - 와이어 끝 / 핀이 다른 와이어 중간에 닿는 점 (T자)
+        - 와이어 끝과 핀이 3개 이상 모이는 점
+        에 정션이 필요합니다.
+        """
+        needed = {}
+        for item in self.items:
+            if item.kind not in ("wire", "pin"):
+                continue
+            for x, y in item.points:
+                key = point_key(x, y)
+                if key in needed:
+                    continue
+                ends = 0
+                interior = False
+                has_junction = False
+                for other in self.connection_items(x, y):
+                    if other.kind == "junction":
+                        has_junction = True
+                    elif other.kind in ("wire", "pin"):
+                        if other.on_interior(x, y):
+                            interior = True
+                        else:
+                            ends += 1
+                if not has_junction and (ends >= 3 or (interior and ends >= 1)):
+                    needed[key] = (x, y)
+                else:
+                    needed.setdefault(key, None)
+        return sorted(p for p in needed.values() if p is not None)
+
+    def conflicts(self, x1: float, y1: float, x2: float, y2: float, net: str) -> list[Item]:
+        """net 와이어 (x1, y1)-(x2, y2)를 넣으면 다른 넷 항목과 연결되는지 검사합니다.
+
+        서로 수직으로 지나가기만 하는 와이어(끝점이 아닌 교차)는 연결이 아니므로 제외합니다.
+
+        Returns:
+            넷이 다른 (또는 넷을 모르는) 와이어/라벨/핀 목록
+        """
+        bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        a, b = point_key(x1, y1), point_key(x2, y2)
+        found = []
+        for item in self.query(bbox, kinds=("wire", "label", "global_label", "hierarchical_label", "pin")):
+            if item.net == net:
+                continue
+            keys = [point_key(*p) for p in item.points]
+            # 상대 연결점이 새 와이어 위(끝 포함)에 있음
+            touched = any(k in (a, b) or _on_segment(k, a, b) for k in keys)
+            # 새 와이어 끝이 상대 와이어 중간에 닿음
+            if not touched and item.kind == "wire":
+                touched = item.on_interior(x1, y1) or item.on_interior(x2, y2) or _collinear_overlap(
+                    a, b, keys[0], keys[1]
+                )
+            if touched:
+                found.append(item)
+        return found
+
+    def nets(self) -> list[dict]:
+        """연결 그룹 목록 (와이어 끝점 / 정션 / 라벨 / 핀 기준 union-find).
+
+        Returns:
+            [{"names": [라벨/전원 넷 이름, ...], "items": 항목 수, "at": 대표 좌표}, ...]
+        """
+        parent = list(range(len(self.items)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for item in self.items:
+            if item.kind == "symbol":
+                continue
+            for x, y in item.points:
+                for other in self.connection_items(x, y):
+                    if other.id == item.id or other.kind == "symbol":
+                        continue
+                    # 와이어 중간에는 정션 / 라벨만 연결됨
+                    if other.on_interior(x, y) and item.kind not in ("junction",) + LABEL_KINDS:
+                        continue
+                    parent[find(item.id)] = find(other.id)
+
+        groups: dict[int, dict] = {}
+        for item in self.items:
+            if item.kind == "symbol":
+                continue
+            group = groups.setdefault(find(item.id), {"names": set(), "items": 0, "at": item.points[0]})
+            group["items"] += 1
+            if item.net and item.kind != "wire":
+                group["names"].add(item.net)
+        return [
+            {"names": sorted(g["names"]), "items": g["items"], "at": g["at"]}
+            for g in groups.values()
+        ]
+
+    def shorts(self) -> list[dict]:
+        """이름이 다른 라벨/전원 넷이 한 연결 그룹에 있는 곳."""
+        return [g for g in self.nets() if len(g["names"]) > 1]
+
+    def free_position(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        step: float = 2.54,
+        max_rings: int = 40,
+        margin: float = 1.27,
+    ) -> Optional[Point]:
+        """(x, y)에서 가장 가까운, 크기 width × height 상자가 아무 항목과도 겹치지 않는 자리.
+
+        (x, y)를 중심으로 step 간격의 정사각 고리를 바깥으로 넓혀 가며 찾습니다.
+        후보마다 주변 버킷만 질의하므로 시트 크기와 무관합니다.
+
+        Args:
+            x, y: 기준 위치 (상자 왼쪽 위)
+            width, height: 상자 크기 (mm)
+            step: 후보 간격 (그리드)
+            max_rings: 최대 탐색 고리 수
+            margin: 다른 항목과 띄울 여백
+
+        Returns:
+            (x, y) 또는 None (max_rings 안에 빈 자리가 없음)
+        """
+        for ring in range(max_rings + 1):
+            candidates = sorted(
+                (abs(dx) + abs(dy), dy, dx)
+                for dx in range(-ring, ring + 1)
+                for dy in range(-ring, ring + 1)
+                if max(abs(dx), abs(dy)) == ring
+            )
+            for _, dy, dx in candidates:
+                cx, cy = x + dx * step, y + dy * step
+                box = (cx - margin, cy - margin, cx + width + margin, cy + height + margin)
+                if next(self.query(box), None) is None:
+                    return round(cx, 4), round(cy, 4)
+        return None
+
+
+# =============================================================================
+# 기하 헬퍼
+# =============================================================================
+
+def _on_segment(k: tuple[int, int], a: tuple[int, int], b: tuple[int, int]) -> bool:
+    """정수 키 점 k가 선분 a-b 위(끝점 포함)에 있는지."""
+    (kx, ky), (ax, ay), (bx, by) = k, a, b
+    if not (min(ax, bx) <= kx <= max(ax, bx) and min(ay, by) <= ky <= max(ay, by)):
+        return False
+    return (bx - ax) * (ky - ay) == (by - ay) * (kx - ax)
+
+
+def _collinear_overlap(a, b, c, d) -> bool:
+    """두 선분이 같은 직선 위에서 길이가 있는 구간을 공유하는지."""
+    (ax, ay), (bx, by) = a, b
+    cross = lambda p: (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax)  # noqa: E731
+    if cross(c) != 0 or cross(d) != 0:
+        return False
+    if ax == bx:
+        lo, hi = max(min(ay, by), min(c[1], d[1])), min(max(ay, by), max(c[1], d[1]))
+    else:
+        lo, hi = max(min(ax, bx), min(c[0], d[0])), min(max(ax, bx), max(c[0], d[0]))
+    return lo < hi
+
+
+def _label_bbox(name: str, x: float, y: float, angle: float) -> BBox:
+    """라벨 글자 영역 근사 (앵커에서 angle 방향으로 뻗음)."""
+    length = max(len(name), 1) * LABEL_CHAR_WIDTH
+    half = LABEL_HEIGHT / 2
+    angle = round(angle) % 360
+    if angle == 180:
+        return x - length, y - half, x, y + half
+    if angle == 90:
+        return x - half, y - length, x + half, y
+    if angle == 270:
+        return x - half, y, x + half, y + length
+    return x, y - half, x + length, y + half
+
+
+class _Transform:
+    """심볼 라이브러리 좌표 (y 위쪽) → 회로도 좌표 (y 아래쪽) 변환."""
+
+    def __init__(self, x: float, y: float, angle: float, mirror: str = ""):
+        self.x, self.y = x, y
+        rad = math.radians(angle)
+        self.cos, self.sin = round(math.cos(rad)), round(math.sin(rad))
+        self.mirror = mirror
+
+    def __call__(self, px: float, py: float) -> Point:
+        # 라이브러리 y축 반전 후 화면 기준 반시계 회전
+        sx, sy = px, -py
+        rx = sx * self.cos + sy * self.sin
+        ry = -sx * self.sin + sy * self.cos
+        if self.mirror == "x":
+            ry = -ry
+        elif self.mirror == "y":
+            rx = -rx
+        return round(self.x + rx, 4), round(self.y + ry, 4)
+
+    def angle(self, px: float, py: float, angle: float) -> float:
+        """라이브러리 좌표의 방향(도)을 화면 방향으로 (화면 y 아래쪽, 반시계 기준)."""
+        rad = math.radians(angle)
+        x0, y0 = self(px, py)
+        x1, y1 = self(px + math.cos(rad), py + math.sin(rad))
+        return round(math.degrees(math.atan2(y0 - y1, x1 - x0))) % 360
+
+
+def place_symbol(
+    lib_symbol: SNode,
+    x: float = 0.0,
+    y: float = 0.0,
+    angle: float = 0,
+    mirror: str = "",
+    unit: int = 1,
+) -> tuple[Optional[BBox], list[Point]]:
+    """심볼 정의를 회로도 위치에 놓았을 때의 본체 경계 상자와 핀 끝점.
+
+    Returns:
+        (경계 상자 또는 None (도형/핀 없음), [(x, y), ...])
+    """
+    transform = _Transform(x, y, angle, mirror)
+    pins, outline = _symbol_geometry(lib_symbol, unit)
+    pin_points = [transform(px, py) for px, py in pins]
+    points = [transform(px, py) for px, py in outline] + pin_points
+    if not points:
+        return None, pin_points
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys)), pin_points
+
+
+def _resolve_extends(lib: SNode, lib_symbols: dict[str, SNode]) -> SNode:
+    """(extends "parent") 심볼은 부모 정의의 도형/핀을 사용합니다."""
+    parent = lib.get("extends")
+    if not parent:
+        return lib
+    prefix = lib.value().rpartition(":")[0]
+    return lib_symbols.get(f"{prefix}:{parent}" if prefix else parent, lib)
+
+
+def _symbol_units(lib_symbol: SNode, unit: int = 1) -> list[SNode]:
+    """심볼 정의 중 유닛 0(공통) 또는 unit, 바디 스타일 0/1에 해당하는 노드들 (하위 심볼 "NAME_U_S")."""
+    units = [lib_symbol]
+    for sub in lib_symbol.find_all("symbol"):
+        parts = (sub.value() or "").rsplit("_", 2)
+        if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+            if int(parts[1]) in (0, unit) and int(parts[2]) in (0, 1):
+                units.append(sub)
+    return units
+
+
+@dataclass
+class SymbolPin:
+    """회로도 위에 놓인 심볼 핀."""
+    x: float
+    y: float
+    number: str
+    name: str
+    type: str           # input / output / passive / power_in ... (KiCad 전기 타입)
+    shape: str = "line"
+    hidden: bool = False
+    angle: float = 0    # 끝점에서 본체 쪽으로 향하는 화면 방향 (0 / 90 / 180 / 270)
+
+
+def symbol_pins(
+    lib_symbol: SNode,
+    x: float = 0.0,
+    y: float = 0.0,
+    angle: float = 0,
+    mirror: str = "",
+    unit: int = 1,
+) -> list[SymbolPin]:
+    """심볼 정의를 회로도 위치에 놓았을 때의 핀 (끝점 좌표 + 번호/이름/전기 타입)."""
+    transform = _Transform(x, y, angle, mirror)
+    pins = []
+    for node in _symbol_units(lib_symbol, unit):
+        for child in node.find_all("pin"):
+            px, py, pa = child.at()
+            atoms = child.atoms
+            hidden = "hide" in atoms or child.get("hide") == "yes"
+            pins.append(SymbolPin(
+                *transform(px, py),
+                number=child.get("number", default=""),
+                name=child.get("name", default=""),
+                type=atoms[0] if atoms else "unspecified",
+                shape=atoms[1] if len(atoms) > 1 else "line",
+                hidden=hidden,
+                angle=transform.angle(px, py, pa),
+            ))
+    return pins
+
+
+def _symbol_geometry(lib_symbol: SNode, unit: int = 1) -> tuple[list[Point], list[Point]]:
+    """심볼 정의의 핀 끝점과 본체 윤곽 점 (라이브러리 좌표).
+
+    하위 심볼 "NAME_U_S" 중 유닛 0(공통) 또는 unit, 바디 스타일 0/1만 사용합니다.
+    """
+    pins: list[Point] = []
+    outline: list[Point] = []
+
+    for node in _symbol_units(lib_symbol, unit):
+        for child in node.children:
+            name = child.name
+            if name == "pin":
+                px, py, _ = child.at()
+                pins.append((px, py))
+            elif name == "rectangle":
+                for key in ("start", "end"):
+                    p = child.find(key)
+                    if p is not None:
+                        outline.append((float(p.value(0)), float(p.value(1))))
+            elif name in ("polyline", "bezier"):
+                pts = child.find("pts")
+                if pts is not None:
+                    outline.extend((float(n.value(0)), float(n.value(1))) for n in pts.find_all("xy"))
+            elif name == "circle":
+                center, radius = child.find("center"), child.get("radius")
+                if center is not None and radius is not None:
+                    cx, cy, r = float(center.value(0)), float(center.value(1)), float(radius)
+                    outline.extend([(cx - r, cy - r), (cx + r, cy + r)])
+            elif name == "arc":
+                for key in ("start", "mid", "end"):
+                    p = child.find(key)
+                    if p is not None:
+                        outline.append((float(p.value(0)), float(p.value(1))))
+    return pins, outline
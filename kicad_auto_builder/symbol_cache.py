@@ -0,0 +1,145 @@
+"""
+Symbol Cache - 빌드 단위 심볼 라이브러리 캐시 v1.1
+
+심볼 라이브러리(custom.kicad_sym)와 각 시트의 lib_symbols가 같은 심볼을 반복해서
+읽고 추출하지 않도록, 빌드 하나 동안 다음을 한 번씩만 계산해 보관합니다.
+
+- .kicad_sym 파일 읽기 + 최상위 심볼 색인 (파일당 1회, 여러 심볼이 있는 라이브러리 지원)
+- 부품 → 심볼 텍스트 (LCSC 라이브러리 > 내장 심볼)
+- lib_symbols용 들여쓰기 블록, 증분 빌드용 심볼 지문
+
+따라서 심볼 I/O는 (부품 수 × 시트 수)가 아니라 고유 심볼 수에 비례합니다.
+
+v1.1: 심볼 기하 (원점 기준 본체 상자 + 핀 끝점/방향) - 라벨을 핀 끝점에 놓을 때 사용
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .build_cache import fingerprint
+from .sexpr import iter_nodes, parse
+from .spatial_index import BBox, SymbolPin, place_symbol, symbol_pins
+from .templates.symbol import BUILTIN_SYMBOLS, SymbolTemplate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SymbolGeometry:
+    """원점에 놓은 심볼의 본체 경계 상자와 핀 (유닛 1, 회전 없음)."""
+    bbox: Optional[BBox]
+    pins: list[SymbolPin]
+    _by_name: dict = field(default_factory=dict, repr=False)
+    _by_number: dict = field(default_factory=dict, repr=False)
+    _by_folded: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        for pin in self.pins:
+            self._by_name.setdefault(pin.name, pin)
+            self._by_number.setdefault(pin.number, pin)
+            self._by_folded.setdefault(pin.name.casefold(), pin)
+
+    def find(self, pin_key) -> Optional[SymbolPin]:
+        """설정의 핀 키에 해당하는 핀 (net_validator.match_pin과 같은 순서: 이름 → 번호 → 대소문자 무시 이름)."""
+        key = str(pin_key)
+        return self._by_name.get(key) or self._by_number.get(key) or self._by_folded.get(key.casefold())
+
+
+class SymbolCache:
+    """심볼 텍스트 / 들여쓰기 블록 메모이제이션.
+
+    잠금 없이 dict만 사용하므로 KicadBuilder와 함께 프로세스 풀로 pickle할 수 있습니다
+    (스레드 경합 시 같은 값을 중복 계산할 수는 있지만 결과는 같음).
+
+    Attributes:
+        reads: 실제로 읽은 라이브러리 파일 수
+    """
+
+    def __init__(self):
+        self._libs: dict[str, dict[str, str]] = {}
+        self._indented: dict[str, str] = {}
+        self._digests: dict[str, str] = {}
+        self._power: dict[str, str] = {}
+        self._geometry: dict[str, Optional[SymbolGeometry]] = {}
+        self.reads = 0
+
+    def library(self, path: Path) -> dict[str, str]:
+        """라이브러리 파일의 최상위 심볼 {이름: 텍스트} (파일 순서, 읽기 실패 시 빈 dict)."""
+        key = str(path)
+        lib = self._libs.get(key)
+        if lib is not None:
+            return lib
+
+        lib = {}
+        try:
+            content = Path(path).read_text(encoding='utf-8')
+            self.reads += 1
+        except OSError as e:
+            logger.warning(f"심볼 라이브러리를 읽을 수 없음: {path} ({e})")
+            content = ""
+
+        # (kicad_symbol_lib (symbol "A" ...) (symbol "B" ...)) - 하위 유닛(A_0_1 등)은 중첩되어 제외됨
+        for node in iter_nodes(content, depth=1):
+            if node.name == "symbol":
+                lib.setdefault(node.value(0, ""), content[node.start:node.end])
+
+        return self._libs.setdefault(key, lib)
+
+    def part_symbol(self, part) -> Optional[str]:
+        """부품의 심볼 정의 텍스트.
+
+        우선순위:
+        1. LCSC 라이브러리 파일에서 symbol_name과 같은 심볼 (없으면 첫 심볼)
+        2. 내장 심볼
+
+        Returns:
+            심볼 텍스트 또는 None
+        """
+        if part.symbol_lib:
+            lib = self.library(part.symbol_lib)
+            text = lib.get(part.symbol_name)
+            if text is None and lib:
+                text = next(iter(lib.values()))
+            if text is not None:
+                return text
+        return BUILTIN_SYMBOLS.get(part.symbol_name)
+
+    def power_symbol(self, net_value: str) -> str:
+        """전원 넷 프리셋 값의 심볼 (내장 심볼 또는 생성)."""
+        text = self._power.get(net_value)
+        if text is None:
+            text = BUILTIN_SYMBOLS.get(net_value) or SymbolTemplate.create_power_symbol(net_value, net_value)
+            self._power[net_value] = text
+        return text
+
+    def geometry(self, part) -> Optional[SymbolGeometry]:
+        """부품 심볼의 원점 기준 기하 (심볼이 없으면 None)."""
+        text = self.part_symbol(part)
+        if text is None:
+            return None
+        geometry = self._geometry.get(text)
+        if geometry is None:
+            node = parse(text)
+            bbox, _ = place_symbol(node)
+            geometry = self._geometry[text] = SymbolGeometry(bbox, symbol_pins(node))
+        return geometry
+
+    def indented(self, symbol: str) -> str:
+        """lib_symbols용 탭 들여쓰기 블록."""
+        block = self._indented.get(symbol)
+        if block is None:
+            block = '\n'.join('\t\t' + line for line in symbol.strip().split('\n'))
+            self._indented[symbol] = block
+        return block
+
+    def digest(self, part) -> str:
+        """부품이 실제로 사용하는 심볼 텍스트의 지문."""
+        text = self.part_symbol(part)
+        if text is None:
+            return fingerprint(None)
+        value = self._digests.get(text)
+        if value is None:
+            value = self._digests[text] = fingerprint(text)
+        return value
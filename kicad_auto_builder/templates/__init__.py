@@ -1,6 +1,20 @@
 """KiCad file templates."""
 
-from .symbol import SymbolTemplate
-from .schematic import SchematicTemplate
+import importlib
+
+_LAZY_EXPORTS = {
+    "SymbolTemplate": ".symbol",
+    "SchematicTemplate": ".schematic",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ["SymbolTemplate", "SchematicTemplate"]
@@ -1,21 +1,44 @@
 """
-Schematic Templates - KiCad 회로도 템플릿 v1.3
+Schematic Templates - KiCad 회로도 템플릿 v1.7
 
 .kicad_sch 파일 생성 기능.
 v1.2: 계층 시트 지원 추가
 v1.3: 타이틀 블록 동적 생성, generator_version 통합, ports 확장
+v1.4: 스트리밍 출력 (emit_* + SchematicWriter), 원자적 파일 쓰기, canonical 레이아웃 옵션
+v1.5: 결정적 UUID - create_*/emit_*에 uuid_key를 주면 (project, sheet, ref, role)에서 uuid5 생성
+v1.6: create_junction (배선 분기점 정션)
+v1.7: create_label 회전에 맞춘 정렬 (180 / 270도는 오른쪽 정렬), 루트 회로도 시트 핀 라벨
 """
 
 import uuid
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
+from ..sch_writer import Section, SchematicWriter, atomic_write, render
 
-def gen_uuid() -> str:
-    """UUID 생성."""
+
+# 결정적 UUID 네임스페이스 (uuid5)
+UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "kicad_auto_builder")
+
+
+def gen_uuid(*key) -> str:
+    """UUID 생성.
+
+    Args:
+        key: (project, sheet, ref, role) 등 - 주어지면 같은 키는 항상 같은 UUID (uuid5),
+             없으면 무작위 UUID (uuid4)
+    """
+    if key:
+        return str(uuid.uuid5(UUID_NAMESPACE, "\x1f".join(str(k) for k in key)))
     return str(uuid.uuid4())
 
 
+def _key_uuid(uuid_key: tuple, role: str) -> str:
+    """uuid_key가 있으면 (uuid_key..., role)에서 결정적 UUID, 없으면 무작위 UUID."""
+    return gen_uuid(*uuid_key, role) if uuid_key else gen_uuid()
+
+
 @dataclass
 class Position:
     """위치 정보."""
@@ -69,7 +92,30 @@ class SchematicTemplate:
         Returns:
             .kicad_sch 파일 내용
         """
-        schematic_uuid = gen_uuid()
+        return render(lambda writer: SchematicTemplate.emit_schematic(
+            writer, project_name, lib_symbols, components, wires, labels, texts,
+            title_block, generator_version,
+        ))
+
+    @staticmethod
+    def emit_schematic(
+        writer: SchematicWriter,
+        project_name: str,
+        lib_symbols: Section,
+        components: Section,
+        wires: Section = "",
+        labels: Section = "",
+        texts: Section = "",
+        title_block: TitleBlockInfo = None,
+        generator_version: str = "1.0.0",
+        schematic_uuid: str = "",
+    ):
+        """회로도를 섹션 단위로 출력합니다 (create_schematic의 스트리밍 버전).
+
+        섹션 인자는 문자열 또는 노드 문자열 목록/제너레이터입니다.
+        schematic_uuid를 주지 않으면 무작위 UUID를 사용합니다.
+        """
+        schematic_uuid = schematic_uuid or gen_uuid()
 
         # 타이틀 블록 기본값
         if title_block is None:
@@ -82,7 +128,51 @@ class SchematicTemplate:
                 comment1=f"Generated by kicad_auto_builder v{generator_version}",
             )
 
-        # 코멘트 섹션 생성
+        writer.write(SchematicTemplate._header(schematic_uuid, "A3", title_block, generator_version))
+        writer.lib_symbols(lib_symbols)
+        writer.section(components)
+        writer.section(wires)
+        writer.section(labels)
+        writer.section(texts)
+        writer.write(SchematicTemplate._ROOT_SHEET_INSTANCES)
+        writer.write(")\n")
+
+    @staticmethod
+    def write_file(
+        path: Path,
+        emit,
+        *args,
+        canonical: bool = False,
+        skip_unchanged: bool = False,
+        **kwargs,
+    ) -> Path:
+        """emit_* 함수의 출력을 파일에 원자적으로 씁니다 (임시 파일 + rename).
+
+        Args:
+            path: 출력 경로
+            emit: emit_schematic / emit_root_schematic / emit_sub_schematic
+            *args, **kwargs: emit 함수 인자 (writer 제외)
+            canonical: KiCad 저장 레이아웃으로 출력
+            skip_unchanged: 내용이 기존 파일과 같으면 교체하지 않음
+
+        Returns:
+            출력 경로
+        """
+        with atomic_write(path, canonical, skip_unchanged) as writer:
+            emit(writer, *args, **kwargs)
+        return Path(path)
+
+    # 루트 회로도의 sheet_instances 섹션
+    _ROOT_SHEET_INSTANCES = '''	(sheet_instances
+		(path "/"
+			(page "1")
+		)
+	)
+'''
+
+    @staticmethod
+    def _header(schematic_uuid: str, paper: str, title_block: TitleBlockInfo, generator_version: str) -> str:
+        """파일 헤더 ~ title_block 섹션."""
         comments = f'(comment 1 "{title_block.comment1}")\n' if title_block.comment1 else ''
         if title_block.comment2:
             comments += f'\t\t(comment 2 "{title_block.comment2}")\n'
@@ -92,7 +182,7 @@ class SchematicTemplate:
 	(generator "kicad_auto_builder")
 	(generator_version "{generator_version}")
 	(uuid "{schematic_uuid}")
-	(paper "A3")
+	(paper "{paper}")
 	(title_block
 		(title "{title_block.title}")
 		(date "{title_block.date}")
@@ -100,19 +190,6 @@ class SchematicTemplate:
 		(company "{title_block.company}")
 		{comments.rstrip()}
 	)
-	(lib_symbols
-{lib_symbols}
-	)
-{components}
-{wires}
-{labels}
-{texts}
-	(sheet_instances
-		(path "/"
-			(page "1")
-		)
-	)
-)
 '''
 
     @staticmethod
@@ -126,6 +203,7 @@ class SchematicTemplate:
         footprint: str = "",
         lcsc: str = "",
         project: str = "project",
+        uuid_key: tuple = (),
     ) -> str:
         """컴포넌트 인스턴스를 생성합니다.
 
@@ -138,12 +216,13 @@ class SchematicTemplate:
             footprint: 풋프린트 이름
             lcsc: LCSC 부품번호
             project: 프로젝트 이름
+            uuid_key: 결정적 UUID 키 (예: (project, sheet, ref)), 비어 있으면 무작위
 
         Returns:
             컴포넌트 인스턴스 문자열
         """
-        component_uuid = gen_uuid()
-        path_uuid = gen_uuid()
+        component_uuid = _key_uuid(uuid_key, "symbol")
+        path_uuid = _key_uuid(uuid_key, "path")
 
         lcsc_prop = ""
         if lcsc:
@@ -179,10 +258,11 @@ class SchematicTemplate:
         y: float,
         rotation: int = 0,
         project: str = "project",
+        uuid_key: tuple = (),
     ) -> str:
         """전원 심볼 인스턴스를 생성합니다."""
-        component_uuid = gen_uuid()
-        path_uuid = gen_uuid()
+        component_uuid = _key_uuid(uuid_key, "symbol")
+        path_uuid = _key_uuid(uuid_key, "path")
 
         return f'''	(symbol
 		(lib_id "{lib_id}")
@@ -206,25 +286,36 @@ class SchematicTemplate:
 	)'''
 
     @staticmethod
-    def create_wire(x1: float, y1: float, x2: float, y2: float) -> str:
+    def create_wire(x1: float, y1: float, x2: float, y2: float, uuid_key: tuple = ()) -> str:
         """와이어를 생성합니다."""
         return f'''	(wire
 		(pts (xy {x1} {y1}) (xy {x2} {y2}))
 		(stroke (width 0) (type default))
-		(uuid "{gen_uuid()}")
+		(uuid "{_key_uuid(uuid_key, "wire")}")
 	)'''
 
     @staticmethod
-    def create_label(name: str, x: float, y: float, rotation: int = 0) -> str:
-        """네트 라벨을 생성합니다."""
+    def create_junction(x: float, y: float, uuid_key: tuple = ()) -> str:
+        """정션(와이어 연결점)을 생성합니다."""
+        return f'''	(junction
+		(at {x} {y})
+		(diameter 0)
+		(color 0 0 0 0)
+		(uuid "{_key_uuid(uuid_key, "junction")}")
+	)'''
+
+    @staticmethod
+    def create_label(name: str, x: float, y: float, rotation: int = 0, uuid_key: tuple = ()) -> str:
+        """네트 라벨을 생성합니다 (180 / 270도는 KiCad처럼 오른쪽 정렬 - 글자가 앵커 바깥쪽으로)."""
+        justify = "right bottom" if rotation in (180, 270) else "left bottom"
         return f'''	(label "{name}"
 		(at {x} {y} {rotation})
 		(fields_autoplaced yes)
 		(effects
 			(font (size 1.27 1.27))
-			(justify left bottom)
+			(justify {justify})
 		)
-		(uuid "{gen_uuid()}")
+		(uuid "{_key_uuid(uuid_key, "label")}")
 	)'''
 
     @staticmethod
@@ -234,6 +325,7 @@ class SchematicTemplate:
         y: float,
         shape: str = "passive",
         rotation: int = 0,
+        uuid_key: tuple = (),
     ) -> str:
         """글로벌 라벨을 생성합니다.
 
@@ -242,6 +334,7 @@ class SchematicTemplate:
             x, y: 위치
             shape: 'input', 'output', 'bidirectional', 'passive'
             rotation: 회전 각도
+            uuid_key: 결정적 UUID 키, 비어 있으면 무작위
         """
         return f'''	(global_label "{name}"
 		(shape {shape})
@@ -251,11 +344,11 @@ class SchematicTemplate:
 			(font (size 1.27 1.27))
 			(justify left)
 		)
-		(uuid "{gen_uuid()}")
+		(uuid "{_key_uuid(uuid_key, "global_label")}")
 	)'''
 
     @staticmethod
-    def create_text(text: str, x: float, y: float, rotation: int = 0) -> str:
+    def create_text(text: str, x: float, y: float, rotation: int = 0, uuid_key: tuple = ()) -> str:
         """텍스트 주석을 생성합니다."""
         # 줄바꿈 이스케이프
         escaped_text = text.replace("\n", "\\n")
@@ -267,7 +360,7 @@ class SchematicTemplate:
 			(font (size 1.27 1.27))
 			(justify left)
 		)
-		(uuid "{gen_uuid()}")
+		(uuid "{_key_uuid(uuid_key, "text")}")
 	)'''
 
     @staticmethod
@@ -299,6 +392,7 @@ class SchematicTemplate:
         width: float = 30.0,
         height: float = 20.0,
         pins: list = None,
+        uuid_key: tuple = (),
     ) -> str:
         """루트 시트에 배치되는 서브시트 심볼을 생성합니다.
 
@@ -308,11 +402,12 @@ class SchematicTemplate:
             x, y: 위치
             width, height: 심볼 크기
             pins: 계층 핀 목록 [PortSpec, ...] 또는 [{"name": str, "type": str, "side": str}, ...]
+            uuid_key: 결정적 UUID 키 (예: (project, "root", sheet_name)), 비어 있으면 무작위
 
         Returns:
             sheet 심볼 문자열
         """
-        sheet_uuid = gen_uuid()
+        sheet_uuid = _key_uuid(uuid_key, "sheet")
 
         # 계층 핀 생성 (side에 따라 좌/우 배치)
         pins_str = ""
@@ -333,7 +428,7 @@ class SchematicTemplate:
 		(pin "{pin_name}" {pin_type}
 			(at {x} {pin_y} 180)
 			(effects (font (size 1.27 1.27)) (justify right))
-			(uuid "{gen_uuid()}")
+			(uuid "{_key_uuid(uuid_key, f"pin:{pin_name}")}")
 		)'''
                 pin_y += 2.54
 
@@ -350,7 +445,7 @@ class SchematicTemplate:
 		(pin "{pin_name}" {pin_type}
 			(at {x + width} {pin_y} 0)
 			(effects (font (size 1.27 1.27)) (justify left))
-			(uuid "{gen_uuid()}")
+			(uuid "{_key_uuid(uuid_key, f"pin:{pin_name}")}")
 		)'''
                 pin_y += 2.54
 
@@ -378,6 +473,7 @@ class SchematicTemplate:
         y: float,
         shape: str = "passive",
         rotation: int = 180,
+        uuid_key: tuple = (),
     ) -> str:
         """서브시트 내부의 계층 핀(포트)을 생성합니다.
 
@@ -389,6 +485,7 @@ class SchematicTemplate:
             x, y: 위치
             shape: 'input', 'output', 'bidirectional', 'passive'
             rotation: 회전 각도
+            uuid_key: 결정적 UUID 키, 비어 있으면 무작위
 
         Returns:
             hierarchical_label 문자열
@@ -401,7 +498,7 @@ class SchematicTemplate:
 			(font (size 1.27 1.27))
 			(justify right)
 		)
-		(uuid "{gen_uuid()}")
+		(uuid "{_key_uuid(uuid_key, "hierarchical_label")}")
 	)'''
 
     @staticmethod
@@ -426,7 +523,27 @@ class SchematicTemplate:
         Returns:
             루트 .kicad_sch 파일 내용
         """
-        schematic_uuid = gen_uuid()
+        return render(lambda writer: SchematicTemplate.emit_root_schematic(
+            writer, project_name, lib_symbols, sheet_symbols, texts, title_block, generator_version,
+        ))
+
+    @staticmethod
+    def emit_root_schematic(
+        writer: SchematicWriter,
+        project_name: str,
+        lib_symbols: Section,
+        sheet_symbols: Section,
+        texts: Section = "",
+        title_block: TitleBlockInfo = None,
+        generator_version: str = "1.0.0",
+        schematic_uuid: str = "",
+        labels: Section = "",
+    ):
+        """루트 회로도를 섹션 단위로 출력합니다 (create_root_schematic의 스트리밍 버전).
+
+        labels: 시트 핀 위의 로컬 라벨 (같은 이름의 시트 핀끼리 연결)
+        """
+        schematic_uuid = schematic_uuid or gen_uuid()
 
         # 타이틀 블록 기본값
         if title_block is None:
@@ -439,35 +556,13 @@ class SchematicTemplate:
                 comment1=f"Generated by kicad_auto_builder v{generator_version}",
             )
 
-        comments = f'(comment 1 "{title_block.comment1}")\n' if title_block.comment1 else ''
-        if title_block.comment2:
-            comments += f'\t\t(comment 2 "{title_block.comment2}")\n'
-
-        return f'''(kicad_sch
-	(version 20250114)
-	(generator "kicad_auto_builder")
-	(generator_version "{generator_version}")
-	(uuid "{schematic_uuid}")
-	(paper "A3")
-	(title_block
-		(title "{title_block.title}")
-		(date "{title_block.date}")
-		(rev "{title_block.rev}")
-		(company "{title_block.company}")
-		{comments.rstrip()}
-	)
-	(lib_symbols
-{lib_symbols}
-	)
-{sheet_symbols}
-{texts}
-	(sheet_instances
-		(path "/"
-			(page "1")
-		)
-	)
-)
-'''
+        writer.write(SchematicTemplate._header(schematic_uuid, "A3", title_block, generator_version))
+        writer.lib_symbols(lib_symbols)
+        writer.section(sheet_symbols)
+        writer.section(labels)
+        writer.section(texts)
+        writer.write(SchematicTemplate._ROOT_SHEET_INSTANCES)
+        writer.write(")\n")
 
     @staticmethod
     def create_sub_schematic(
@@ -501,6 +596,27 @@ class SchematicTemplate:
         Returns:
             서브시트 .kicad_sch 파일 내용
         """
+        return render(lambda writer: SchematicTemplate.emit_sub_schematic(
+            writer, sheet_name, project_name, lib_symbols, components, wires, labels,
+            hierarchical_pins, texts, sheet_uuid, title_block, generator_version,
+        ))
+
+    @staticmethod
+    def emit_sub_schematic(
+        writer: SchematicWriter,
+        sheet_name: str,
+        project_name: str,
+        lib_symbols: Section,
+        components: Section,
+        wires: Section = "",
+        labels: Section = "",
+        hierarchical_pins: Section = "",
+        texts: Section = "",
+        sheet_uuid: str = "",
+        title_block: TitleBlockInfo = None,
+        generator_version: str = "1.0.0",
+    ):
+        """서브시트를 섹션 단위로 출력합니다 (create_sub_schematic의 스트리밍 버전)."""
         schematic_uuid = sheet_uuid or gen_uuid()
 
         # 타이틀 블록 기본값
@@ -514,30 +630,11 @@ class SchematicTemplate:
                 comment1=f"Sub-sheet: {sheet_name}",
             )
 
-        comments = f'(comment 1 "{title_block.comment1}")\n' if title_block.comment1 else ''
-        if title_block.comment2:
-            comments += f'\t\t(comment 2 "{title_block.comment2}")\n'
-
-        return f'''(kicad_sch
-	(version 20250114)
-	(generator "kicad_auto_builder")
-	(generator_version "{generator_version}")
-	(uuid "{schematic_uuid}")
-	(paper "A4")
-	(title_block
-		(title "{title_block.title}")
-		(date "{title_block.date}")
-		(rev "{title_block.rev}")
-		(company "{title_block.company}")
-		{comments.rstrip()}
-	)
-	(lib_symbols
-{lib_symbols}
-	)
-{components}
-{wires}
-{labels}
-{hierarchical_pins}
-{texts}
-)
-'''
+        writer.write(SchematicTemplate._header(schematic_uuid, "A4", title_block, generator_version))
+        writer.lib_symbols(lib_symbols)
+        writer.section(components)
+        writer.section(wires)
+        writer.section(labels)
+        writer.section(hierarchical_pins)
+        writer.section(texts)
+        writer.write(")\n")
@@ -2,10 +2,14 @@
 Symbol Templates - KiCad 심볼 템플릿
 
 기본 심볼 정의 및 라이브러리 생성 기능.
+기본 심볼은 builtin_symbols.kicad_sym 리소스에 있으며 처음 사용할 때 읽습니다.
 """
 
+import re
 import uuid
-from typing import Optional
+from collections.abc import Mapping
+from importlib import resources
+from typing import Iterator, Optional
 
 
 def gen_uuid() -> str:
@@ -13,489 +17,57 @@ def gen_uuid() -> str:
     return str(uuid.uuid4())
 
 
-# 기본 심볼 정의 (KiCad 8 포맷)
-BUILTIN_SYMBOLS = {
-    "R": '''(symbol "R"
-    (pin_numbers hide)
-    (pin_names (offset 0))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "R" (at 2.032 0 90) (effects (font (size 1.27 1.27))))
-    (property "Value" "R" (at 0 0 90) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at -1.778 0 90) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "R_0_1"
-        (rectangle (start -1.016 -2.54) (end 1.016 2.54) (stroke (width 0.254) (type default)) (fill (type none)))
-    )
-    (symbol "R_1_1"
-        (pin passive line (at 0 5.08 270) (length 2.54) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 0 -5.08 90) (length 2.54) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+# 기본 심볼 정의 (KiCad 8 포맷) - 패키지 리소스 builtin_symbols.kicad_sym
+BUILTIN_SYMBOLS_RESOURCE = "builtin_symbols.kicad_sym"
 
-    "C": '''(symbol "C"
-    (pin_numbers hide)
-    (pin_names (offset 0.254))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "C" (at 0.635 2.54 0) (effects (font (size 1.27 1.27)) (justify left)))
-    (property "Value" "C" (at 0.635 -2.54 0) (effects (font (size 1.27 1.27)) (justify left)))
-    (property "Footprint" "" (at 0.9652 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "C_0_1"
-        (polyline (pts (xy -2.032 -0.762) (xy 2.032 -0.762)) (stroke (width 0.508) (type default)) (fill (type none)))
-        (polyline (pts (xy -2.032 0.762) (xy 2.032 0.762)) (stroke (width 0.508) (type default)) (fill (type none)))
-    )
-    (symbol "C_1_1"
-        (pin passive line (at 0 3.81 270) (length 2.794) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 0 -3.81 90) (length 2.794) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+# 리소스 파일에서 심볼은 줄 맨 앞(들여쓰기 없음)에서 시작
+_BUILTIN_HEAD_RE = re.compile(rb'^\(symbol "((?:[^"\\]|\\.)*)"', re.MULTILINE)
 
-    "CP": '''(symbol "CP"
-    (pin_numbers hide)
-    (pin_names (offset 0.254))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "C" (at 0.635 2.54 0) (effects (font (size 1.27 1.27)) (justify left)))
-    (property "Value" "CP" (at 0.635 -2.54 0) (effects (font (size 1.27 1.27)) (justify left)))
-    (property "Footprint" "" (at 0.9652 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "CP_0_1"
-        (rectangle (start -2.286 0.508) (end 2.286 1.016) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy -1.778 2.286) (xy -0.762 2.286)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy -1.27 1.778) (xy -1.27 2.794)) (stroke (width 0) (type default)) (fill (type none)))
-        (rectangle (start 2.286 -0.508) (end -2.286 -1.016) (stroke (width 0) (type default)) (fill (type outline)))
-    )
-    (symbol "CP_1_1"
-        (pin passive line (at 0 3.81 270) (length 2.794) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 0 -3.81 90) (length 2.794) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
 
-    "L": '''(symbol "L"
-    (pin_numbers hide)
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "L" (at -1.27 0 90) (effects (font (size 1.27 1.27))))
-    (property "Value" "L" (at 1.905 0 90) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "L_0_1"
-        (arc (start 0 -2.54) (mid 0.6323 -1.905) (end 0 -1.27) (stroke (width 0) (type default)) (fill (type none)))
-        (arc (start 0 -1.27) (mid 0.6323 -0.635) (end 0 0) (stroke (width 0) (type default)) (fill (type none)))
-        (arc (start 0 0) (mid 0.6323 0.635) (end 0 1.27) (stroke (width 0) (type default)) (fill (type none)))
-        (arc (start 0 1.27) (mid 0.6323 1.905) (end 0 2.54) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "L_1_1"
-        (pin passive line (at 0 5.08 270) (length 2.54) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 0 -5.08 90) (length 2.54) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+class BuiltinSymbols(Mapping):
+    """내장 심볼 정의 (이름 → 심볼 텍스트).
 
-    "LED": '''(symbol "LED"
-    (pin_numbers hide)
-    (pin_names (offset 1.016) hide)
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "D" (at 0 2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "LED" (at 0 -2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "LED_0_1"
-        (polyline (pts (xy -1.27 -1.27) (xy -1.27 1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
-        (polyline (pts (xy -1.27 0) (xy 1.27 0)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 1.27 -1.27) (xy 1.27 1.27) (xy -1.27 0) (xy 1.27 -1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
-    )
-    (symbol "LED_1_1"
-        (pin passive line (at -3.81 0 0) (length 2.54) (name "K" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 3.81 0 180) (length 2.54) (name "A" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    처음 조회할 때 리소스 파일을 읽어 심볼별 바이트 구간만 색인하고,
+    각 심볼 텍스트는 처음 요청될 때 디코딩해 보관합니다.
+    """
 
-    "D_Schottky": '''(symbol "D_Schottky"
-    (pin_numbers hide)
-    (pin_names (offset 1.016) hide)
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "D" (at 0 2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "D_Schottky" (at 0 -2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "D_Schottky_0_1"
-        (polyline (pts (xy 1.27 0) (xy -1.27 0)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 1.27 1.27) (xy 1.27 -1.27) (xy -1.27 0) (xy 1.27 1.27)) (stroke (width 0.254) (type default)) (fill (type none)))
-    )
-    (symbol "D_Schottky_1_1"
-        (pin passive line (at -3.81 0 0) (length 2.54) (name "K" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 3.81 0 180) (length 2.54) (name "A" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def __init__(self, resource: str = BUILTIN_SYMBOLS_RESOURCE):
+        self._resource = resource
+        self._data: Optional[bytes] = None
+        self._offsets: Optional[dict[str, tuple[int, int]]] = None
+        self._decoded: dict[str, str] = {}
 
-    "GND": '''(symbol "GND"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "GND" (at 0 -2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "GND_0_1"
-        (polyline (pts (xy 0 0) (xy 0 -1.27) (xy 1.27 -1.27) (xy 0 -2.54) (xy -1.27 -1.27) (xy 0 -1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "GND_1_1"
-        (pin power_in line (at 0 0 270) (length 0) (name "GND" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def _index(self) -> dict[str, tuple[int, int]]:
+        if self._offsets is None:
+            data = resources.files(__package__).joinpath(self._resource).read_bytes()
+            heads = [(m.start(), m.group(1).decode("utf-8")) for m in _BUILTIN_HEAD_RE.finditer(data)]
+            root_end = data.rfind(b")")
+            offsets = {}
+            for i, (start, name) in enumerate(heads):
+                limit = heads[i + 1][0] if i + 1 < len(heads) else root_end
+                offsets[name] = (start, data.rfind(b")", start, limit) + 1)
+            self._data = data
+            self._offsets = offsets
+        return self._offsets
 
-    "+5V": '''(symbol "+5V"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "+5V" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "+5V_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "+5V_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "+5V" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def __getitem__(self, name: str) -> str:
+        text = self._decoded.get(name)
+        if text is None:
+            start, end = self._index()[name]
+            text = self._decoded.setdefault(name, self._data[start:end].decode("utf-8"))
+        return text
 
-    "+3V3": '''(symbol "+3V3"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "+3V3" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "+3V3_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "+3V3_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "+3V3" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def __contains__(self, name) -> bool:
+        return name in self._index()
 
-    "Crystal": '''(symbol "Crystal"
-    (pin_numbers hide)
-    (pin_names (offset 1.016) hide)
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "Y" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "Crystal" (at 0 -3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "Crystal_0_1"
-        (rectangle (start -0.762 -1.524) (end 0.762 1.524) (stroke (width 0.254) (type default)) (fill (type none)))
-        (polyline (pts (xy -1.778 -1.778) (xy -1.778 1.778)) (stroke (width 0.254) (type default)) (fill (type none)))
-        (polyline (pts (xy 1.778 -1.778) (xy 1.778 1.778)) (stroke (width 0.254) (type default)) (fill (type none)))
-    )
-    (symbol "Crystal_1_1"
-        (pin passive line (at -5.08 0 0) (length 3.302) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 5.08 0 180) (length 3.302) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
 
-    "SW_Push": '''(symbol "SW_Push"
-    (pin_numbers hide)
-    (pin_names (offset 1.016) hide)
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "SW" (at 0 5.08 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "SW_Push" (at 0 -3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 5.08 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 5.08 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "SW_Push_0_1"
-        (circle (center -2.032 0) (radius 0.508) (stroke (width 0) (type default)) (fill (type none)))
-        (circle (center 2.032 0) (radius 0.508) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 1.27) (xy 0 3.048)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy -2.54 1.27) (xy 2.54 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "SW_Push_1_1"
-        (pin passive line (at -5.08 0 0) (length 2.54) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 5.08 0 180) (length 2.54) (name "2" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
+    def __len__(self) -> int:
+        return len(self._index())
 
-    "TestPoint": '''(symbol "TestPoint"
-    (pin_numbers hide)
-    (pin_names (offset 0.762) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "TP" (at 0 5.08 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "TestPoint" (at 0 2.54 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 5.08 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 5.08 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "TestPoint_0_1"
-        (circle (center 0 0) (radius 0.762) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "TestPoint_1_1"
-        (pin passive line (at 0 -2.54 90) (length 1.778) (name "1" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
 
-    # === 커넥터 심볼 ===
-    "Barrel_Jack": '''(symbol "Barrel_Jack"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "J" (at 0 6.35 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "Barrel_Jack" (at 0 -6.35 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 1.27 -1.27 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 1.27 -1.27 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "Barrel_Jack_0_1"
-        (rectangle (start -5.08 5.08) (end 5.08 -5.08) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "Barrel_Jack_1_1"
-        (pin passive line (at 7.62 2.54 180) (length 2.54) (name "+" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin passive line (at 7.62 -2.54 180) (length 2.54) (name "-" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    # === 전원 IC 심볼 ===
-    "LM2596S-5": '''(symbol "LM2596S-5"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "U" (at 0 10.16 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "LM2596S-5.0" (at 0 -10.16 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "Package_TO_SOT_SMD:TO-263-5_TabPin3" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "LM2596S-5_0_1"
-        (rectangle (start -7.62 7.62) (end 7.62 -7.62) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "LM2596S-5_1_1"
-        (pin power_in line (at -10.16 5.08 0) (length 2.54) (name "VIN" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin output line (at 10.16 5.08 180) (length 2.54) (name "OUT" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-        (pin power_in line (at 0 -10.16 90) (length 2.54) (name "GND" (effects (font (size 1.27 1.27)))) (number "3" (effects (font (size 1.27 1.27)))))
-        (pin input line (at 10.16 0 180) (length 2.54) (name "FB" (effects (font (size 1.27 1.27)))) (number "4" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -10.16 0 0) (length 2.54) (name "ON/OFF" (effects (font (size 1.27 1.27)))) (number "5" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    "LM2596S-ADJ": '''(symbol "LM2596S-ADJ"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "U" (at 0 10.16 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "LM2596S-ADJ" (at 0 -10.16 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "Package_TO_SOT_SMD:TO-263-5_TabPin3" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "LM2596S-ADJ_0_1"
-        (rectangle (start -7.62 7.62) (end 7.62 -7.62) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "LM2596S-ADJ_1_1"
-        (pin power_in line (at -10.16 5.08 0) (length 2.54) (name "VIN" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin output line (at 10.16 5.08 180) (length 2.54) (name "OUT" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-        (pin power_in line (at 0 -10.16 90) (length 2.54) (name "GND" (effects (font (size 1.27 1.27)))) (number "3" (effects (font (size 1.27 1.27)))))
-        (pin input line (at 10.16 0 180) (length 2.54) (name "FB" (effects (font (size 1.27 1.27)))) (number "4" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -10.16 0 0) (length 2.54) (name "ON/OFF" (effects (font (size 1.27 1.27)))) (number "5" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    # === 전원 심볼 ===
-    "+1V8": '''(symbol "+1V8"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "+1V8" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "+1V8_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "+1V8_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "+1V8" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    "+12V": '''(symbol "+12V"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "+12V" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "+12V_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "+12V_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "+12V" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    "VIN": '''(symbol "VIN"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "VIN" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "VIN_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "VIN_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "VIN" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    "VBUS": '''(symbol "VBUS"
-    (power)
-    (pin_numbers hide)
-    (pin_names (offset 0) hide)
-    (exclude_from_sim no)
-    (in_bom no)
-    (on_board yes)
-    (property "Reference" "#PWR" (at 0 -3.81 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Value" "VBUS" (at 0 3.81 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "VBUS_0_1"
-        (polyline (pts (xy -0.762 1.27) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 0) (xy 0 2.54)) (stroke (width 0) (type default)) (fill (type none)))
-        (polyline (pts (xy 0 2.54) (xy 0.762 1.27)) (stroke (width 0) (type default)) (fill (type none)))
-    )
-    (symbol "VBUS_1_1"
-        (pin power_in line (at 0 0 90) (length 0) (name "VBUS" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    # === USB 커넥터 심볼 ===
-    "USB_A": '''(symbol "USB_A"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "J" (at 0 6.35 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "USB_A" (at 0 -6.35 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 2.54 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 2.54 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "USB_A_0_1"
-        (rectangle (start -5.08 5.08) (end 5.08 -5.08) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "USB_A_1_1"
-        (pin power_out line (at 7.62 2.54 180) (length 2.54) (name "VBUS" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 7.62 0 180) (length 2.54) (name "D-" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 7.62 -2.54 180) (length 2.54) (name "D+" (effects (font (size 1.27 1.27)))) (number "3" (effects (font (size 1.27 1.27)))))
-        (pin power_in line (at 0 -7.62 90) (length 2.54) (name "GND" (effects (font (size 1.27 1.27)))) (number "4" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    # === USB Hub IC (USB5744) ===
-    "USB5744": '''(symbol "USB5744"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "U" (at 0 27.94 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "USB5744" (at 0 -27.94 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "USB5744_0_1"
-        (rectangle (start -12.7 26.67) (end 12.7 -26.67) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "USB5744_1_1"
-        (pin power_in line (at -15.24 22.86 0) (length 2.54) (name "VDD33" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin power_in line (at 0 -30.48 90) (length 3.81) (name "GND" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at -15.24 17.78 0) (length 2.54) (name "USB_DM_UP" (effects (font (size 1.27 1.27)))) (number "3" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at -15.24 15.24 0) (length 2.54) (name "USB_DP_UP" (effects (font (size 1.27 1.27)))) (number "4" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -15.24 7.62 0) (length 2.54) (name "XTALIN" (effects (font (size 1.27 1.27)))) (number "5" (effects (font (size 1.27 1.27)))))
-        (pin output line (at -15.24 5.08 0) (length 2.54) (name "XTALOUT" (effects (font (size 1.27 1.27)))) (number "6" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -15.24 0 0) (length 2.54) (name "RESET_N" (effects (font (size 1.27 1.27)))) (number "7" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 17.78 180) (length 2.54) (name "USB_DM_DN1" (effects (font (size 1.27 1.27)))) (number "8" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 15.24 180) (length 2.54) (name "USB_DP_DN1" (effects (font (size 1.27 1.27)))) (number "9" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 10.16 180) (length 2.54) (name "USB_DM_DN2" (effects (font (size 1.27 1.27)))) (number "10" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 7.62 180) (length 2.54) (name "USB_DP_DN2" (effects (font (size 1.27 1.27)))) (number "11" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 2.54 180) (length 2.54) (name "USB_DM_DN3" (effects (font (size 1.27 1.27)))) (number "12" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 0 180) (length 2.54) (name "USB_DP_DN3" (effects (font (size 1.27 1.27)))) (number "13" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 -5.08 180) (length 2.54) (name "USB_DM_DN4" (effects (font (size 1.27 1.27)))) (number "14" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 -7.62 180) (length 2.54) (name "USB_DP_DN4" (effects (font (size 1.27 1.27)))) (number "15" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-
-    # === USB PHY IC (USB3320) ===
-    "USB3320": '''(symbol "USB3320"
-    (pin_names (offset 1.016))
-    (exclude_from_sim no)
-    (in_bom yes)
-    (on_board yes)
-    (property "Reference" "U" (at 0 22.86 0) (effects (font (size 1.27 1.27))))
-    (property "Value" "USB3320" (at 0 -22.86 0) (effects (font (size 1.27 1.27))))
-    (property "Footprint" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (property "Datasheet" "" (at 0 0 0) (effects (font (size 1.27 1.27)) hide))
-    (symbol "USB3320_0_1"
-        (rectangle (start -12.7 21.59) (end 12.7 -21.59) (stroke (width 0.254) (type default)) (fill (type background)))
-    )
-    (symbol "USB3320_1_1"
-        (pin power_in line (at -15.24 17.78 0) (length 2.54) (name "VDD33" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
-        (pin power_in line (at 0 -25.4 90) (length 3.81) (name "GND" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at -15.24 12.7 0) (length 2.54) (name "DP" (effects (font (size 1.27 1.27)))) (number "3" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at -15.24 10.16 0) (length 2.54) (name "DM" (effects (font (size 1.27 1.27)))) (number "4" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -15.24 5.08 0) (length 2.54) (name "REFCLK" (effects (font (size 1.27 1.27)))) (number "5" (effects (font (size 1.27 1.27)))))
-        (pin input line (at -15.24 0 0) (length 2.54) (name "RESET_N" (effects (font (size 1.27 1.27)))) (number "6" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 17.78 180) (length 2.54) (name "DATA0" (effects (font (size 1.27 1.27)))) (number "7" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 15.24 180) (length 2.54) (name "DATA1" (effects (font (size 1.27 1.27)))) (number "8" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 12.7 180) (length 2.54) (name "DATA2" (effects (font (size 1.27 1.27)))) (number "9" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 10.16 180) (length 2.54) (name "DATA3" (effects (font (size 1.27 1.27)))) (number "10" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 7.62 180) (length 2.54) (name "DATA4" (effects (font (size 1.27 1.27)))) (number "11" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 5.08 180) (length 2.54) (name "DATA5" (effects (font (size 1.27 1.27)))) (number "12" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 2.54 180) (length 2.54) (name "DATA6" (effects (font (size 1.27 1.27)))) (number "13" (effects (font (size 1.27 1.27)))))
-        (pin bidirectional line (at 15.24 0 180) (length 2.54) (name "DATA7" (effects (font (size 1.27 1.27)))) (number "14" (effects (font (size 1.27 1.27)))))
-        (pin output line (at 15.24 -5.08 180) (length 2.54) (name "DIR" (effects (font (size 1.27 1.27)))) (number "15" (effects (font (size 1.27 1.27)))))
-        (pin output line (at 15.24 -7.62 180) (length 2.54) (name "NXT" (effects (font (size 1.27 1.27)))) (number "16" (effects (font (size 1.27 1.27)))))
-        (pin input line (at 15.24 -10.16 180) (length 2.54) (name "STP" (effects (font (size 1.27 1.27)))) (number "17" (effects (font (size 1.27 1.27)))))
-        (pin output line (at 15.24 -12.7 180) (length 2.54) (name "CLK" (effects (font (size 1.27 1.27)))) (number "18" (effects (font (size 1.27 1.27)))))
-    )
-)''',
-}
+BUILTIN_SYMBOLS = BuiltinSymbols()
 
 
 class SymbolTemplate:
@@ -0,0 +1,415 @@
+"""
+Wire Router - 넷별 직교 Steiner 트리 배선 v1.0
+
+라벨 좌표를 (y, x) 순으로 정렬해 L자로 이어 붙이는 대신, 넷마다 맨해튼 거리 기준
+최소 신장 트리를 키워 가며 배선합니다.
+
+- 새 단자는 지금까지 만든 트리(단자 + 배선이 지나는 모든 그리드 점) 중 가장 가까운 점에
+  연결하므로, 같은 넷의 배선은 줄기를 공유하는 Steiner 근사 트리가 됩니다
+  (넓은 전원 넷에서 겹치는 긴 배선이 사라짐)
+- 그리드 점유 맵으로 다른 넷의 단자/배선과 겹치거나 닿는 경로를 피합니다
+  (L자 두 방향 → 실패 시 Z자 우회 경로 순으로 후보를 평가)
+- 거리 계산(가장 가까운 트리 점 갱신)은 NumPy로 벡터화 (없으면 순수 파이썬으로 동작)
+- 넷별 총 배선 길이 / 세그먼트 수 / 피하지 못한 충돌 수를 보고
+- 세그먼트는 트리 분기점(간선 3개 이상)에서 나뉨 - KiCad 와이어는 끝점에서만 연결되므로
+  분기점마다 끝점이 모이고 정션을 놓을 수 있음
+
+Usage:
+    router = WireRouter(grid=2.54)
+    routes = router.route({"GND": [(50.8, 40.64), (91.44, 40.64)], ...})
+    for seg in routes["GND"].segments:
+        ...
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 순수 파이썬 거리 계산
+    np = None
+
+GridPoint = tuple[int, int]
+Segment = tuple[float, float, float, float]
+
+# Z자 우회 경로에서 단자 바깥으로 벗어날 최대 그리드 수
+DETOUR_SPAN = 3
+
+# 충돌을 피하지 못했을 때 다른 연결점으로 다시 시도할 트리 점 수
+REANCHOR_TRIES = 8
+
+
+@dataclass
+class NetRoute:
+    """넷 하나의 배선 결과."""
+    net: str
+    segments: list[Segment] = field(default_factory=list)  # mm 좌표 (x1, y1, x2, y2)
+    length: float = 0.0                                    # 총 배선 길이 (mm)
+    conflicts: int = 0                                     # 피하지 못한 다른 넷과의 접촉 수
+
+    def to_dict(self) -> dict:
+        """리포트용 요약."""
+        return {
+            "length_mm": round(self.length, 2),
+            "segments": len(self.segments),
+            "conflicts": self.conflicts,
+        }
+
+
+class WireRouter:
+    """그리드 점유 맵 기반 넷별 배선기.
+
+    그리드 좌표에서 수평 간선 (i, j)는 (i, j)-(i+1, j), 수직 간선 (i, j)는 (i, j)-(i, j+1)입니다.
+    """
+
+    def __init__(self, grid: float = 2.54):
+        """초기화.
+
+        Args:
+            grid: 그리드 크기 (mm) - 입력 좌표는 이 그리드에 스냅되어 있어야 함
+        """
+        self.grid = grid
+        self._terminal: dict[GridPoint, str] = {}   # 단자(라벨 위치) → 넷
+        self._h: dict[GridPoint, str] = {}          # 수평 간선 → 넷
+        self._v: dict[GridPoint, str] = {}          # 수직 간선 → 넷
+        self._point: dict[GridPoint, str] = {}      # 배선이 지나는 점 → 넷
+
+    def route(self, label_points: dict[str, list[tuple[float, float]]]) -> dict[str, NetRoute]:
+        """모든 넷을 배선합니다.
+
+        단자가 많은 넷부터 배선하고(넓은 전원 넷이 먼저 줄기를 잡음),
+        결과는 입력 넷 순서로 반환합니다.
+
+        Args:
+            label_points: {net_name: [(x, y), ...]} (mm, 그리드 스냅된 좌표)
+
+        Returns:
+            {net_name: NetRoute}
+        """
+        terminals = {
+            net: list(dict.fromkeys(self._to_grid(p) for p in points))
+            for net, points in label_points.items()
+        }
+        for net, points in terminals.items():
+            for p in points:
+                self._terminal.setdefault(p, net)
+
+        order = sorted(terminals, key=lambda n: (-len(terminals[n]), n))
+        routes = {net: self._route_net(net, terminals[net]) for net in order}
+        return {net: routes[net] for net in label_points}
+
+    # =========================================================================
+    # 넷 배선
+    # =========================================================================
+
+    def _route_net(self, net: str, terminals: list[GridPoint]) -> NetRoute:
+        result = NetRoute(net)
+        if len(terminals) < 2:
+            return result
+
+        own_h: set[GridPoint] = set()
+        own_v: set[GridPoint] = set()
+        own_points = {terminals[0]}
+        remaining = terminals[1:]
+        nearest = _Nearest(remaining)
+        nearest.update([terminals[0]])
+
+        while remaining:
+            # 트리에 가장 가까운 단자 → 그 단자에 가장 가까운 트리 점에 연결
+            k = nearest.closest()
+            target = remaining[k]
+            source = nearest.anchor(k)
+            remaining.pop(k)
+            nearest.remove(k)
+
+            path, conflicts = self._best_path(net, source, target, own_h, own_v)
+            if conflicts:
+                path, conflicts = self._reanchor(net, target, own_points, own_h, own_v, path, conflicts)
+            result.conflicts += conflicts
+            nearest.update(self._commit(net, path, own_h, own_v, own_points))
+
+        result.segments = self._merge_runs(own_h, own_v)
+        result.length = (len(own_h) + len(own_v)) * self.grid
+        return result
+
+    def _best_path(
+        self,
+        net: str,
+        a: GridPoint,
+        b: GridPoint,
+        own_h: set,
+        own_v: set,
+    ) -> tuple[list[GridPoint], int]:
+        """a → b 직교 경로 후보 중 (충돌 수, 새 배선 길이)가 가장 작은 경로.
+
+        Returns:
+            (꼭짓점 목록, 충돌 수)
+        """
+        (ax, ay), (bx, by) = a, b
+        candidates = [[a, (bx, ay), b], [a, (ax, by), b]]
+        best = min(((self._score(net, c, own_h, own_v), c) for c in candidates), key=lambda t: t[0])
+        if best[0][0] == 0:
+            return best[1], 0
+
+        # Z자 우회: 수직 줄기를 x = c로, 또는 수평 줄기를 y = r로 옮겨 다른 넷을 피함
+        lo_x, hi_x = min(ax, bx) - DETOUR_SPAN, max(ax, bx) + DETOUR_SPAN
+        lo_y, hi_y = min(ay, by) - DETOUR_SPAN, max(ay, by) + DETOUR_SPAN
+        xs = {x for x in (ax, bx, (ax + bx) // 2) for x in range(x - DETOUR_SPAN, x + DETOUR_SPAN + 1)}
+        ys = {y for y in (ay, by, (ay + by) // 2) for y in range(y - DETOUR_SPAN, y + DETOUR_SPAN + 1)}
+        detours = [[a, (c, ay), (c, by), b] for c in sorted(xs) if lo_x <= c <= hi_x]
+        detours += [[a, (ax, r), (bx, r), b] for r in sorted(ys) if lo_y <= r <= hi_y]
+        best = self._pick(net, detours, best, own_h, own_v)
+        if best[0][0] == 0:
+            return best[1], 0
+
+        # 라벨이 세로로 쌓인 열: 양 끝에서 옆으로 짧게 빠져나온 뒤 y = r로 건너감
+        escapes = [
+            [a, (c1, ay), (c1, r), (c2, r), (c2, by), b]
+            for c1 in _offsets(ax) for c2 in _offsets(bx) for r in sorted(ys) if lo_y <= r <= hi_y
+        ]
+        best = self._pick(net, escapes, best, own_h, own_v)
+        return best[1], best[0][0]
+
+    def _reanchor(
+        self,
+        net: str,
+        target: GridPoint,
+        own_points: set,
+        own_h: set,
+        own_v: set,
+        path: list[GridPoint],
+        conflicts: int,
+    ) -> tuple[list[GridPoint], int]:
+        """가장 가까운 트리 점에서 충돌 없이 연결하지 못하면, 다음으로 가까운 트리 점들에서 시도합니다."""
+        tx, ty = target
+        anchors = sorted(own_points, key=lambda p: (abs(p[0] - tx) + abs(p[1] - ty), p))
+        for anchor in anchors[1:1 + REANCHOR_TRIES]:
+            alt, alt_conflicts = self._best_path(net, anchor, target, own_h, own_v)
+            if alt_conflicts < conflicts:
+                path, conflicts = alt, alt_conflicts
+                if not conflicts:
+                    break
+        return path, conflicts
+
+    def _pick(self, net: str, paths: list, best: tuple, own_h: set, own_v: set) -> tuple:
+        """후보 경로들 중 best보다 나은 것이 있으면 교체합니다 (같은 점수면 먼저 평가한 경로)."""
+        for path in paths:
+            score = self._score(net, path, own_h, own_v, limit=best[0][0])
+            if score < best[0]:
+                best = (score, path)
+        return best
+
+    def _score(
+        self,
+        net: str,
+        path: list[GridPoint],
+        own_h: set,
+        own_v: set,
+        limit: Optional[int] = None,
+    ) -> tuple[int, int]:
+        """(다른 넷과의 충돌 수, 이 넷에 새로 추가되는 간선 수).
+
+        Args:
+            limit: 충돌 수가 이 값을 넘으면 더 세지 않고 바로 반환 (이미 더 나은 후보가 있음)
+        """
+        conflicts = 0
+        new_edges = 0
+        h, v, point, terminal = self._h, self._v, self._point, self._terminal
+
+        for kind, edge in _unit_edges(path):
+            owner = (h if kind == "h" else v).get(edge)
+            if owner is None:
+                new_edges += edge not in (own_h if kind == "h" else own_v)
+            elif owner != net:
+                conflicts += 1  # 다른 넷 배선과 같은 축으로 겹침
+                if limit is not None and conflicts > limit:
+                    return conflicts, new_edges
+
+        for p, straight in _path_points(path):
+            term = terminal.get(p)
+            if term is not None and term != net:
+                conflicts += 1  # 다른 넷 라벨 위를 지남
+            other = point.get(p)
+            if other is not None and other != net and not self._is_crossing(p, straight):
+                conflicts += 1  # 다른 넷 배선의 끝/꺾임점에 닿음
+            if limit is not None and conflicts > limit:
+                break
+
+        return conflicts, new_edges
+
+    def _is_crossing(self, p: GridPoint, straight: Optional[str]) -> bool:
+        """p에서 후보 경로와 기존 배선이 서로 수직으로 곧게 지나가기만 하는지 (연결 아님)."""
+        if straight is None:
+            return False
+        x, y = p
+        through_h = (x - 1, y) in self._h and (x, y) in self._h
+        through_v = (x, y - 1) in self._v and (x, y) in self._v
+        touches_h = (x - 1, y) in self._h or (x, y) in self._h
+        touches_v = (x, y - 1) in self._v or (x, y) in self._v
+        if straight == "h":
+            return through_v and not touches_h
+        return through_h and not touches_v
+
+    def _commit(
+        self,
+        net: str,
+        path: list[GridPoint],
+        own_h: set,
+        own_v: set,
+        own_points: set,
+    ) -> list[GridPoint]:
+        """경로를 점유 맵에 기록하고, 새로 트리에 들어간 점을 반환합니다."""
+        for kind, edge in _unit_edges(path):
+            if kind == "h":
+                own_h.add(edge)
+                self._h.setdefault(edge, net)
+            else:
+                own_v.add(edge)
+                self._v.setdefault(edge, net)
+        added = []
+        for p, _ in _path_points(path):
+            self._point.setdefault(p, net)
+            if p not in own_points:
+                own_points.add(p)
+                added.append(p)
+        return added
+
+    def _merge_runs(self, own_h: set, own_v: set) -> list[Segment]:
+        """간선 집합을 행/열별 연속 구간(세그먼트)으로 합칩니다 (분기점에서는 나눔)."""
+        degree: dict[GridPoint, int] = {}
+        for i, j in own_h:
+            for p in ((i, j), (i + 1, j)):
+                degree[p] = degree.get(p, 0) + 1
+        for i, j in own_v:
+            for p in ((i, j), (i, j + 1)):
+                degree[p] = degree.get(p, 0) + 1
+        branches = {p for p, d in degree.items() if d >= 3}
+
+        g = self.grid
+        segments = []
+        for (i, j), length in _runs(own_h, axis=0, breaks=branches):
+            segments.append((i * g, j * g, (i + length) * g, j * g))
+        for (i, j), length in _runs(own_v, axis=1, breaks=branches):
+            segments.append((i * g, j * g, i * g, (j + length) * g))
+        return segments
+
+    def _to_grid(self, point: tuple[float, float]) -> GridPoint:
+        return round(point[0] / self.grid), round(point[1] / self.grid)
+
+
+def _offsets(x: int) -> list[int]:
+    """x 양옆으로 1 ~ DETOUR_SPAN 그리드 떨어진 좌표."""
+    return [x + d * k for k in range(1, DETOUR_SPAN + 1) for d in (1, -1)]
+
+
+def _unit_edges(path: list[GridPoint]):
+    """꼭짓점 목록을 단위 간선 ("h" | "v", 간선)으로 펼칩니다."""
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        if y0 == y1:
+            for x in range(min(x0, x1), max(x0, x1)):
+                yield "h", (x, y0)
+        else:
+            for y in range(min(y0, y1), max(y0, y1)):
+                yield "v", (x0, y)
+
+
+def _path_points(path: list[GridPoint]):
+    """경로가 지나는 그리드 점과, 그 점에서 경로가 곧게 지나가는 축("h" | "v")을 반환합니다.
+
+    끝점과 꺾임점의 축은 None입니다.
+    """
+    corners = [p for i, p in enumerate(path) if i == 0 or p != path[i - 1]]
+    yield corners[0], None
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:]):
+        axis = "h" if y0 == y1 else "v"
+        n = abs(x1 - x0) + abs(y1 - y0)
+        dx, dy = (x1 > x0) - (x1 < x0), (y1 > y0) - (y1 < y0)
+        for k in range(1, n):
+            yield (x0 + k * dx, y0 + k * dy), axis
+        yield (x1, y1), None
+
+
+def _runs(edges: set, axis: int, breaks: set = frozenset()):
+    """같은 행(axis=0) / 열(axis=1)의 연속 간선을 ((시작점), 길이)로 묶습니다.
+
+    breaks의 점에서는 연속이어도 구간을 나눕니다.
+    """
+    if axis == 0:
+        ordered = sorted(edges, key=lambda e: (e[1], e[0]))
+    else:
+        ordered = sorted(edges)
+    start = prev = None
+    length = 0
+    for e in ordered:
+        if prev is not None and e not in breaks and (
+            (axis == 0 and e == (prev[0] + 1, prev[1])) or
+            (axis == 1 and e == (prev[0], prev[1] + 1))
+        ):
+            length += 1
+        else:
+            if start is not None:
+                yield start, length
+            start, length = e, 1
+        prev = e
+    if start is not None:
+        yield start, length
+
+
+class _Nearest:
+    """남은 단자마다 트리에서 가장 가까운 점(맨해튼 거리)을 유지합니다.
+
+    트리에 점이 추가될 때마다 (남은 단자 수 × 새 점 수) 거리 행렬로 한 번에 갱신합니다.
+    """
+
+    def __init__(self, terminals: list[GridPoint]):
+        self.terminals = list(terminals)
+        if np is not None:
+            self._t = np.array(terminals, dtype=np.int64).reshape(-1, 2)
+            self._best = np.full(len(terminals), np.iinfo(np.int64).max, dtype=np.int64)
+            self._anchor = np.zeros((len(terminals), 2), dtype=np.int64)
+        else:
+            self._best = [float("inf")] * len(terminals)
+            self._anchor = [None] * len(terminals)
+
+    def update(self, points: list[GridPoint]):
+        """트리에 새로 들어간 점들로 최근접 거리를 갱신합니다."""
+        if not points or not self.terminals:
+            return
+        if np is not None:
+            p = np.array(points, dtype=np.int64).reshape(-1, 2)
+            d = np.abs(self._t[:, None, :] - p[None, :, :]).sum(axis=2)
+            idx = d.argmin(axis=1)
+            dmin = d[np.arange(len(idx)), idx]
+            better = dmin < self._best
+            self._best[better] = dmin[better]
+            self._anchor[better] = p[idx[better]]
+            return
+        for k, (tx, ty) in enumerate(self.terminals):
+            for p in points:
+                d = abs(tx - p[0]) + abs(ty - p[1])
+                if d < self._best[k]:
+                    self._best[k] = d
+                    self._anchor[k] = p
+
+    def closest(self) -> int:
+        """트리에 가장 가까운 남은 단자의 인덱스 (같으면 앞쪽)."""
+        if np is not None:
+            return int(self._best.argmin())
+        return min(range(len(self._best)), key=self._best.__getitem__)
+
+    def anchor(self, k: int) -> GridPoint:
+        """단자 k에 가장 가까운 트리 점."""
+        if np is not None:
+            return tuple(int(v) for v in self._anchor[k])
+        return self._anchor[k]
+
+    def remove(self, k: int):
+        """연결된 단자를 제거합니다."""
+        self.terminals.pop(k)
+        if np is not None:
+            self._t = np.delete(self._t, k, axis=0)
+            self._best = np.delete(self._best, k)
+            self._anchor = np.delete(self._anchor, k, axis=0)
+        else:
+            self._best.pop(k)
+            self._anchor.pop(k)
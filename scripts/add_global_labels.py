@@ -7,7 +7,12 @@ No CSV filtering - ALL pins get global labels.
 
 import uuid
 import os
-import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.document import SchematicDocument
 
 PROJECT_DIR = r"D:\git2\fcBoardKicad"
 CONNECTOR_SCH = os.path.join(PROJECT_DIR, "connector.kicad_sch")
@@ -24,66 +29,40 @@ def generate_uuid():
     """Generate a new UUID for KiCad."""
     return str(uuid.uuid4())
 
-def parse_symbol_pins(content, lib_id):
+def parse_symbol_pins(doc, lib_id):
     """Parse symbol definition to extract all pin info.
     Returns dict: {pin_number: (pin_name, rel_x, rel_y, angle)}
     """
     pins = {}
 
     # Find the symbol definition
-    symbol_start = content.find(f'(symbol "{lib_id}"')
-    if symbol_start == -1:
+    symbol = doc.lib_symbol(lib_id)
+
+    if symbol is None:
         print(f"Warning: Symbol {lib_id} not found")
         return pins
 
-    # Find the end of this symbol
-    depth = 0
-    symbol_end = symbol_start
-    for i in range(symbol_start, len(content)):
-        if content[i] == '(':
-            depth += 1
-        elif content[i] == ')':
-            depth -= 1
-            if depth == 0:
-                symbol_end = i
-                break
-
-    symbol_content = content[symbol_start:symbol_end]
-
-    # Pattern to find pin definitions with name and coordinates
-    # (pin bidirectional line (at x y angle) (length ...) (name "PIN_NAME" ...) (number "NUM" ...)
-    pattern = r'\(pin\s+\w+\s+\w+\s*\n?\s*\(at\s+([-\d.]+)\s+([-\d.]+)\s+(\d+)\).*?\(name\s+"([^"]+)".*?\(number\s+"(\d+)"'
-
-    for match in re.finditer(pattern, symbol_content, re.DOTALL):
-        rel_x = float(match.group(1))
-        rel_y = float(match.group(2))
-        angle = int(match.group(3))
-        pin_name = match.group(4)
-        pin_num = match.group(5)
-        pins[pin_num] = (pin_name, rel_x, rel_y, angle)
+    # (pin bidirectional line (at x y angle) (length ...) (name "PIN_NAME" ...) (number "NUM" ...))
+    for pin in symbol.iter('pin'):
+        rel_x, rel_y, angle = pin.at()
+        pin_name = pin.get('name')
+        pin_num = pin.get('number')
+        if pin_name is None or pin_num is None:
+            continue
+        pins[pin_num] = (pin_name, rel_x, rel_y, int(angle))
 
     return pins
 
-def parse_symbol_instances(content):
+def parse_symbol_instances(doc):
     """Parse symbol instances to get positions.
     Returns dict: {lib_id: (x, y, rotation, ref)}
     """
     instances = {}
 
-    # Pattern: (symbol (lib_id "...") (at x y rot) ... (property "Reference" "Jxx"
-    pattern = r'\(symbol\s*\n?\s*\(lib_id\s+"([^"]+)"\)\s*\n?\s*\(at\s+([-\d.]+)\s+([-\d.]+)\s*(\d*)\)'
-
-    for match in re.finditer(pattern, content):
-        lib_id = match.group(1)
-        x = float(match.group(2))
-        y = float(match.group(3))
-        rot = int(match.group(4)) if match.group(4) else 0
-
-        # Find reference
-        ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', content[match.end():match.end()+500])
-        ref = ref_match.group(1) if ref_match else ""
-
-        instances[lib_id] = (x, y, rot, ref)
+    for sym in doc.symbols:
+        x, y, rot = sym.at()
+        ref = sym.property('Reference', '')
+        instances[sym.get('lib_id')] = (x, y, int(rot), ref)
 
     return instances
 
@@ -142,12 +121,12 @@ def main():
     print("Adding global labels to connector.kicad_sch...")
     print("Mode: ALL pins (including GND, +12V, VCCO)")
 
-    # Read current schematic
-    with open(CONNECTOR_SCH, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Read current schematic once; instances and symbol definitions
+    # come from the same indexed document
+    doc = SchematicDocument.load(CONNECTOR_SCH)
 
     # Parse symbol instances (get symbol positions)
-    instances = parse_symbol_instances(content)
+    instances = parse_symbol_instances(doc)
     print(f"\nFound {len(instances)} symbol instances")
     for lib_id, (x, y, rot, ref) in instances.items():
         if 'ACU5EV' in lib_id:
@@ -166,7 +145,7 @@ def main():
         print(f"\nProcessing {conn_name} ({ref}) at ({symbol_x}, {symbol_y}) rot={symbol_rot}...")
 
         # Parse symbol definition for pin positions and names
-        symbol_pins = parse_symbol_pins(content, lib_id)
+        symbol_pins = parse_symbol_pins(doc, lib_id)
         print(f"  Found {len(symbol_pins)} pins in symbol definition")
 
         for pin_num, (pin_name, rel_x, rel_y, pin_angle) in symbol_pins.items():
@@ -218,14 +197,11 @@ def main():
     print(f"\nTotal: {len(all_labels)} labels, {len(all_wires)} wires")
 
     # Insert labels and wires before the closing parenthesis
-    insert_pos = content.rfind(')')
-    new_content = '\n'.join(all_labels) + '\n' + '\n'.join(all_wires) + '\n'
-    content = content[:insert_pos] + new_content + content[insert_pos:]
+    doc.add_items('\n'.join(all_labels) + '\n' + '\n'.join(all_wires) + '\n')
 
     # Write to new file
     output_file = CONNECTOR_SCH.replace('.kicad_sch', '_with_labels.kicad_sch')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    doc.save(output_file)
 
     print(f"\nOutput written to: {output_file}")
 
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared S-expression parser vs. the legacy per-script regexes
+
+Replays the extraction work of the annotate -> ERC -> footprint -> BOM tools
+(plus verify_connections_v2 and add_global_labels), each of which used to
+re-scan the file with its own DOTALL regexes, and compares it against one
+pass of kicad_auto_builder.sexpr serving every step from the same tree.
+
+The main gain of the shared parser is deduplication: one tree with offsets
+instead of six hand-written regex sets that each break on a different
+formatting change. Speed is roughly at parity. parse() only indexes the
+top-level sections, and items are tokenized when first touched. Expanding
+every lib_symbols pin then costs about as much as the legacy pin regex.
+Measured with --repeat 20:
+connector_with_labels 1.1-1.2x, fcBoard_USB 1.0-1.1x, fcBoard 1.0x.
+
+Usage:
+    python scripts/bench_sexpr.py [schematic.kicad_sch] [--repeat N]
+
+The parse() line times the parse alone, without extraction. The mmap line
+times kicad_auto_builder.loader reading only the symbol instances, which
+never tokenizes lib_symbols.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from kicad_auto_builder.sexpr import parse, iter_instance_symbols
+from kicad_auto_builder.loader import open_sheet
+
+DEFAULT_SCHEMATIC = ROOT_DIR / "connector_with_labels.kicad_sch"
+
+
+# =========================================================================
+# LEGACY (regex) EXTRACTION - copied from the scripts before the parser
+# =========================================================================
+
+def legacy_symbols(content):
+    """kicad_tools.parse_schematic"""
+    components = []
+    symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
+    for match in re.finditer(symbol_pattern, content, re.DOTALL):
+        inner = match.group(2)
+        ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', inner)
+        val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', inner)
+        fp_match = re.search(r'\(property\s+"Footprint"\s+"([^"]*)"', inner)
+        at_match = re.search(r'\(at\s+([\d.-]+)\s+([\d.-]+)', inner)
+        components.append((
+            match.group(1),
+            ref_match.group(1) if ref_match else "?",
+            val_match.group(1) if val_match else "",
+            fp_match.group(1) if fp_match else "",
+            float(at_match.group(1)) if at_match else 0,
+            float(at_match.group(2)) if at_match else 0,
+        ))
+    return components
+
+
+def legacy_lib_symbols_end(content):
+    """verify_connections_v2 / fix_annotations_v2 char-by-char loop"""
+    start = content.find('(lib_symbols')
+    if start == -1:
+        return 0
+    depth = 0
+    for i, c in enumerate(content[start:], start):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return 0
+
+
+def legacy_pins(content):
+    """add_global_labels.parse_symbol_pins (all symbols)"""
+    pattern = (r'\(pin\s+\w+\s+\w+\s*\n?\s*\(at\s+([-\d.]+)\s+([-\d.]+)\s+(\d+)\)'
+               r'.*?\(name\s+"([^"]+)".*?\(number\s+"(\d+)"')
+    return [m.groups() for m in re.finditer(pattern, content, re.DOTALL)]
+
+
+def legacy_labels(content):
+    """verify_connections_v2.parse_schematic"""
+    lib_end = legacy_lib_symbols_end(content)
+    instance_content = content[lib_end:]
+    wires = len(re.findall(r'\(wire\s+\(pts', instance_content))
+    labels = re.findall(r'\(label\s+"([^"]+)"\s*\n?\s*\(at\s+([\d.-]+)\s+([\d.-]+)', content)
+    glabels = re.findall(r'\(global_label\s+"([^"]+)"', content)
+    return wires, labels, glabels
+
+
+def legacy_assign_footprints(content):
+    """kicad_tools.assign_footprints (symbol regex + per-block re.sub)"""
+    symbol_pattern = r'(\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?))\n\t\)\n'
+
+    def replace_footprint(match):
+        full_match = match.group(0)
+        re.search(r'\(property\s+"Reference"\s+"([^"]+)"', match.group(3))
+        re.search(r'\(property\s+"Value"\s+"([^"]+)"', match.group(3))
+        return re.sub(r'(\(property\s+"Footprint"\s+)"([^"]*)"', r'\1"\2"', full_match)
+
+    return re.sub(symbol_pattern, replace_footprint, content, flags=re.DOTALL)
+
+
+def run_legacy(content):
+    """annotate -> ERC -> footprint -> BOM -> verify, each step re-scanning"""
+    symbols = legacy_symbols(content)           # annotate
+    legacy_symbols(content)                     # ERC
+    content.upper()                             # ERC power label check
+    legacy_assign_footprints(content)           # footprint assignment
+    legacy_symbols(content)                     # BOM
+    lib_end = legacy_lib_symbols_end(content)   # verify_connections_v2
+    labels = legacy_labels(content)
+    pins = legacy_pins(content)                 # add_global_labels
+    return symbols, lib_end, pins, labels
+
+
+# =========================================================================
+# SHARED PARSER
+# =========================================================================
+
+def run_parser(content):
+    """The same steps served from one parse of the file"""
+    root = parse(content)
+
+    symbols = []
+    for sym in iter_instance_symbols(root):
+        x, y, _ = sym.at()
+        symbols.append((
+            sym.get('lib_id'),
+            sym.property('Reference', '?'),
+            sym.property('Value', ''),
+            sym.property('Footprint', ''),
+            x,
+            y,
+        ))
+
+    lib_symbols = root.find('lib_symbols')
+    lib_end = lib_symbols.end if lib_symbols is not None else 0
+
+    pins = []
+    if lib_symbols is not None:
+        for pin in lib_symbols.iter('pin'):
+            pins.append((pin.get('name'), pin.get('number')))
+
+    wires = len(root.find_all('wire'))
+    labels = root.find_all('label')
+    glabels = root.find_all('global_label')
+
+    return symbols, lib_end, pins, (wires, labels, glabels)
+
+
+def run_lazy(path):
+    """Instances only, from the memory-mapped file (lib_symbols skipped)"""
+    with open_sheet(path) as sheet:
+        return [sym.property('Reference', '?') for sym in sheet.instance_symbols()]
+
+
+def bench(func, content, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("schematic", nargs="?", default=str(DEFAULT_SCHEMATIC))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = Path(args.schematic)
+    content = path.read_text(encoding='utf-8')
+
+    print("=" * 60)
+    print(f"S-expression benchmark: {path.name} ({len(content.encode('utf-8')) / 1024:.0f} KB)")
+    print("=" * 60)
+
+    legacy_time, legacy = bench(run_legacy, content, args.repeat)
+    parser_time, parsed = bench(run_parser, content, args.repeat)
+    parse_time, _ = bench(parse, content, args.repeat)
+    lazy_time, lazy = bench(run_lazy, path, args.repeat)
+
+    print(f"  legacy regexes : {legacy_time * 1000:8.1f} ms")
+    print(f"  shared parser  : {parser_time * 1000:8.1f} ms")
+    print(f"  speedup        : {legacy_time / parser_time:8.1f}x")
+    print(f"  parse() only   : {parse_time * 1000:8.1f} ms (sections indexed, items lazy)")
+    print(f"  mmap instances : {lazy_time * 1000:8.1f} ms (file read included)")
+
+    # Cross-check: both paths must see the same design
+    print("")
+    print(f"  symbols        : legacy={len(legacy[0])} parser={len(parsed[0])} mmap={len(lazy)}")
+    print(f"  lib_symbols end: legacy={legacy[1]} parser={parsed[1]}")
+    print(f"  pins           : legacy={len(legacy[2])} parser={len(parsed[2])}")
+    print(f"  wires          : legacy={legacy[3][0]} parser={parsed[3][0]}")
+    print(f"  global labels  : legacy={len(legacy[3][2])} parser={len(parsed[3][2])}")
+
+
+if __name__ == "__main__":
+    main()
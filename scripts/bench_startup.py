@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: kicad_auto_builder CLI startup time
+
+Runs the commands used by the editor-save hook and the --dry-run path in a
+fresh interpreter several times and reports the best / median wall time.
+The "python -c pass" line is the interpreter's own startup, for reference.
+
+Usage:
+    python scripts/bench_startup.py [config.yaml] [--repeat N] [--importtime]
+
+--importtime additionally prints the slowest kicad_auto_builder / third-party
+imports of each command (python -X importtime, cumulative microseconds).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG = ROOT_DIR / "kicad_auto_builder" / "examples" / "hierarchical_board.yaml"
+
+
+def commands(config: Path) -> list[tuple[str, list[str]]]:
+    cli = ["-m", "kicad_auto_builder.cli"]
+    return [
+        ("python -c pass", ["-c", "pass"]),
+        ("cli --help", cli + ["--help"]),
+        ("cli build --dry-run", cli + ["build", str(config), "--dry-run"]),
+        ("cli validate --offline", cli + ["validate", str(config), "--offline"]),
+    ]
+
+
+def run(args: list[str], cwd: str, env: dict, extra: list[str] = ()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra, *args],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+
+
+def time_command(args: list[str], cwd: str, env: dict, repeat: int) -> list[float]:
+    run(args, cwd, env)  # warm the OS file cache / __pycache__
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run(args, cwd, env)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def top_imports(args: list[str], cwd: str, env: dict, limit: int = 8) -> list[tuple[int, str]]:
+    result = run(args, cwd, env, extra=["-X", "importtime"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # outermost imports only (nested ones are included in their parent's time)
+        if len(name) - len(name.lstrip()) > 1:
+            continue
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("config", nargs="?", type=Path, default=DEFAULT_CONFIG)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT_DIR), env.get("PYTHONPATH")]))
+
+    # validate --offline uses ./cache; keep it out of the repository
+    with tempfile.TemporaryDirectory() as cwd:
+        print(f"config: {args.config}")
+        print(f"{'command':<26} {'best':>9} {'median':>9}")
+        for label, cmd in commands(args.config.resolve()):
+            samples = time_command(cmd, cwd, env, args.repeat)
+            print(f"{label:<26} {min(samples) * 1000:>7.1f}ms {statistics.median(samples) * 1000:>7.1f}ms")
+
+        if args.importtime:
+            for label, cmd in commands(args.config.resolve())[1:]:
+                print(f"\n{label} - slowest imports (cumulative us)")
+                for us, name in top_imports(cmd, cwd, env):
+                    print(f"  {us:>8}  {name}")
+
+
+if __name__ == "__main__":
+    main()
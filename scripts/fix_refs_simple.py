@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """
 Simple fix: Replace all X? with sequential numbers across all files
+
+Existing numbered references are kept; each X? (and any duplicate) gets the
+first free number of its prefix from the shared annotation engine.
 """
 
-import re
 import os
-from collections import defaultdict
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.annotator import Annotator
+from kicad_auto_builder.loader import open_sheet
 
 PROJECT_DIR = r"D:\git2\fcBoardKicad"
 
@@ -25,88 +33,39 @@ def main():
     print("Simple Reference Fix")
     print("=" * 60)
 
-    # Global counters
-    counters = defaultdict(int)
-
-    # First, find the highest existing number for each prefix
-    print("\n[Step 1] Finding existing references...")
-
-    for sch_file in SCHEMATIC_FILES:
-        filepath = os.path.join(PROJECT_DIR, sch_file)
-        if not os.path.exists(filepath):
-            continue
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        for prefix in PREFIXES:
-            # Find all existing numbered references
-            pattern = rf'"{prefix}(\d+)"'
-            for match in re.finditer(pattern, content):
-                num = int(match.group(1))
-                if num > counters[prefix]:
-                    counters[prefix] = num
+    paths = [
+        os.path.join(PROJECT_DIR, sch_file)
+        for sch_file in SCHEMATIC_FILES
+        if os.path.exists(os.path.join(PROJECT_DIR, sch_file))
+    ]
 
-    print("  Current max:")
-    for prefix in sorted(counters.keys()):
-        if counters[prefix] > 0:
-            print(f"    {prefix}: {counters[prefix]}")
+    print("\n[Step 1] Replacing X? patterns...")
 
-    # Now replace all X? patterns
-    print("\n[Step 2] Replacing X? patterns...")
+    result = Annotator(keep_existing=True, prefixes=PREFIXES).annotate(paths)
 
-    for sch_file in SCHEMATIC_FILES:
-        filepath = os.path.join(PROJECT_DIR, sch_file)
-        if not os.path.exists(filepath):
-            continue
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        changes = 0
-        original = content
-
-        for prefix in PREFIXES:
-            # Replace "X?" with sequential numbers
-            pattern = rf'"{prefix}\?"'
-
-            def replacer(match):
-                nonlocal changes
-                counters[prefix] += 1
-                changes += 1
-                return f'"{prefix}{counters[prefix]}"'
-
-            content = re.sub(pattern, replacer, content)
-
-        if content != original:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+    for filepath in paths:
+        sch_file = os.path.basename(filepath)
+        changes = sum(1 for c in result.changes if c.sheet == sch_file)
+        if changes:
             print(f"  {sch_file}: {changes} references fixed")
         else:
             print(f"  {sch_file}: no changes needed")
 
     # Final counts
-    print("\n[Step 3] Final reference ranges:")
-    for prefix in sorted(counters.keys()):
-        if counters[prefix] > 0:
-            print(f"    {prefix}: 1-{counters[prefix]}")
+    print("\n[Step 2] Final reference ranges:")
+    for prefix in sorted(result.ranges.keys()):
+        print(f"    {prefix}: 1-{result.ranges[prefix]}")
 
     # Verify
-    print("\n[Step 4] Verification...")
+    print("\n[Step 3] Verification...")
     remaining = 0
 
-    for sch_file in SCHEMATIC_FILES:
-        filepath = os.path.join(PROJECT_DIR, sch_file)
-        if not os.path.exists(filepath):
-            continue
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+    for filepath in paths:
+        sch_file = os.path.basename(filepath)
 
-        file_remaining = 0
-        for prefix in PREFIXES:
-            matches = re.findall(rf'"{prefix}\?"', content)
-            file_remaining += len(matches)
+        with open_sheet(filepath) as sheet:
+            refs = [sym.property('Reference', '') for sym in sheet.instance_symbols()]
+        file_remaining = sum(1 for ref in refs if ref.endswith('?') and ref[:-1] in PREFIXES)
 
         if file_remaining > 0:
             print(f"  WARNING: {sch_file} has {file_remaining} remaining ?")
@@ -16,9 +16,15 @@ Usage:
 
 import uuid
 import hashlib
+import sys
 from pathlib import Path
 from typing import Optional
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from kicad_auto_builder.sch_writer import SchematicWriter, atomic_write, render
+
 from .symbols import COMMON_SYMBOLS, POWER_SYMBOLS, IC_SYMBOLS, CONNECTOR_SYMBOLS
 from .components import JLCPCB_PARTS
 
@@ -387,21 +393,24 @@ class SchematicGenerator:
     # FILE GENERATION
     # =========================================================================
 
-    def generate(self) -> str:
+    def generate(self, canonical: bool = False) -> str:
         """Generate the complete schematic file content.
 
+        Args:
+            canonical: Format with KiCad's own save layout
+
         Returns:
             KiCad schematic file content as string
         """
-        # Symbols already have proper indentation, just join with newlines
-        lib_symbols = '\n\t\t'.join(self._symbols)
-        instances = '\n'.join(self._instances)
-        wires = '\n'.join(self._wires)
-        labels = '\n'.join(self._labels)
-        hlabels = '\n'.join(self._hlabels)
-        text = '\n'.join(self._text)
-
-        return f'''(kicad_sch
+        return render(self.emit, canonical)
+
+    def emit(self, writer: SchematicWriter):
+        """Write the schematic section by section to a SchematicWriter.
+
+        Args:
+            writer: Destination writer (see kicad_auto_builder.sch_writer)
+        """
+        writer.write(f'''(kicad_sch
 	(version 20250114)
 	(generator "eeschema")
 	(generator_version "9.0")
@@ -413,38 +422,42 @@ class SchematicGenerator:
 		(rev "1.0")
 		(company "fcBoard Project")
 	)
-	(lib_symbols
-		{lib_symbols}
-	)
-{instances}
-{wires}
-{labels}
-{hlabels}
-{text}
-	(sheet_instances
+''')
+        # Symbols already have proper indentation after the first line
+        writer.lib_symbols(f"\t\t{symbol}" for symbol in self._symbols)
+        writer.section(self._instances)
+        writer.section(self._wires)
+        writer.section(self._labels)
+        writer.section(self._hlabels)
+        writer.section(self._text)
+        writer.write('''	(sheet_instances
 		(path "/"
 			(page "1")
 		)
 	)
 )
-'''
+''')
 
-    def save(self, output_path: Optional[str] = None):
+    def save(self, output_path: Optional[str] = None, canonical: bool = False):
         """Save the schematic to a file.
 
+        The file is streamed to a temporary file next to the target and
+        atomically renamed into place, so a failed run never leaves a
+        truncated schematic behind.
+
         Args:
             output_path: Output file path. If None, uses default naming.
+            canonical: Format with KiCad's own save layout, so re-saving
+                in KiCad does not churn the diff
         """
         if output_path is None:
             # Default: project root / fcBoard_{name}.kicad_sch
-            script_dir = Path(__file__).parent.resolve()
-            project_root = script_dir.parent.parent
-            output_path = project_root / f"fcBoard_{self.name}.kicad_sch"
+            output_path = PROJECT_ROOT / f"fcBoard_{self.name}.kicad_sch"
         else:
             output_path = Path(output_path)
 
-        content = self.generate()
-        output_path.write_text(content, encoding='utf-8')
+        with atomic_write(output_path, canonical) as writer:
+            self.emit(writer)
         print(f"[OK] Generated: {output_path}")
         return output_path
 
@@ -4,14 +4,26 @@ KiCad Schematic Tools - Annotate, ERC, Footprint Assignment, BOM Generation
 Works by parsing KiCad 8 S-expression schematic files directly
 """
 
+import csv
 import re
 import os
+import sys
 import json
-from collections import defaultdict
-from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.sexpr import parse, iter_instance_symbols
+from kicad_auto_builder.annotator import Annotator
+from kicad_auto_builder.bom import BomAggregator, CsvSink, TextTableSink, items_from_schematics, write_bom
+from kicad_auto_builder.connectivity import Project
+from kicad_auto_builder.document import SchematicDocument
 
 PROJECT_DIR = r"D:\git2\fcBoardKicad"
 
+# Root sheet of the hierarchy (used by the connectivity ERC)
+ROOT_SCHEMATIC = "fcBoard.kicad_sch"
+
 # Schematic files to process
 SCHEMATIC_FILES = [
     "fcBoard_Power.kicad_sch",
@@ -121,110 +133,28 @@ def parse_schematic(filepath):
 
     components = []
 
-    # Find all symbol instances
-    # Pattern: (symbol (lib_id "...") ... (property "Reference" "X?" ...) ...)
-    symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
-
-    for match in re.finditer(symbol_pattern, content, re.DOTALL):
-        lib_id = match.group(1)
-        symbol_content = match.group(2)
-
-        # Extract reference
-        ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', symbol_content)
-        ref = ref_match.group(1) if ref_match else "?"
-
-        # Extract value
-        val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', symbol_content)
-        value = val_match.group(1) if val_match else ""
-
-        # Extract UUID
-        uuid_match = re.search(r'\(uuid\s+"?([^"\)]+)"?\)', symbol_content)
-        uuid = uuid_match.group(1) if uuid_match else ""
-
-        # Extract footprint
-        fp_match = re.search(r'\(property\s+"Footprint"\s+"([^"]*)"', symbol_content)
-        footprint = fp_match.group(1) if fp_match else ""
-
-        # Extract position
-        at_match = re.search(r'\(at\s+([\d.]+)\s+([\d.]+)', symbol_content)
-        x = float(at_match.group(1)) if at_match else 0
-        y = float(at_match.group(2)) if at_match else 0
+    # Single pass over the file; lib_symbols definitions are not top-level
+    # so only placed symbol instances are visited
+    root = parse(content)
+    for sym in iter_instance_symbols(root):
+        x, y, _ = sym.at()
 
         components.append({
-            'lib_id': lib_id,
-            'reference': ref,
-            'value': value,
-            'uuid': uuid,
-            'footprint': footprint,
+            'lib_id': sym.get('lib_id'),
+            'reference': sym.property('Reference', '?'),
+            'value': sym.property('Value', ''),
+            'uuid': sym.get('uuid', default=''),
+            'footprint': sym.property('Footprint', ''),
             'x': x,
             'y': y,
+            'start': sym.start,
+            'end': sym.end,
             'file': os.path.basename(filepath)
         })
 
     return components, content
 
 
-def annotate_schematic(filepath, ref_counters):
-    """Annotate symbols in a schematic file with sequential numbers"""
-    components, content = parse_schematic(filepath)
-
-    # Sort components by position (top to bottom, left to right)
-    components.sort(key=lambda c: (c['y'], c['x']))
-
-    changes = []
-
-    for comp in components:
-        ref = comp['reference']
-        if not ref or ref == "?":
-            continue
-
-        # Check if reference needs annotation (ends with ? or has no number)
-        ref_match = re.match(r'^([A-Za-z_]+)(\d*)(\??)$', ref)
-        if not ref_match:
-            continue
-
-        prefix = ref_match.group(1)
-        number = ref_match.group(2)
-        has_question = ref_match.group(3)
-
-        # Skip power symbols
-        if prefix in ['PWR', '#PWR', 'GND', '#GND', 'VCC', 'VDD']:
-            continue
-
-        if has_question or not number:
-            # Needs annotation
-            ref_counters[prefix] = ref_counters.get(prefix, 0) + 1
-            new_ref = f"{prefix}{ref_counters[prefix]}"
-            changes.append({
-                'old_ref': ref,
-                'new_ref': new_ref,
-                'value': comp['value'],
-                'uuid': comp['uuid']
-            })
-
-    return changes, ref_counters
-
-
-def apply_annotations(filepath, changes):
-    """Apply annotation changes to a schematic file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    for change in changes:
-        old_ref = change['old_ref']
-        new_ref = change['new_ref']
-
-        # Replace the reference in property
-        pattern = rf'(\(property\s+"Reference"\s+)"{re.escape(old_ref)}"'
-        replacement = rf'\1"{new_ref}"'
-        content = re.sub(pattern, replacement, content)
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    return len(changes)
-
-
 def run_erc(filepath):
     """Run basic Electrical Rules Check on a schematic"""
     components, content = parse_schematic(filepath)
@@ -283,37 +213,43 @@ def run_erc(filepath):
     return errors, warnings
 
 
+def run_project_erc():
+    """Connectivity ERC over the whole sheet hierarchy (no kicad-cli needed)"""
+    root = os.path.join(PROJECT_DIR, ROOT_SCHEMATIC)
+    if not os.path.exists(root):
+        return 0, 0
+
+    report = Project.load(root).erc()
+    print(f"\n  Connectivity ({ROOT_SCHEMATIC}, {report.nets} nets):")
+    for code, count in report.counts().items():
+        print(f"    {code}: {count}")
+    for violation in [v for v in report.violations if v.severity == "error"][:5]:
+        print(f"    ERROR: {violation.sheet} {violation.message}: {violation.items[0].describe()}")
+    if report.errors > 5:
+        print(f"    ... and {report.errors - 5} more errors")
+    return report.errors, report.warnings
+
+
 def assign_footprints(filepath):
     """Assign footprints to components based on type and value"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    doc = SchematicDocument.load(filepath)
 
     changes = []
 
-    # Find all symbol blocks
-    symbol_pattern = r'(\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?))\n\t\)\n'
-
-    def replace_footprint(match):
-        full_match = match.group(0)
-        lib_id = match.group(2)
-        symbol_content = match.group(3)
-
+    for sym in doc.symbols:
         # Extract reference and value
-        ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', symbol_content)
-        ref = ref_match.group(1) if ref_match else ""
-
-        val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', symbol_content)
-        value = val_match.group(1) if val_match else ""
+        ref = sym.property('Reference', '')
+        value = sym.property('Value', '')
 
         # Get prefix
         prefix_match = re.match(r'^([A-Za-z_]+)', ref)
         if not prefix_match:
-            return full_match
+            continue
         prefix = prefix_match.group(1)
 
         # Skip power symbols
         if prefix in ['PWR', '#PWR', 'GND', '#GND', 'VCC', 'VDD', '#FLG']:
-            return full_match
+            continue
 
         # Determine footprint
         footprint = None
@@ -332,118 +268,46 @@ def assign_footprints(filepath):
                     footprint = fp_dict.get('default', '')
 
         if not footprint:
-            return full_match
-
-        # Check if footprint property exists
-        fp_pattern = r'(\(property\s+"Footprint"\s+)"([^"]*)"'
-        fp_match = re.search(fp_pattern, full_match)
-
-        if fp_match:
-            old_fp = fp_match.group(2)
-            if old_fp != footprint:
-                changes.append({
-                    'ref': ref,
-                    'value': value,
-                    'old_fp': old_fp,
-                    'new_fp': footprint
-                })
-                new_match = re.sub(fp_pattern, rf'\1"{footprint}"', full_match)
-                return new_match
-
-        return full_match
+            continue
 
-    new_content = re.sub(symbol_pattern, replace_footprint, content, flags=re.DOTALL)
+        # Only symbols that already carry a Footprint property are updated
+        old_fp = sym.property('Footprint')
+        if old_fp is not None and old_fp != footprint:
+            changes.append({
+                'ref': ref,
+                'value': value,
+                'old_fp': old_fp,
+                'new_fp': footprint
+            })
+            doc.set_footprint(sym, footprint)
 
-    if new_content != content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+    if doc.modified:
+        doc.save()
 
     return changes
 
 
 def generate_bom(schematic_files, output_file):
-    """Generate Bill of Materials from all schematic files"""
-    all_components = []
+    """Generate Bill of Materials from all schematic files
 
-    for sch_file in schematic_files:
-        filepath = os.path.join(PROJECT_DIR, sch_file)
-        if os.path.exists(filepath):
-            components, _ = parse_schematic(filepath)
-            for comp in components:
-                # Skip power symbols
-                ref = comp['reference']
-                prefix_match = re.match(r'^([A-Za-z_#]+)', ref)
-                if prefix_match:
-                    prefix = prefix_match.group(1)
-                    if prefix in ['PWR', '#PWR', 'GND', '#GND', 'VCC', 'VDD', '#FLG']:
-                        continue
-                all_components.append(comp)
-
-    # Group by value and footprint
-    grouped = defaultdict(list)
-    for comp in all_components:
-        key = (comp['value'], comp['footprint'], comp['lib_id'])
-        grouped[key].append(comp['reference'])
-
-    # Sort by reference type then number
-    def sort_key(ref):
-        match = re.match(r'^([A-Za-z_]+)(\d+)?', ref)
-        if match:
-            prefix = match.group(1)
-            num = int(match.group(2)) if match.group(2) else 0
-            return (prefix, num)
-        return (ref, 0)
-
-    # Generate BOM
-    bom_lines = []
-    bom_lines.append("=" * 100)
-    bom_lines.append("BILL OF MATERIALS - fcBoard Carrier Board")
-    bom_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    bom_lines.append("=" * 100)
-    bom_lines.append("")
-    bom_lines.append(f"{'Qty':<6} {'References':<30} {'Value':<25} {'Footprint':<35}")
-    bom_lines.append("-" * 100)
-
-    total_parts = 0
-    total_unique = 0
-
-    for (value, footprint, lib_id), refs in sorted(grouped.items(), key=lambda x: sort_key(x[1][0])):
-        refs_sorted = sorted(refs, key=sort_key)
-        qty = len(refs_sorted)
-        refs_str = ", ".join(refs_sorted)
-        if len(refs_str) > 28:
-            refs_str = refs_str[:25] + "..."
-
-        fp_short = footprint.split(":")[-1] if footprint else "N/A"
-        if len(fp_short) > 33:
-            fp_short = fp_short[:30] + "..."
-
-        bom_lines.append(f"{qty:<6} {refs_str:<30} {value:<25} {fp_short:<35}")
-        total_parts += qty
-        total_unique += 1
-
-    bom_lines.append("-" * 100)
-    bom_lines.append(f"Total unique parts: {total_unique}")
-    bom_lines.append(f"Total components: {total_parts}")
-    bom_lines.append("")
-
-    # Also generate CSV
-    csv_lines = ["Qty,References,Value,Footprint,Library"]
-    for (value, footprint, lib_id), refs in sorted(grouped.items(), key=lambda x: sort_key(x[1][0])):
-        refs_sorted = sorted(refs, key=sort_key)
-        qty = len(refs_sorted)
-        refs_str = " ".join(refs_sorted)
-        csv_lines.append(f'{qty},"{refs_str}","{value}","{footprint}","{lib_id}"')
-
-    # Write files
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(bom_lines))
-
-    csv_file = output_file.replace('.txt', '.csv')
-    with open(csv_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(csv_lines))
-
-    return total_unique, total_parts, bom_lines
+    One aggregation pass feeds both the text table and the CSV
+    (power symbols and multi-unit duplicates are dropped by the loader).
+    """
+    paths = [os.path.join(PROJECT_DIR, f) for f in schematic_files]
+    items = items_from_schematics(p for p in paths if os.path.exists(p))
+    bom = BomAggregator(keys=("value", "footprint", "lib_id"), order="ref").aggregate(items)
+
+    table = TextTableSink(output_file, title="BILL OF MATERIALS - fcBoard Carrier Board")
+    csv_sink = CsvSink(
+        output_file.replace('.txt', '.csv'),
+        ("Qty", "References", "Value", "Footprint", "Library"),
+        ref_sep=" ",
+        quoting=csv.QUOTE_NONNUMERIC,
+        lineterminator="\n",
+    )
+    write_bom(bom, [table, csv_sink], skip_unchanged=False)
+
+    return table.unique, table.total, table.lines
 
 
 def main():
@@ -455,22 +319,26 @@ def main():
     print("\n[1/4] Annotating symbols...")
     print("-" * 40)
 
-    ref_counters = {}
-    total_annotated = 0
-
+    paths = []
     for sch_file in SCHEMATIC_FILES:
         filepath = os.path.join(PROJECT_DIR, sch_file)
         if not os.path.exists(filepath):
             print(f"  SKIP: {sch_file} not found")
             continue
+        paths.append(filepath)
+
+    # Every sheet is read once; references without a number get the next free
+    # number of their prefix and each sheet is rewritten in a single pass
+    result = Annotator(keep_existing=True).annotate(paths)
+    total_annotated = len(result.changes)
 
-        changes, ref_counters = annotate_schematic(filepath, ref_counters)
+    for filepath in paths:
+        sch_file = os.path.basename(filepath)
+        changes = [c for c in result.changes if c.sheet == sch_file]
         if changes:
-            apply_annotations(filepath, changes)
-            total_annotated += len(changes)
             print(f"  {sch_file}: {len(changes)} symbols annotated")
             for ch in changes[:5]:
-                print(f"    {ch['old_ref']} -> {ch['new_ref']} ({ch['value']})")
+                print(f"    {ch.old} -> {ch.new}")
             if len(changes) > 5:
                 print(f"    ... and {len(changes) - 5} more")
         else:
@@ -503,6 +371,10 @@ def main():
         else:
             print(f"  {sch_file}: OK")
 
+    project_errors, project_warnings = run_project_erc()
+    total_errors += project_errors
+    total_warnings += project_warnings
+
     print(f"\n  ERC Summary: {total_errors} errors, {total_warnings} warnings")
 
     # Step 3: Footprint assignment
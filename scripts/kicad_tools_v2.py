@@ -4,14 +4,27 @@ KiCad Schematic Tools v2 - Global Annotate across all sheets
 Fixes duplicate reference issues by using global counter
 """
 
+import csv
 import re
 import os
+import sys
 import json
 from collections import defaultdict
-from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.sexpr import parse, iter_instance_symbols
+from kicad_auto_builder.annotator import Annotator
+from kicad_auto_builder.bom import BomAggregator, CsvSink, TextTableSink, items_from_schematics, write_bom
+from kicad_auto_builder.connectivity import Project
+from kicad_auto_builder.document import SchematicDocument
 
 PROJECT_DIR = r"D:\git2\fcBoardKicad"
 
+# Root sheet of the hierarchy (used by the connectivity ERC)
+ROOT_SCHEMATIC = "fcBoard.kicad_sch"
+
 SCHEMATIC_FILES = [
     "fcBoard_Power.kicad_sch",
     "fcBoard_USB.kicad_sch",
@@ -84,36 +97,19 @@ def parse_all_components():
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Find all symbol instances
-        symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
-
-        for match in re.finditer(symbol_pattern, content, re.DOTALL):
-            lib_id = match.group(1)
-            symbol_content = match.group(2)
-
-            ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', symbol_content)
-            ref = ref_match.group(1) if ref_match else "?"
-
-            val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', symbol_content)
-            value = val_match.group(1) if val_match else ""
-
-            at_match = re.search(r'\(at\s+([\d.-]+)\s+([\d.-]+)', symbol_content)
-            x = float(at_match.group(1)) if at_match else 0
-            y = float(at_match.group(2)) if at_match else 0
-
-            fp_match = re.search(r'\(property\s+"Footprint"\s+"([^"]*)"', symbol_content)
-            footprint = fp_match.group(1) if fp_match else ""
+        for sym in iter_instance_symbols(parse(content)):
+            x, y, _ = sym.at()
 
             all_components.append({
                 'file': sch_file,
-                'lib_id': lib_id,
-                'reference': ref,
-                'value': value,
-                'footprint': footprint,
+                'lib_id': sym.get('lib_id'),
+                'reference': sym.property('Reference', '?'),
+                'value': sym.property('Value', ''),
+                'footprint': sym.property('Footprint', ''),
                 'x': x,
                 'y': y,
-                'match_start': match.start(),
-                'match_end': match.end(),
+                'match_start': sym.start,
+                'match_end': sym.end,
             })
 
     return all_components
@@ -124,101 +120,36 @@ def global_annotate():
     print("\n[1/4] Global Annotation...")
     print("-" * 50)
 
-    # Counters per prefix, per sheet to maintain locality
-    ref_counters = defaultdict(int)
-
+    paths = []
     for sch_file in SCHEMATIC_FILES:
         filepath = os.path.join(PROJECT_DIR, sch_file)
         if not os.path.exists(filepath):
             print(f"  SKIP: {sch_file} not found")
             continue
+        paths.append(filepath)
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Collect all symbols with their positions for sorting
-        symbols = []
-        symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
-
-        for match in re.finditer(symbol_pattern, content, re.DOTALL):
-            lib_id = match.group(1)
-            symbol_content = match.group(2)
-
-            ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', symbol_content)
-            ref = ref_match.group(1) if ref_match else "?"
-
-            at_match = re.search(r'\(at\s+([\d.-]+)\s+([\d.-]+)', symbol_content)
-            x = float(at_match.group(1)) if at_match else 0
-            y = float(at_match.group(2)) if at_match else 0
+    # One pass over all sheets: existing numbers are kept, "?" and duplicate
+    # references get the first free number of their prefix
+    result = Annotator(keep_existing=True).annotate(paths)
 
-            symbols.append({
-                'ref': ref,
-                'x': x,
-                'y': y,
-                'start': match.start(),
-                'end': match.end(),
-                'content': match.group(0)
-            })
+    changes_by_file = defaultdict(list)
+    for change in result.changes:
+        changes_by_file[change.sheet].append(change)
 
-        # Sort by position (top to bottom, left to right)
-        symbols.sort(key=lambda s: (s['y'], s['x']))
-
-        changes = []
+    for filepath in paths:
+        changes = changes_by_file[os.path.basename(filepath)]
+        print(f"  {os.path.basename(filepath)}: {len(changes)} symbols annotated")
+        for ch in changes[:3]:
+            print(f"    {ch.old} -> {ch.new}")
+        if len(changes) > 3:
+            print(f"    ... and {len(changes) - 3} more")
 
-        for sym in symbols:
-            ref = sym['ref']
-
-            # Extract prefix
-            prefix_match = re.match(r'^([A-Za-z_#]+)(\d*)(\??)$', ref)
-            if not prefix_match:
-                continue
-
-            prefix = prefix_match.group(1)
-
-            # Skip power symbols - they don't need unique refs
-            if prefix in ['#PWR', '#FLG', 'PWR']:
-                continue
-
-            # Check if needs annotation
-            has_question = '?' in ref
-            has_number = bool(prefix_match.group(2))
-
-            if has_question or not has_number:
-                ref_counters[prefix] += 1
-                new_ref = f"{prefix}{ref_counters[prefix]}"
-                changes.append({
-                    'old': ref,
-                    'new': new_ref,
-                    'pattern': rf'(\(property\s+"Reference"\s+)"{re.escape(ref)}"',
-                    'replacement': rf'\1"{new_ref}"'
-                })
-
-        # Apply changes
-        modified = False
-        for change in changes:
-            new_content = re.sub(change['pattern'], change['replacement'], content, count=1)
-            if new_content != content:
-                content = new_content
-                modified = True
-
-        if modified:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-        print(f"  {sch_file}: {len(changes)} symbols annotated")
-        if changes:
-            for ch in changes[:3]:
-                print(f"    {ch['old']} -> {ch['new']}")
-            if len(changes) > 3:
-                print(f"    ... and {len(changes) - 3} more")
-
-    total = sum(ref_counters.values())
-    print(f"\n  Total: {total} symbols annotated")
+    print(f"\n  Total: {len(result.changes)} symbols annotated ({result.seconds * 1000:.1f} ms)")
     print(f"  Reference ranges:")
-    for prefix in sorted(ref_counters.keys()):
-        print(f"    {prefix}: 1-{ref_counters[prefix]}")
+    for prefix in sorted(result.ranges.keys()):
+        print(f"    {prefix}: 1-{result.ranges[prefix]}")
 
-    return ref_counters
+    return result.ranges
 
 
 def run_erc():
@@ -230,31 +161,22 @@ def run_erc():
     total_errors = 0
     total_warnings = 0
 
+    components_by_file = defaultdict(list)
+    for comp in parse_all_components():
+        components_by_file[comp['file']].append(comp)
+
     for sch_file in SCHEMATIC_FILES:
         filepath = os.path.join(PROJECT_DIR, sch_file)
         if not os.path.exists(filepath):
             continue
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         errors = []
         warnings = []
 
-        # Find all symbols
-        symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
-
-        for match in re.finditer(symbol_pattern, content, re.DOTALL):
-            symbol_content = match.group(2)
-
-            ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', symbol_content)
-            ref = ref_match.group(1) if ref_match else "?"
-
-            val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', symbol_content)
-            value = val_match.group(1) if val_match else ""
-
-            fp_match = re.search(r'\(property\s+"Footprint"\s+"([^"]*)"', symbol_content)
-            footprint = fp_match.group(1) if fp_match else ""
+        for comp in components_by_file[sch_file]:
+            ref = comp['reference']
+            value = comp['value']
+            footprint = comp['footprint']
 
             prefix_match = re.match(r'^([A-Za-z_#]+)', ref)
             prefix = prefix_match.group(1) if prefix_match else ""
@@ -298,10 +220,31 @@ def run_erc():
             print(f"    {ref}: {', '.join(files)}")
         total_errors += len(duplicates)
 
+    project_errors, project_warnings = run_project_erc()
+    total_errors += project_errors
+    total_warnings += project_warnings
+
     print(f"\n  ERC Summary: {total_errors} errors, {total_warnings} warnings")
     return total_errors, total_warnings
 
 
+def run_project_erc():
+    """Connectivity ERC over the whole sheet hierarchy (no kicad-cli needed)"""
+    root = os.path.join(PROJECT_DIR, ROOT_SCHEMATIC)
+    if not os.path.exists(root):
+        return 0, 0
+
+    report = Project.load(root).erc()
+    print(f"\n  Connectivity ({ROOT_SCHEMATIC}, {report.nets} nets):")
+    for code, count in report.counts().items():
+        print(f"    {code}: {count}")
+    for violation in [v for v in report.violations if v.severity == "error"][:5]:
+        print(f"    ERROR: {violation.sheet} {violation.message}: {violation.items[0].describe()}")
+    if report.errors > 5:
+        print(f"    ... and {report.errors - 5} more errors")
+    return report.errors, report.warnings
+
+
 def assign_footprints():
     """Assign footprints to all components"""
     print("\n[3/4] Assigning footprints...")
@@ -314,8 +257,7 @@ def assign_footprints():
         if not os.path.exists(filepath):
             continue
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        doc = SchematicDocument.load(filepath)
 
         changes = []
 
@@ -338,48 +280,30 @@ def assign_footprints():
             return fp_dict.get('default')
 
         # Process each symbol
-        symbol_pattern = r'(\(symbol\s+\(lib_id\s+"[^"]+"\)(.*?)\n\t\)\n)'
-
-        def replace_fp(match):
-            nonlocal changes
-            full = match.group(0)
-            inner = match.group(2)
-
-            ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', inner)
-            ref = ref_match.group(1) if ref_match else ""
-
-            val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', inner)
-            value = val_match.group(1) if val_match else ""
+        for sym in doc.symbols:
+            ref = sym.property('Reference', '')
+            value = sym.property('Value', '')
 
             prefix_match = re.match(r'^([A-Za-z_#]+)', ref)
             prefix = prefix_match.group(1) if prefix_match else ""
 
             # Skip power symbols
             if prefix in ['#PWR', '#FLG', 'PWR']:
-                return full
+                continue
 
             # Get appropriate footprint
             new_fp = get_footprint(prefix, value)
             if not new_fp:
-                return full
+                continue
 
             # Check current footprint
-            fp_pattern = r'(\(property\s+"Footprint"\s+)"([^"]*)"'
-            fp_match = re.search(fp_pattern, full)
-
-            if fp_match:
-                old_fp = fp_match.group(2)
-                if old_fp != new_fp:
-                    changes.append({'ref': ref, 'value': value, 'old': old_fp, 'new': new_fp})
-                    return re.sub(fp_pattern, rf'\1"{new_fp}"', full)
-
-            return full
-
-        new_content = re.sub(symbol_pattern, replace_fp, content, flags=re.DOTALL)
+            old_fp = sym.property('Footprint')
+            if old_fp is not None and old_fp != new_fp:
+                changes.append({'ref': ref, 'value': value, 'old': old_fp, 'new': new_fp})
+                doc.set_footprint(sym, new_fp)
 
-        if new_content != content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+        if doc.modified:
+            doc.save()
 
         total_assigned += len(changes)
 
@@ -401,113 +325,35 @@ def generate_bom():
     print("\n[4/4] Generating BOM...")
     print("-" * 50)
 
-    components = []
-
-    for sch_file in SCHEMATIC_FILES:
-        filepath = os.path.join(PROJECT_DIR, sch_file)
-        if not os.path.exists(filepath):
-            continue
+    # One aggregation pass (grouped by value + footprint, refs sorted naturally)
+    # feeds both outputs; power symbols are skipped by the loader
+    paths = [os.path.join(PROJECT_DIR, f) for f in SCHEMATIC_FILES]
+    items = items_from_schematics(p for p in paths if os.path.exists(p))
+    bom = BomAggregator(keys=("value", "footprint"), order="ref").aggregate(items)
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)(.*?)\n\t\)\n'
-
-        for match in re.finditer(symbol_pattern, content, re.DOTALL):
-            lib_id = match.group(1)
-            inner = match.group(2)
-
-            ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', inner)
-            ref = ref_match.group(1) if ref_match else ""
-
-            val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', inner)
-            value = val_match.group(1) if val_match else ""
-
-            fp_match = re.search(r'\(property\s+"Footprint"\s+"([^"]*)"', inner)
-            footprint = fp_match.group(1) if fp_match else ""
-
-            prefix_match = re.match(r'^([A-Za-z_#]+)', ref)
-            prefix = prefix_match.group(1) if prefix_match else ""
-
-            # Skip power symbols
-            if prefix in ['#PWR', '#FLG', 'PWR']:
-                continue
-
-            components.append({
-                'ref': ref,
-                'value': value,
-                'footprint': footprint,
-                'lib_id': lib_id,
-                'sheet': sch_file
-            })
-
-    # Group by value + footprint
-    grouped = defaultdict(list)
-    for comp in components:
-        key = (comp['value'], comp['footprint'])
-        grouped[key].append(comp['ref'])
-
-    # Sort refs naturally
-    def sort_key(ref):
-        match = re.match(r'^([A-Za-z_]+)(\d+)?', ref)
-        if match:
-            return (match.group(1), int(match.group(2) or 0))
-        return (ref, 0)
-
-    # Generate BOM text
-    lines = []
-    lines.append("=" * 100)
-    lines.append("BILL OF MATERIALS - fcBoard Carrier Board")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("=" * 100)
-    lines.append("")
-    lines.append(f"{'Qty':<5} {'References':<35} {'Value':<20} {'Footprint':<35}")
-    lines.append("-" * 100)
-
-    total_qty = 0
-
-    for (value, footprint), refs in sorted(grouped.items(), key=lambda x: sort_key(x[1][0])):
-        refs_sorted = sorted(refs, key=sort_key)
-        qty = len(refs_sorted)
-        total_qty += qty
-
-        refs_str = ", ".join(refs_sorted)
-        if len(refs_str) > 33:
-            refs_str = refs_str[:30] + "..."
-
-        fp_short = footprint.split(":")[-1] if footprint else "N/A"
-        if len(fp_short) > 33:
-            fp_short = fp_short[:30] + "..."
-
-        lines.append(f"{qty:<5} {refs_str:<35} {value:<20} {fp_short:<35}")
-
-    lines.append("-" * 100)
-    lines.append(f"Unique parts: {len(grouped)}")
-    lines.append(f"Total components: {total_qty}")
-
-    # Write TXT
     bom_txt = os.path.join(PROJECT_DIR, "fcBoard_BOM.txt")
-    with open(bom_txt, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines))
-
-    # Write CSV
-    csv_lines = ["Qty,References,Value,Footprint"]
-    for (value, footprint), refs in sorted(grouped.items(), key=lambda x: sort_key(x[1][0])):
-        refs_sorted = sorted(refs, key=sort_key)
-        qty = len(refs_sorted)
-        refs_str = " ".join(refs_sorted)
-        csv_lines.append(f'{qty},"{refs_str}","{value}","{footprint}"')
-
     bom_csv = os.path.join(PROJECT_DIR, "fcBoard_BOM.csv")
-    with open(bom_csv, 'w', encoding='utf-8') as f:
-        f.write("\n".join(csv_lines))
+    table = TextTableSink(
+        bom_txt,
+        title="BILL OF MATERIALS - fcBoard Carrier Board",
+        widths=(5, 35, 20, 35),
+        unique_label="Unique parts",
+    )
+    csv_sink = CsvSink(
+        bom_csv,
+        ("Qty", "References", "Value", "Footprint"),
+        ref_sep=" ",
+        quoting=csv.QUOTE_NONNUMERIC,
+        lineterminator="\n",
+    )
+    write_bom(bom, [table, csv_sink], skip_unchanged=False)
 
     print(f"  BOM TXT: {bom_txt}")
     print(f"  BOM CSV: {bom_csv}")
-    print(f"  Unique parts: {len(grouped)}")
-    print(f"  Total components: {total_qty}")
+    print(f"  Unique parts: {table.unique}")
+    print(f"  Total components: {table.total}")
 
-    return len(grouped), total_qty
+    return table.unique, table.total
 
 
 def main():
@@ -3,293 +3,155 @@
 Automatic component placement for ACU5EV SoM Carrier Board PCB
 Board size: 150mm x 100mm with offset (100, 100)
 Board area: X=100-250, Y=100-200
+
+Edge connectors and mounting holes are pinned to fixed positions; every other
+footprint is placed by the simulated-annealing placer in
+kicad_auto_builder.pcb_placer, which minimises half-perimeter wirelength over
+the pad nets while keeping courtyards from overlapping.
+
+Usage:
+    python place_components.py [fcBoard.kicad_pcb] [--seed N] [--report placement.json]
+    python place_components.py fcBoard.kicad_pcb --netlist out/fcBoard.json
+
+--netlist takes pad nets from a JSON netlist written by
+`python -m kicad_auto_builder.cli export-netlist` when the PCB has not been
+updated from the schematic yet.
 """
 
-import re
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.document import PcbDocument
+from kicad_auto_builder.netlist import Netlist
+from kicad_auto_builder.pcb_placer import (
+    PcbPlacementResult, PcbPlacer, apply_placement, board_outline, load_footprints,
+)
+
+DEFAULT_PCB = r"D:\git2\fcBoardKicad\fcBoard.kicad_pcb"
 
-def parse_components(content):
+# Used when the PCB has no Edge.Cuts outline yet
+BOARD_AREA = (100, 100, 250, 200)
+
+def parse_components(doc):
     """Extract all component references and their current positions from PCB file"""
     components = {}
 
-    # Find each footprint block and extract info
-    # Structure: (footprint "name" (placed ...) (layer ...) (uuid ...) (at X Y [angle]) ... (property "Reference" "REF")
-
-    # Split by footprint blocks
-    fp_pattern = r'\(footprint\s+"([^"]+)"\s*\n\s+\(placed[^)]+\)\s*\n\s+\(layer[^)]+\)\s*\n\s+\(uuid[^)]+\)\s*\n\s+\(at\s+([\d.]+)\s+([\d.]+)(?:\s+([\d.]+))?\)'
-
-    # Find all footprint headers with position
-    for match in re.finditer(fp_pattern, content):
-        footprint = match.group(1)
-        x = float(match.group(2))
-        y = float(match.group(3))
-        angle = float(match.group(4)) if match.group(4) else 0
-
-        # Find the reference within the next ~2000 chars after this match
-        start_pos = match.end()
-        end_pos = min(start_pos + 2000, len(content))
-        block = content[start_pos:end_pos]
-
-        ref_match = re.search(r'property\s+"Reference"\s+"([^"]+)"', block)
-        if ref_match:
-            ref = ref_match.group(1)
-            components[ref] = {
-                'footprint': footprint,
-                'x': x,
-                'y': y,
-                'angle': angle
-            }
+    # Each top-level (footprint "name" ... (at X Y [angle]) ... (property "Reference" "REF"))
+    # is indexed by reference, so the whole block is searched regardless of its size
+    for ref, node in doc.footprints.items():
+        x, y, angle = node.at()
+        components[ref] = {
+            'footprint': node.value(0, ''),
+            'x': x,
+            'y': y,
+            'angle': angle
+        }
 
     return components
 
-def get_placement_map():
-    """Define target positions for all components
+def get_pinned_positions():
+    """Positions of parts that must not move: connectors on the board edges
+    and the corner mounting holes. Everything else is placed by the optimiser.
     Board: 100,100 to 250,200 (150x100mm)
     """
-    placement = {}
-
-    # ==========================================
-    # CONNECTORS - Board edges
-    # ==========================================
+    pinned = {}
 
     # DC Jack J16 - Left side
-    placement['J16'] = (108, 150, 180)  # DC barrel jack, facing left
+    pinned['J16'] = (108, 150, 180)  # DC barrel jack, facing left
 
     # USB Connectors J1-J5 - Right side (vertical stack)
     for i, ref in enumerate(['J1', 'J2', 'J3', 'J4', 'J5']):
-        placement[ref] = (242, 115 + i * 12, 90)  # USB facing right
+        pinned[ref] = (242, 115 + i * 12, 90)  # USB facing right
 
     # RJ45 J6 - Right side
-    placement['J6'] = (230, 140, 90)  # RJ45 facing right
+    pinned['J6'] = (230, 140, 90)  # RJ45 facing right
 
     # HDMI Connectors - Right side
-    placement['J23'] = (235, 165, 90)  # HDMI IN
-    placement['J24'] = (235, 185, 90)  # HDMI OUT
-
-    # Pin Headers J7-J12 - Center area for SoM connection
-    placement['J7'] = (150, 120, 0)
-    placement['J8'] = (150, 130, 0)
-    placement['J9'] = (150, 140, 0)
-    placement['J10'] = (160, 120, 0)
-    placement['J11'] = (160, 130, 0)
-    placement['J12'] = (160, 140, 0)
-
-    # ==========================================
-    # POWER SECTION - Left side
-    # ==========================================
-
-    # Power regulator U26 (LM2596)
-    placement['U26'] = (125, 145, 0)
-
-    # Inductors near power regulator
-    placement['L4'] = (115, 155, 0)
-    placement['L5'] = (125, 155, 0)
-    placement['L6'] = (135, 155, 0)
-
-    # Power capacitors
-    placement['C20'] = (115, 165, 0)
-    placement['C21'] = (125, 165, 0)
-    placement['C22'] = (135, 165, 0)
-
-    # ==========================================
-    # ETHERNET SECTION - Right upper
-    # ==========================================
-
-    # Ethernet PHY U1
-    placement['U1'] = (200, 130, 0)
-
-    # Crystals for Ethernet
-    placement['Y1'] = (190, 125, 0)
-    placement['Y2'] = (190, 135, 0)
-
-    # ==========================================
-    # HDMI SECTION - Center-right
-    # ==========================================
-
-    # HDMI TX/RX ICs
-    placement['U43'] = (195, 165, 0)  # HDMI IC 1
-    placement['U44'] = (195, 180, 0)  # HDMI IC 2
-
-    # Level shifters for HDMI
-    placement['U41'] = (180, 165, 0)  # TPD12S016
-    placement['U42'] = (180, 180, 0)  # TXB0108
-
-    # HDMI crystals
-    placement['Y9'] = (185, 172, 0)
-    placement['Y10'] = (185, 188, 0)
-
-    # ==========================================
-    # USB SECTION ICs - Right side
-    # ==========================================
-
-    # USB Hub IC
-    placement['U2'] = (215, 120, 0)
-    placement['U3'] = (215, 135, 0)
-    placement['U4'] = (215, 150, 0)
-    placement['U5'] = (205, 120, 0)
-    placement['U6'] = (205, 135, 0)
-    placement['U7'] = (205, 150, 0)
-    placement['U8'] = (225, 120, 0)
-
-    # ==========================================
-    # PERIPHERALS SECTION - Bottom
-    # ==========================================
-
-    # UART CP2102N
-    placement['U27'] = (130, 180, 0)
-    placement['U28'] = (145, 180, 0)
-
-    # Other peripheral ICs
-    for i, ref in enumerate(['U9', 'U10', 'U11', 'U12', 'U13', 'U14', 'U15', 'U16', 'U17']):
-        row = i // 3
-        col = i % 3
-        placement[ref] = (140 + col * 15, 110 + row * 12, 0)
-
-    # ==========================================
-    # SWITCHES - Accessible location
-    # ==========================================
-
-    placement['SW1'] = (110, 185, 0)
-    placement['SW2'] = (120, 185, 0)
-
-    # ==========================================
-    # LEDs - Status indicator area
-    # ==========================================
-
-    # Power LEDs
-    for i in range(1, 17):
-        ref = f'D{i}'
-        row = (i - 1) // 4
-        col = (i - 1) % 4
-        placement[ref] = (110 + col * 6, 110 + row * 6, 0)
-
-    # ==========================================
-    # RESISTORS - Near their associated ICs
-    # ==========================================
-
-    # General resistor placement in available space
-    for i in range(1, 25):
-        ref = f'R{i}'
-        row = (i - 1) // 6
-        col = (i - 1) % 6
-        placement[ref] = (165 + col * 5, 105 + row * 5, 0)
-
-    # ==========================================
-    # CAPACITORS - Near ICs
-    # ==========================================
-
-    # Additional capacitors
-    for i in range(23, 38):
-        ref = f'C{i}'
-        idx = i - 23
-        row = idx // 5
-        col = idx % 5
-        placement[ref] = (140 + col * 6, 190 + row * 5, 0)
-
-    # ==========================================
-    # MOUNTING HOLES - Corners (already placed)
-    # ==========================================
-
-    placement['MH1'] = (105, 105, 0)
-    placement['MH2'] = (245, 105, 0)
-    placement['MH3'] = (105, 195, 0)
-    placement['MH4'] = (245, 195, 0)
-
-    return placement
-
-def update_component_position(content, ref, x, y, angle=0):
-    """Update the position of a component in the PCB file"""
-
-    # Find the footprint block containing this reference
-    # We need to find the (at X Y) line that comes BEFORE the reference property
-
-    # Strategy: Find the reference, then search backwards for the (at line
-    ref_pattern = rf'property\s+"Reference"\s+"{re.escape(ref)}"'
-    ref_match = re.search(ref_pattern, content)
-
-    if not ref_match:
-        return content, False
-
-    # Find the start of this footprint block (search backwards for "(footprint")
-    ref_pos = ref_match.start()
-
-    # Search backwards from reference position to find the footprint start
-    search_start = max(0, ref_pos - 3000)  # footprint block is usually within 3000 chars
-    block_before = content[search_start:ref_pos]
-
-    # Find the last (footprint occurrence before the reference
-    fp_matches = list(re.finditer(r'\(footprint\s+"[^"]+"', block_before))
-    if not fp_matches:
-        return content, False
-
-    # Get the absolute position of the footprint start
-    fp_rel_pos = fp_matches[-1].start()
-    fp_abs_pos = search_start + fp_rel_pos
-
-    # Now find the (at X Y) line within this footprint block
-    # It should be within the first 500 chars of the footprint block
-    fp_block_start = content[fp_abs_pos:fp_abs_pos + 500]
-
-    at_match = re.search(r'\(at\s+([\d.]+)\s+([\d.]+)(?:\s+([\d.]+))?\)', fp_block_start)
-    if not at_match:
-        return content, False
+    pinned['J23'] = (235, 165, 90)  # HDMI IN
+    pinned['J24'] = (235, 185, 90)  # HDMI OUT
 
-    # Calculate the absolute position of the (at line
-    at_rel_start = at_match.start()
-    at_rel_end = at_match.end()
-    at_abs_start = fp_abs_pos + at_rel_start
-    at_abs_end = fp_abs_pos + at_rel_end
-
-    # Create the new (at line
-    new_at = f"(at {x} {y})" if angle == 0 else f"(at {x} {y} {angle})"
+    # Switches - Accessible location
+    pinned['SW1'] = (110, 185, 0)
+    pinned['SW2'] = (120, 185, 0)
 
-    # Replace in content
-    new_content = content[:at_abs_start] + new_at + content[at_abs_end:]
+    # Mounting holes - Corners
+    pinned['MH1'] = (105, 105, 0)
+    pinned['MH2'] = (245, 105, 0)
+    pinned['MH3'] = (105, 195, 0)
+    pinned['MH4'] = (245, 195, 0)
 
-    return new_content, True
+    return pinned
 
-def place_components(pcb_path):
-    """Main function to place all components"""
+def place_components(pcb_path, seed=0, rotate=True, report_path=None, dry_run=False, netlist_path=None):
+    """Pin the edge parts, optimise the rest and write the result back"""
 
     print(f"Reading PCB file: {pcb_path}")
-    with open(pcb_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    doc = PcbDocument.load(pcb_path)
 
     # Parse existing components
-    components = parse_components(content)
+    components = parse_components(doc)
     print(f"Found {len(components)} components in PCB")
 
-    for ref, info in sorted(components.items()):
-        print(f"  {ref}: {info['footprint'][:40]:<40} at ({info['x']:.1f}, {info['y']:.1f})")
-
-    # Get placement map
-    placement = get_placement_map()
-    print(f"\nPlacement defined for {len(placement)} components")
-
-    # Update positions
-    updated_count = 0
-    for ref, (x, y, angle) in placement.items():
-        if ref in components:
-            content, success = update_component_position(content, ref, x, y, angle)
-            if success:
-                old = components[ref]
-                print(f"  Moved {ref}: ({old['x']:.1f}, {old['y']:.1f}) -> ({x}, {y}, {angle}°)")
-                updated_count += 1
-            else:
-                print(f"  Warning: Could not update {ref}")
-        else:
-            print(f"  Skipped {ref}: not found in PCB")
+    # Move the pinned parts first; the optimiser then treats them as fixed
+    pin_nets = None
+    if netlist_path:
+        pin_nets = Netlist.load(netlist_path).pin_nets()
+        print(f"Pad nets from netlist: {netlist_path} ({len(pin_nets)} components)")
+    footprints = load_footprints(doc, pin_nets)
+    pinned = {ref: pos for ref, pos in get_pinned_positions().items() if ref in components}
+    updated_count = apply_placement(doc, footprints, PcbPlacementResult(positions=pinned))
+    print(f"Pinned {len(pinned)} edge components")
+
+    board = board_outline(doc)
+    if board is None:
+        print(f"  No Edge.Cuts outline, using board area {BOARD_AREA}")
+        board = BOARD_AREA
+
+    result = PcbPlacer(seed=seed, rotate=rotate).place(footprints, board, fixed=pinned)
+    summary = result.to_dict()
+    print(f"\nPlaced {summary['movable']} components ({summary['nets']} nets) in {summary['seconds']}s")
+    print(f"  HPWL: {summary['hpwl_before_mm']} mm -> {summary['hpwl_mm']} mm ({summary['improvement_pct']}%)")
+    print(f"  Courtyard overlap: {summary['overlap_before_mm2']} mm2 -> {summary['overlap_mm2']} mm2")
+    for a, b, area in result.overlaps:
+        print(f"  Warning: {a} overlaps {b} ({area} mm2)")
+    if summary['outside_mm2'] > 0:
+        print(f"  Warning: {summary['outside_mm2']} mm2 of courtyard outside the board")
+
+    if report_path:
+        report = dict(summary, overlaps=result.overlaps, positions=result.positions)
+        Path(report_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"  Report: {report_path}")
+
+    updated_count += apply_placement(doc, footprints, result)
 
     # Save updated PCB
-    if updated_count > 0:
+    if updated_count > 0 and not dry_run:
         print(f"\nSaving PCB with {updated_count} updated positions...")
-        with open(pcb_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        doc.save()
         print("Done!")
+    elif updated_count > 0:
+        print(f"\nDry run: {updated_count} positions would change.")
     else:
         print("\nNo components were updated.")
 
     return updated_count
 
+def main():
+    parser = argparse.ArgumentParser(description="Place PCB footprints by net wirelength")
+    parser.add_argument("pcb", nargs="?", default=DEFAULT_PCB, help="KiCad PCB file")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same placement)")
+    parser.add_argument("--no-rotate", action="store_true", help="Keep footprint orientations")
+    parser.add_argument("--report", help="Write the placement report as JSON")
+    parser.add_argument("--dry-run", action="store_true", help="Do not save the PCB")
+    parser.add_argument("--netlist", help="JSON netlist (export-netlist) for pads without a net")
+    args = parser.parse_args()
+
+    place_components(args.pcb, seed=args.seed, rotate=not args.no_rotate,
+                     report_path=args.report, dry_run=args.dry_run, netlist_path=args.netlist)
+
 if __name__ == "__main__":
-    pcb_path = r"D:\git2\fcBoardKicad\fcBoard.kicad_pcb"
-    place_components(pcb_path)
+    main()
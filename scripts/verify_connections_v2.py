@@ -3,9 +3,15 @@
 Verify schematic connections v2 - improved parsing
 """
 
-import re
 import os
+import sys
 from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kicad_auto_builder.loader import open_sheet
+from kicad_auto_builder.spatial_index import SchematicIndex
 
 PROJECT_DIR = r"D:\git2\fcBoardKicad"
 
@@ -19,10 +25,7 @@ SCHEMATIC_FILES = [
 
 
 def parse_schematic(filepath):
-    """Parse schematic with improved patterns"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
+    """Parse schematic with the shared S-expression parser"""
     data = {
         'symbols': 0,
         'power_symbols': 0,
@@ -30,49 +33,32 @@ def parse_schematic(filepath):
         'labels': [],
         'hierarchical_labels': [],
         'junctions': 0,
+        'missing_junctions': [],
+        'shorts': [],
     }
 
-    # Find lib_symbols end
-    lib_start = content.find('(lib_symbols')
-    lib_end = 0
-    if lib_start != -1:
-        depth = 0
-        for i, c in enumerate(content[lib_start:], lib_start):
-            if c == '(':
-                depth += 1
-            elif c == ')':
-                depth -= 1
-                if depth == 0:
-                    lib_end = i + 1
-                    break
-
-    instance_content = content[lib_end:]
-
-    # Count symbols (excluding lib_symbols definitions)
-    symbol_count = len(re.findall(r'\(symbol\s+\(lib_id', instance_content))
-    power_count = len(re.findall(r'lib_id\s+"power:', instance_content))
-    data['symbols'] = symbol_count - power_count
-    data['power_symbols'] = power_count
-
-    # Count wires
-    data['wires'] = len(re.findall(r'\(wire\s+\(pts', instance_content))
-
-    # Count junctions
-    data['junctions'] = len(re.findall(r'\(junction\s+\(at', instance_content))
-
-    # Parse labels - improved pattern
-    label_pattern = r'\(label\s+"([^"]+)"\s*\n?\s*\(at\s+([\d.-]+)\s+([\d.-]+)'
-    for match in re.finditer(label_pattern, content):
-        name = match.group(1)
-        x, y = float(match.group(2)), float(match.group(3))
-        data['labels'].append({'name': name, 'x': x, 'y': y})
-
-    # Parse hierarchical labels - improved pattern
-    hlabel_pattern = r'\(hierarchical_label\s+"([^"]+)"\s*\n?\s*\(shape\s+\w+\)\s*\n?\s*\(at\s+([\d.-]+)\s+([\d.-]+)'
-    for match in re.finditer(hlabel_pattern, content):
-        name = match.group(1)
-        x, y = float(match.group(2)), float(match.group(3))
-        data['hierarchical_labels'].append({'name': name, 'x': x, 'y': y})
+    # The file is memory-mapped; wires and junctions are only counted and
+    # lib_symbols is never tokenized
+    with open_sheet(filepath) as sheet:
+        data['wires'] = len(sheet.find_sections('wire'))
+        data['junctions'] = len(sheet.find_sections('junction'))
+
+        for node in sheet.instance_symbols():
+            if node.get('lib_id', default='').startswith('power:'):
+                data['power_symbols'] += 1
+            else:
+                data['symbols'] += 1
+
+        for node in sheet.nodes('label', 'hierarchical_label'):
+            x, y, _ = node.at()
+            key = 'labels' if node.name == 'label' else 'hierarchical_labels'
+            data[key].append({'name': node.value(), 'x': x, 'y': y})
+
+    # Geometry checks: T-junctions without a junction dot, and wire groups
+    # that join differently named labels / power nets
+    index = SchematicIndex.load(filepath)
+    data['missing_junctions'] = index.junctions_needed()
+    data['shorts'] = index.shorts()
 
     return data
 
@@ -109,6 +95,13 @@ def main():
         if len(data['hierarchical_labels']) == 0:
             issues.append("No hierarchical labels - may be isolated")
 
+        for x, y in data['missing_junctions']:
+            issues.append(f"Missing junction at ({x}, {y})")
+
+        for group in data['shorts']:
+            x, y = group['at']
+            issues.append(f"Nets {' / '.join(group['names'])} shorted near ({x}, {y})")
+
         if issues:
             print(f"  Issues: {', '.join(issues)}")
             total_issues += len(issues)
@@ -0,0 +1,68 @@
+"""
+테스트 공용 회로도.
+
+power_rail_sheet: +3V3 전원 심볼과 저항 R1 핀 1을 와이어로 잇고, 같은 와이어 위에 라벨을 놓은 시트 하나.
+"""
+
+import pytest
+
+LIB_SYMBOLS = """	(lib_symbols
+		(symbol "power:+3V3"
+			(power)
+			(property "Reference" "#PWR" (at 0 0 0))
+			(property "Value" "+3V3" (at 0 0 0))
+			(symbol "+3V3_1_1"
+				(pin power_in line (at 0 0 90) (length 0) hide
+					(name "+3V3")
+					(number "1")
+				)
+			)
+		)
+		(symbol "Device:R"
+			(property "Reference" "R" (at 0 0 0))
+			(property "Value" "R" (at 0 0 0))
+			(symbol "R_1_1"
+				(pin passive line (at 0 3.81 270) (length 1.27)
+					(name "~")
+					(number "1")
+				)
+				(pin passive line (at 0 -3.81 90) (length 1.27)
+					(name "~")
+					(number "2")
+				)
+			)
+		)
+	)
+"""
+
+POWER = """	(symbol (lib_id "power:+3V3") (at 50.8 40.64 0) (unit 1)
+		(property "Reference" "#PWR01" (at 0 0 0))
+		(property "Value" "+3V3" (at 0 0 0))
+	)
+"""
+
+# R1 핀 1 끝점은 (50.8, 46.99) - 와이어가 전원 핀 (50.8, 40.64)에서 여기까지 이어짐
+RESISTOR = """	(symbol (lib_id "Device:R") (at 50.8 50.8 0) (unit 1)
+		(property "Reference" "R1" (at 0 0 0))
+		(property "Value" "10k" (at 0 0 0))
+	)
+	(wire (pts (xy 50.8 40.64) (xy 50.8 46.99)))
+"""
+
+
+@pytest.fixture
+def power_rail_sheet(tmp_path):
+    """전원 심볼(선택) + R1 + 와이어 + 라벨로 된 루트 시트를 쓰는 함수.
+
+    labels는 와이어 중간 (50.8, 43.18)에 놓을 라벨 노드 문자열, 반환값은 시트 경로입니다.
+    """
+    def write(labels: str = "", power: bool = True):
+        path = tmp_path / "test.kicad_sch"
+        path.write_text(
+            '(kicad_sch\n\t(version 20231120)\n\t(generator "eeschema")\n'
+            '\t(uuid "00000000-0000-0000-0000-000000000001")\n'
+            + LIB_SYMBOLS + (POWER if power else "") + RESISTOR + labels + ")\n",
+            encoding="utf-8",
+        )
+        return path
+    return write
@@ -0,0 +1,34 @@
+"""
+connectivity 넷 이름 규칙 테스트 (전원 심볼 + 라벨이 같은 넷에 있는 시트, conftest.power_rail_sheet).
+"""
+
+from kicad_auto_builder.connectivity import Project
+
+
+def _net_of(project: Project, ref: str, number: str):
+    for net in project.nets():
+        if any(p.ref == ref and p.number == number for p in net.pins):
+            return net
+    raise AssertionError(f"{ref}.{number} 넷 없음")
+
+
+def test_power_symbol_beats_local_label(power_rail_sheet):
+    project = Project.load(power_rail_sheet('\t(label "VDD_IO" (at 50.8 43.18 0))\n'))
+    net = _net_of(project, "R1", "1")
+    assert net.name == "+3V3"
+    assert "VDD_IO" in net.names
+
+
+def test_power_symbol_beats_hierarchical_label(power_rail_sheet):
+    project = Project.load(power_rail_sheet('\t(hierarchical_label "VDD_IO" (shape input) (at 50.8 43.18 0))\n'))
+    assert _net_of(project, "R1", "1").name == "+3V3"
+
+
+def test_global_label_beats_power_symbol(power_rail_sheet):
+    project = Project.load(power_rail_sheet('\t(global_label "VCC_GLOBAL" (shape input) (at 50.8 43.18 0))\n'))
+    assert _net_of(project, "R1", "1").name == "VCC_GLOBAL"
+
+
+def test_local_label_without_power_is_sheet_scoped(power_rail_sheet):
+    project = Project.load(power_rail_sheet('\t(label "VDD_IO" (at 50.8 43.18 0))\n', power=False))
+    assert _net_of(project, "R1", "1").name == "/VDD_IO"
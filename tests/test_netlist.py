@@ -0,0 +1,43 @@
+"""
+넷리스트 넷 이름 회귀 테스트 - 전원 레일에 로컬 라벨이 함께 붙은 넷 (conftest.power_rail_sheet).
+
+.net / JSON 모두 connectivity의 넷 이름을 그대로 쓰므로 전원 심볼 이름(+3V3)으로 나와야 합니다.
+"""
+
+import json
+
+from kicad_auto_builder.connectivity import Project
+from kicad_auto_builder.netlist import Netlist
+
+
+def _netlist(power_rail_sheet, **kw) -> Netlist:
+    path = power_rail_sheet('\t(label "VDD_IO" (at 50.8 43.18 0))\n', **kw)
+    return Netlist.from_project(Project.load(path), path)
+
+
+def test_power_rail_with_label_keeps_power_name(power_rail_sheet):
+    netlist = _netlist(power_rail_sheet)
+    assert netlist.net_names()[netlist.net_of("R1", "1")] == "+3V3"
+    assert "/VDD_IO" not in netlist.net_names().values()
+
+
+def test_kicad_netlist_uses_power_name(power_rail_sheet):
+    text = _netlist(power_rail_sheet).to_kicad()
+    assert '(name "+3V3") (class "Default")' in text
+    assert '(node (ref "R1") (pin "1") (pintype "passive"))' in text
+    assert "VDD_IO" not in text
+
+
+def test_json_netlist_round_trip_uses_power_name(power_rail_sheet, tmp_path):
+    path = tmp_path / "test.json"
+    _netlist(power_rail_sheet).save(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [net["name"] for net in data["nets"] if [0, "1", "passive"] in net["nodes"]] == ["+3V3"]
+
+    loaded = Netlist.load(path)
+    assert loaded.net_names()[loaded.net_of("R1", "1")] == "+3V3"
+
+
+def test_label_without_power_rail_is_sheet_scoped(power_rail_sheet):
+    netlist = _netlist(power_rail_sheet, power=False)
+    assert netlist.net_names()[netlist.net_of("R1", "1")] == "/VDD_IO"